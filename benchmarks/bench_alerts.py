@@ -0,0 +1,110 @@
+"""Benchmark: alert rule evaluation over a multi-route run.
+
+Builds a price history summary for `--routes` routes x `--window` outbound dates, then times
+reading the run's history from it (`load_alert_history`) and checking `--rules` rules (a mix
+of all kinds, half of them limited to one route) against the run (`evaluate_alerts`).
+
+Usage:
+    uv run python benchmarks/bench_alerts.py --routes 5 --window 60 --rules 300
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "src"))
+
+from flight_price_tracker.alerts import evaluate_alerts, load_alert_history  # noqa: E402
+from flight_price_tracker.records import SearchRun  # noqa: E402
+from flight_price_tracker.settings import AlertRuleConfig  # noqa: E402
+from flight_price_tracker.summary import update_summary  # noqa: E402
+
+_KINDS = ("drop", "drop_pct", "new_low", "below")
+
+
+def _runs(routes: list[str], *, window: int, day: int) -> list[SearchRun]:
+    """Return one run's rows, with prices that move from day to day."""
+    observed_at = datetime(2026, 1, 1, 6, 0, tzinfo=timezone.utc) + timedelta(days=day)
+    return [
+        SearchRun(
+            run_date=observed_at.date().isoformat(),
+            observed_at_utc=observed_at,
+            route=route,
+            origin=route[:3],
+            destination=route[4:],
+            outbound_date=(datetime(2026, 3, 1) + timedelta(days=i)).date().isoformat(),
+            currency="EUR",
+            serpapi_params="{}",
+            cheapest_price=100.0 + (day * 37 + i * 11 + r * 7) % 120,
+        )
+        for r, route in enumerate(routes)
+        for i in range(window)
+    ]
+
+
+def _rules(n: int, routes: list[str]) -> list[AlertRuleConfig]:
+    """Return `n` rules cycling through the kinds; every other rule is limited to one route."""
+    rules = []
+    for i in range(n):
+        kind = _KINDS[i % len(_KINDS)]
+        rules.append(
+            AlertRuleConfig(
+                name=f"rule-{i}",
+                kind=kind,
+                threshold=None if kind == "new_low" else float(5 + i % 40),
+                routes=[routes[i % len(routes)]] if i % 2 else None,
+            )
+        )
+    return rules
+
+
+def main() -> None:
+    """Build the history, time history lookup and rule evaluation, and print JSON results."""
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--routes", type=int, default=5)
+    parser.add_argument("--window", type=int, default=60)
+    parser.add_argument("--rules", type=int, default=300)
+    parser.add_argument("--history-days", type=int, default=30)
+    args = parser.parse_args()
+
+    routes = [f"VIE-R{i:02d}" for i in range(args.routes)]
+    rules = _rules(args.rules, routes)
+    with tempfile.TemporaryDirectory() as tmp:
+        dataset_root = Path(tmp) / "flight_price_tracker"
+        for day in range(args.history_days):
+            update_summary(
+                dataset_root=dataset_root, search_runs=_runs(routes, window=args.window, day=day)
+            )
+        current = _runs(routes, window=args.window, day=args.history_days)
+
+        t0 = time.perf_counter()
+        history = load_alert_history(dataset_root=dataset_root, search_runs=current)
+        history_seconds = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        alerts = evaluate_alerts(rules=rules, search_runs=current, history=history)
+        evaluate_seconds = time.perf_counter() - t0
+
+    print(
+        json.dumps(
+            {
+                "rows": len(current),
+                "rules": len(rules),
+                "alerts": len(alerts),
+                "history_seconds": history_seconds,
+                "evaluate_seconds": evaluate_seconds,
+                "total_seconds": history_seconds + evaluate_seconds,
+            },
+            indent=2,
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
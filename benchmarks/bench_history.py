@@ -0,0 +1,144 @@
+"""Benchmark: `report.load_previous_prices` over a synthetic multi-year history.
+
+Generates `--years` of daily runs (one `search_runs` file per day, `--window` outbound dates
+per run, plus a second route as noise) and compares the Arrow-pushdown implementation with
+the previous full-scan + `to_pylist()` implementation (kept here as a reference) and, if
+DuckDB is installed, with the `previous_prices` named query of the DuckDB query layer (with
+and without the engine start-up).
+
+Usage:
+    uv run python benchmarks/bench_history.py --years 3 --window 30
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections.abc import Callable
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "src"))
+
+import pyarrow.dataset as ds  # noqa: E402
+
+from flight_price_tracker.parquet_writer import write_tables  # noqa: E402
+from flight_price_tracker.query import NAMED_QUERIES, QueryEngine, QueryError  # noqa: E402
+from flight_price_tracker.report import load_previous_prices  # noqa: E402
+
+
+def _legacy_load_previous_prices(
+    *, data_root: Path, dataset_name: str, route: str, before_observed_at_utc: datetime
+) -> dict[str, float] | None:
+    """Previous implementation: read everything, filter in a Python loop."""
+    dataset = ds.dataset(str(data_root / dataset_name / "search_runs"), format="parquet")
+    table = dataset.to_table(
+        columns=["observed_at_utc", "route", "outbound_date", "cheapest_price"]
+    )
+    filtered = [
+        r
+        for r in table.to_pylist()
+        if r["route"] == route and r["observed_at_utc"] < before_observed_at_utc
+    ]
+    if not filtered:
+        return None
+    latest_obs = max(r["observed_at_utc"] for r in filtered)
+    out = {
+        r["outbound_date"]: float(r["cheapest_price"])
+        for r in filtered
+        if r["observed_at_utc"] == latest_obs and r["cheapest_price"] is not None
+    }
+    return out or None
+
+
+def _generate(data_root: Path, *, years: int, window: int) -> datetime:
+    """Write the synthetic history and return the timestamp just after the last run."""
+    start = datetime(2020, 1, 1, 6, 0, tzinfo=timezone.utc)
+    days = 365 * years
+    for day in range(days):
+        observed_at = start + timedelta(days=day)
+        rows: list[dict[str, Any]] = []
+        for route in ("VIE-TGD", "VIE-LHR"):
+            for i in range(window):
+                rows.append(
+                    {
+                        "run_date": observed_at.date().isoformat(),
+                        "observed_at_utc": observed_at,
+                        "route": route,
+                        "outbound_date": (observed_at.date() + timedelta(days=i + 1)).isoformat(),
+                        "currency": "EUR",
+                        "cheapest_price": 100.0 + (day * 7 + i) % 90,
+                    }
+                )
+        write_tables(
+            dataset_root=data_root / "flight_price_tracker", search_runs_rows=rows, offers_rows=[]
+        )
+    return start + timedelta(days=days)
+
+
+def _measure(fn: Callable[..., Any], **kwargs: Any) -> dict[str, float]:
+    """Return wall time and Python peak allocation of one call."""
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    fn(**kwargs)
+    seconds = time.perf_counter() - t0
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"seconds": seconds, "py_peak_mb": peak / 2**20}
+
+
+def _measure_duckdb(kwargs: dict[str, Any]) -> dict[str, dict[str, float]]:
+    """Time the `previous_prices` named query (uncached), with and without engine start-up."""
+    sql = NAMED_QUERIES["previous_prices"].sql
+    params = {"route": kwargs["route"], "before": kwargs["before_observed_at_utc"]}
+    t0 = time.perf_counter()
+    with QueryEngine(kwargs["data_root"] / kwargs["dataset_name"]) as engine:
+        table = engine.sql(sql, params)
+        cold = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        engine.sql(sql, params)
+        warm = time.perf_counter() - t0
+    prices = table.to_pydict()
+    assert dict(zip(prices["outbound_date"], prices["cheapest_price"], strict=True)) == (
+        load_previous_prices(**kwargs)
+    )
+    return {"duckdb_cold": {"seconds": cold}, "duckdb_warm": {"seconds": warm}}
+
+
+def main() -> None:
+    """Generate the dataset, run both implementations and print JSON results."""
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--years", type=int, default=3)
+    parser.add_argument("--window", type=int, default=30)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        data_root = Path(tmp)
+        before = _generate(data_root, years=args.years, window=args.window)
+        kwargs = {
+            "data_root": data_root,
+            "dataset_name": "flight_price_tracker",
+            "route": "VIE-TGD",
+            "before_observed_at_utc": before,
+        }
+        assert load_previous_prices(**kwargs) == _legacy_load_previous_prices(**kwargs)
+        results = {
+            "rows": 365 * args.years * args.window * 2,
+            "legacy": _measure(_legacy_load_previous_prices, **kwargs),
+            "pushdown": _measure(load_previous_prices, **kwargs),
+        }
+        try:
+            results.update(_measure_duckdb(kwargs))
+        except QueryError:
+            pass  # DuckDB is not installed
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""Benchmark: full `extract_offers` + slice vs. single-pass `top_offers`.
+
+Builds a large multi-airport response (`--airports` containers with `--entries` offers per
+bucket, as returned with `deep_search`) and measures wall time and Python peak memory of
+picking the top-N and cheapest offers for `--dates` outbound dates.
+
+Usage:
+    uv run python benchmarks/bench_normalize.py --airports 4 --entries 150 --top-n 5
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+import tracemalloc
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path[:0] = [str(ROOT / "src"), str(ROOT / "benchmarks")]
+
+from simulator import synthetic_response  # noqa: E402
+
+from flight_price_tracker.normalize import (  # noqa: E402
+    cheapest_offer,
+    extract_offers,
+    top_offers,
+)
+
+
+def _full_sort(resp: dict[str, Any], *, top_n: int) -> Any:
+    """Previous run path: build and sort every offer, then slice and scan again."""
+    offers = extract_offers(resp, outbound_date="2026-03-01", default_currency="EUR")
+    return offers[:top_n], cheapest_offer(offers)
+
+
+def _single_pass(resp: dict[str, Any], *, top_n: int) -> Any:
+    """New run path: bounded heap, offers built only for the winners."""
+    return top_offers(resp, outbound_date="2026-03-01", top_n=top_n, default_currency="EUR")
+
+
+def _measure(fn: Callable[..., Any], responses: list[dict[str, Any]], top_n: int) -> dict:
+    """Return wall time (untraced) and Python peak memory (traced) over all responses."""
+    t0 = time.perf_counter()
+    for r in responses:
+        fn(r, top_n=top_n)
+    seconds = time.perf_counter() - t0
+
+    tracemalloc.start()
+    for r in responses:
+        fn(r, top_n=top_n)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"seconds": seconds, "py_peak_kb": peak / 1024}
+
+
+def main() -> None:
+    """Run both paths on identical responses and print JSON results."""
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--airports", type=int, default=4)
+    parser.add_argument("--entries", type=int, default=150)
+    parser.add_argument("--dates", type=int, default=30)
+    parser.add_argument("--top-n", type=int, default=5)
+    args = parser.parse_args()
+
+    responses = [
+        synthetic_response(airports=args.airports, entries=args.entries, seed=d)
+        for d in range(args.dates)
+    ]
+    for r in responses:
+        assert _full_sort(r, top_n=args.top_n) == _single_pass(r, top_n=args.top_n)
+
+    results = {
+        "offers_per_response": 2 * args.entries * (args.airports + 1),
+        "dates": args.dates,
+        "full_sort": _measure(_full_sort, responses, args.top_n),
+        "single_pass": _measure(_single_pass, responses, args.top_n),
+    }
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""Benchmark: decode, canonicalise and hash SerpApi payloads.
+
+Compares, on large multi-airport responses (as returned with `deep_search`):
+
+- `legacy`: `str` decode + `json.loads`, `json.dumps` to a canonical string, then one UTF-8
+  encode for the evidence file and another for the SHA256;
+- `payload`: :func:`decode_json` on the response bytes (orjson when installed) and
+  :func:`canonical_json` once, hashing the same bytes that are written.
+
+Both paths must produce identical evidence bytes.
+
+Usage:
+    uv run python benchmarks/bench_payload.py --airports 4 --entries 150
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+from collections.abc import Callable
+from hashlib import sha256
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path[:0] = [str(ROOT / "src"), str(ROOT / "benchmarks")]
+
+from simulator import synthetic_response  # noqa: E402
+
+from flight_price_tracker.payload import JSON_BACKEND, canonical_json, decode_json  # noqa: E402
+
+
+def _legacy(body: bytes) -> tuple[bytes, str]:
+    """Previous path: `resp.json()`, `json.dumps`, then encode twice (write and hash)."""
+    data = json.loads(body.decode("utf-8"))
+    raw = json.dumps(data, ensure_ascii=False, sort_keys=True)
+    written = raw.encode("utf-8")
+    return written, sha256(raw.encode("utf-8")).hexdigest()
+
+
+def _payload(body: bytes) -> tuple[bytes, str]:
+    """New path: decode bytes, encode the canonical bytes once, hash those bytes."""
+    raw = canonical_json(decode_json(body))
+    return raw, sha256(raw).hexdigest()
+
+
+def _seconds(fn: Callable[[bytes], tuple[bytes, str]], bodies: list[bytes], repeat: int) -> float:
+    """Return the best wall time of `repeat` passes over all bodies."""
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        for body in bodies:
+            fn(body)
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main() -> None:
+    """Run both paths on identical response bodies and print JSON results."""
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--airports", type=int, default=4)
+    parser.add_argument("--entries", type=int, default=150)
+    parser.add_argument("--dates", type=int, default=30)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    # Response bodies as served: compact, unsorted keys, non-ASCII characters.
+    bodies = [
+        json.dumps(
+            {
+                **synthetic_response(airports=args.airports, entries=args.entries, seed=d),
+                "note": "Beč–Ñ",
+            },
+            separators=(",", ":"),
+            ensure_ascii=False,
+        ).encode("utf-8")
+        for d in range(args.dates)
+    ]
+    for body in bodies:
+        assert _legacy(body) == _payload(body)
+
+    legacy = _seconds(_legacy, bodies, args.repeat)
+    payload = _seconds(_payload, bodies, args.repeat)
+    results = {
+        "backend": JSON_BACKEND,
+        "dates": args.dates,
+        "mb_per_response": round(sum(map(len, bodies)) / len(bodies) / 1e6, 3),
+        "legacy_seconds": legacy,
+        "payload_seconds": payload,
+        "speedup": legacy / payload,
+    }
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""Benchmark: memory per offer for row dicts vs. slotted `Offer` / `SearchRun` records.
+
+Builds `--dates` search runs with `--offers` offers each, once as the `search_runs` / `offers`
+row dicts `run_once` used to assemble and once as records, and reports traced Python memory
+per offer plus the time to turn each into the Arrow tables the PyArrow writer writes.
+
+Usage:
+    uv run python benchmarks/bench_records.py --dates 2000 --offers 5
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+import tracemalloc
+from collections.abc import Callable
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "src"))
+
+from flight_price_tracker.parquet_writer import (  # noqa: E402
+    OFFERS_SCHEMA,
+    SEARCH_RUNS_SCHEMA,
+    offers_to_table,
+    rows_to_table,
+    search_runs_to_table,
+)
+from flight_price_tracker.records import Offer, SearchRun  # noqa: E402
+
+OBSERVED_AT = datetime(2026, 3, 1, 6, 0, tzinfo=timezone.utc)
+
+
+def _records(dates: int, offers: int) -> list[SearchRun]:
+    """Build search run records with their offers."""
+    runs = []
+    for d in range(dates):
+        od = f"2030-{d % 12 + 1:02d}-{d % 28 + 1:02d}"
+        runs.append(
+            SearchRun(
+                run_date="2026-03-01",
+                observed_at_utc=OBSERVED_AT,
+                route="VIE-TGD",
+                origin="VIE",
+                destination="TGD",
+                outbound_date=od,
+                currency="EUR",
+                serpapi_params="{}",
+                cheapest_price=100.0 + d,
+                evidence_json_path="e.json",
+                evidence_sha256="0" * 64,
+                offers=tuple(
+                    Offer(
+                        outbound_date=od,
+                        bucket="best_flights",
+                        price=100.0 + d + r,
+                        currency="EUR",
+                        airlines="Austrian",
+                        depart_time=f"{od} 06:00",
+                        arrive_time=f"{od} 09:30",
+                        duration_minutes=90 + r,
+                        stops=r % 2,
+                    )
+                    for r in range(offers)
+                ),
+            )
+        )
+    return runs
+
+
+def _rows(dates: int, offers: int) -> tuple[list[dict[str, Any]], list[dict[str, Any]]]:
+    """Build the same data as row dicts (offer dicts re-copied into ranked rows)."""
+    runs = _records(dates, offers)
+    search_runs_rows = [r.to_row() for r in runs]
+    offers_rows = [row for r in runs for row in r.offer_rows()]
+    del runs
+    return search_runs_rows, offers_rows
+
+
+def _traced(build: Callable[[], Any]) -> tuple[Any, int]:
+    """Return the built object and the Python memory it still holds."""
+    tracemalloc.start()
+    obj = build()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return obj, current
+
+
+def main() -> None:
+    """Measure both representations and print JSON results."""
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--dates", type=int, default=2000)
+    parser.add_argument("--offers", type=int, default=5)
+    args = parser.parse_args()
+    n_offers = args.dates * args.offers
+
+    (sr_rows, of_rows), rows_bytes = _traced(lambda: _rows(args.dates, args.offers))
+    t0 = time.perf_counter()
+    rows_to_table(sr_rows, schema=SEARCH_RUNS_SCHEMA, load_id="1")
+    rows_to_table(of_rows, schema=OFFERS_SCHEMA, load_id="1")
+    rows_seconds = time.perf_counter() - t0
+    del sr_rows, of_rows
+
+    runs, records_bytes = _traced(lambda: _records(args.dates, args.offers))
+    t0 = time.perf_counter()
+    search_runs_to_table(runs, load_id="1")
+    offers_to_table(runs, load_id="1")
+    records_seconds = time.perf_counter() - t0
+
+    results = {
+        "offers": n_offers,
+        "dicts": {"bytes_per_offer": rows_bytes / n_offers, "to_arrow_seconds": rows_seconds},
+        "records": {
+            "bytes_per_offer": records_bytes / n_offers,
+            "to_arrow_seconds": records_seconds,
+        },
+    }
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
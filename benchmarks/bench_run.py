@@ -0,0 +1,126 @@
+"""Benchmark: `run_once` end to end against the local SerpApi simulator.
+
+Each repetition runs a full tracking run (fetch, evidence, normalize, Parquet load, summary,
+reports) in a fresh temporary directory, with the SerpApi client pointed at
+:class:`simulator.SerpApiSimulator`. Besides the total wall time, the per-stage totals of the
+run's `run_metrics` table are reported, so a regression can be traced to a stage.
+
+Usage:
+    uv run python benchmarks/bench_run.py --routes 2 --dates 30 --latency 0.05 --error-rate 0.05
+"""
+
+from __future__ import annotations
+
+import argparse
+import functools
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path[:0] = [str(ROOT / "src"), str(ROOT / "benchmarks")]
+
+import pyarrow.dataset as ds  # noqa: E402
+from simulator import SerpApiSimulator  # noqa: E402
+
+import flight_price_tracker.run as run  # noqa: E402
+from flight_price_tracker.serpapi import SerpApiClient  # noqa: E402
+
+_DESTINATIONS = ("TGD", "LHR", "CDG", "FCO", "BCN", "AMS", "ZRH", "CPH")
+
+
+def _config(*, routes: int, dates: int, writer: str, concurrency: int) -> str:
+    """Return a YAML config with `routes` routes of `dates` outbound dates each."""
+    lines = ["routes:"]
+    for destination in _DESTINATIONS[:routes]:
+        lines.append(f"  - {{origin: VIE, destination: {destination}}}")
+    lines += [
+        f"window: {{start_offset_days: 1, window_days: {dates}}}",
+        # Short backoffs: the benchmark measures the run, not the configured waits.
+        f"serpapi: {{rate_limit_seconds: 0, max_concurrency: {concurrency},",
+        "  retry_backoff_seconds: 0.05, final_pass_delay_seconds: 0.1}",
+        f"storage: {{writer: {writer}}}",
+        "cache: {enabled: false}",
+    ]
+    return "\n".join(lines) + "\n"
+
+
+def _run(config: str) -> dict[str, Any]:
+    """Run once in a fresh directory and return wall time and per-stage totals."""
+    cwd = Path.cwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        try:
+            Path("config.yaml").write_text(config, encoding="utf-8")
+            t0 = time.perf_counter()
+            run.run_once(config_path=Path("config.yaml"))
+            seconds = time.perf_counter() - t0
+            metrics = ds.dataset("data/flight_price_tracker/run_metrics").to_table()
+            runs = ds.dataset("data/flight_price_tracker/search_runs").to_table(
+                columns=["cheapest_price"]
+            )
+        finally:
+            os.chdir(cwd)
+
+    stages: dict[str, float] = {}
+    for row in metrics.select(["stage", "seconds"]).to_pylist():
+        stages[row["stage"]] = stages.get(row["stage"], 0.0) + row["seconds"]
+    return {
+        "seconds": seconds,
+        "search_runs": runs.num_rows,
+        "priced": runs.num_rows - runs["cheapest_price"].null_count,
+        "stage_seconds": stages,
+    }
+
+
+def main() -> None:
+    """Run the benchmark and print JSON results."""
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--routes", type=int, default=2, choices=range(1, len(_DESTINATIONS) + 1))
+    parser.add_argument("--dates", type=int, default=30)
+    parser.add_argument("--airports", type=int, default=1)
+    parser.add_argument("--entries", type=int, default=40)
+    parser.add_argument("--latency", type=float, default=0.02)
+    parser.add_argument("--jitter", type=float, default=0.01)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--writer", choices=("dlt", "pyarrow"), default="pyarrow")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    os.environ.setdefault("SERPAPI_API_KEY", "bench")
+    config = _config(
+        routes=args.routes, dates=args.dates, writer=args.writer, concurrency=args.concurrency
+    )
+    sim = SerpApiSimulator(
+        airports=args.airports,
+        entries=args.entries,
+        latency_seconds=args.latency,
+        jitter_seconds=args.jitter,
+        error_rate=args.error_rate,
+        rate_limit_rate=args.rate_limit_rate,
+    )
+    with sim:
+        run.SerpApiClient = functools.partial(SerpApiClient, base_url=sim.base_url)
+        runs = [_run(config) for _ in range(args.repeat)]
+
+    best = min(runs, key=lambda r: r["seconds"])
+    results = {
+        "requests": sim.requests,
+        "statuses": {str(status): n for status, n in sorted(sim.statuses.items())},
+        "response_mb": sim.response_bytes / 2**20,
+        "search_runs": best["search_runs"],
+        "priced": best["priced"],
+        "seconds": best["seconds"],
+        "stage_seconds": best["stage_seconds"],
+    }
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""Micro-benchmark: per-request overhead of the SerpApi client paths.
+
+Compares, against the local SerpApi stub used by the tests:
+
+- `dlt`: the previous path (fresh dlt `RESTAPIConfig` + `rest_api_resources` per request),
+- `one-shot`: :func:`search_google_flights` (a new client and connection per request),
+- `pooled`: one shared :class:`SerpApiClient` with keep-alive connections.
+
+Usage:
+    uv run python benchmarks/bench_serpapi_client.py --requests 200
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+from collections.abc import Callable, Mapping
+from pathlib import Path
+from typing import Any
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path[:0] = [str(ROOT / "src"), str(ROOT / "tests")]
+
+from serpapi_stub import SerpApiStub  # noqa: E402
+
+from flight_price_tracker.serpapi import SerpApiClient, search_google_flights  # noqa: E402
+
+SearchFn = Callable[[Mapping[str, Any]], Any]
+
+
+def _dlt_search(base_url: str) -> SearchFn:
+    """Return a search function replicating the previous dlt REST API source path."""
+    from dlt.sources.rest_api import rest_api_resources
+
+    def _search(params: Mapping[str, Any]) -> Any:
+        merged = {**dict(params), "api_key": "bench", "engine": "google_flights"}
+        config: Any = {
+            "client": {"base_url": base_url},
+            "resources": [
+                {
+                    "name": "search",
+                    "endpoint": {
+                        "path": "search.json",
+                        "params": merged,
+                        "paginator": {"type": "single_page"},
+                        "data_selector": "$",
+                    },
+                }
+            ],
+        }
+        (resource,) = list(rest_api_resources(config))
+        return list(resource)
+
+    return _search
+
+
+def _time_per_request(search: SearchFn, n: int) -> float:
+    """Return mean seconds per request over `n` sequential requests."""
+    search({"outbound_date": "2026-03-01"})  # warm-up (imports, first connection)
+    start = time.perf_counter()
+    for i in range(n):
+        search({"outbound_date": f"2026-03-{i % 28 + 1:02d}"})
+    return (time.perf_counter() - start) / n
+
+
+def main() -> None:
+    """Run the benchmark and print per-request overhead in milliseconds."""
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=200)
+    args = parser.parse_args()
+
+    payload = json.loads(
+        (ROOT / "tests" / "fixtures" / "serpapi_google_flights_sample.json").read_text("utf-8")
+    )
+
+    with SerpApiStub(payload=payload) as stub:
+        with SerpApiClient(api_key="bench", base_url=stub.base_url) as client:
+            paths: dict[str, SearchFn] = {
+                "dlt": _dlt_search(stub.base_url),
+                "one-shot": lambda p: search_google_flights(
+                    api_key="bench", params=p, base_url=stub.base_url
+                ),
+                "pooled": client.search_google_flights,
+            }
+            results = {name: _time_per_request(fn, args.requests) for name, fn in paths.items()}
+            connections = stub.connections
+
+    for name, seconds in results.items():
+        print(f"{name:>9}: {seconds * 1000:7.3f} ms/request")
+    print(f"stub connections accepted: {connections}")
+
+
+if __name__ == "__main__":
+    main()
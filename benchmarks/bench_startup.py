@@ -0,0 +1,120 @@
+"""Benchmark: CLI startup time per subcommand, with a regression threshold.
+
+Runs each command in a fresh interpreter and reports:
+
+- `ms`: best wall time over `--repeat` runs, minus a bare `python -c pass`;
+- `import_ms`: total of the top-level imports reported by `python -X importtime`;
+- `slowest`: the slowest top-level imports;
+- `heavy`: heavy packages (dlt, PyArrow, pydantic-settings, requests) that were imported.
+
+Exits with status 1 if a command exceeds its budget or imports a heavy package it should not.
+
+Usage:
+    uv run python benchmarks/bench_startup.py --repeat 10
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+
+HEAVY = ("dlt", "pyarrow", "pydantic_settings", "requests")
+
+# (name, argv, budget in ms over a bare interpreter). Validation is dominated by importing
+# pydantic itself; `--help` should need nothing beyond argparse.
+COMMANDS: list[tuple[str, list[str], float]] = [
+    ("help", ["--help"], 50.0),
+    ("validate-config", ["validate-config", "--config", str(ROOT / "config.yaml")], 250.0),
+]
+
+_PROBE = (
+    "import sys\n"
+    "from flight_price_tracker.cli import main\n"
+    "try:\n"
+    "    main(sys.argv[1:])\n"
+    "except SystemExit:\n"
+    "    pass\n"
+    "print(' '.join(sorted({m.split('.')[0] for m in sys.modules})), file=sys.stderr)\n"
+)
+
+
+def _env() -> dict[str, str]:
+    """Return the environment with `src` on the import path."""
+    return {**os.environ, "PYTHONPATH": str(ROOT / "src")}
+
+
+def _best_ms(argv: list[str], repeat: int) -> float:
+    """Return the best wall time of `repeat` runs of a Python command line, in ms."""
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        subprocess.run([sys.executable, *argv], env=_env(), capture_output=True, check=False)
+        best = min(best, time.perf_counter() - t0)
+    return best * 1000
+
+
+def _profile(args: list[str]) -> tuple[float, list[tuple[str, float]], list[str]]:
+    """Run a command under `-X importtime`.
+
+    Returns:
+        Tuple of (total top-level import ms, slowest top-level imports, heavy modules loaded).
+    """
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", _PROBE, *args],
+        env=_env(),
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    top: list[tuple[str, float]] = []
+    lines = proc.stderr.splitlines()
+    for line in lines:
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        # Top-level imports are not indented beyond the single separator space.
+        if not name.startswith("  ") and cumulative.strip().isdigit():
+            top.append((name.strip(), int(cumulative) / 1000))
+    loaded = set(lines[-1].split()) if lines else set()
+    slowest = sorted(top, key=lambda t: t[1], reverse=True)[:5]
+    return sum(ms for _, ms in top), slowest, [m for m in HEAVY if m in loaded]
+
+
+def main() -> None:
+    """Measure every command and print JSON results."""
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument(
+        "--scale", type=float, default=1.0, help="Multiply all budgets (e.g. for slow machines)"
+    )
+    args = parser.parse_args()
+
+    bare = _best_ms(["-c", "pass"], args.repeat)
+    results: dict[str, dict[str, object]] = {}
+    failed = False
+    for name, argv, budget in COMMANDS:
+        ms = _best_ms(["-c", _PROBE, *argv], args.repeat) - bare
+        import_ms, slowest, heavy = _profile(argv)
+        ok = ms <= budget * args.scale and not heavy
+        failed |= not ok
+        results[name] = {
+            "ms": round(ms, 1),
+            "budget_ms": budget * args.scale,
+            "import_ms": round(import_ms, 1),
+            "slowest": {mod: round(t, 1) for mod, t in slowest},
+            "heavy": heavy,
+            "ok": ok,
+        }
+    print(json.dumps({"bare_interpreter_ms": round(bare, 1), "commands": results}, indent=2))
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
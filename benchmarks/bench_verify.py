@@ -0,0 +1,80 @@
+"""Benchmark: evidence verification with one and several hashing threads.
+
+Writes `--files` JSON evidence files of `--kib` KiB each (with sidecars), then times a full
+`verify_evidence` pass with one thread and with `--workers` threads, and an incremental pass
+in which nothing changed.
+
+Usage:
+    uv run python benchmarks/bench_verify.py --files 400 --kib 256 --workers 8
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import tempfile
+from hashlib import sha256
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "src"))
+
+from flight_price_tracker.evidence_store import evidence_json_path  # noqa: E402
+from flight_price_tracker.verify import verify_evidence  # noqa: E402
+
+
+def _write_tree(evidence_root: Path, *, files: int, kib: int) -> None:
+    """Write evidence files with distinct payloads and matching sidecars."""
+    filler = "x" * (kib * 1024)
+    for i in range(files):
+        path = evidence_json_path(
+            evidence_root=evidence_root,
+            route=f"VIE-R{i % 5:02d}",
+            run_date=f"2026-01-{1 + i // 100 % 28:02d}",
+            outbound_date=f"2026-{3 + i // 28 % 9:02d}-{1 + i % 28:02d}",
+        )
+        raw = json.dumps({"i": i, "filler": filler}).encode("utf-8")
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(raw)
+        path.with_suffix(".sha256").write_text(sha256(raw).hexdigest() + "\n", encoding="utf-8")
+
+
+def main() -> None:
+    """Build the evidence tree, time the verification passes, and print JSON results."""
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--files", type=int, default=400)
+    parser.add_argument("--kib", type=int, default=256)
+    parser.add_argument("--workers", type=int, default=8)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        evidence_root = Path(tmp) / "evidence"
+        manifest = Path(tmp) / "manifest.json"
+        _write_tree(evidence_root, files=args.files, kib=args.kib)
+        kwargs = {"evidence_root": evidence_root, "dataset_root": Path(tmp) / "data"}
+
+        serial = verify_evidence(**kwargs, workers=1, manifest_path=None)
+        parallel = verify_evidence(**kwargs, workers=args.workers, manifest_path=manifest)
+        incremental = verify_evidence(**kwargs, manifest_path=manifest, incremental=True)
+
+    print(
+        json.dumps(
+            {
+                "files": serial.files,
+                "megabytes": serial.bytes_hashed / 1e6,
+                "issues": len(serial.issues) + len(parallel.issues),
+                "workers": args.workers,
+                "serial_seconds": serial.seconds,
+                "parallel_seconds": parallel.seconds,
+                "speedup": serial.seconds / parallel.seconds if parallel.seconds else 0.0,
+                "incremental_hashed": incremental.hashed,
+                "incremental_seconds": incremental.seconds,
+            },
+            indent=2,
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
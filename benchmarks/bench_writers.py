@@ -0,0 +1,93 @@
+"""Benchmark: end-to-end Parquet write time and peak RSS of the dlt vs PyArrow writers.
+
+Each writer runs in a fresh interpreter (so import cost is included, as in a real run) on a
+synthetic run of `--dates` outbound dates x `--offers` offers per date. Peak RSS is the child
+process' `ru_maxrss`.
+
+Usage:
+    uv run python benchmarks/bench_writers.py --dates 30 --offers 5
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+
+_CHILD = """
+import sys, time
+t0 = time.perf_counter()
+sys.path.insert(0, {src!r})
+from datetime import datetime, timezone
+from pathlib import Path
+from flight_price_tracker.records import Offer, SearchRun
+from flight_price_tracker.run import _write_tables
+from flight_price_tracker.settings import AppConfig
+
+config = AppConfig.model_validate(
+    {{"route": {{"origin": "VIE", "destination": "TGD"}}, "storage": {{"writer": {writer!r}}}}}
+)
+observed_at = datetime.now(timezone.utc)
+search_runs = []
+for d in range({dates}):
+    od = f"2030-01-{{d % 28 + 1:02d}}"
+    offers = tuple(
+        Offer(outbound_date=od, bucket="best_flights", price=100.0 + d + r, currency="EUR",
+              airlines="OS", depart_time="t", arrive_time="t", duration_minutes=90, stops=0)
+        for r in range({offers})
+    )
+    search_runs.append(SearchRun(
+        run_date=observed_at.date().isoformat(), observed_at_utc=observed_at, route="VIE-TGD",
+        origin="VIE", destination="TGD", outbound_date=od, currency="EUR", serpapi_params="{{}}",
+        cheapest_price=100.0 + d, evidence_json_path="e.json", evidence_sha256="0" * 64,
+        serpapi_search_metadata_id="m", offers=offers,
+    ))
+_write_tables(config=config, data_root=Path("data"), search_runs=search_runs)
+print(time.perf_counter() - t0)
+"""
+
+
+def _run_writer(writer: str, *, dates: int, offers: int) -> dict[str, float]:
+    """Run one writer in a child interpreter and return its wall time and peak RSS."""
+    code = _CHILD.format(src=str(ROOT / "src"), writer=writer, dates=dates, offers=offers)
+    with tempfile.TemporaryDirectory() as tmp:
+        env = {**os.environ, "DLT_DATA_DIR": str(Path(tmp) / ".dlt")}
+        proc = subprocess.Popen(
+            [sys.executable, "-c", code], cwd=tmp, env=env, stdout=subprocess.PIPE, text=True
+        )
+        assert proc.stdout is not None
+        out = proc.stdout.read()
+        _, status, usage = os.wait4(proc.pid, 0)
+        if status != 0:
+            raise RuntimeError(f"{writer} writer failed with status {status}")
+    return {"seconds": float(out.strip()), "peak_rss_mb": usage.ru_maxrss / 1024}
+
+
+def main() -> None:
+    """Run both writers and print a comparison as JSON."""
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--dates", type=int, default=30)
+    parser.add_argument("--offers", type=int, default=5)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    results: dict[str, dict[str, float]] = {}
+    for writer in ("dlt", "pyarrow"):
+        runs = [
+            _run_writer(writer, dates=args.dates, offers=args.offers) for _ in range(args.repeat)
+        ]
+        results[writer] = {
+            "seconds": min(r["seconds"] for r in runs),
+            "peak_rss_mb": min(r["peak_rss_mb"] for r in runs),
+        }
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
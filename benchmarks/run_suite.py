@@ -0,0 +1,177 @@
+"""Run the benchmark suite, save the results as JSON and compare them with a baseline.
+
+Every benchmark script runs in its own interpreter and prints JSON; the outputs are collected
+into one file together with the commit they were measured on:
+
+    benchmarks/results/<commit>.json
+
+Comparing against the file of an earlier commit flags every timing (values under keys ending
+in `seconds` or `ms`) that got slower by more than `--threshold`, and exits with status 1 if
+there is one.
+
+Usage:
+    uv run python benchmarks/run_suite.py --quick
+    uv run python benchmarks/run_suite.py --compare benchmarks/results/<old-commit>.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+ROOT = Path(__file__).resolve().parents[1]
+RESULTS_DIR = ROOT / "benchmarks" / "results"
+
+# Script -> (arguments of a full run, arguments of a `--quick` run).
+SUITE: dict[str, tuple[list[str], list[str]]] = {
+    "bench_run": ([], ["--dates", "10", "--repeat", "1"]),
+    "bench_normalize": ([], ["--dates", "5"]),
+    "bench_history": ([], ["--years", "1"]),
+    "bench_alerts": ([], ["--rules", "100"]),
+    "bench_verify": ([], ["--files", "100", "--kib", "64"]),
+    "bench_writers": ([], ["--repeat", "1"]),
+    "bench_records": ([], []),
+    "bench_payload": ([], ["--dates", "5"]),
+    "bench_startup": ([], []),
+}
+
+# Differences below this are treated as noise whatever the ratio.
+_MIN_DELTA_SECONDS = 0.002
+
+
+def _git(*args: str) -> str:
+    """Return the stripped output of a git command in the repository (empty on failure)."""
+    proc = subprocess.run(["git", *args], cwd=ROOT, capture_output=True, text=True, check=False)
+    return proc.stdout.strip() if proc.returncode == 0 else ""
+
+
+def _run_script(name: str, args: list[str]) -> dict[str, Any]:
+    """Run one benchmark script and return its parsed JSON output and wall time."""
+    t0 = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, str(ROOT / "benchmarks" / f"{name}.py"), *args],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    entry: dict[str, Any] = {
+        "args": args,
+        "exit_code": proc.returncode,
+        "wall_seconds": time.perf_counter() - t0,
+    }
+    try:
+        entry["results"] = json.loads(proc.stdout)
+    except json.JSONDecodeError:
+        entry["error"] = (proc.stderr or proc.stdout).strip().splitlines()[-5:]
+    return entry
+
+
+def _timings(results: Any, prefix: str = "") -> dict[str, float]:
+    """Flatten nested results to {dotted.key: value}, keeping only timings."""
+    if isinstance(results, dict):
+        flat: dict[str, float] = {}
+        for key, value in results.items():
+            flat.update(_timings(value, f"{prefix}.{key}" if prefix else str(key)))
+        return flat
+    parts = prefix.split(".")
+    # A leaf is a timing if its key or a parent key (e.g. `stage_seconds`) names a duration;
+    # startup budgets are limits, not measurements.
+    is_timing = any(p.endswith("seconds") or p == "ms" or p.endswith("_ms") for p in parts)
+    if (
+        is_timing
+        and parts[-1] != "budget_ms"
+        and isinstance(results, int | float)
+        and not isinstance(results, bool)
+    ):
+        return {prefix: float(results)}
+    return {}
+
+
+def compare(
+    current: dict[str, Any], baseline: dict[str, Any], *, threshold: float
+) -> list[tuple[str, float, float]]:
+    """Return the timings that regressed between two result files.
+
+    Args:
+        current: Results of this run.
+        baseline: Results to compare against.
+        threshold: Allowed relative slowdown (0.2 = 20 %).
+
+    Returns:
+        Tuples of (script.key, baseline value, current value), slowest ratio first.
+    """
+    regressions: list[tuple[str, float, float]] = []
+    for name, entry in current["benchmarks"].items():
+        base_entry = baseline.get("benchmarks", {}).get(name)
+        if not base_entry or "results" not in base_entry or "results" not in entry:
+            continue
+        before = _timings(base_entry["results"])
+        for key, new in _timings(entry["results"]).items():
+            old = before.get(key)
+            if old is None or old <= 0:
+                continue
+            delta = new - old
+            if key.endswith("ms"):
+                delta /= 1000
+            if new > old * (1 + threshold) and delta > _MIN_DELTA_SECONDS:
+                regressions.append((f"{name}.{key}", old, new))
+    return sorted(regressions, key=lambda r: r[2] / r[1], reverse=True)
+
+
+def main() -> None:
+    """Run the selected benchmarks, write the results file and compare with a baseline."""
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--quick", action="store_true", help="smaller inputs, one repetition")
+    parser.add_argument("--only", nargs="+", choices=sorted(SUITE), help="scripts to run")
+    parser.add_argument("--output", type=Path, help="results file (default: results/<commit>)")
+    parser.add_argument("--compare", type=Path, help="baseline results file to compare with")
+    parser.add_argument("--threshold", type=float, default=0.2)
+    args = parser.parse_args()
+
+    commit = _git("rev-parse", "--short=12", "HEAD") or "unknown"
+    dirty = bool(_git("status", "--porcelain", "--untracked-files=no"))
+    report: dict[str, Any] = {
+        "commit": commit,
+        "dirty": dirty,
+        "created_at_utc": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "quick": args.quick,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "benchmarks": {},
+    }
+    for name in args.only or SUITE:
+        full, quick = SUITE[name]
+        print(f"running {name} ...", file=sys.stderr, flush=True)
+        report["benchmarks"][name] = _run_script(name, quick if args.quick else full)
+
+    output = args.output or RESULTS_DIR / f"{commit}{'-dirty' if dirty else ''}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+    print(f"results written to {output}", file=sys.stderr)
+
+    failed = [n for n, e in report["benchmarks"].items() if "results" not in e]
+    for name in failed:
+        print(f"{name} failed: {report['benchmarks'][name]['error']}", file=sys.stderr)
+    if args.compare is None:
+        sys.exit(1 if failed else 0)
+
+    baseline = json.loads(args.compare.read_text(encoding="utf-8"))
+    if baseline.get("quick") != args.quick:
+        print("warning: baseline was measured with a different --quick setting", file=sys.stderr)
+    regressions = compare(report, baseline, threshold=args.threshold)
+    print(f"compared with {baseline.get('commit')}: {len(regressions)} regression(s)")
+    for key, old, new in regressions:
+        print(f"  {key}: {old:.4g} -> {new:.4g} ({new / old - 1:+.0%})")
+    sys.exit(1 if failed or regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
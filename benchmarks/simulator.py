@@ -0,0 +1,261 @@
+"""Local fake SerpApi server for benchmarks.
+
+Unlike the fixed-payload stub used by the tests, the simulator generates a synthetic Google
+Flights response per outbound date (`airports` extra airport containers with `entries` offers
+per bucket, as returned with `deep_search`), waits a configurable latency with jitter, and
+answers a share of the requests with errors:
+
+- `error_rate`: HTTP 500 with a SerpApi-style error body,
+- `rate_limit_rate`: HTTP 429 with a `Retry-After` header.
+
+Responses and failures are derived from `seed`, so two runs with the same settings see the
+same payloads and the same sequence of failures.
+
+Run standalone to point a manual `run` at it:
+
+    uv run python benchmarks/simulator.py --port 8765 --latency 0.2 --rate-limit-rate 0.1
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import threading
+import time
+import zlib
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+from urllib.parse import parse_qsl, urlsplit
+
+_AIRLINES = ("Air Test", "Fly Cheap", "Sky Line", "Jet Go")
+
+
+def synthetic_entry(
+    rng: random.Random, i: int, *, outbound_date: str = "2026-03-01"
+) -> dict[str, Any]:
+    """Return one synthetic SerpApi offer entry."""
+    legs = rng.randint(1, 3)
+    return {
+        "price": rng.randint(80, 900),
+        "total_duration": rng.randint(90, 1400),
+        "booking_token": f"tok-{i}",
+        "flights": [
+            {
+                "airline": rng.choice(_AIRLINES),
+                "duration": rng.randint(45, 600),
+                "departure_airport": {"id": "VIE", "time": f"{outbound_date} 06:00"},
+                "arrival_airport": {"id": "TGD", "time": f"{outbound_date} 09:30"},
+            }
+            for _ in range(legs)
+        ],
+    }
+
+
+def synthetic_response(
+    *, airports: int, entries: int, seed: int = 7, outbound_date: str = "2026-03-01"
+) -> dict[str, Any]:
+    """Build a multi-airport response with `entries` offers per bucket and container."""
+    rng = random.Random(seed)
+    counter = iter(range(10**9))
+
+    def bucket() -> list[dict[str, Any]]:
+        return [
+            synthetic_entry(rng, next(counter), outbound_date=outbound_date) for _ in range(entries)
+        ]
+
+    return {
+        "best_flights": bucket(),
+        "other_flights": bucket(),
+        "airports": [
+            {"best_flights": bucket(), "other_flights": bucket()} for _ in range(airports)
+        ],
+    }
+
+
+class SerpApiSimulator:
+    """Threaded HTTP server imitating the SerpApi `search.json` endpoint.
+
+    Attributes:
+        airports: Extra airport containers per response.
+        entries: Offers per bucket and container.
+        latency_seconds: Base delay before each response.
+        jitter_seconds: Uniform random delay added to `latency_seconds`.
+        error_rate: Share of requests answered with HTTP 500.
+        rate_limit_rate: Share of requests answered with HTTP 429.
+        retry_after_seconds: `Retry-After` value sent with HTTP 429.
+        seed: Seed of the payload and failure generators.
+        statuses: Number of responses sent per HTTP status.
+        response_bytes: Total body bytes of successful responses.
+    """
+
+    def __init__(
+        self,
+        *,
+        airports: int = 0,
+        entries: int = 20,
+        latency_seconds: float = 0.0,
+        jitter_seconds: float = 0.0,
+        error_rate: float = 0.0,
+        rate_limit_rate: float = 0.0,
+        retry_after_seconds: int = 1,
+        seed: int = 0,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ) -> None:
+        """Configure the simulator; call `start()` or use it as a context manager."""
+        if error_rate + rate_limit_rate > 1.0:
+            raise ValueError("error_rate + rate_limit_rate must not exceed 1")
+        self.airports = airports
+        self.entries = entries
+        self.latency_seconds = latency_seconds
+        self.jitter_seconds = jitter_seconds
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.retry_after_seconds = retry_after_seconds
+        self.seed = seed
+        self.statuses: Counter[int] = Counter()
+        self.response_bytes = 0
+        self._rng = random.Random(seed)
+        self._bodies: dict[str, bytes] = {}
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._handler())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True
+        )
+
+    @property
+    def base_url(self) -> str:
+        """Base URL to pass to the SerpApi client."""
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/"
+
+    @property
+    def requests(self) -> int:
+        """Number of requests answered so far."""
+        with self._lock:
+            return sum(self.statuses.values())
+
+    def start(self) -> SerpApiSimulator:
+        """Start serving in a background thread."""
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop the server and release its socket."""
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> SerpApiSimulator:
+        """Start the simulator."""
+        return self.start()
+
+    def __exit__(self, *exc: object) -> None:
+        """Stop the simulator."""
+        self.stop()
+
+    def _next_outcome(self) -> tuple[int, float]:
+        """Draw the status and delay of the next request."""
+        with self._lock:
+            draw = self._rng.random()
+            delay = self.latency_seconds + self._rng.uniform(0.0, self.jitter_seconds)
+        if draw < self.error_rate:
+            return 500, delay
+        if draw < self.error_rate + self.rate_limit_rate:
+            return 429, delay
+        return 200, delay
+
+    def _body(self, outbound_date: str) -> bytes:
+        """Return the (cached) encoded response of one outbound date."""
+        with self._lock:
+            body = self._bodies.get(outbound_date)
+        if body is None:
+            resp = synthetic_response(
+                airports=self.airports,
+                entries=self.entries,
+                seed=zlib.crc32(f"{self.seed}:{outbound_date}".encode()),
+                outbound_date=outbound_date,
+            )
+            resp["search_metadata"] = {"id": f"sim-{outbound_date}", "status": "Success"}
+            body = json.dumps(resp).encode("utf-8")
+            with self._lock:
+                self._bodies[outbound_date] = body
+        return body
+
+    def _handler(self) -> type[BaseHTTPRequestHandler]:
+        """Build a request handler class bound to this simulator."""
+        sim = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def do_GET(self) -> None:  # noqa: N802
+                query = dict(parse_qsl(urlsplit(self.path).query))
+                status, delay = sim._next_outcome()
+                if delay:
+                    time.sleep(delay)
+
+                headers: dict[str, str] = {}
+                if status == 500:
+                    body = b'{"error": "Simulated server error."}'
+                elif status == 429:
+                    body = b'{"error": "Simulated rate limit."}'
+                    headers["Retry-After"] = str(sim.retry_after_seconds)
+                else:
+                    body = sim._body(query.get("outbound_date", ""))
+                with sim._lock:
+                    sim.statuses[status] += 1
+                    if status == 200:
+                        sim.response_bytes += len(body)
+
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format: str, *args: Any) -> None:  # noqa: A002
+                return
+
+        return Handler
+
+
+def main() -> None:
+    """Serve until interrupted, printing the base URL."""
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--airports", type=int, default=0)
+    parser.add_argument("--entries", type=int, default=20)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    sim = SerpApiSimulator(
+        airports=args.airports,
+        entries=args.entries,
+        latency_seconds=args.latency,
+        jitter_seconds=args.jitter,
+        error_rate=args.error_rate,
+        rate_limit_rate=args.rate_limit_rate,
+        seed=args.seed,
+        port=args.port,
+    )
+    with sim:
+        print(f"SerpApi simulator listening on {sim.base_url}", flush=True)
+        try:
+            threading.Event().wait()
+        except KeyboardInterrupt:
+            pass
+    print(json.dumps(dict(sim.statuses)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,11 @@
+select
+  route,
+  airline,
+  currency,
+  offers,
+  min_price,
+  avg_price,
+  max_price,
+  first_seen_utc,
+  last_seen_utc
+from read_parquet('../data/flight_price_tracker/serving/airline_stats/*/*.parquet')
@@ -0,0 +1,8 @@
+select
+  route,
+  outbound_date,
+  run_date,
+  currency,
+  min_price,
+  last_observed_at_utc
+from read_parquet('../data/flight_price_tracker/serving/daily_min/*/*.parquet')
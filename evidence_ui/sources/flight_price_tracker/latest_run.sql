@@ -0,0 +1,11 @@
+select
+  route,
+  observed_at_utc,
+  outbound_date,
+  return_date,
+  currency,
+  cheapest_price,
+  error,
+  evidence_json_path,
+  evidence_sha256
+from read_parquet('../data/flight_price_tracker/serving/latest_run/*/*.parquet')
@@ -0,0 +1,14 @@
+select
+  route,
+  outbound_date,
+  currency,
+  observations,
+  first_seen_utc,
+  last_seen_utc,
+  min_price,
+  max_price,
+  last_price,
+  last_change,
+  last_change_utc,
+  last_drop_utc
+from read_parquet('../data/flight_price_tracker/price_history_summary/*.parquet')
@@ -0,0 +1,10 @@
+select
+  run_date,
+  observed_at_utc,
+  stage,
+  route,
+  outbound_date,
+  seconds,
+  bytes,
+  rows
+from read_parquet('../data/flight_price_tracker/serving/run_metrics/*.parquet')
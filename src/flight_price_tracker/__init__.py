@@ -1,5 +1,8 @@
 """Flight price tracker package."""
 
-__all__ = ["__version__"]
+__all__ = ["DATASET_NAME", "__version__"]
 
 __version__ = "0.1.0"
+
+# dlt dataset name; also the dataset folder under the data root.
+DATASET_NAME = "flight_price_tracker"
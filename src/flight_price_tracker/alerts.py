@@ -0,0 +1,274 @@
+"""Price alert rules evaluated per run, and the sinks alerts are sent to.
+
+After the Parquet load, each run checks its one-way `search_runs` rows against the
+configured rules (see :class:`flight_price_tracker.settings.AlertRuleConfig`):
+
+- `drop` / `drop_pct`: the price fell by an amount / a percentage since the date's previous
+  observation;
+- `new_low`: the price is below every earlier observation of the date;
+- `below`: the price crossed below a limit.
+
+History comes from the `price_history_summary` rows of the run's dates (previous price and
+all-time low per route and outbound date), read before the run is folded into the summary,
+so evaluation never scans `search_runs`. Rules are grouped by route once, and each row is
+checked against its route's rules with dict lookups; hundreds of rules over several routes
+evaluate in milliseconds (see `benchmarks/bench_alerts.py`). Rows already folded into the
+summary (e.g. when a run is resumed) do not alert again.
+
+Alerts go to every configured sink: stdout, a JSON Lines file or a webhook. A failing sink
+does not stop the others or the run.
+"""
+
+from __future__ import annotations
+
+import json
+import sys
+from collections import defaultdict
+from collections.abc import Iterable, Mapping, Sequence
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Protocol, TextIO
+
+from flight_price_tracker.records import SearchRun
+from flight_price_tracker.report import format_money
+from flight_price_tracker.settings import AlertRuleConfig, AlertSinkConfig
+from flight_price_tracker.summary import PriceSummary, load_summary
+
+
+@dataclass(frozen=True)
+class Alert:
+    """One rule match.
+
+    Attributes:
+        rule: Name of the rule.
+        kind: Kind of the rule.
+        route: Route identifier in the form ORIGIN-DESTINATION.
+        outbound_date: Outbound date (YYYY-MM-DD).
+        observed_at_utc: Start time of the run.
+        currency: Currency of the price.
+        price: Cheapest price of the run.
+        previous_price: The date's previous observed price, if any.
+        threshold: The rule's threshold, if it has one.
+        message: One-line description.
+    """
+
+    rule: str
+    kind: str
+    route: str
+    outbound_date: str
+    observed_at_utc: datetime
+    currency: str
+    price: float
+    previous_price: float | None
+    threshold: float | None
+    message: str
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return the alert as a JSON-serialisable mapping."""
+        return {**asdict(self), "observed_at_utc": self.observed_at_utc.isoformat()}
+
+
+def load_alert_history(
+    *, dataset_root: Path, search_runs: Iterable[SearchRun]
+) -> dict[tuple[str, str], PriceSummary]:
+    """Read the price history summaries of the one-way dates of a run.
+
+    Must be called before the run is folded into the summary.
+
+    Args:
+        dataset_root: Dataset folder (e.g. `data/flight_price_tracker`).
+        search_runs: Search runs of this run.
+
+    Returns:
+        Summaries keyed by (route, outbound_date); dates never observed are missing.
+    """
+    dates: dict[str, set[str]] = defaultdict(set)
+    for r in search_runs:
+        if r.return_date is None:
+            dates[r.route].add(r.outbound_date)
+    return {
+        (route, outbound_date): summary
+        for route, outbound_dates in dates.items()
+        for outbound_date, summary in load_summary(
+            dataset_root=dataset_root, route=route, outbound_dates=outbound_dates
+        ).items()
+    }
+
+
+def evaluate_alerts(
+    *,
+    rules: Sequence[AlertRuleConfig],
+    search_runs: Iterable[SearchRun],
+    history: Mapping[tuple[str, str], PriceSummary],
+) -> list[Alert]:
+    """Check the priced one-way rows of a run against the alert rules.
+
+    Args:
+        rules: Alert rules.
+        search_runs: Search runs of this run.
+        history: Price history before this run, keyed by (route, outbound_date).
+
+    Returns:
+        Alerts in row order, then rule order.
+    """
+    for_all = [rule for rule in rules if rule.routes is None]
+    by_route: dict[str, list[AlertRuleConfig]] = defaultdict(list)
+    for rule in rules:
+        for route in rule.routes or ():
+            by_route[route].append(rule)
+
+    alerts: list[Alert] = []
+    for run in search_runs:
+        if run.cheapest_price is None or run.return_date is not None:
+            continue
+        prior = history.get((run.route, run.outbound_date))
+        if prior is not None and prior.last_seen_utc >= run.observed_at_utc:
+            continue  # already folded into the summary, so already alerted
+        for rule in (*for_all, *by_route.get(run.route, ())):
+            alert = _check(rule, run, run.cheapest_price, prior)
+            if alert is not None:
+                alerts.append(alert)
+    return alerts
+
+
+class AlertSink(Protocol):
+    """Destination of alerts."""
+
+    def send(self, alerts: Sequence[Alert]) -> None:
+        """Deliver a batch of alerts (raising on failure)."""
+
+
+class StdoutSink:
+    """Prints one line per alert."""
+
+    def __init__(self, stream: TextIO | None = None) -> None:
+        """Print to `stream` (default: `sys.stdout` at send time)."""
+        self._stream = stream
+
+    def send(self, alerts: Sequence[Alert]) -> None:
+        """Print the alerts' messages."""
+        stream = self._stream or sys.stdout
+        for alert in alerts:
+            print(f"[alert] {alert.message}", file=stream)
+
+
+class FileSink:
+    """Appends one JSON object per alert to a JSON Lines file."""
+
+    def __init__(self, path: Path) -> None:
+        """Append to `path` (created with its parent folders if missing)."""
+        self.path = path
+
+    def send(self, alerts: Sequence[Alert]) -> None:
+        """Append the alerts."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self.path.open("a", encoding="utf-8") as f:
+            f.writelines(json.dumps(a.to_dict(), sort_keys=True) + "\n" for a in alerts)
+
+
+class WebhookSink:
+    """POSTs `{"alerts": [...]}` as JSON to a URL."""
+
+    def __init__(self, url: str, *, timeout_seconds: float = 10.0) -> None:
+        """Post to `url` with a connect/read timeout."""
+        self.url = url
+        self.timeout_seconds = timeout_seconds
+
+    def send(self, alerts: Sequence[Alert]) -> None:
+        """Post the alerts in one request.
+
+        Raises:
+            requests.RequestException: If the request fails or returns an HTTP error.
+        """
+        import requests
+
+        resp = requests.post(
+            self.url,
+            json={"alerts": [a.to_dict() for a in alerts]},
+            timeout=self.timeout_seconds,
+        )
+        resp.raise_for_status()
+
+
+def build_sinks(configs: Sequence[AlertSinkConfig]) -> list[AlertSink]:
+    """Create the sinks of a config.
+
+    Args:
+        configs: Validated sink configs.
+
+    Returns:
+        One sink per config, in order.
+    """
+    sinks: list[AlertSink] = []
+    for c in configs:
+        if c.type == "file" and c.path is not None:
+            sinks.append(FileSink(c.path))
+        elif c.type == "webhook" and c.url is not None:
+            sinks.append(WebhookSink(c.url, timeout_seconds=c.timeout_seconds))
+        else:
+            sinks.append(StdoutSink())
+    return sinks
+
+
+def send_alerts(alerts: Sequence[Alert], sinks: Sequence[AlertSink]) -> list[str]:
+    """Send alerts to every sink; a failing sink does not stop the others.
+
+    Args:
+        alerts: Alerts to send (nothing is sent if empty).
+        sinks: Destinations.
+
+    Returns:
+        One error message per failed sink.
+    """
+    if not alerts:
+        return []
+    errors: list[str] = []
+    for sink in sinks:
+        try:
+            sink.send(alerts)
+        except Exception as e:  # noqa: BLE001 - report and continue with the next sink
+            errors.append(f"{type(sink).__name__}: {e}")
+    return errors
+
+
+def _check(
+    rule: AlertRuleConfig, run: SearchRun, price: float, prior: PriceSummary | None
+) -> Alert | None:
+    """Return the alert of one rule for one row, if it fires."""
+    previous = None if prior is None else prior.last_price
+    # Validated to be set for every kind but `new_low`.
+    threshold = rule.threshold or 0.0
+    what = f"{run.route} {run.outbound_date}: {format_money(price, run.currency)}"
+    if rule.kind == "new_low":
+        if prior is None or price >= prior.min_price:
+            return None
+        message = f"{what}, new low (previous low {format_money(prior.min_price, run.currency)})"
+    elif rule.kind == "below":
+        if price >= threshold or (previous is not None and previous < threshold):
+            return None
+        message = f"{what}, below {format_money(threshold, run.currency)}"
+    else:
+        if previous is None or previous <= price:
+            return None
+        drop = previous - price
+        if rule.kind == "drop" and drop < threshold:
+            return None
+        if rule.kind == "drop_pct" and drop / previous * 100 < threshold:
+            return None
+        message = (
+            f"{what}, down {format_money(drop, run.currency)} ({drop / previous:.1%}) "
+            f"from {format_money(previous, run.currency)}"
+        )
+    return Alert(
+        rule=rule.name,
+        kind=rule.kind,
+        route=run.route,
+        outbound_date=run.outbound_date,
+        observed_at_utc=run.observed_at_utc,
+        currency=run.currency,
+        price=price,
+        previous_price=previous,
+        threshold=rule.threshold,
+        message=f"{rule.name}: {message}",
+    )
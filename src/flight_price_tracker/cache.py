@@ -0,0 +1,200 @@
+"""On-disk SerpApi response cache.
+
+Entries are keyed by a hash of the canonicalised query params (without `api_key`) and point at
+evidence already written by an earlier run, so a cache hit reuses that evidence JSON and its
+SHA256 instead of calling SerpApi again.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import time
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass
+from hashlib import sha256
+from pathlib import Path
+from typing import Any
+
+from flight_price_tracker.evidence_store import read_evidence
+from flight_price_tracker.parquet_writer import write_atomic
+from flight_price_tracker.payload import decode_json
+
+
+@dataclass(frozen=True)
+class CachedResponse:
+    """A cache hit.
+
+    Attributes:
+        response: Parsed SerpApi JSON response.
+        raw_json: Raw JSON bytes as stored in the evidence file.
+        evidence_json_path: Relative path of the reused evidence JSON.
+        evidence_sha256: SHA256 of the reused evidence JSON.
+    """
+
+    response: dict[str, Any]
+    raw_json: bytes
+    evidence_json_path: str
+    evidence_sha256: str
+
+
+class ResponseCache:
+    """Content-addressed response cache with a TTL and LRU eviction.
+
+    Each entry is a small JSON file under `root`; its mtime is bumped on every hit and used as
+    the last-access time for eviction. Its age, for the TTL, is counted from its `created_at`
+    (when it was put), both on lookup and on eviction, so hits do not extend its life.
+
+    Attributes:
+        root: Directory holding cache entries.
+        ttl_seconds: Maximum age of an entry (since it was put) before it is ignored and removed.
+        max_entries: Maximum number of entries kept after eviction.
+    """
+
+    def __init__(
+        self,
+        *,
+        root: Path,
+        ttl_seconds: float,
+        max_entries: int,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        """Create a cache rooted at `root`.
+
+        Args:
+            root: Directory holding cache entries (created on first write).
+            ttl_seconds: Maximum age of an entry.
+            max_entries: Maximum number of entries kept after eviction.
+            clock: Wall-clock function (injectable for tests).
+        """
+        self.root = root
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._clock = clock
+
+    @staticmethod
+    def key_for(params: Mapping[str, Any]) -> str:
+        """Compute the cache key for a set of query params.
+
+        Args:
+            params: SerpApi query params; `api_key` is ignored if present.
+
+        Returns:
+            Hex SHA256 of the canonical JSON form of the params.
+        """
+        canonical = json.dumps(
+            {k: v for k, v in params.items() if k != "api_key"},
+            sort_keys=True,
+            separators=(",", ":"),
+            ensure_ascii=False,
+        )
+        return sha256(canonical.encode("utf-8")).hexdigest()
+
+    def get(self, params: Mapping[str, Any]) -> CachedResponse | None:
+        """Look up a fresh entry and load its evidence.
+
+        Entries that are expired, or whose evidence is missing or no longer matches the stored
+        digest, are removed and reported as misses.
+
+        Args:
+            params: SerpApi query params.
+
+        Returns:
+            The cached response, or None on a miss.
+        """
+        path = self._entry_path(self.key_for(params))
+        try:
+            entry = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+
+        now = self._clock()
+        if self._expired(entry, now=now):
+            path.unlink(missing_ok=True)
+            return None
+
+        evidence_path = entry.get("evidence_json_path")
+        digest = entry.get("evidence_sha256")
+        try:
+            raw_json = read_evidence(evidence_path)
+        except (OSError, TypeError):
+            path.unlink(missing_ok=True)
+            return None
+        if sha256(raw_json).hexdigest() != digest:
+            path.unlink(missing_ok=True)
+            return None
+
+        os.utime(path, (now, now))
+        return CachedResponse(
+            response=decode_json(raw_json),
+            raw_json=raw_json,
+            evidence_json_path=evidence_path,
+            evidence_sha256=digest,
+        )
+
+    def put(
+        self,
+        params: Mapping[str, Any],
+        *,
+        evidence_json_path: str,
+        evidence_sha256: str,
+    ) -> None:
+        """Record that `params` were answered by the given evidence.
+
+        Args:
+            params: SerpApi query params.
+            evidence_json_path: Relative path of the evidence JSON.
+            evidence_sha256: SHA256 of the evidence JSON.
+        """
+        key = self.key_for(params)
+        path = self._entry_path(key)
+        now = self._clock()
+        entry = {
+            "key": key,
+            "created_at": now,
+            "evidence_json_path": evidence_json_path,
+            "evidence_sha256": evidence_sha256,
+        }
+        text = json.dumps(entry, sort_keys=True)
+        write_atomic(path, lambda tmp: tmp.write_text(text, encoding="utf-8"))
+        os.utime(path, (now, now))
+
+    def evict(self) -> int:
+        """Remove expired or unreadable entries, then least-recently-used ones above the limit.
+
+        Returns:
+            Number of entries removed.
+        """
+        if not self.root.exists():
+            return 0
+
+        now = self._clock()
+        removed = 0
+        live: list[tuple[float, Path]] = []
+        for p in self.root.glob("*/*.json"):
+            try:
+                mtime = p.stat().st_mtime
+                entry = json.loads(p.read_text(encoding="utf-8"))
+            except FileNotFoundError:
+                continue  # removed by a concurrent `get` or `evict`
+            except (OSError, ValueError):
+                entry = {}
+            if self._expired(entry, now=now):
+                p.unlink(missing_ok=True)
+                removed += 1
+            else:
+                live.append((mtime, p))
+
+        live.sort()
+        for _, p in live[: max(len(live) - self.max_entries, 0)]:
+            p.unlink(missing_ok=True)
+            removed += 1
+        return removed
+
+    def _expired(self, entry: Mapping[str, Any], *, now: float) -> bool:
+        """Return whether an entry is older than the TTL (entries without `created_at` are)."""
+        return now - float(entry.get("created_at", 0.0)) > self.ttl_seconds
+
+    def _entry_path(self, key: str) -> Path:
+        """Return the file path for a cache key."""
+        return self.root / key[:2] / f"{key}.json"
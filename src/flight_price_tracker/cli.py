@@ -1,11 +1,20 @@
-"""Command line interface for the tracker."""
+"""Command line interface for the tracker.
+
+Subcommands import their modules when they run, so `--help` and `validate-config` do not pay
+for dlt, PyArrow or pydantic-settings (see `benchmarks/bench_startup.py`).
+"""
 
 from __future__ import annotations
 
 import argparse
+import sys
 from pathlib import Path
+from typing import Any
+
+from flight_price_tracker import DATASET_NAME
 
-from flight_price_tracker.run import run_once
+# Mirrors `compact.DEFAULT_ROW_GROUP_SIZE` without importing PyArrow for argument parsing.
+_DEFAULT_ROW_GROUP_SIZE = 128 * 1024
 
 
 def _build_parser() -> argparse.ArgumentParser:
@@ -19,6 +28,114 @@ def _build_parser() -> argparse.ArgumentParser:
 
     run_p = sub.add_parser("run", help="Fetch prices, persist to parquet, and generate report")
     run_p.add_argument("--config", type=Path, default=Path("config.yaml"))
+    run_p.add_argument(
+        "--cache",
+        action=argparse.BooleanOptionalAction,
+        default=None,
+        help="Reuse cached SerpApi responses (default: `cache.enabled` from the config)",
+    )
+    run_p.add_argument(
+        "--resume",
+        action="store_true",
+        help="Continue the latest interrupted run, reusing its evidence instead of refetching",
+    )
+    run_p.add_argument(
+        "--profile",
+        type=Path,
+        default=None,
+        metavar="PATH",
+        help="Write cProfile stats of the run's main thread to PATH (pstats format)",
+    )
+
+    serve_p = sub.add_parser("serve", help="Run routes on their schedules in a long-running daemon")
+    serve_p.add_argument("--config", type=Path, default=Path("config.yaml"))
+    serve_p.add_argument(
+        "--host", default=None, help="Health endpoint address (default: `serve.host`)"
+    )
+    serve_p.add_argument(
+        "--port", type=int, default=None, help="Health endpoint port (default: `serve.port`)"
+    )
+
+    compact_p = sub.add_parser(
+        "compact", help="Merge small Parquet files per partition into sorted files"
+    )
+    compact_p.add_argument("--data-root", type=Path, default=Path("data"))
+    compact_p.add_argument(
+        "--table",
+        action="append",
+        dest="tables",
+        choices=["search_runs", "offers"],
+        help="Table to compact (repeatable; default: all)",
+    )
+    compact_p.add_argument("--row-group-size", type=int, default=_DEFAULT_ROW_GROUP_SIZE)
+    compact_p.add_argument(
+        "--min-files",
+        type=int,
+        default=2,
+        help="Only rewrite partitions with at least this many files",
+    )
+
+    archive_p = sub.add_parser(
+        "archive-evidence",
+        help="Move JSON evidence files into the compressed, deduplicated archive",
+    )
+    archive_p.add_argument("--evidence-root", type=Path, default=Path("evidence"))
+
+    reprocess_p = sub.add_parser(
+        "reprocess",
+        help="Re-extract offers from stored evidence and rewrite the Parquet tables",
+    )
+    reprocess_p.add_argument("--config", type=Path, default=Path("config.yaml"))
+    reprocess_p.add_argument("--data-root", type=Path, default=Path("data"))
+    reprocess_p.add_argument(
+        "--workers", type=int, default=None, help="Worker processes (default: one per CPU)"
+    )
+
+    verify_p = sub.add_parser(
+        "verify",
+        help="Check evidence against its .sha256 sidecars and the Parquet records",
+    )
+    verify_p.add_argument("--evidence-root", type=Path, default=Path("evidence"))
+    verify_p.add_argument("--data-root", type=Path, default=Path("data"))
+    verify_p.add_argument(
+        "--workers", type=int, default=None, help="Hashing threads (default: Python's default)"
+    )
+    verify_p.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Only re-hash files whose size or mtime changed since the last verification",
+    )
+    verify_p.add_argument(
+        "--manifest",
+        type=Path,
+        default=Path(".tracker/verify/manifest.json"),
+        help="Manifest of verified files (default: %(default)s)",
+    )
+
+    query_p = sub.add_parser(
+        "query", help="Run a named query or ad-hoc SQL over the Parquet tables with DuckDB"
+    )
+    query_p.add_argument("name", nargs="?", help="Named query to run (see --list)")
+    query_p.add_argument(
+        "--param",
+        "-p",
+        action="append",
+        default=[],
+        metavar="KEY=VALUE",
+        help="Parameter of the named query (repeatable)",
+    )
+    query_p.add_argument("--sql", help="Ad-hoc SQL over the table views instead of a named query")
+    query_p.add_argument("--list", action="store_true", help="List the named queries and exit")
+    query_p.add_argument("--data-root", type=Path, default=Path("data"))
+    query_p.add_argument(
+        "--database",
+        default=".tracker/query.duckdb",
+        help="DuckDB file that keeps the views, or :memory: (default: %(default)s)",
+    )
+    query_p.add_argument("--format", choices=["table", "csv", "json"], default="table")
+
+    validate_p = sub.add_parser("validate-config", help="Validate a config file and summarise it")
+    validate_p.add_argument("--config", type=Path, default=Path("config.yaml"))
 
     return parser
 
@@ -36,7 +153,229 @@ def main(argv: list[str] | None = None) -> int:
     args = parser.parse_args(argv)
 
     if args.command == "run":
-        run_once(config_path=args.config)
+        from flight_price_tracker.run import run_once
+
+        if args.profile is None:
+            run_once(config_path=args.config, use_cache=args.cache, resume=args.resume)
+            return 0
+
+        import cProfile
+
+        with cProfile.Profile() as profiler:
+            try:
+                run_once(config_path=args.config, use_cache=args.cache, resume=args.resume)
+            finally:
+                profiler.dump_stats(args.profile)
+        print(f"profile written to {args.profile}")
+        return 0
+
+    if args.command == "serve":
+        return _serve(args)
+
+    if args.command == "compact":
+        from flight_price_tracker.compact import compact_dataset
+
+        stats = compact_dataset(
+            dataset_root=args.data_root / DATASET_NAME,
+            tables=tuple(args.tables or ("search_runs", "offers")),
+            row_group_size=args.row_group_size,
+            min_files=args.min_files,
+        )
+        for st in stats:
+            print(
+                f"{st.table}: rewrote {st.partitions} partitions, "
+                f"files {st.files_before} -> {st.files_after}, "
+                f"bytes {st.bytes_before} -> {st.bytes_after}"
+            )
         return 0
 
+    if args.command == "archive-evidence":
+        from flight_price_tracker.evidence_store import EvidenceArchive
+
+        archived = EvidenceArchive(args.evidence_root).import_tree()
+        print(f"archived {archived} evidence files")
+        return 0
+
+    if args.command == "reprocess":
+        from flight_price_tracker.reprocess import reprocess_dataset
+        from flight_price_tracker.settings import load_app_config
+
+        config = load_app_config(args.config)
+        result = reprocess_dataset(
+            dataset_root=args.data_root / DATASET_NAME,
+            top_n={
+                route.route_id: c.serpapi.top_n_offers
+                for c in config.split_routes()
+                if (route := c.route) is not None
+            },
+            default_top_n=config.serpapi.top_n_offers,
+            workers=args.workers,
+        )
+        print(
+            f"reprocessed {result.files} evidence files in {result.partitions} partitions "
+            f"({result.skipped} skipped) in {result.seconds:.1f}s, "
+            f"{result.files_per_second:.0f} files/s"
+        )
+        return 0
+
+    if args.command == "verify":
+        from flight_price_tracker.verify import verify_evidence
+
+        stats = verify_evidence(
+            evidence_root=args.evidence_root,
+            dataset_root=args.data_root / DATASET_NAME,
+            workers=args.workers,
+            manifest_path=args.manifest,
+            incremental=args.incremental,
+        )
+        for issue in stats.issues:
+            print(f"{issue.kind}: {issue.path}: {issue.detail}", file=sys.stderr)
+        print(
+            f"verified {stats.files} evidence files ({stats.hashed} hashed, "
+            f"{stats.unchanged} unchanged) in {stats.seconds:.1f}s, "
+            f"{stats.megabytes_per_second:.0f} MB/s: {len(stats.issues)} issues"
+        )
+        return 0 if stats.ok else 1
+
+    if args.command == "query":
+        return _query(args, parser)
+
+    if args.command == "validate-config":
+        return _validate_config(args.config)
+
     raise AssertionError(f"Unhandled command: {args.command}")
+
+
+def _serve(args: argparse.Namespace) -> int:
+    """Run the `serve` command until SIGINT or SIGTERM.
+
+    Args:
+        args: Parsed arguments.
+
+    Returns:
+        Process exit code.
+    """
+    import signal
+    import threading
+
+    from flight_price_tracker.daemon import HealthServer, TrackerDaemon
+
+    def _log(message: str) -> None:
+        print(message, flush=True)
+
+    daemon = TrackerDaemon(args.config, on_event=_log)
+    serve = daemon.config.serve
+    stop = threading.Event()
+    signal.signal(signal.SIGTERM, lambda *_: stop.set())
+    with HealthServer(
+        daemon,
+        host=serve.host if args.host is None else args.host,
+        port=serve.port if args.port is None else args.port,
+    ) as server:
+        _log(f"serving {len(daemon.routes)} routes, health at {server.url}healthz")
+        for route, state in daemon.routes.items():
+            _log(f"{route}: next run {state.next_run_utc.isoformat()}")
+        try:
+            daemon.serve_forever(stop)
+        except KeyboardInterrupt:
+            pass
+    return 0
+
+
+def _query(args: argparse.Namespace, parser: argparse.ArgumentParser) -> int:
+    """Run the `query` command.
+
+    Args:
+        args: Parsed `query` arguments.
+        parser: Parser used to report usage errors.
+
+    Returns:
+        Process exit code (1 if the query failed).
+    """
+    from flight_price_tracker.query import NAMED_QUERIES, QueryEngine, QueryError
+
+    if args.list:
+        for name, q in NAMED_QUERIES.items():
+            params = " ".join(f"-p {p}=..." for p in q.params)
+            print(f"{name} {params}\n    {q.description}")
+        return 0
+    if (args.name is None) == (args.sql is None):
+        parser.error("query: give either a query name or --sql")
+    params: dict[str, str] = {}
+    for item in args.param:
+        key, sep, value = item.partition("=")
+        if not sep:
+            parser.error(f"query: --param expects KEY=VALUE, got {item!r}")
+        params[key] = value
+
+    database = args.database if args.database == ":memory:" else Path(args.database)
+    try:
+        with QueryEngine(args.data_root / DATASET_NAME, database=database) as engine:
+            if args.sql is not None:
+                table = engine.sql(args.sql, params)
+            else:
+                table = engine.run(args.name, **params)
+    except QueryError as e:
+        print(f"query failed: {e}", file=sys.stderr)
+        return 1
+    _print_table(table, fmt=args.format)
+    return 0
+
+
+def _print_table(table: Any, *, fmt: str) -> None:
+    """Print an Arrow table as an aligned text table, CSV or JSON lines."""
+    if fmt == "csv":
+        import pyarrow.csv
+
+        sys.stdout.flush()
+        pyarrow.csv.write_csv(table, sys.stdout.buffer)
+        sys.stdout.buffer.flush()
+        return
+    rows = table.to_pylist()
+    if fmt == "json":
+        import json
+
+        for row in rows:
+            print(json.dumps(row, default=str))
+        return
+    header = table.column_names
+    cells = [["" if v is None else str(v) for v in row.values()] for row in rows]
+    widths = [max([len(h), *(len(r[i]) for r in cells)]) for i, h in enumerate(header)]
+    print("  ".join(h.ljust(w) for h, w in zip(header, widths, strict=True)).rstrip())
+    print("  ".join("-" * w for w in widths))
+    for r in cells:
+        print("  ".join(c.ljust(w) for c, w in zip(r, widths, strict=True)).rstrip())
+    print(f"({len(rows)} row{'s' if len(rows) != 1 else ''})")
+
+
+def _validate_config(path: Path) -> int:
+    """Validate a config file and print a one-line summary per route.
+
+    Args:
+        path: Path to the YAML config file.
+
+    Returns:
+        Process exit code (1 if the config is missing or invalid).
+    """
+    import yaml
+
+    from flight_price_tracker.settings import load_app_config
+
+    try:
+        config = load_app_config(path)
+    except (OSError, ValueError, yaml.YAMLError) as e:
+        print(f"{path}: invalid config\n{e}", file=sys.stderr)
+        return 1
+
+    routes = config.split_routes()
+    print(f"{path}: OK ({len(routes)} route{'s' if len(routes) != 1 else ''})")
+    for c in routes:
+        route_id = c.route.route_id if c.route is not None else "?"
+        trips = ""
+        if c.window.trip_lengths_days is not None:
+            trips = f" x {', '.join(map(str, c.window.trip_lengths_days))} nights (round trip)"
+        print(
+            f"  {route_id}: {c.window.window_days} days from +{c.window.start_offset_days}{trips}, "
+            f"top {c.serpapi.top_n_offers} offers in {c.serpapi.currency}"
+        )
+    return 0
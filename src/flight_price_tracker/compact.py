@@ -0,0 +1,206 @@
+"""Compaction of small Parquet files.
+
+Every run appends one small file per table and `run_date=` partition. Compaction merges the
+files of a partition into a single file sorted by `(route, outbound_date, observed_at_utc)`
+with tuned row groups, and swaps it in so that readers see either the old or the new files,
+never a mix.
+
+The swap holds the dataset lock (:func:`flight_price_tracker.parquet_writer.dataset_lock`)
+that writers hold while adding files, so a file written during compaction is never lost. A
+reader that listed a partition's files before the swap may still fail to open one of them
+afterwards; such a reader should retry its scan.
+"""
+
+from __future__ import annotations
+
+import ctypes
+import os
+import secrets
+import shutil
+import sys
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from flight_price_tracker.parquet_writer import dataset_lock
+
+SORT_KEYS = ("route", "outbound_date", "observed_at_utc")
+DEFAULT_ROW_GROUP_SIZE = 128 * 1024
+_RENAME_EXCHANGE = 2
+
+
+@dataclass(frozen=True)
+class CompactionStats:
+    """Before/after file counts and sizes for one table.
+
+    Attributes:
+        table: Table folder name.
+        partitions: Number of partitions that were rewritten.
+        files_before: Parquet files in the table before compaction.
+        files_after: Parquet files in the table after compaction.
+        bytes_before: Total size of the table's Parquet files before compaction.
+        bytes_after: Total size of the table's Parquet files after compaction.
+    """
+
+    table: str
+    partitions: int
+    files_before: int
+    files_after: int
+    bytes_before: int
+    bytes_after: int
+
+
+def compact_dataset(
+    *,
+    dataset_root: Path,
+    tables: tuple[str, ...] = ("search_runs", "offers"),
+    row_group_size: int = DEFAULT_ROW_GROUP_SIZE,
+    min_files: int = 2,
+) -> list[CompactionStats]:
+    """Compact every `run_date=` partition of the given tables.
+
+    Args:
+        dataset_root: Dataset folder (e.g. `data/flight_price_tracker`).
+        tables: Table folder names to compact.
+        row_group_size: Maximum rows per row group in the merged files.
+        min_files: Only partitions with at least this many files are rewritten.
+
+    Returns:
+        Statistics per table (tables that do not exist are skipped).
+    """
+    stats: list[CompactionStats] = []
+    for table in tables:
+        table_dir = dataset_root / table
+        if not table_dir.is_dir():
+            continue
+
+        files_before, bytes_before = _count(table_dir)
+        rewritten = 0
+        for partition in sorted(table_dir.glob("run_date=*")):
+            if partition.is_dir() and len(parquet_files(partition)) >= min_files:
+                compact_partition(partition, row_group_size=row_group_size)
+                rewritten += 1
+        files_after, bytes_after = _count(table_dir)
+
+        stats.append(
+            CompactionStats(
+                table=table,
+                partitions=rewritten,
+                files_before=files_before,
+                files_after=files_after,
+                bytes_before=bytes_before,
+                bytes_after=bytes_after,
+            )
+        )
+    return stats
+
+
+def compact_partition(partition: Path, *, row_group_size: int = DEFAULT_ROW_GROUP_SIZE) -> Path:
+    """Merge all Parquet files of one partition into one sorted file.
+
+    The merged file is built in a hidden staging directory next to the partition (ignored by
+    `pyarrow.dataset` and by `run_date=*` globs), then the two directories are exchanged
+    atomically under the dataset lock. Files that a concurrent writer added to the old
+    partition meanwhile are moved into the new one before the old directory is removed.
+
+    Args:
+        partition: A `run_date=...` partition directory.
+        row_group_size: Maximum rows per row group.
+
+    Returns:
+        Path of the merged file.
+    """
+    sources = parquet_files(partition)
+    table = pa.concat_tables(
+        [pq.read_table(p) for p in sources], promote_options="default"
+    ).combine_chunks()
+    sort_keys = [k for k in SORT_KEYS if k in table.column_names]
+    if sort_keys:
+        table = table.sort_by([(k, "ascending") for k in sort_keys])
+
+    staging = partition.with_name(f".{partition.name}.compact")
+    shutil.rmtree(staging, ignore_errors=True)
+    staging.mkdir()
+    merged = staging / f"{time.time()}.{secrets.token_hex(5)}.parquet"
+    pq.write_table(
+        table,
+        merged,
+        row_group_size=row_group_size,
+        sorting_columns=pq.SortingColumn.from_ordering(
+            table.schema, [(k, "ascending") for k in sort_keys]
+        ),
+    )
+
+    with dataset_lock(partition.parent.parent):
+        replace_partition(partition, staging=staging, replaced={p.name for p in sources})
+    return partition / merged.name
+
+
+def replace_partition(partition: Path, *, staging: Path, replaced: set[str]) -> None:
+    """Swap a fully written staging directory in place of a partition.
+
+    The directories are exchanged atomically; entries of the old partition that are not in
+    `replaced` (e.g. files added by a writer since staging started) are moved into the new one
+    before the old directory is removed. The caller must hold the dataset lock
+    (:func:`flight_price_tracker.parquet_writer.dataset_lock`), so no writer is adding a file
+    meanwhile.
+
+    Args:
+        partition: A `run_date=...` partition directory (created if it does not exist).
+        staging: Hidden sibling directory holding the new files.
+        replaced: Names of the old files that the new files supersede.
+    """
+    if not partition.exists():
+        os.rename(staging, partition)
+        return
+    _exchange_dirs(staging, partition)
+    finish_replace(partition, staging=staging, replaced=replaced)
+
+
+def finish_replace(partition: Path, *, staging: Path, replaced: set[str]) -> None:
+    """Complete a swap after the directories were exchanged.
+
+    Args:
+        partition: The partition, now holding the new files.
+        staging: The staging directory, now holding the old files.
+        replaced: Names of the old files that the new files supersede.
+    """
+    for leftover in staging.iterdir():
+        if leftover.name not in replaced:
+            os.replace(leftover, partition / leftover.name)
+    shutil.rmtree(staging)
+
+
+def _exchange_dirs(a: Path, b: Path) -> None:
+    """Atomically swap two directories.
+
+    Uses `renameat2(RENAME_EXCHANGE)` on Linux. Elsewhere (or if the filesystem does not
+    support it) falls back to two renames, leaving a brief window where `b` is missing.
+    """
+    if sys.platform.startswith("linux"):
+        libc = ctypes.CDLL(None, use_errno=True)
+        renameat2 = getattr(libc, "renameat2", None)
+        if renameat2 is not None:
+            at_fdcwd = -100
+            rc = renameat2(at_fdcwd, os.fsencode(a), at_fdcwd, os.fsencode(b), _RENAME_EXCHANGE)
+            if rc == 0:
+                return
+
+    parked = b.with_name(f".{b.name}.{secrets.token_hex(4)}.old")
+    os.rename(b, parked)
+    os.rename(a, b)
+    os.rename(parked, a)
+
+
+def parquet_files(directory: Path) -> list[Path]:
+    """List visible Parquet files in a directory, sorted by name."""
+    return sorted(p for p in directory.glob("*.parquet") if not p.name.startswith("."))
+
+
+def _count(table_dir: Path) -> tuple[int, int]:
+    """Count Parquet files and their total size under a table directory."""
+    files = [p for part in table_dir.glob("run_date=*") for p in parquet_files(part)]
+    return len(files), sum(p.stat().st_size for p in files)
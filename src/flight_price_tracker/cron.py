@@ -0,0 +1,152 @@
+"""Five-field cron expressions, evaluated in UTC.
+
+Supports the standard `minute hour day-of-month month day-of-week` fields with `*`, values,
+ranges (`1-5`), lists (`1,15`) and steps (`*/15`, `8-18/2`), plus the `@hourly`, `@daily`,
+`@weekly` and `@monthly` shorthands. Day of week is 0-7 with both 0 and 7 meaning Sunday.
+As in Vixie cron, when both day fields are restricted a day matches if either does.
+
+Kept free of third-party imports so config validation can parse expressions cheaply.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta, timezone
+
+_ALIASES = {
+    "@hourly": "0 * * * *",
+    "@daily": "0 0 * * *",
+    "@weekly": "0 0 * * 0",
+    "@monthly": "0 0 1 * *",
+}
+
+# (name, lowest, highest) of each field, in expression order.
+_FIELDS = (
+    ("minute", 0, 59),
+    ("hour", 0, 23),
+    ("day of month", 1, 31),
+    ("month", 1, 12),
+    ("day of week", 0, 7),
+)
+
+# Longest gap between two matches of a satisfiable expression (e.g. `0 0 29 2 *`) is under
+# eight years; searching further means the expression never matches.
+_MAX_SEARCH_DAYS = 8 * 366
+
+
+@dataclass(frozen=True)
+class CronSchedule:
+    """A parsed cron expression.
+
+    Attributes:
+        expression: The expression as given.
+        minutes: Matching minutes.
+        hours: Matching hours.
+        days: Matching days of the month.
+        months: Matching months.
+        weekdays: Matching days of the week (0 = Sunday).
+        days_restricted: Whether the day-of-month field is not `*`.
+        weekdays_restricted: Whether the day-of-week field is not `*`.
+    """
+
+    expression: str
+    minutes: tuple[int, ...]
+    hours: tuple[int, ...]
+    days: frozenset[int]
+    months: frozenset[int]
+    weekdays: frozenset[int]
+    days_restricted: bool
+    weekdays_restricted: bool
+
+    @classmethod
+    def parse(cls, expression: str) -> CronSchedule:
+        """Parse a cron expression.
+
+        Args:
+            expression: Five whitespace-separated fields, or an `@` shorthand.
+
+        Returns:
+            The schedule.
+
+        Raises:
+            ValueError: If the expression is malformed.
+        """
+        fields = _ALIASES.get(expression.strip(), expression).split()
+        if len(fields) != len(_FIELDS):
+            raise ValueError(f"Cron expression {expression!r} must have 5 fields")
+        values = [
+            _parse_field(text, name=name, low=low, high=high)
+            for text, (name, low, high) in zip(fields, _FIELDS, strict=True)
+        ]
+        return cls(
+            expression=expression,
+            minutes=tuple(sorted(values[0])),
+            hours=tuple(sorted(values[1])),
+            days=frozenset(values[2]),
+            months=frozenset(values[3]),
+            weekdays=frozenset(d % 7 for d in values[4]),
+            days_restricted=not fields[2].startswith("*"),
+            weekdays_restricted=not fields[4].startswith("*"),
+        )
+
+    def matches_day(self, day: date) -> bool:
+        """Return whether the schedule fires on `day` (at some time)."""
+        if day.month not in self.months:
+            return False
+        in_days = day.day in self.days
+        in_weekdays = (day.weekday() + 1) % 7 in self.weekdays
+        if self.days_restricted and self.weekdays_restricted:
+            return in_days or in_weekdays
+        return in_days and in_weekdays
+
+    def next_after(self, moment: datetime) -> datetime:
+        """Return the first matching minute strictly after `moment`.
+
+        Args:
+            moment: Timezone-aware time.
+
+        Returns:
+            The next firing time, in UTC.
+
+        Raises:
+            ValueError: If the expression never matches (e.g. `0 0 30 2 *`).
+        """
+        start = moment.astimezone(timezone.utc).replace(second=0, microsecond=0)
+        start += timedelta(minutes=1)
+        day = start.date()
+        for _ in range(_MAX_SEARCH_DAYS):
+            if self.matches_day(day):
+                after = start.time() if day == start.date() else time(0, 0)
+                for hour in self.hours:
+                    if hour < after.hour:
+                        continue
+                    first = after.minute if hour == after.hour else 0
+                    minute = next((m for m in self.minutes if m >= first), None)
+                    if minute is not None:
+                        return datetime.combine(day, time(hour, minute), tzinfo=timezone.utc)
+            day += timedelta(days=1)
+        raise ValueError(f"Cron expression {self.expression!r} never matches")
+
+
+def _parse_field(text: str, *, name: str, low: int, high: int) -> set[int]:
+    """Parse one comma-separated cron field into the values it matches."""
+    values: set[int] = set()
+    for part in text.split(","):
+        base, _, step_text = part.partition("/")
+        try:
+            step = int(step_text) if step_text else 1
+            if base == "*":
+                first, last = low, high
+            elif "-" in base:
+                first_text, last_text = base.split("-", 1)
+                first, last = int(first_text), int(last_text)
+            else:
+                first = int(base)
+                # `5/10` means every 10th value starting at 5.
+                last = high if step_text else first
+        except ValueError:
+            raise ValueError(f"Invalid cron {name} field {text!r}") from None
+        if step < 1 or not low <= first <= last <= high:
+            raise ValueError(f"Invalid cron {name} field {text!r} (allowed {low}-{high})")
+        values.update(range(first, last + 1, step))
+    return values
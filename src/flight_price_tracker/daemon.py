@@ -0,0 +1,400 @@
+"""Long-running `serve` daemon with an in-process scheduler.
+
+Instead of a cold process per cron tick, :class:`TrackerDaemon` keeps the parsed config, one
+SerpApi client (and its keep-alive connections) and the previous prices of every one-way
+route in memory, and calls :func:`flight_price_tracker.run.run_once` for the routes that are
+due. Each route runs on its own `trigger` (a cron expression or a fixed interval, see
+:class:`flight_price_tracker.settings.TriggerConfig`); routes that fall due together share one
+run, and with it one fetch queue and one Parquet load. A tick therefore does only the
+incremental work: the routes' queries, the load of their rows and the summary and serving
+updates, but no imports, config parsing or history scans.
+
+`config.yaml` is checked every `serve.reload_seconds` and reloaded when its size or mtime
+changes. An invalid file is reported and the previous config stays in effect. Routes whose
+trigger changed are rescheduled; the client is reopened when the fetch settings changed.
+
+:class:`HealthServer` exposes the daemon's state on a local HTTP endpoint: `/healthz` (JSON)
+and `/metrics` (Prometheus text format).
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any
+
+import yaml
+
+from flight_price_tracker.cron import CronSchedule
+from flight_price_tracker.records import SearchRun
+from flight_price_tracker.run import open_serpapi_client, run_once
+from flight_price_tracker.serpapi import SerpApiClient
+from flight_price_tracker.settings import TriggerConfig, load_app_config
+
+
+@dataclass(frozen=True)
+class IntervalSchedule:
+    """Fires every `seconds`, counted from the previous run.
+
+    Attributes:
+        seconds: Time between runs.
+    """
+
+    seconds: float
+
+    def next_after(self, moment: datetime) -> datetime:
+        """Return the time one interval after `moment`."""
+        return moment + timedelta(seconds=self.seconds)
+
+
+def build_schedule(trigger: TriggerConfig) -> CronSchedule | IntervalSchedule:
+    """Return the schedule of a trigger.
+
+    Args:
+        trigger: Validated trigger config.
+
+    Returns:
+        A cron or interval schedule.
+    """
+    if trigger.cron is not None:
+        return CronSchedule.parse(trigger.cron)
+    return IntervalSchedule(seconds=(trigger.interval_minutes or 0.0) * 60.0)
+
+
+@dataclass
+class RouteState:
+    """Scheduling state and counters of one route.
+
+    Attributes:
+        trigger: The route's trigger.
+        next_run_utc: When the route is next due.
+        last_run_utc: When the route last ran, if it has.
+        last_seconds: Duration of the run the route last took part in.
+        last_error: Error of the route's last run, if it failed.
+        runs: Runs the route took part in.
+        failures: Runs of the route that raised.
+    """
+
+    trigger: TriggerConfig
+    next_run_utc: datetime
+    last_run_utc: datetime | None = None
+    last_seconds: float | None = None
+    last_error: str | None = None
+    runs: int = 0
+    failures: int = 0
+
+
+class TrackerDaemon:
+    """Runs routes on their triggers and keeps config, client and price history in memory.
+
+    `tick()` does one scheduling step; `serve_forever()` loops over it. State read by the
+    health endpoint is guarded by a lock, so `health()` and `metrics_text()` can be called
+    from other threads.
+
+    Attributes:
+        config_path: Path of the YAML config.
+        config: Config currently in effect.
+        routes: Scheduling state by route identifier.
+    """
+
+    def __init__(
+        self,
+        config_path: Path,
+        *,
+        clock: Callable[[], datetime] | None = None,
+        on_event: Callable[[str], None] | None = None,
+    ) -> None:
+        """Load the config and schedule every route.
+
+        Args:
+            config_path: Path of the YAML config.
+            clock: Returns the current UTC time (default: the system clock).
+            on_event: Called with a one-line message for every run, failure and reload.
+
+        Raises:
+            ValueError: If the config is invalid.
+        """
+        self.config_path = config_path
+        self._clock = clock or (lambda: datetime.now(timezone.utc))
+        self._on_event = on_event or (lambda _message: None)
+        self._lock = threading.Lock()
+        self._config_stat = _stat(config_path)
+        self.config = load_app_config(config_path)
+        self.routes: dict[str, RouteState] = {}
+        self._previous: dict[str, dict[str, float] | None] = {}
+        self._client: SerpApiClient | None = None
+        self.started_at_utc = self._clock()
+        self.config_loaded_at_utc = self.started_at_utc
+        self.config_error: str | None = None
+        self.reloads = 0
+        self._reschedule(self.started_at_utc)
+
+    def tick(self) -> list[SearchRun]:
+        """Reload the config if it changed, then run the routes that are due.
+
+        A failing run is reported and counted against its routes; it does not stop the
+        daemon. Either way the routes are rescheduled from their trigger.
+
+        Returns:
+            The search runs of this tick's run (empty if nothing was due or it failed).
+        """
+        self.reload_if_changed()
+        now = self._clock()
+        due = [route for route, state in self.routes.items() if state.next_run_utc <= now]
+        if not due:
+            return []
+
+        if self._client is None:
+            self._client = open_serpapi_client(self.config)
+        started = time.perf_counter()
+        error: str | None = None
+        search_runs: list[SearchRun] = []
+        try:
+            search_runs = run_once(
+                config_path=self.config_path,
+                config=self.config,
+                routes=due,
+                client=self._client,
+                previous_prices=self._previous,
+            )
+        except Exception as e:  # noqa: BLE001 - a failed run must not stop the daemon
+            error = f"{type(e).__name__}: {e}"
+        seconds = time.perf_counter() - started
+
+        with self._lock:
+            for route in due:
+                state = self.routes[route]
+                state.runs += 1
+                state.last_run_utc = now
+                state.last_seconds = seconds
+                state.last_error = error
+                state.failures += error is not None
+                state.next_run_utc = build_schedule(state.trigger).next_after(now)
+            for route in due:
+                # Round-trip rows are never compared with previous prices.
+                rows = [r for r in search_runs if r.route == route and r.return_date is None]
+                if rows:
+                    # What `load_previous_prices` would read back for the next run.
+                    self._previous[route] = {
+                        r.outbound_date: r.cheapest_price
+                        for r in rows
+                        if r.cheapest_price is not None
+                    }
+        if error is None:
+            self._on_event(f"ran {', '.join(due)} in {seconds:.1f}s ({len(search_runs)} rows)")
+        else:
+            self._on_event(f"run of {', '.join(due)} failed after {seconds:.1f}s: {error}")
+        return search_runs
+
+    def reload_if_changed(self) -> bool:
+        """Reload the config if the file's size or mtime changed.
+
+        Returns:
+            Whether a new config was put into effect.
+        """
+        stat = _stat(self.config_path)
+        if stat == self._config_stat:
+            return False
+        self._config_stat = stat
+        try:
+            config = load_app_config(self.config_path)
+        except (OSError, ValueError, yaml.YAMLError) as e:
+            with self._lock:
+                self.config_error = str(e)
+            self._on_event(f"config reload failed, keeping the previous config: {e}")
+            return False
+
+        fetch_changed = (config.serpapi.timeout_seconds, config.serpapi.max_concurrency) != (
+            self.config.serpapi.timeout_seconds,
+            self.config.serpapi.max_concurrency,
+        )
+        if fetch_changed and self._client is not None:
+            self._client.close()
+            self._client = None
+        now = self._clock()
+        with self._lock:
+            self.config = config
+            self.config_error = None
+            self.config_loaded_at_utc = now
+            self.reloads += 1
+        self._reschedule(now)
+        self._on_event(f"config reloaded ({len(self.routes)} routes)")
+        return True
+
+    def next_wakeup_utc(self) -> datetime:
+        """Return when the next route is due."""
+        return min(state.next_run_utc for state in self.routes.values())
+
+    def serve_forever(self, stop: threading.Event) -> None:
+        """Tick until `stop` is set, sleeping until the next route is due or config check.
+
+        Args:
+            stop: Set (e.g. from a signal handler) to return after the current run.
+        """
+        try:
+            while not stop.is_set():
+                self.tick()
+                wait = (self.next_wakeup_utc() - self._clock()).total_seconds()
+                stop.wait(min(max(wait, 0.0), self.config.serve.reload_seconds))
+        finally:
+            self.close()
+
+    def close(self) -> None:
+        """Close the SerpApi client."""
+        if self._client is not None:
+            self._client.close()
+            self._client = None
+
+    def health(self) -> dict[str, Any]:
+        """Return the daemon's state as a JSON-serialisable mapping."""
+        with self._lock:
+            return {
+                "status": "ok" if self.config_error is None else "degraded",
+                "started_at_utc": self.started_at_utc.isoformat(),
+                "config_loaded_at_utc": self.config_loaded_at_utc.isoformat(),
+                "config_error": self.config_error,
+                "reloads": self.reloads,
+                "routes": {
+                    route: {
+                        "next_run_utc": state.next_run_utc.isoformat(),
+                        "last_run_utc": None
+                        if state.last_run_utc is None
+                        else state.last_run_utc.isoformat(),
+                        "last_seconds": state.last_seconds,
+                        "last_error": state.last_error,
+                        "runs": state.runs,
+                        "failures": state.failures,
+                    }
+                    for route, state in self.routes.items()
+                },
+            }
+
+    def metrics_text(self) -> str:
+        """Return the daemon's counters in the Prometheus text exposition format."""
+        lines = [
+            "# TYPE flight_price_tracker_runs_total counter",
+            "# TYPE flight_price_tracker_run_failures_total counter",
+            "# TYPE flight_price_tracker_last_run_seconds gauge",
+            "# TYPE flight_price_tracker_next_run_timestamp_seconds gauge",
+        ]
+        with self._lock:
+            for route, state in self.routes.items():
+                label = f'{{route="{route}"}}'
+                lines.append(f"flight_price_tracker_runs_total{label} {state.runs}")
+                lines.append(f"flight_price_tracker_run_failures_total{label} {state.failures}")
+                if state.last_seconds is not None:
+                    lines.append(
+                        f"flight_price_tracker_last_run_seconds{label} {state.last_seconds:.3f}"
+                    )
+                lines.append(
+                    f"flight_price_tracker_next_run_timestamp_seconds{label} "
+                    f"{state.next_run_utc.timestamp():.0f}"
+                )
+            lines.append("# TYPE flight_price_tracker_config_reloads_total counter")
+            lines.append(f"flight_price_tracker_config_reloads_total {self.reloads}")
+            lines.append("# TYPE flight_price_tracker_config_valid gauge")
+            lines.append(f"flight_price_tracker_config_valid {int(self.config_error is None)}")
+        return "\n".join(lines) + "\n"
+
+    def _reschedule(self, now: datetime) -> None:
+        """Schedule new routes and routes whose trigger changed; drop removed routes."""
+        triggers = self.config.route_triggers()
+        with self._lock:
+            for route in set(self.routes) - set(triggers):
+                del self.routes[route]
+                self._previous.pop(route, None)
+            for route, trigger in triggers.items():
+                state = self.routes.get(route)
+                if state is not None and state.trigger == trigger:
+                    continue
+                schedule = build_schedule(trigger)
+                # Interval routes start right away; cron routes wait for their next match.
+                first = now if isinstance(schedule, IntervalSchedule) else schedule.next_after(now)
+                if state is None:
+                    self.routes[route] = RouteState(trigger=trigger, next_run_utc=first)
+                else:
+                    state.trigger, state.next_run_utc = trigger, first
+
+
+class HealthServer:
+    """Local HTTP endpoint serving a daemon's `/healthz` and `/metrics`."""
+
+    def __init__(self, daemon: TrackerDaemon, *, host: str, port: int) -> None:
+        """Bind the server; call `start()` to serve in a background thread.
+
+        Args:
+            daemon: Daemon whose state is served.
+            host: Address to bind.
+            port: Port to bind (0 picks a free port).
+        """
+        self._server = ThreadingHTTPServer((host, port), _handler(daemon))
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        """Base URL of the endpoint."""
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/"
+
+    def start(self) -> HealthServer:
+        """Start serving in a background thread."""
+        self._thread.start()
+        return self
+
+    def close(self) -> None:
+        """Stop serving and release the port."""
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> HealthServer:
+        """Start serving."""
+        return self.start()
+
+    def __exit__(self, *exc: object) -> None:
+        """Stop serving."""
+        self.close()
+
+
+def _handler(daemon: TrackerDaemon) -> type[BaseHTTPRequestHandler]:
+    """Build the request handler class bound to `daemon`."""
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:  # noqa: N802 - http.server naming
+            path = self.path.split("?", 1)[0]
+            if path == "/healthz":
+                health = daemon.health()
+                status = 200 if health["status"] == "ok" else 503
+                self._send(status, "application/json", json.dumps(health).encode("utf-8"))
+            elif path == "/metrics":
+                body = daemon.metrics_text().encode("utf-8")
+                self._send(200, "text/plain; version=0.0.4", body)
+            else:
+                self._send(404, "text/plain", b"not found\n")
+
+        def _send(self, status: int, content_type: str, body: bytes) -> None:
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format: str, *args: Any) -> None:  # noqa: A002
+            """Keep request logs off stderr."""
+
+    return Handler
+
+
+def _stat(path: Path) -> tuple[int, int] | None:
+    """Return (size, mtime_ns) of a file, or None if it is missing."""
+    try:
+        st = path.stat()
+    except FileNotFoundError:
+        return None
+    return st.st_size, st.st_mtime_ns
@@ -32,6 +32,7 @@ def build_resources(
                 "serpapi_params": {"data_type": "text"},
                 "evidence_json_path": {"data_type": "text"},
                 "evidence_sha256": {"data_type": "text"},
+                "return_date": {"data_type": "text"},
             },
         ),
         dlt.resource(
@@ -43,6 +44,7 @@ def build_resources(
                 "airlines": {"data_type": "text"},
                 "depart_time": {"data_type": "text"},
                 "arrive_time": {"data_type": "text"},
+                "return_date": {"data_type": "text"},
             },
         ),
     ]
@@ -0,0 +1,18 @@
+"""Secrets loaded from the environment.
+
+Kept apart from :mod:`flight_price_tracker.settings` so that reading and validating the YAML
+config does not import `pydantic-settings`; only commands that call SerpApi need it.
+"""
+
+from __future__ import annotations
+
+from pydantic import Field
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+
+class EnvSettings(BaseSettings):
+    """Secrets loaded from environment variables and `.env`."""
+
+    model_config = SettingsConfigDict(env_prefix="", env_file=".env", extra="ignore")
+
+    serpapi_api_key: str = Field(validation_alias="SERPAPI_API_KEY")
@@ -0,0 +1,268 @@
+"""Compressed, deduplicated evidence archive.
+
+The default evidence store writes every raw SerpApi response as a standalone JSON file plus a
+`.sha256` sidecar. The archive store instead writes zstd-compressed blobs keyed by their
+SHA256, so identical payloads are stored once, plus a small per-run index:
+
+    evidence/archive/blobs/ab/<sha256>.json.zst
+    evidence/archive/index/route=<route>/run_date=<date>.json   {outbound_date: sha256}
+
+Round-trip queries append the return date to the file name and the index key
+(`outbound_date=<date>_return_date=<date>.json`).
+
+Several processes (e.g. the `serve` daemon and a scheduled `run`) may write to one archive:
+blobs and index files are written under unique temporary names and renamed into place, and
+each index update holds an exclusive `flock` on a lock file next to the index, so concurrent
+writers of the same route and run date do not lose each other's entries. On platforms without
+`fcntl` (Windows) the archive supports a single writer process only.
+
+Evidence is still referenced by its logical path
+(`evidence/route=.../run_date=.../outbound_date=....json`), and :func:`open_evidence` resolves
+such a path from either store.
+"""
+
+from __future__ import annotations
+
+import json
+import re
+from collections.abc import Iterator
+from hashlib import sha256
+from pathlib import Path
+from typing import BinaryIO, cast
+
+import pyarrow as pa
+
+from flight_price_tracker.parquet_writer import exclusive_lock, write_atomic
+
+ARCHIVE_DIR = "archive"
+
+_BLOB_SUFFIX = ".json.zst"
+
+_LOGICAL_PATH_RE = re.compile(
+    r"^(?P<root>.*?)/?route=(?P<route>[^/]+)/run_date=(?P<run_date>[^/]+)/"
+    r"outbound_date=(?P<outbound_date>[^/_]+)(?:_return_date=(?P<return_date>[^/]+))?\.json$"
+)
+
+
+class EvidenceNotFoundError(FileNotFoundError):
+    """Raised when an evidence path resolves to neither a JSON file nor an archived blob."""
+
+
+def evidence_json_path(
+    *,
+    evidence_root: Path,
+    route: str,
+    run_date: str,
+    outbound_date: str,
+    return_date: str | None = None,
+) -> Path:
+    """Return the logical evidence JSON path for a query.
+
+    Args:
+        evidence_root: Root evidence folder.
+        route: Route identifier in the form ORIGIN-DESTINATION.
+        run_date: Run date (YYYY-MM-DD).
+        outbound_date: Outbound date (YYYY-MM-DD).
+        return_date: Return date (YYYY-MM-DD) of a round-trip query, or None for one-way.
+
+    Returns:
+        The path used by the JSON file store and recorded in `search_runs`.
+    """
+    return (
+        evidence_root
+        / f"route={route}"
+        / f"run_date={run_date}"
+        / f"outbound_date={_date_key(outbound_date, return_date)}.json"
+    )
+
+
+def _date_key(outbound_date: str, return_date: str | None) -> str:
+    """Return the archive index key of a query (also the tail of its evidence file name)."""
+    return outbound_date if return_date is None else f"{outbound_date}_return_date={return_date}"
+
+
+class EvidenceArchive:
+    """Content-addressed, zstd-compressed evidence store.
+
+    Attributes:
+        evidence_root: Root evidence folder (the archive lives in `evidence_root/archive`).
+    """
+
+    def __init__(self, evidence_root: Path) -> None:
+        """Create an archive rooted under `evidence_root`.
+
+        Args:
+            evidence_root: Root evidence folder.
+        """
+        self.evidence_root = evidence_root
+        self._root = evidence_root / ARCHIVE_DIR
+
+    def put(
+        self,
+        *,
+        route: str,
+        run_date: str,
+        outbound_date: str,
+        raw: bytes,
+        return_date: str | None = None,
+    ) -> tuple[str, str]:
+        """Store a payload (once per digest) and index it for (route, run_date, outbound_date).
+
+        Args:
+            route: Route identifier in the form ORIGIN-DESTINATION.
+            run_date: Run date (YYYY-MM-DD).
+            outbound_date: Outbound date (YYYY-MM-DD).
+            raw: Raw JSON bytes.
+            return_date: Return date (YYYY-MM-DD) of a round-trip query, or None for one-way.
+
+        Returns:
+            Tuple of (logical_json_path, sha256_hex).
+        """
+        digest = sha256(raw).hexdigest()
+        blob = self.blob_path(digest)
+        if not blob.exists():
+            write_atomic(blob, lambda tmp: _write_blob(tmp, raw))
+
+        index_path = self._index_path(route=route, run_date=run_date)
+        with exclusive_lock(index_path.with_name(f".{index_path.name}.lock")):
+            index = self._read_index(index_path)
+            index[_date_key(outbound_date, return_date)] = digest
+            text = json.dumps(index, sort_keys=True, indent=0) + "\n"
+            write_atomic(index_path, lambda tmp: tmp.write_text(text, encoding="utf-8"))
+
+        logical = evidence_json_path(
+            evidence_root=self.evidence_root,
+            route=route,
+            run_date=run_date,
+            outbound_date=outbound_date,
+            return_date=return_date,
+        )
+        return logical.as_posix(), digest
+
+    def lookup(
+        self, *, route: str, run_date: str, outbound_date: str, return_date: str | None = None
+    ) -> str | None:
+        """Return the digest indexed for a query, or None if it is not archived."""
+        index = self._read_index(self._index_path(route=route, run_date=run_date))
+        return index.get(_date_key(outbound_date, return_date))
+
+    def blob_path(self, digest: str) -> Path:
+        """Return the blob path for a SHA256 digest."""
+        return self._root / "blobs" / digest[:2] / f"{digest}{_BLOB_SUFFIX}"
+
+    def import_tree(self) -> int:
+        """Move existing JSON evidence files (with matching sidecars) into the archive.
+
+        Files whose `.sha256` sidecar is missing or does not match are left untouched.
+
+        Returns:
+            Number of files archived.
+        """
+        archived = 0
+        for path in sorted(self.evidence_root.glob("route=*/run_date=*/outbound_date=*.json")):
+            m = _LOGICAL_PATH_RE.match(path.as_posix())
+            sidecar = path.with_suffix(".sha256")
+            if m is None or not sidecar.exists():
+                continue
+            raw = path.read_bytes()
+            if sha256(raw).hexdigest() != sidecar.read_text(encoding="utf-8").strip():
+                continue
+            self.put(
+                route=m["route"],
+                run_date=m["run_date"],
+                outbound_date=m["outbound_date"],
+                return_date=m["return_date"],
+                raw=raw,
+            )
+            path.unlink()
+            sidecar.unlink()
+            archived += 1
+        return archived
+
+    def _index_path(self, *, route: str, run_date: str) -> Path:
+        """Return the index file for one route and run date."""
+        return self._root / "index" / f"route={route}" / f"run_date={run_date}.json"
+
+    @staticmethod
+    def _read_index(path: Path) -> dict[str, str]:
+        """Read an index file (empty if missing)."""
+        try:
+            return dict(json.loads(path.read_text(encoding="utf-8")))
+        except FileNotFoundError:
+            return {}
+
+
+def _write_blob(path: Path, raw: bytes) -> None:
+    """Write a payload zstd-compressed."""
+    with pa.CompressedOutputStream(str(path), "zstd") as out:
+        out.write(raw)
+
+
+def resolve_evidence(json_path: str | Path) -> Path:
+    """Return the file holding an evidence payload: its JSON file, or its archived blob.
+
+    Args:
+        json_path: Evidence path as recorded in `search_runs.evidence_json_path`.
+
+    Returns:
+        The JSON file if it exists, otherwise the archive blob indexed for the path.
+
+    Raises:
+        EvidenceNotFoundError: If the evidence exists in neither store.
+    """
+    path = Path(json_path)
+    if path.exists():
+        return path
+
+    m = _LOGICAL_PATH_RE.match(path.as_posix())
+    if m is not None:
+        archive = EvidenceArchive(Path(m["root"] or "."))
+        digest = archive.lookup(
+            route=m["route"],
+            run_date=m["run_date"],
+            outbound_date=m["outbound_date"],
+            return_date=m["return_date"],
+        )
+        if digest is not None and archive.blob_path(digest).exists():
+            return archive.blob_path(digest)
+    raise EvidenceNotFoundError(f"Evidence not found: {json_path}")
+
+
+def open_evidence(json_path: str | Path) -> BinaryIO:
+    """Open evidence by its logical path, from the JSON file store or the archive.
+
+    Args:
+        json_path: Evidence path as recorded in `search_runs.evidence_json_path`, or a file
+            returned by :func:`resolve_evidence`.
+
+    Returns:
+        A binary stream of the raw JSON payload (archived blobs are decompressed).
+
+    Raises:
+        EvidenceNotFoundError: If the evidence exists in neither store.
+    """
+    path = resolve_evidence(json_path)
+    if path.name.endswith(_BLOB_SUFFIX):
+        return cast(BinaryIO, pa.CompressedInputStream(pa.OSFile(str(path)), "zstd"))
+    return path.open("rb")
+
+
+def read_evidence(json_path: str | Path) -> bytes:
+    """Read a whole evidence payload by its logical path (see :func:`open_evidence`)."""
+    with open_evidence(json_path) as f:
+        return f.read()
+
+
+def iter_evidence_chunks(json_path: str | Path, *, chunk_size: int = 1 << 16) -> Iterator[bytes]:
+    """Stream an evidence payload in chunks without holding it in memory.
+
+    Args:
+        json_path: Evidence path as recorded in `search_runs.evidence_json_path`.
+        chunk_size: Maximum bytes per chunk.
+
+    Yields:
+        Consecutive chunks of the raw JSON payload.
+    """
+    with open_evidence(json_path) as f:
+        while chunk := f.read(chunk_size):
+            yield chunk
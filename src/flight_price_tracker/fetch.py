@@ -0,0 +1,323 @@
+"""Bounded-concurrency fetch engine for SerpApi queries.
+
+Requests are issued from a small thread pool while a shared token bucket caps the global
+request rate, so a window of N dates takes roughly max(N / rate, slowest request) instead of
+N x (latency + sleep).
+
+Transient failures (HTTP 429/5xx, connection errors, timeouts) are retried with jittered
+exponential backoff, waiting at least as long as the response's `Retry-After` asks. A circuit
+breaker shared by the workers stops issuing requests after repeated consecutive failures, so
+an outage costs a handful of calls instead of one per remaining date.
+"""
+
+from __future__ import annotations
+
+import random
+import threading
+import time
+from collections.abc import Callable, Mapping, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any
+
+from flight_price_tracker.records import query_key
+from flight_price_tracker.serpapi import SerpApiError
+
+SearchFn = Callable[[Mapping[str, Any]], tuple[dict[str, Any], bytes]]
+
+
+class TokenBucket:
+    """Thread-safe token-bucket rate limiter.
+
+    Callers reserve a token under the lock and sleep outside of it, so waiting threads are
+    released in arrival order and never exceed `rate_per_second` on average.
+
+    Attributes:
+        rate_per_second: Sustained token refill rate. None disables limiting.
+        capacity: Maximum number of tokens that can accumulate (burst size).
+    """
+
+    def __init__(
+        self,
+        *,
+        rate_per_second: float | None,
+        capacity: float = 1.0,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        """Create a limiter.
+
+        Args:
+            rate_per_second: Sustained token refill rate. None or 0 disables limiting.
+            capacity: Maximum number of tokens that can accumulate (burst size).
+            clock: Monotonic clock function (injectable for tests).
+            sleep: Sleep function (injectable for tests).
+        """
+        self.rate_per_second = rate_per_second or None
+        self.capacity = capacity
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._tokens = capacity
+        self._updated = clock()
+
+    @classmethod
+    def from_interval(cls, seconds: float) -> TokenBucket:
+        """Create a limiter that allows one request every `seconds`.
+
+        Args:
+            seconds: Minimum spacing between request starts; 0 disables limiting.
+
+        Returns:
+            A limiter with a burst capacity of one request.
+        """
+        return cls(rate_per_second=1.0 / seconds if seconds > 0 else None)
+
+    def acquire(self) -> None:
+        """Block until a token is available and consume it."""
+        if self.rate_per_second is None:
+            return
+
+        with self._lock:
+            now = self._clock()
+            elapsed = now - self._updated
+            self._updated = now
+            self._tokens = min(self.capacity, self._tokens + elapsed * self.rate_per_second)
+            self._tokens -= 1.0
+            wait = -self._tokens / self.rate_per_second if self._tokens < 0 else 0.0
+
+        if wait > 0:
+            self._sleep(wait)
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """Retry schedule for transient search failures.
+
+    Attributes:
+        max_retries: Retries after the first attempt (0 disables retrying).
+        base_delay_seconds: Backoff cap of the first retry; doubles on every further retry.
+        max_delay_seconds: Upper bound of any single wait. A `Retry-After` longer than this
+            is not waited for: the failure is returned instead (e.g. for a later pass).
+    """
+
+    max_retries: int = 3
+    base_delay_seconds: float = 1.0
+    max_delay_seconds: float = 30.0
+
+    def delay(
+        self,
+        retry: int,
+        *,
+        retry_after_seconds: float | None = None,
+        rng: Callable[[], float] = random.random,
+    ) -> float | None:
+        """Return how long to wait before a retry, or None to give up.
+
+        Uses "full jitter": a uniform draw between 0 and the exponential backoff cap, which
+        spreads out the retries of workers that failed at the same time.
+
+        Args:
+            retry: Number of the retry about to be made (0 for the first).
+            retry_after_seconds: Delay requested by the server, if any.
+            rng: Uniform random number generator on [0, 1) (injectable for tests).
+
+        Returns:
+            Seconds to wait, or None if the retries are exhausted or the server asks for a
+            longer wait than `max_delay_seconds`.
+        """
+        if retry >= self.max_retries:
+            return None
+        if retry_after_seconds is not None and retry_after_seconds > self.max_delay_seconds:
+            return None
+        cap = min(self.max_delay_seconds, self.base_delay_seconds * 2**retry)
+        return max(rng() * cap, retry_after_seconds or 0.0)
+
+
+class CircuitBreaker:
+    """Thread-safe per-run circuit breaker.
+
+    The breaker opens after `failure_threshold` consecutive transient failures (any success in
+    between resets the count) and stays open until :meth:`reset`, so no further searches are
+    issued in the current pass. Non-transient failures (e.g. bad params, an unparsable
+    response) say nothing about the API's health and are not counted.
+
+    Attributes:
+        failure_threshold: Consecutive failures that open the breaker.
+    """
+
+    def __init__(self, *, failure_threshold: int) -> None:
+        """Create a closed breaker.
+
+        Args:
+            failure_threshold: Consecutive failures that open the breaker.
+        """
+        self.failure_threshold = failure_threshold
+        self._lock = threading.Lock()
+        self._failures = 0
+
+    @property
+    def is_open(self) -> bool:
+        """Whether searches are currently refused."""
+        with self._lock:
+            return self._failures >= self.failure_threshold
+
+    def record_success(self) -> None:
+        """Reset the consecutive failure count (an open breaker stays open)."""
+        with self._lock:
+            if self._failures < self.failure_threshold:
+                self._failures = 0
+
+    def record_failure(self) -> None:
+        """Count one transiently failed search."""
+        with self._lock:
+            self._failures += 1
+
+    def reset(self) -> None:
+        """Close the breaker again (e.g. before a final re-attempt pass)."""
+        with self._lock:
+            self._failures = 0
+
+
+@dataclass(frozen=True)
+class FetchJob:
+    """A single SerpApi query to run.
+
+    Attributes:
+        route: Route identifier in the form ORIGIN-DESTINATION.
+        outbound_date: Outbound date (YYYY-MM-DD) the query is for.
+        params: Query params excluding the API key.
+        return_date: Return date (YYYY-MM-DD) of a round-trip query, or None for one-way.
+    """
+
+    route: str
+    outbound_date: str
+    params: dict[str, Any]
+    return_date: str | None = None
+
+    @property
+    def key(self) -> tuple[str, ...]:
+        """Identity of the job within a run (see :func:`query_key`)."""
+        return query_key(self.route, self.outbound_date, self.return_date)
+
+
+@dataclass(frozen=True)
+class FetchResult:
+    """Outcome of a :class:`FetchJob`.
+
+    Exactly one of (`response`, `raw_json`) or `error` is set.
+
+    Attributes:
+        job: The job this result belongs to.
+        response: Parsed SerpApi JSON response.
+        raw_json: Canonical JSON bytes of the response (written and hashed as evidence).
+        error: The failure raised by the search function (of the last attempt).
+        seconds: Wall time of the search calls, summed over attempts (excluding rate-limit
+            and backoff waits).
+        attempts: Search calls made (0 if the circuit breaker refused the job).
+        backoff_seconds: Time spent waiting between retries.
+    """
+
+    job: FetchJob
+    response: dict[str, Any] | None = None
+    raw_json: bytes | None = None
+    error: SerpApiError | None = None
+    seconds: float | None = None
+    attempts: int = 1
+    backoff_seconds: float = 0.0
+
+
+def fetch_all(
+    jobs: Sequence[FetchJob],
+    *,
+    search: SearchFn,
+    limiter: TokenBucket,
+    max_concurrency: int,
+    on_result: Callable[[FetchResult], None] | None = None,
+    retry: RetryPolicy | None = None,
+    breaker: CircuitBreaker | None = None,
+    sleep: Callable[[float], None] = time.sleep,
+) -> list[FetchResult]:
+    """Run all jobs with bounded concurrency under a shared rate limit.
+
+    Args:
+        jobs: Queries to run.
+        search: Function performing a single search; must raise `SerpApiError` on failure.
+        limiter: Rate limiter shared by all workers (every retry takes a token as well).
+        max_concurrency: Maximum number of requests in flight.
+        on_result: Called with each result as soon as its job finishes (from the worker
+            thread), e.g. to checkpoint progress before the whole batch is done.
+        retry: Retry policy for transient failures (None: one attempt per job).
+        breaker: Circuit breaker shared by the workers; jobs started while it is open fail
+            without a search call.
+        sleep: Sleep function for backoff waits (injectable for tests).
+
+    Returns:
+        One result per job, in the same order as `jobs`.
+    """
+
+    def _run(job: FetchJob) -> FetchResult:
+        result = _search_with_retries(
+            job, search=search, limiter=limiter, retry=retry, breaker=breaker, sleep=sleep
+        )
+        if on_result is not None:
+            on_result(result)
+        return result
+
+    workers = min(max_concurrency, len(jobs))
+    if workers <= 1:
+        return [_run(job) for job in jobs]
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="serpapi") as pool:
+        return list(pool.map(_run, jobs))
+
+
+def _search_with_retries(
+    job: FetchJob,
+    *,
+    search: SearchFn,
+    limiter: TokenBucket,
+    retry: RetryPolicy | None,
+    breaker: CircuitBreaker | None,
+    sleep: Callable[[float], None],
+) -> FetchResult:
+    """Run one job, retrying transient failures as allowed by `retry` and `breaker`."""
+    attempts = 0
+    seconds = backoff = 0.0
+    while True:
+        if breaker is not None and breaker.is_open:
+            error = SerpApiError(
+                "Skipped: circuit breaker open after repeated SerpApi failures", transient=True
+            )
+            break
+        limiter.acquire()
+        attempts += 1
+        start = time.perf_counter()
+        try:
+            resp, raw_json = search(job.params)
+        except SerpApiError as e:
+            error = e
+        else:
+            if breaker is not None:
+                breaker.record_success()
+            return FetchResult(
+                job=job,
+                response=resp,
+                raw_json=raw_json,
+                seconds=seconds + time.perf_counter() - start,
+                attempts=attempts,
+                backoff_seconds=backoff,
+            )
+        seconds += time.perf_counter() - start
+        if breaker is not None and error.transient:
+            breaker.record_failure()
+        wait = None
+        if retry is not None and error.transient:
+            wait = retry.delay(attempts - 1, retry_after_seconds=error.retry_after_seconds)
+        if wait is None:
+            break
+        sleep(wait)
+        backoff += wait
+    return FetchResult(
+        job=job, error=error, seconds=seconds, attempts=attempts, backoff_seconds=backoff
+    )
@@ -0,0 +1,187 @@
+"""Per-run checkpoint journal.
+
+Every run appends JSON lines to `.tracker/journal/run=<observed_at>.jsonl` as each
+(route, outbound_date[, return_date]) moves through the pipeline:
+
+- `started`: once, with the run's `observed_at_utc`.
+- `fetched`: the response was received and its evidence written (or the query failed, with
+  `error`).
+- `normalized`: the search run and its offers were built.
+- `loaded`: the rows were written to Parquet.
+- `completed`: once, after the reports were written.
+
+A run without `completed` was interrupted; `run --resume` picks it up under the same
+`observed_at_utc`, rebuilding fetched dates from their evidence and skipping loaded ones.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+from flight_price_tracker.records import query_key
+
+JOURNAL_DIR = Path(".tracker/journal")
+
+STAGES = ("fetched", "normalized", "loaded")
+
+
+@dataclass(frozen=True)
+class JournalEntry:
+    """Latest known state of one (route, outbound_date) in a run.
+
+    Attributes:
+        stage: Furthest stage reached (`fetched`, `normalized` or `loaded`).
+        evidence_json_path: Evidence path recorded when fetched.
+        evidence_sha256: Evidence SHA256 recorded when fetched.
+        error: Error message if the fetch failed.
+    """
+
+    stage: str
+    evidence_json_path: str | None = None
+    evidence_sha256: str | None = None
+    error: str | None = None
+
+
+class RunJournal:
+    """Append-only JSONL journal of one run.
+
+    Events are flushed and fsynced as they are recorded, so the journal survives a crash of
+    the process. Recording is thread-safe.
+
+    Attributes:
+        path: Journal file.
+        observed_at_utc: Start time of the journaled run.
+    """
+
+    def __init__(self, path: Path, *, observed_at_utc: datetime) -> None:
+        """Open a journal file for appending.
+
+        Args:
+            path: Journal file.
+            observed_at_utc: Start time of the journaled run.
+        """
+        self.path = path
+        self.observed_at_utc = observed_at_utc
+        self._lock = threading.Lock()
+
+    @classmethod
+    def start(cls, root: Path, *, observed_at_utc: datetime) -> RunJournal:
+        """Create the journal of a new run.
+
+        Args:
+            root: Journal directory.
+            observed_at_utc: Start time of the run.
+
+        Returns:
+            The new journal, with its `started` event recorded.
+        """
+        stamp = observed_at_utc.strftime("%Y%m%dT%H%M%S%fZ")
+        journal = cls(root / f"run={stamp}.jsonl", observed_at_utc=observed_at_utc)
+        root.mkdir(parents=True, exist_ok=True)
+        journal.record("started", observed_at_utc=observed_at_utc.isoformat())
+        return journal
+
+    @classmethod
+    def latest_incomplete(cls, root: Path) -> RunJournal | None:
+        """Find the most recent run that did not complete.
+
+        Args:
+            root: Journal directory.
+
+        Returns:
+            The journal of that run, or None if the latest run completed (or there is none).
+        """
+        paths = sorted(root.glob("run=*.jsonl"))
+        if not paths:
+            return None
+        events = _read_events(paths[-1])
+        if not events or events[0].get("event") != "started":
+            return None
+        if any(e.get("event") == "completed" for e in events):
+            return None
+        with paths[-1].open("rb+") as f:
+            # Terminate a line torn by the crash so the next event starts on its own line.
+            f.seek(-1, os.SEEK_END)
+            if f.read(1) != b"\n":
+                f.write(b"\n")
+        observed_at = datetime.fromisoformat(events[0]["observed_at_utc"])
+        return cls(paths[-1], observed_at_utc=observed_at)
+
+    def record(
+        self,
+        event: str,
+        *,
+        route: str | None = None,
+        outbound_date: str | None = None,
+        return_date: str | None = None,
+        **fields: Any,
+    ) -> None:
+        """Append one event.
+
+        Args:
+            event: Event name (`started`, one of `STAGES`, or `completed`).
+            route: Route identifier the event is about, if any.
+            outbound_date: Outbound date the event is about, if any.
+            return_date: Return date of the round trip the event is about, if any.
+            **fields: Extra JSON-serialisable fields (e.g. evidence path and digest).
+        """
+        line: dict[str, Any] = {"event": event}
+        if route is not None:
+            line["route"] = route
+        if outbound_date is not None:
+            line["outbound_date"] = outbound_date
+        if return_date is not None:
+            line["return_date"] = return_date
+        line.update({k: v for k, v in fields.items() if v is not None})
+        data = (json.dumps(line, sort_keys=True) + "\n").encode("utf-8")
+        with self._lock, self.path.open("ab") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+
+    def entries(self) -> dict[tuple[str, ...], JournalEntry]:
+        """Return the latest state of every query in the run, by :func:`query_key`.
+
+        A later `fetched` event (from a resumed attempt) replaces earlier state, so a date that
+        failed and was re-fetched reports the new outcome; other events only move a date
+        forward.
+        """
+        state: dict[tuple[str, ...], JournalEntry] = {}
+        for e in _read_events(self.path):
+            if e.get("event") not in STAGES:
+                continue
+            key = query_key(e["route"], e["outbound_date"], e.get("return_date"))
+            if e["event"] == "fetched":
+                state[key] = JournalEntry(
+                    stage="fetched",
+                    evidence_json_path=e.get("evidence_json_path"),
+                    evidence_sha256=e.get("evidence_sha256"),
+                    error=e.get("error"),
+                )
+            elif key in state and STAGES.index(e["event"]) > STAGES.index(state[key].stage):
+                prev = state[key]
+                state[key] = JournalEntry(
+                    stage=e["event"],
+                    evidence_json_path=prev.evidence_json_path,
+                    evidence_sha256=prev.evidence_sha256,
+                    error=prev.error,
+                )
+        return state
+
+
+def _read_events(path: Path) -> list[dict[str, Any]]:
+    """Read the events of a journal, skipping torn lines left by a crash."""
+    events: list[dict[str, Any]] = []
+    with path.open("rb") as f:
+        for raw in f:
+            try:
+                events.append(json.loads(raw))
+            except ValueError:
+                continue
+    return events
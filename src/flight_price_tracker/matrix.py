@@ -0,0 +1,190 @@
+"""Outbound date x trip length price matrices of round-trip routes.
+
+A round-trip window queries every outbound date once per configured trip length, so one run
+of a route yields a grid of cheapest prices: rows are outbound dates, columns are stay lengths
+in nights (the return date is the outbound date plus that many days). The grid is built from
+the stored `search_runs` rows of the run with Arrow compute kernels, so placing and formatting
+the cells costs a handful of kernel calls regardless of the grid size:
+
+- the nights of each row are the `days_between` its outbound and return dates,
+- each row's cell index is `outbound_index * n_lengths + length_index`, both via `index_in`,
+- the flat row-major grid is one `take` of the prices by the row holding each cell.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+
+from flight_price_tracker.parquet_writer import open_dataset
+
+_EMPTY_CELL = "–"
+
+
+@dataclass(frozen=True)
+class MatrixCell:
+    """One priced cell of a :class:`PriceMatrix`.
+
+    Attributes:
+        outbound_date: Outbound date (YYYY-MM-DD).
+        trip_length_days: Nights between outbound and return.
+        return_date: Return date (YYYY-MM-DD).
+        price: Cheapest round-trip price.
+    """
+
+    outbound_date: str
+    trip_length_days: int
+    return_date: str
+    price: float
+
+
+@dataclass(frozen=True)
+class PriceMatrix:
+    """Cheapest round-trip prices of one run, by outbound date and trip length.
+
+    Attributes:
+        outbound_dates: Row labels, ascending.
+        trip_lengths: Column labels (nights), in configured order.
+        prices: Row-major cells (`len(outbound_dates) * len(trip_lengths)`), null where the
+            query failed, found no offers or was not run.
+    """
+
+    outbound_dates: pa.Array
+    trip_lengths: pa.Array
+    prices: pa.Array
+
+    @property
+    def shape(self) -> tuple[int, int]:
+        """(rows, columns) of the matrix."""
+        return len(self.outbound_dates), len(self.trip_lengths)
+
+    def price(self, outbound_date: str, trip_length_days: int) -> float | None:
+        """Return one cell, or None if it is empty or outside the matrix."""
+        row = pc.index(self.outbound_dates, outbound_date).as_py()
+        col = pc.index(self.trip_lengths, trip_length_days).as_py()
+        if row < 0 or col < 0:
+            return None
+        return self.prices[row * self.shape[1] + col].as_py()
+
+    def cheapest(self, k: int) -> list[MatrixCell]:
+        """Return the `k` cheapest priced cells, cheapest first (empty cells sort last)."""
+        n_cols = self.shape[1]
+        order = pc.sort_indices(self.prices)[:k]
+        order = order.filter(pc.is_valid(pc.take(self.prices, order)))
+        row_idx = pc.divide(order, n_cols)
+        rows = pc.take(self.outbound_dates, row_idx)
+        cols = pc.take(self.trip_lengths, pc.subtract(order, pc.multiply(row_idx, n_cols)))
+        returns = _add_days(rows, cols)
+        return [
+            MatrixCell(outbound_date=od, trip_length_days=n, return_date=rd, price=p)
+            for od, n, rd, p in zip(
+                rows.to_pylist(),
+                cols.to_pylist(),
+                returns.to_pylist(),
+                pc.take(self.prices, order).to_pylist(),
+                strict=True,
+            )
+        ]
+
+    def to_markdown(self) -> list[str]:
+        """Render the matrix as Markdown table lines (prices without currency).
+
+        Each column is formatted and gathered with one kernel call, and the rows are joined
+        element-wise, so rendering does not loop over cells in Python.
+        """
+        n_rows, n_cols = self.shape
+        header = ["Outbound \\ nights", *(str(n) for n in self.trip_lengths.to_pylist())]
+        lines = [
+            "| " + " | ".join(header) + " |",
+            "|---|" + "---:|" * n_cols,
+        ]
+        if n_rows == 0:
+            return lines
+        text = pc.fill_null(pc.cast(pc.round(self.prices, 2), pa.string()), _EMPTY_CELL)
+        starts = pa.array(range(0, n_rows * n_cols, n_cols), type=pa.int64())
+        columns = [pc.take(text, pc.add(starts, j)) for j in range(n_cols)]
+        cells = pc.binary_join_element_wise(self.outbound_dates, *columns, " | ")
+        lines.extend(pc.binary_join_element_wise("| ", cells, " |", "").to_pylist())
+        return lines
+
+
+def load_price_matrix(
+    *,
+    dataset_root: Path,
+    route: str,
+    observed_at_utc: datetime,
+    trip_lengths: list[int],
+) -> PriceMatrix:
+    """Build the price matrix of one route from the `search_runs` rows of one run.
+
+    Args:
+        dataset_root: Dataset folder (e.g. `data/flight_price_tracker`).
+        route: Route identifier in the form ORIGIN-DESTINATION.
+        observed_at_utc: Start time of the run.
+        trip_lengths: Configured trip lengths (matrix columns, in this order).
+
+    Returns:
+        The matrix; rows are the outbound dates the run stored for the route.
+    """
+    lengths = pa.array(trip_lengths, type=pa.int64())
+    table = pa.table(
+        {
+            "outbound_date": pa.array([], pa.string()),
+            "return_date": pa.array([], pa.string()),
+            "cheapest_price": pa.array([], pa.float64()),
+        }
+    )
+    if (dataset_root / "search_runs").exists():
+        table = open_dataset(dataset_root, "search_runs").to_table(
+            columns=["outbound_date", "return_date", "cheapest_price"],
+            # Rows land in the partition of their load date (the dlt writer derives it from
+            # the load id), which can be after the run's start date but never before it.
+            filter=(ds.field("run_date") >= observed_at_utc.date().isoformat())
+            & (ds.field("route") == route)
+            & (
+                ds.field("observed_at_utc")
+                == pa.scalar(observed_at_utc, type=pa.timestamp("us", tz="UTC"))
+            )
+            & ds.field("return_date").is_valid(),
+        )
+    return build_price_matrix(table, trip_lengths=lengths)
+
+
+def build_price_matrix(table: pa.Table, *, trip_lengths: pa.Array) -> PriceMatrix:
+    """Place round-trip rows into an outbound date x trip length matrix.
+
+    Args:
+        table: Rows with `outbound_date`, `return_date` and `cheapest_price` columns.
+        trip_lengths: Matrix columns (nights); rows with other trip lengths are dropped.
+
+    Returns:
+        The matrix.
+    """
+    outbound = table.column("outbound_date").combine_chunks()
+    nights = pc.days_between(
+        pc.cast(outbound, pa.date32()),
+        pc.cast(table.column("return_date").combine_chunks(), pa.date32()),
+    )
+    outbound_dates = pc.unique(outbound)
+    outbound_dates = pc.take(outbound_dates, pc.sort_indices(outbound_dates))
+
+    n_cells = len(outbound_dates) * len(trip_lengths)
+    cell = pc.add(
+        pc.multiply(pc.index_in(outbound, value_set=outbound_dates), len(trip_lengths)),
+        pc.index_in(nights, value_set=trip_lengths),
+    )
+    # For every cell, the row that holds it (null if none); nulls propagate through `take`.
+    source = pc.index_in(pa.array(range(n_cells), type=pa.int64()), value_set=cell)
+    prices = pc.take(pc.cast(table.column("cheapest_price").combine_chunks(), pa.float64()), source)
+    return PriceMatrix(outbound_dates=outbound_dates, trip_lengths=trip_lengths, prices=prices)
+
+
+def _add_days(dates: pa.Array, days: pa.Array) -> pa.Array:
+    """Add whole days to YYYY-MM-DD strings, element-wise."""
+    shifted = pc.add(pc.cast(pc.cast(dates, pa.date32()), pa.int32()), pc.cast(days, pa.int32()))
+    return pc.cast(pc.cast(shifted, pa.date32()), pa.string())
@@ -0,0 +1,245 @@
+"""Per-stage timing and size metrics of a run.
+
+The run loop wraps each stage in :meth:`RunMetrics.stage`, optionally per route and outbound
+date, and attaches byte and row counts. At the end of a run the samples are written to the
+`run_metrics` table (one row per sample) and summarised per stage in the reports:
+
+    data/flight_price_tracker/run_metrics/run_date=YYYY-MM-DD/<load_id>.parquet
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections.abc import Callable, Iterable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+
+import pyarrow as pa
+
+from flight_price_tracker.parquet_writer import write_table
+
+TABLE_NAME = "run_metrics"
+
+RUN_METRICS_SCHEMA = pa.schema(
+    [
+        pa.field("run_date", pa.string(), nullable=False),
+        pa.field("observed_at_utc", pa.timestamp("us", tz="UTC"), nullable=False),
+        pa.field("stage", pa.string(), nullable=False),
+        pa.field("route", pa.string()),
+        pa.field("outbound_date", pa.string()),
+        pa.field("seconds", pa.float64(), nullable=False),
+        pa.field("bytes", pa.int64()),
+        pa.field("rows", pa.int64()),
+    ]
+)
+
+
+@dataclass(frozen=True)
+class StageSample:
+    """One timed execution of a stage.
+
+    Attributes:
+        stage: Stage name (e.g. `serpapi`, `normalize`, `load`).
+        seconds: Wall time.
+        route: Route the sample is about, if any.
+        outbound_date: Outbound date the sample is about, if any.
+        bytes: Bytes read or written, if relevant.
+        rows: Rows or items produced, if relevant.
+    """
+
+    stage: str
+    seconds: float
+    route: str | None = None
+    outbound_date: str | None = None
+    bytes: int | None = None
+    rows: int | None = None
+
+
+@dataclass(frozen=True)
+class StageSummary:
+    """Totals of one stage over a run.
+
+    Attributes:
+        stage: Stage name.
+        count: Number of samples.
+        seconds: Total wall time (summed over concurrent samples).
+        max_seconds: Slowest sample.
+        bytes: Total bytes, or None if the stage records none.
+        rows: Total rows, or None if the stage records none.
+    """
+
+    stage: str
+    count: int
+    seconds: float
+    max_seconds: float
+    bytes: int | None
+    rows: int | None
+
+
+class StageTimer:
+    """Mutable handle yielded by :meth:`RunMetrics.stage` to attach sizes to a sample.
+
+    Attributes:
+        bytes: Bytes read or written.
+        rows: Rows or items produced.
+    """
+
+    __slots__ = ("bytes", "rows")
+
+    def __init__(self) -> None:
+        """Start without sizes."""
+        self.bytes: int | None = None
+        self.rows: int | None = None
+
+
+class RunMetrics:
+    """Thread-safe collector of stage samples for one run."""
+
+    def __init__(self, *, clock: Callable[[], float] = time.perf_counter) -> None:
+        """Create an empty collector.
+
+        Args:
+            clock: Monotonic clock function (injectable for tests).
+        """
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._samples: list[StageSample] = []
+
+    @contextmanager
+    def stage(
+        self, name: str, *, route: str | None = None, outbound_date: str | None = None
+    ) -> Iterator[StageTimer]:
+        """Time a block as one sample of a stage.
+
+        The sample is recorded even if the block raises.
+
+        Args:
+            name: Stage name.
+            route: Route the block works on, if any.
+            outbound_date: Outbound date the block works on, if any.
+
+        Yields:
+            A handle whose `bytes` and `rows` are stored with the sample.
+        """
+        timer = StageTimer()
+        start = self._clock()
+        try:
+            yield timer
+        finally:
+            self.record(
+                name,
+                seconds=self._clock() - start,
+                route=route,
+                outbound_date=outbound_date,
+                bytes=timer.bytes,
+                rows=timer.rows,
+            )
+
+    def record(
+        self,
+        name: str,
+        *,
+        seconds: float,
+        route: str | None = None,
+        outbound_date: str | None = None,
+        bytes: int | None = None,
+        rows: int | None = None,
+    ) -> None:
+        """Record a sample timed elsewhere (e.g. a SerpApi call in a fetch worker).
+
+        Args:
+            name: Stage name.
+            seconds: Wall time.
+            route: Route the sample is about, if any.
+            outbound_date: Outbound date the sample is about, if any.
+            bytes: Bytes read or written, if relevant.
+            rows: Rows or items produced, if relevant.
+        """
+        sample = StageSample(
+            stage=name,
+            seconds=seconds,
+            route=route,
+            outbound_date=outbound_date,
+            bytes=bytes,
+            rows=rows,
+        )
+        with self._lock:
+            self._samples.append(sample)
+
+    @property
+    def samples(self) -> list[StageSample]:
+        """Samples recorded so far, in recording order."""
+        with self._lock:
+            return list(self._samples)
+
+    def summary(self) -> list[StageSummary]:
+        """Return per-stage totals, in order of each stage's first sample."""
+        totals: dict[str, list[StageSample]] = {}
+        for s in self.samples:
+            totals.setdefault(s.stage, []).append(s)
+        return [
+            StageSummary(
+                stage=stage,
+                count=len(samples),
+                seconds=sum(s.seconds for s in samples),
+                max_seconds=max(s.seconds for s in samples),
+                bytes=_sum_known(s.bytes for s in samples),
+                rows=_sum_known(s.rows for s in samples),
+            )
+            for stage, samples in totals.items()
+        ]
+
+    def to_table(self, *, run_date: str, observed_at_utc: datetime) -> pa.Table:
+        """Convert the samples to a `run_metrics` table.
+
+        Args:
+            run_date: Run date (YYYY-MM-DD).
+            observed_at_utc: Time the run started.
+
+        Returns:
+            The Arrow table with `RUN_METRICS_SCHEMA`.
+        """
+        samples = self.samples
+        n = len(samples)
+        columns = {
+            "run_date": [run_date] * n,
+            "observed_at_utc": [observed_at_utc] * n,
+            "stage": [s.stage for s in samples],
+            "route": [s.route for s in samples],
+            "outbound_date": [s.outbound_date for s in samples],
+            "seconds": [s.seconds for s in samples],
+            "bytes": [s.bytes for s in samples],
+            "rows": [s.rows for s in samples],
+        }
+        return pa.Table.from_pydict(columns, schema=RUN_METRICS_SCHEMA)
+
+
+def write_run_metrics(
+    metrics: RunMetrics, *, dataset_root: Path, run_date: str, observed_at_utc: datetime
+) -> list[Path]:
+    """Append the samples of a run to the `run_metrics` table.
+
+    Args:
+        metrics: Collected samples.
+        dataset_root: Dataset folder (e.g. `data/flight_price_tracker`).
+        run_date: Run date (YYYY-MM-DD).
+        observed_at_utc: Time the run started.
+
+    Returns:
+        Paths of the files written.
+    """
+    return write_table(
+        dataset_root=dataset_root,
+        table_name=TABLE_NAME,
+        table=metrics.to_table(run_date=run_date, observed_at_utc=observed_at_utc),
+        load_id=str(time.time()),
+    )
+
+
+def _sum_known(values: Iterable[int | None]) -> int | None:
+    """Sum the non-None values, or return None if there are none."""
+    known = [v for v in values if v is not None]
+    return sum(known) if known else None
@@ -2,8 +2,12 @@
 
 from __future__ import annotations
 
+import heapq
 import re
-from typing import Any
+from collections.abc import Iterator
+from typing import Any, NamedTuple
+
+from flight_price_tracker.records import Offer
 
 _NUMBER_RE = re.compile(r"(\d+(?:[\.,]\d+)*)")
 
@@ -13,7 +17,7 @@ def extract_offers(
     *,
     outbound_date: str,
     default_currency: str | None = None,
-) -> list[dict[str, Any]]:
+) -> list[Offer]:
     """Extract a sorted list of flight offers from a SerpApi response.
 
     Args:
@@ -24,8 +28,107 @@ def extract_offers(
     Returns:
         A list of offers sorted by price ascending.
     """
-    offers: list[dict[str, Any]] = []
+    offers = list(
+        iter_offers(response, outbound_date=outbound_date, default_currency=default_currency)
+    )
+    offers.sort(key=lambda o: (o.price, o.stops if o.stops is not None else 9999))
+    return offers
+
+
+def iter_offers(
+    response: dict[str, Any],
+    *,
+    outbound_date: str,
+    default_currency: str | None = None,
+) -> Iterator[Offer]:
+    """Lazily yield flight offers from a SerpApi response, in response order.
+
+    Args:
+        response: Parsed SerpApi JSON response.
+        outbound_date: Outbound date (YYYY-MM-DD) used for this query.
+        default_currency: Currency to assume when the response doesn't specify one.
+
+    Yields:
+        Offers (unsorted).
+    """
+    for candidate in _iter_candidates(response, default_currency=default_currency):
+        yield _build_offer(candidate, outbound_date=outbound_date)
+
+
+def top_offers(
+    response: dict[str, Any],
+    *,
+    outbound_date: str,
+    top_n: int,
+    default_currency: str | None = None,
+) -> tuple[list[Offer], Offer | None]:
+    """Select the top-N offers and the cheapest offer in a single pass.
+
+    Only price and stops are read for every entry; full offers are built just for the entries
+    that end up in the result. The result is identical to
+    `extract_offers(...)[:top_n]` and `cheapest_offer(extract_offers(...))`.
+
+    Args:
+        response: Parsed SerpApi JSON response.
+        outbound_date: Outbound date (YYYY-MM-DD) used for this query.
+        top_n: Number of offers to keep.
+        default_currency: Currency to assume when the response doesn't specify one.
+
+    Returns:
+        Tuple of (offers sorted by price ascending, cheapest offer or None).
+    """
+    # Max-heap of the best candidates under the `extract_offers` sort key; the response index
+    # keeps ties in response order (like the stable sort) and makes heap entries unique, so
+    # candidates themselves are never compared. At least one is kept for the cheapest offer,
+    # which is the first one of the sorted list.
+    keep = max(top_n, 1)
+    heap: list[tuple[float, int, int, _Candidate]] = []
+    for i, c in enumerate(_iter_candidates(response, default_currency=default_currency)):
+        item = (-c.price, -(c.stops if c.stops is not None else 9999), -i, c)
+        if len(heap) < keep:
+            heapq.heappush(heap, item)
+        elif item > heap[0]:
+            heapq.heapreplace(heap, item)
+
+    ranked = [_build_offer(c, outbound_date=outbound_date) for *_, c in sorted(heap, reverse=True)]
+    return ranked[:top_n], ranked[0] if ranked else None
+
+
+def cheapest_offer(offers: list[Offer]) -> Offer | None:
+    """Return the cheapest offer (by `price`).
 
+    Args:
+        offers: Offers as returned by :func:`extract_offers`.
+
+    Returns:
+        The cheapest offer, or None if there are no offers.
+    """
+    return min(offers, key=lambda o: o.price, default=None)
+
+
+class _Candidate(NamedTuple):
+    """A priced offer entry whose remaining fields have not been extracted yet."""
+
+    price: float
+    currency: str | None
+    stops: int | None
+    bucket: str
+    entry: dict[str, Any]
+    flights: list[Any]
+
+
+def _iter_candidates(
+    response: dict[str, Any], *, default_currency: str | None
+) -> Iterator[_Candidate]:
+    """Yield priced, de-duplicated offer entries from all buckets and airport containers.
+
+    Args:
+        response: Parsed SerpApi JSON response.
+        default_currency: Currency to assume when the response doesn't specify one.
+
+    Yields:
+        Candidates in response order.
+    """
     seen_booking_tokens: set[str] = set()
 
     containers: list[dict[str, Any]] = [response]
@@ -56,44 +159,33 @@ def extract_offers(
                 if not isinstance(flights, list):
                     flights = []
 
-                airlines = _extract_airlines(flights, entry)
-                depart_time, arrive_time = _extract_times(flights)
-                duration_minutes = _extract_duration_minutes(entry, flights)
-                stops = _extract_stops(entry, flights)
-
-                offers.append(
-                    {
-                        "outbound_date": outbound_date,
-                        "bucket": bucket_name,
-                        "price": price,
-                        "currency": currency,
-                        "airlines": airlines,
-                        "depart_time": depart_time,
-                        "arrive_time": arrive_time,
-                        "duration_minutes": duration_minutes,
-                        "stops": stops,
-                    }
-                )
-
                 if isinstance(booking_token, str):
                     seen_booking_tokens.add(booking_token)
 
-    offers.sort(
-        key=lambda o: (o["price"], o.get("stops") if o.get("stops") is not None else 9999)
-    )
-    return offers
-
-
-def cheapest_offer(offers: list[dict[str, Any]]) -> dict[str, Any] | None:
-    """Return the cheapest offer (by `price`).
+                yield _Candidate(
+                    price=price,
+                    currency=currency,
+                    stops=_extract_stops(entry, flights),
+                    bucket=bucket_name,
+                    entry=entry,
+                    flights=flights,
+                )
 
-    Args:
-        offers: Offers as returned by :func:`extract_offers`.
 
-    Returns:
-        The cheapest offer, or None if there are no offers.
-    """
-    return min(offers, key=lambda o: o["price"], default=None)
+def _build_offer(candidate: _Candidate, *, outbound_date: str) -> Offer:
+    """Build the full offer for a candidate."""
+    depart_time, arrive_time = _extract_times(candidate.flights)
+    return Offer(
+        outbound_date=outbound_date,
+        bucket=candidate.bucket,
+        price=candidate.price,
+        currency=candidate.currency,
+        airlines=_extract_airlines(candidate.flights, candidate.entry),
+        depart_time=depart_time,
+        arrive_time=arrive_time,
+        duration_minutes=_extract_duration_minutes(candidate.entry, candidate.flights),
+        stops=candidate.stops,
+    )
 
 
 def _extract_price(
@@ -0,0 +1,339 @@
+"""Direct PyArrow Parquet writer for the output tables.
+
+An alternative to the dlt pipeline (`storage.writer: pyarrow`) that writes the same
+`{table}/run_date=YYYY-MM-DD/{load_id}.{file_id}.parquet` layout with fixed schemas, without
+dlt's import, normalize stage or state files.
+
+Writers and compaction serialize on an exclusive lock on the dataset (:func:`dataset_lock`),
+so compaction never swaps a partition while a file is being added to it. The files of both
+tables of one run are written under one hold of the lock.
+"""
+
+from __future__ import annotations
+
+import os
+import secrets
+import time
+from collections.abc import Callable, Iterator, Sequence
+from contextlib import AbstractContextManager, contextmanager
+from operator import attrgetter
+from pathlib import Path
+from typing import Any
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from flight_price_tracker.records import SearchRun
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None  # type: ignore[assignment]
+
+# Bookkeeping columns dlt adds to every row; kept so files from both writers share a schema.
+_DLT_COLUMNS = [
+    pa.field("_dlt_load_id", pa.string(), nullable=False),
+    pa.field("_dlt_id", pa.string(), nullable=False),
+]
+
+# Column order and types mirror what dlt produces from `dlt_source.build_resources`: hinted
+# columns first, then the remaining row keys in insertion order.
+SEARCH_RUNS_SCHEMA = pa.schema(
+    [
+        pa.field("cheapest_price", pa.float64()),
+        pa.field("error", pa.string()),
+        pa.field("serpapi_params", pa.string()),
+        pa.field("evidence_json_path", pa.string()),
+        pa.field("evidence_sha256", pa.string()),
+        pa.field("return_date", pa.string()),
+        pa.field("run_date", pa.string()),
+        pa.field("observed_at_utc", pa.timestamp("us", tz="UTC")),
+        pa.field("route", pa.string()),
+        pa.field("origin", pa.string()),
+        pa.field("destination", pa.string()),
+        pa.field("outbound_date", pa.string()),
+        pa.field("currency", pa.string()),
+        pa.field("serpapi_search_metadata_id", pa.string()),
+        *_DLT_COLUMNS,
+    ]
+)
+
+OFFERS_SCHEMA = pa.schema(
+    [
+        pa.field("price", pa.float64()),
+        pa.field("airlines", pa.string()),
+        pa.field("depart_time", pa.string()),
+        pa.field("arrive_time", pa.string()),
+        pa.field("return_date", pa.string()),
+        pa.field("run_date", pa.string()),
+        pa.field("observed_at_utc", pa.timestamp("us", tz="UTC")),
+        pa.field("route", pa.string()),
+        pa.field("outbound_date", pa.string()),
+        pa.field("rank", pa.int64()),
+        pa.field("currency", pa.string()),
+        pa.field("bucket", pa.string()),
+        pa.field("duration_minutes", pa.int64()),
+        pa.field("stops", pa.int64()),
+        *_DLT_COLUMNS,
+    ]
+)
+
+TABLE_SCHEMAS: dict[str, pa.Schema] = {
+    "search_runs": SEARCH_RUNS_SCHEMA,
+    "offers": OFFERS_SCHEMA,
+}
+
+
+def open_dataset(dataset_root: Path, table_name: str) -> ds.Dataset:
+    """Open one output table for scanning, with its fixed schema and `run_date` partitions.
+
+    Scanning with the fixed schema rather than one inferred from the first file makes columns
+    added later (e.g. `return_date`) visible in every file, as nulls in files that predate
+    them.
+
+    Args:
+        dataset_root: Dataset folder (e.g. `data/flight_price_tracker`).
+        table_name: `search_runs` or `offers`.
+
+    Returns:
+        The dataset.
+    """
+    return ds.dataset(
+        str(dataset_root / table_name),
+        format="parquet",
+        schema=TABLE_SCHEMAS[table_name],
+        partitioning=ds.partitioning(pa.schema([("run_date", pa.string())]), flavor="hive"),
+    )
+
+
+def write_search_runs(*, dataset_root: Path, search_runs: Sequence[SearchRun]) -> list[Path]:
+    """Write search run records (and their offers) as Parquet files.
+
+    Columns are built directly from the records, without intermediate row dicts.
+
+    Args:
+        dataset_root: Dataset folder (e.g. `data/flight_price_tracker`).
+        search_runs: Search runs of one run.
+
+    Returns:
+        Paths of the files written.
+    """
+    load_id = str(time.time())
+    written: list[Path] = []
+    with dataset_lock(dataset_root):
+        for table_name, table in (
+            ("search_runs", search_runs_to_table(search_runs, load_id=load_id)),
+            ("offers", offers_to_table(search_runs, load_id=load_id)),
+        ):
+            written.extend(
+                _write_partitions(
+                    dataset_root=dataset_root, table_name=table_name, table=table, load_id=load_id
+                )
+            )
+    return written
+
+
+def write_tables(
+    *,
+    dataset_root: Path,
+    search_runs_rows: list[dict[str, Any]],
+    offers_rows: list[dict[str, Any]],
+) -> list[Path]:
+    """Write the output tables from row dicts, one file per table and run date.
+
+    Args:
+        dataset_root: Dataset folder (e.g. `data/flight_price_tracker`).
+        search_runs_rows: Rows for the `search_runs` table.
+        offers_rows: Rows for the `offers` table.
+
+    Returns:
+        Paths of the files written.
+    """
+    load_id = str(time.time())
+    written: list[Path] = []
+    with dataset_lock(dataset_root):
+        for table_name, rows in (("search_runs", search_runs_rows), ("offers", offers_rows)):
+            written.extend(
+                _write_partitions(
+                    dataset_root=dataset_root,
+                    table_name=table_name,
+                    table=rows_to_table(rows, schema=TABLE_SCHEMAS[table_name], load_id=load_id),
+                    load_id=load_id,
+                )
+            )
+    return written
+
+
+def search_runs_to_table(runs: Sequence[SearchRun], *, load_id: str) -> pa.Table:
+    """Convert search runs to a `search_runs` table, one column at a time.
+
+    Args:
+        runs: Search run records.
+        load_id: Load identifier stored in `_dlt_load_id`.
+
+    Returns:
+        The Arrow table with `SEARCH_RUNS_SCHEMA`.
+    """
+    schema = _data_schema(SEARCH_RUNS_SCHEMA)
+    arrays = [pa.array(list(map(attrgetter(f.name), runs)), type=f.type) for f in schema]
+    return _with_load_columns(pa.Table.from_arrays(arrays, schema=schema), load_id=load_id)
+
+
+def offers_to_table(runs: Sequence[SearchRun], *, load_id: str) -> pa.Table:
+    """Flatten the ranked offers of search runs to an `offers` table, one column at a time.
+
+    Columns that come from the search run are built once per run and repeated per offer with
+    an Arrow `take`, so e.g. `observed_at_utc` is converted once per run, not once per offer.
+
+    Args:
+        runs: Search run records.
+        load_id: Load identifier stored in `_dlt_load_id`.
+
+    Returns:
+        The Arrow table with `OFFERS_SCHEMA`.
+    """
+    schema = _data_schema(OFFERS_SCHEMA)
+    parent = pa.array([i for i, r in enumerate(runs) for _ in r.offers], type=pa.int64())
+    offers = [o for r in runs for o in r.offers]
+    computed = {
+        "rank": pa.array(
+            [rank for r in runs for rank in range(1, len(r.offers) + 1)], type=pa.int64()
+        ),
+        # Offers without a currency inherit the one configured for their route.
+        "currency": pc.coalesce(
+            pa.array(list(map(attrgetter("currency"), offers)), type=pa.string()),
+            pa.array(list(map(attrgetter("currency"), runs)), type=pa.string()).take(parent),
+        ),
+    }
+    for name in ("run_date", "observed_at_utc", "route", "outbound_date", "return_date"):
+        field = schema.field(name)
+        computed[name] = pa.array(list(map(attrgetter(name), runs)), type=field.type).take(parent)
+
+    arrays = [
+        computed[f.name]
+        if f.name in computed
+        else pa.array(list(map(attrgetter(f.name), offers)), type=f.type)
+        for f in schema
+    ]
+    return _with_load_columns(pa.Table.from_arrays(arrays, schema=schema), load_id=load_id)
+
+
+def rows_to_table(rows: Sequence[dict[str, Any]], *, schema: pa.Schema, load_id: str) -> pa.Table:
+    """Convert row dicts to an Arrow table with a fixed schema.
+
+    Args:
+        rows: Row dicts; missing keys become nulls and unknown keys are ignored.
+        schema: Target schema including the `_dlt_*` bookkeeping columns.
+        load_id: Load identifier stored in `_dlt_load_id`.
+
+    Returns:
+        The Arrow table.
+    """
+    table = pa.Table.from_pylist(list(rows), schema=_data_schema(schema))
+    return _with_load_columns(table, load_id=load_id)
+
+
+def write_table(
+    *,
+    dataset_root: Path,
+    table_name: str,
+    table: pa.Table,
+    load_id: str,
+) -> list[Path]:
+    """Write a table into `run_date=` partitions.
+
+    Each file is written under a temporary name and renamed into place, so readers never see
+    a partially written file. The dataset lock is held while the files are written.
+
+    Args:
+        dataset_root: Dataset folder.
+        table_name: Table folder name.
+        table: Arrow table with a `run_date` column.
+        load_id: Load identifier used in the file names.
+
+    Returns:
+        Paths of the files written (none for an empty table).
+    """
+    with dataset_lock(dataset_root):
+        return _write_partitions(
+            dataset_root=dataset_root, table_name=table_name, table=table, load_id=load_id
+        )
+
+
+def write_atomic(path: Path, write: Callable[[Path], object]) -> None:
+    """Write a file under a unique temporary name and rename it into place.
+
+    Readers never see a partially written file, and concurrent writers of the same path never
+    share a temporary file (the last rename wins).
+
+    Args:
+        path: Destination file (its parent folders are created if missing).
+        write: Writes the content to the temporary path it is given.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.{secrets.token_hex(4)}.tmp")
+    try:
+        write(tmp)
+        os.replace(tmp, path)
+    finally:
+        tmp.unlink(missing_ok=True)
+
+
+@contextmanager
+def exclusive_lock(path: Path) -> Iterator[None]:
+    """Hold an exclusive advisory lock on a lock file, across threads and processes.
+
+    The lock is not re-entrant: a second `exclusive_lock` on the same file blocks, even in the
+    same thread. Without `fcntl` (Windows) nothing is locked.
+
+    Args:
+        path: Lock file (created, with its parent folders, if missing).
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("a") as f:
+        if fcntl is not None:
+            fcntl.flock(f, fcntl.LOCK_EX)
+        yield  # closing the file releases the lock
+
+
+def dataset_lock(dataset_root: Path) -> AbstractContextManager[None]:
+    """Return the exclusive lock that writers and compaction of a dataset take.
+
+    The lock file sits next to the dataset folder (`data/.flight_price_tracker.lock`), since
+    dlt refuses to initialize a dataset folder that already exists.
+
+    Args:
+        dataset_root: Dataset folder (e.g. `data/flight_price_tracker`).
+    """
+    return exclusive_lock(dataset_root.with_name(f".{dataset_root.name}.lock"))
+
+
+def _write_partitions(
+    *, dataset_root: Path, table_name: str, table: pa.Table, load_id: str
+) -> list[Path]:
+    """Write a table into `run_date=` partitions (the caller holds the dataset lock)."""
+    written: list[Path] = []
+    for run_date in sorted(set(table.column("run_date").to_pylist())):
+        part = table.filter(pc.equal(table.column("run_date"), run_date))
+        out_dir = dataset_root / table_name / f"run_date={run_date}"
+        out_dir.mkdir(parents=True, exist_ok=True)
+        path = out_dir / f"{load_id}.{secrets.token_hex(5)}.parquet"
+        write_atomic(path, lambda tmp, part=part: pq.write_table(part, tmp))
+        written.append(path)
+    return written
+
+
+def _data_schema(schema: pa.Schema) -> pa.Schema:
+    """Return `schema` without the `_dlt_*` bookkeeping columns."""
+    return pa.schema([f for f in schema if f not in _DLT_COLUMNS])
+
+
+def _with_load_columns(table: pa.Table, *, load_id: str) -> pa.Table:
+    """Append the `_dlt_load_id` / `_dlt_id` bookkeeping columns."""
+    n = table.num_rows
+    load_ids = pa.array([load_id] * n, type=pa.string())
+    row_ids = pa.array([secrets.token_urlsafe(10) for _ in range(n)], type=pa.string())
+    table = table.append_column(_DLT_COLUMNS[0], load_ids)
+    return table.append_column(_DLT_COLUMNS[1], row_ids)
@@ -0,0 +1,70 @@
+"""Decoding and canonical encoding of SerpApi JSON payloads.
+
+Evidence is stored in one canonical form, `json.dumps(data, ensure_ascii=False,
+sort_keys=True)` encoded as UTF-8, and its SHA256 is recorded in `search_runs`. The canonical
+bytes are produced once per response and the same bytes are hashed and written.
+
+Decoding uses `orjson` when it is installed (it comes with dlt). It falls back to the standard
+library for anything orjson rejects (e.g. `NaN`) and for documents with runs of 19+ digits,
+because orjson turns integers beyond 64 bits into floats. Encoding always uses the standard
+library: orjson cannot reproduce the canonical separators or float formatting, and the bytes
+must stay identical so existing digests remain valid.
+"""
+
+from __future__ import annotations
+
+import json
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is a dlt dependency
+    orjson = None  # type: ignore[assignment]
+
+JSON_BACKEND = "stdlib" if orjson is None else "orjson"
+
+# Any integer outside the 64-bit range has at least 19 digits. Mapping every digit to `0` and
+# searching for a run of zeros is much faster than a regular expression over large payloads.
+_DIGITS_TO_ZERO = bytes.maketrans(b"123456789", b"000000000")
+_LONG_DIGIT_RUN = b"0" * 19
+
+# Same output as `json.dumps(data, ensure_ascii=False, sort_keys=True)`, built once. Decoded
+# JSON cannot contain reference cycles, so the circular-reference bookkeeping is skipped.
+_CANONICAL_ENCODER = json.JSONEncoder(ensure_ascii=False, sort_keys=True, check_circular=False)
+
+
+def decode_json(raw: bytes | str) -> Any:
+    """Decode a JSON document.
+
+    Args:
+        raw: JSON text, as UTF-8 bytes or a string (strings use the standard library).
+
+    Returns:
+        The decoded value.
+
+    Raises:
+        ValueError: If `raw` is not valid JSON.
+    """
+    if orjson is not None and isinstance(raw, bytes) and not _has_long_digit_run(raw):
+        try:
+            return orjson.loads(raw)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(raw)
+
+
+def canonical_json(data: Any) -> bytes:
+    """Encode a decoded payload in the canonical evidence form.
+
+    Args:
+        data: Decoded JSON value.
+
+    Returns:
+        UTF-8 bytes of `json.dumps(data, ensure_ascii=False, sort_keys=True)`.
+    """
+    return _CANONICAL_ENCODER.encode(data).encode("utf-8")
+
+
+def _has_long_digit_run(raw: bytes) -> bool:
+    """Return whether `raw` contains 19 or more consecutive ASCII digits."""
+    return raw.translate(_DIGITS_TO_ZERO).find(_LONG_DIGIT_RUN) != -1
@@ -0,0 +1,297 @@
+"""Embedded DuckDB query layer over the Parquet dataset.
+
+:class:`QueryEngine` opens an in-process DuckDB database (in memory, or a file such as
+`.tracker/query.duckdb` so the views can also be used from the `duckdb` shell) and defines
+one view per output table over the Parquet layout:
+
+    search_runs, offers, run_metrics   read_parquet('<table>/run_date=*/*.parquet')
+    price_history_summary              read_parquet('price_history_summary/*.parquet')
+
+Each view is an empty, typed SELECT of the table's schema combined `UNION ALL BY NAME` with
+the files (read with `union_by_name`), so columns added later (e.g. `return_date`) show as
+null in older files, even while no file has them yet. Tables without files yet are empty
+views with the same columns.
+
+Besides ad-hoc SQL, the engine runs the named queries in `NAMED_QUERIES` (latest run,
+previous prices, deltas, per-date trends). Their results are cached per engine and reused
+until a Parquet file of the dataset is added, removed or rewritten.
+
+DuckDB is an optional dependency (`pip install 'flight-price-tracker[query]'`); it is
+imported when an engine is created.
+"""
+
+from __future__ import annotations
+
+import threading
+from collections.abc import Mapping
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+import pyarrow as pa
+
+from flight_price_tracker.metrics import RUN_METRICS_SCHEMA
+from flight_price_tracker.parquet_writer import TABLE_SCHEMAS
+from flight_price_tracker.summary import SUMMARY_SCHEMA
+
+# View name -> (glob relative to the dataset root, schema of an empty table).
+VIEWS: dict[str, tuple[str, pa.Schema]] = {
+    "search_runs": ("search_runs/run_date=*/*.parquet", TABLE_SCHEMAS["search_runs"]),
+    "offers": ("offers/run_date=*/*.parquet", TABLE_SCHEMAS["offers"]),
+    "run_metrics": ("run_metrics/run_date=*/*.parquet", RUN_METRICS_SCHEMA),
+    "price_history_summary": ("price_history_summary/*.parquet", SUMMARY_SCHEMA),
+}
+
+_DUCKDB_TYPES: dict[pa.DataType, str] = {
+    pa.string(): "VARCHAR",
+    pa.float64(): "DOUBLE",
+    pa.int64(): "BIGINT",
+    pa.timestamp("us", tz="UTC"): "TIMESTAMPTZ",
+}
+
+
+class QueryError(RuntimeError):
+    """Raised when DuckDB is missing or a query cannot be run."""
+
+
+@dataclass(frozen=True)
+class NamedQuery:
+    """A parameterised SQL query over the views.
+
+    Attributes:
+        sql: DuckDB SQL using `$name` parameters.
+        params: Parameter names, in the order they are documented.
+        description: One-line summary shown by `query --list`.
+    """
+
+    sql: str
+    params: tuple[str, ...]
+    description: str
+
+
+NAMED_QUERIES: dict[str, NamedQuery] = {
+    "latest_run": NamedQuery(
+        sql="""
+            SELECT observed_at_utc, outbound_date, return_date, currency, cheapest_price, error
+            FROM search_runs
+            WHERE route = $route
+            QUALIFY observed_at_utc = max(observed_at_utc) OVER ()
+            ORDER BY outbound_date, return_date
+        """,
+        params=("route",),
+        description="Search runs of the latest run of a route",
+    ),
+    "previous_prices": NamedQuery(
+        sql="""
+            WITH prior AS (
+                SELECT observed_at_utc, outbound_date, cheapest_price
+                FROM search_runs
+                WHERE route = $route
+                  AND return_date IS NULL
+                  AND observed_at_utc < CAST($before AS TIMESTAMPTZ)
+            )
+            SELECT outbound_date, cheapest_price
+            FROM prior
+            WHERE observed_at_utc = (SELECT max(observed_at_utc) FROM prior)
+              AND cheapest_price IS NOT NULL
+            ORDER BY outbound_date
+        """,
+        params=("route", "before"),
+        description="One-way prices of the latest run of a route before a timestamp",
+    ),
+    "deltas": NamedQuery(
+        sql="""
+            WITH runs AS (
+                SELECT observed_at_utc, outbound_date, cheapest_price
+                FROM search_runs
+                WHERE route = $route AND return_date IS NULL
+            ),
+            latest AS (SELECT max(observed_at_utc) AS ts FROM runs),
+            previous AS (
+                SELECT max(observed_at_utc) AS ts FROM runs
+                WHERE observed_at_utc < (SELECT ts FROM latest)
+            )
+            SELECT
+                cur.outbound_date,
+                cur.cheapest_price,
+                prev.cheapest_price AS previous_price,
+                cur.cheapest_price - prev.cheapest_price AS delta
+            FROM runs AS cur
+            LEFT JOIN runs AS prev
+                ON prev.outbound_date = cur.outbound_date
+                AND prev.observed_at_utc = (SELECT ts FROM previous)
+            WHERE cur.observed_at_utc = (SELECT ts FROM latest)
+            ORDER BY cur.outbound_date
+        """,
+        params=("route",),
+        description="Latest one-way run of a route compared with the run before it",
+    ),
+    "trends": NamedQuery(
+        sql="""
+            SELECT
+                outbound_date,
+                count(*) AS observations,
+                min(cheapest_price) AS min_price,
+                max(cheapest_price) AS max_price,
+                avg(cheapest_price) AS avg_price,
+                arg_min(cheapest_price, observed_at_utc) AS first_price,
+                arg_max(cheapest_price, observed_at_utc) AS last_price,
+                max(observed_at_utc) AS last_seen_utc
+            FROM search_runs
+            WHERE route = $route
+              AND return_date IS NULL
+              AND cheapest_price IS NOT NULL
+              AND run_date >= $since
+            GROUP BY outbound_date
+            ORDER BY outbound_date
+        """,
+        params=("route", "since"),
+        description="Per outbound date price statistics of a route since a run date",
+    ),
+}
+
+
+class QueryEngine:
+    """In-process DuckDB database with views over one dataset.
+
+    Queries are serialised on one connection, so an engine can be shared between threads.
+
+    Attributes:
+        dataset_root: Dataset folder (e.g. `data/flight_price_tracker`).
+        database: DuckDB database file, or `:memory:`.
+    """
+
+    def __init__(
+        self,
+        dataset_root: Path,
+        *,
+        database: Path | str = ":memory:",
+        threads: int | None = None,
+    ) -> None:
+        """Connect to DuckDB and (re)create the views.
+
+        Args:
+            dataset_root: Dataset folder (e.g. `data/flight_price_tracker`).
+            database: DuckDB database file (created if missing), or `:memory:`.
+            threads: DuckDB worker threads (None: DuckDB's default, one per CPU).
+
+        Raises:
+            QueryError: If DuckDB is not installed.
+        """
+        try:
+            import duckdb
+        except ImportError as e:
+            raise QueryError(
+                "The query layer needs DuckDB: pip install 'flight-price-tracker[query]'"
+            ) from e
+
+        self.dataset_root = dataset_root
+        self.database = database
+        if isinstance(database, Path):
+            database.parent.mkdir(parents=True, exist_ok=True)
+        self._duckdb = duckdb
+        self._con = duckdb.connect(str(database))
+        self._lock = threading.Lock()
+        self._cache: dict[tuple[Any, ...], tuple[tuple[Any, ...], pa.Table]] = {}
+        self._con.execute("SET TimeZone = 'UTC'")
+        if threads is not None:
+            self._con.execute(f"SET threads = {int(threads)}")
+        self.refresh_views()
+
+    def refresh_views(self) -> None:
+        """Point the views at the current files (tables without files become empty views)."""
+        self._view_fingerprint = self._fingerprint()
+        with self._lock:
+            for name, (pattern, schema) in VIEWS.items():
+                self._con.execute(
+                    f"CREATE OR REPLACE VIEW {name} AS {self._view_sql(pattern, schema)}"
+                )
+
+    def sql(self, query: str, params: Mapping[str, Any] | None = None) -> pa.Table:
+        """Run SQL against the views.
+
+        Args:
+            query: DuckDB SQL, optionally with `$name` parameters.
+            params: Parameter values.
+
+        Returns:
+            The result as an Arrow table.
+
+        Raises:
+            QueryError: If DuckDB rejects the query.
+        """
+        with self._lock:
+            try:
+                return self._con.execute(query, dict(params or {})).to_arrow_table()
+            except self._duckdb.Error as e:
+                raise QueryError(str(e)) from e
+
+    def run(self, name: str, **params: Any) -> pa.Table:
+        """Run a named query, reusing the cached result while the dataset is unchanged.
+
+        Args:
+            name: Key of `NAMED_QUERIES`.
+            **params: Values of the query's parameters.
+
+        Returns:
+            The result as an Arrow table.
+
+        Raises:
+            QueryError: If the query is unknown, a parameter is missing or unexpected, or
+                DuckDB rejects the query.
+        """
+        query = NAMED_QUERIES.get(name)
+        if query is None:
+            raise QueryError(f"Unknown query {name!r} (known: {', '.join(NAMED_QUERIES)})")
+        if set(params) != set(query.params):
+            raise QueryError(f"Query {name!r} takes parameters: {', '.join(query.params)}")
+
+        key = (name, *sorted((k, str(v)) for k, v in params.items()))
+        fingerprint = self._fingerprint()
+        cached = self._cache.get(key)
+        if cached is not None and cached[0] == fingerprint:
+            return cached[1]
+        if fingerprint != self._view_fingerprint:
+            # A table may have gained its first file since the views were created.
+            self.refresh_views()
+        result = self.sql(query.sql, params)
+        self._cache[key] = (fingerprint, result)
+        return result
+
+    def close(self) -> None:
+        """Close the DuckDB connection."""
+        self._con.close()
+
+    def __enter__(self) -> QueryEngine:
+        """Return the engine."""
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        """Close the engine."""
+        self.close()
+
+    def _fingerprint(self) -> tuple[Any, ...]:
+        """Return (path, size, mtime) of every Parquet file behind the views."""
+        entries: list[tuple[str, int, int]] = []
+        for pattern, _ in VIEWS.values():
+            for path in sorted(self.dataset_root.glob(pattern)):
+                st = path.stat()
+                entries.append((str(path), st.st_size, st.st_mtime_ns))
+        return tuple(entries)
+
+    def _view_sql(self, pattern: str, schema: pa.Schema) -> str:
+        """Return the SELECT behind one view.
+
+        The view starts from an empty, typed SELECT of the table's schema, so every column
+        exists with its type even if no file (or no file yet) has it.
+        """
+        columns = ", ".join(f"CAST(NULL AS {_DUCKDB_TYPES[f.type]}) AS {f.name}" for f in schema)
+        typed = f"SELECT {columns} WHERE false"
+        if not any(self.dataset_root.glob(pattern)):
+            return typed
+        glob = (self.dataset_root.resolve() / pattern).as_posix().replace("'", "''")
+        options = "union_by_name = true"
+        if "run_date=" in pattern:
+            # Partition pruning on `run_date`, kept as the string the files store.
+            options += ", hive_partitioning = true, hive_types = {'run_date': VARCHAR}"
+        return f"{typed} UNION ALL BY NAME SELECT * FROM read_parquet('{glob}', {options})"
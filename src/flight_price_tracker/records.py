@@ -0,0 +1,141 @@
+"""Typed records for normalized offers and search runs.
+
+Records are frozen, slotted dataclasses: they are created once by normalization and the run
+loop, then converted in bulk to Arrow columns (see :mod:`flight_price_tracker.parquet_writer`)
+or to row dicts for dlt.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterator
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any
+
+
+def query_key(route: str, outbound_date: str, return_date: str | None = None) -> tuple[str, ...]:
+    """Return the identity of a query within a run.
+
+    One-way queries are keyed by (route, outbound_date); round trips add the return date.
+
+    Args:
+        route: Route identifier in the form ORIGIN-DESTINATION.
+        outbound_date: Outbound date (YYYY-MM-DD).
+        return_date: Return date (YYYY-MM-DD) of a round trip, or None for one-way.
+
+    Returns:
+        The key tuple.
+    """
+    if return_date is None:
+        return route, outbound_date
+    return route, outbound_date, return_date
+
+
+@dataclass(frozen=True, slots=True)
+class Offer:
+    """One flight offer extracted from a SerpApi response.
+
+    Attributes:
+        outbound_date: Outbound date (YYYY-MM-DD) of the query.
+        bucket: Response bucket the offer came from (`best_flights` / `other_flights`).
+        price: Offer price.
+        currency: Price currency, if known.
+        airlines: Comma-separated airline names.
+        depart_time: Departure time of the first segment.
+        arrive_time: Arrival time of the last segment.
+        duration_minutes: Total duration in minutes.
+        stops: Number of stops.
+    """
+
+    outbound_date: str
+    bucket: str
+    price: float
+    currency: str | None = None
+    airlines: str | None = None
+    depart_time: str | None = None
+    arrive_time: str | None = None
+    duration_minutes: int | None = None
+    stops: int | None = None
+
+
+@dataclass(frozen=True, slots=True)
+class SearchRun:
+    """One SerpApi query of a run, with its ranked offers.
+
+    Attributes:
+        run_date: Run date (YYYY-MM-DD).
+        observed_at_utc: Time the run started.
+        route: Route identifier in the form ORIGIN-DESTINATION.
+        origin: Origin airport code.
+        destination: Destination airport code.
+        outbound_date: Outbound date (YYYY-MM-DD) of the query.
+        currency: Configured currency of the route.
+        serpapi_params: Query params as canonical JSON.
+        return_date: Return date (YYYY-MM-DD) of a round-trip query, or None for one-way.
+        cheapest_price: Cheapest offer price, or None if there were no offers or it failed.
+        evidence_json_path: Path of the raw response evidence.
+        evidence_sha256: SHA256 of the raw response evidence.
+        serpapi_search_metadata_id: SerpApi `search_metadata.id`.
+        error: Error message if the query failed.
+        offers: Top offers, cheapest first; their rank is their position + 1.
+    """
+
+    run_date: str
+    observed_at_utc: datetime
+    route: str
+    origin: str
+    destination: str
+    outbound_date: str
+    currency: str
+    serpapi_params: str
+    return_date: str | None = None
+    cheapest_price: float | None = None
+    evidence_json_path: str | None = None
+    evidence_sha256: str | None = None
+    serpapi_search_metadata_id: str | None = None
+    error: str | None = None
+    offers: tuple[Offer, ...] = ()
+
+    @property
+    def key(self) -> tuple[str, ...]:
+        """Identity of the query within a run (see :func:`query_key`)."""
+        return query_key(self.route, self.outbound_date, self.return_date)
+
+    def to_row(self) -> dict[str, Any]:
+        """Return the `search_runs` row for this query."""
+        return {
+            "run_date": self.run_date,
+            "observed_at_utc": self.observed_at_utc,
+            "route": self.route,
+            "origin": self.origin,
+            "destination": self.destination,
+            "outbound_date": self.outbound_date,
+            "return_date": self.return_date,
+            "currency": self.currency,
+            "cheapest_price": self.cheapest_price,
+            "error": self.error,
+            "evidence_json_path": self.evidence_json_path,
+            "evidence_sha256": self.evidence_sha256,
+            "serpapi_params": self.serpapi_params,
+            "serpapi_search_metadata_id": self.serpapi_search_metadata_id,
+        }
+
+    def offer_rows(self) -> Iterator[dict[str, Any]]:
+        """Yield the `offers` rows for this query, ranked from 1."""
+        for rank, o in enumerate(self.offers, start=1):
+            yield {
+                "run_date": self.run_date,
+                "observed_at_utc": self.observed_at_utc,
+                "route": self.route,
+                "outbound_date": self.outbound_date,
+                "return_date": self.return_date,
+                "rank": rank,
+                "price": o.price,
+                "currency": o.currency or self.currency,
+                "bucket": o.bucket,
+                "airlines": o.airlines,
+                "depart_time": o.depart_time,
+                "arrive_time": o.arrive_time,
+                "duration_minutes": o.duration_minutes,
+                "stops": o.stops,
+            }
@@ -7,8 +7,15 @@ from datetime import datetime
 from pathlib import Path
 from typing import Any
 
+import pyarrow as pa
+import pyarrow.compute as pc
 import pyarrow.dataset as ds
 
+from flight_price_tracker.matrix import PriceMatrix
+from flight_price_tracker.metrics import StageSummary
+from flight_price_tracker.parquet_writer import open_dataset
+from flight_price_tracker.summary import PriceSummary
+
 
 @dataclass(frozen=True)
 class EvidenceRef:
@@ -18,11 +25,13 @@ class EvidenceRef:
         outbound_date: Outbound date (YYYY-MM-DD) this evidence corresponds to.
         json_path: Relative path to the evidence JSON file.
         sha256: SHA256 of the evidence JSON content.
+        return_date: Return date (YYYY-MM-DD) of a round-trip query, or None for one-way.
     """
 
     outbound_date: str
     json_path: str
     sha256: str
+    return_date: str | None = None
 
 
 def build_report_markdown(
@@ -34,6 +43,8 @@ def build_report_markdown(
     evidence: list[EvidenceRef],
     prev_prices: dict[str, float] | None,
     top_k_deals: int,
+    summary: dict[str, PriceSummary] | None = None,
+    timings: list[StageSummary] | None = None,
 ) -> str:
     """Build the Markdown report content.
 
@@ -41,10 +52,15 @@ def build_report_markdown(
         route: Route identifier in the form ORIGIN-DESTINATION.
         observed_at_utc: Timestamp of observation in UTC.
         currency: Currency code used for display.
-        rows: Rows from the `search_runs` table for the current run.
+        rows: Rows from the `search_runs` table for the current run. Rows with a
+            `carried_from` date were not queried in this run and carry forward the price last
+            observed on that date.
         evidence: Evidence references for outbound dates in the run.
         prev_prices: Prior run prices keyed by outbound date (for deltas).
         top_k_deals: Number of cheapest dates to include in the Top deals section.
+        summary: Price history summaries keyed by outbound date; adds range, last change and
+            days-since-last-drop columns.
+        timings: Per-stage totals of the run so far; adds a Run timing section.
 
     Returns:
         Markdown report body.
@@ -56,23 +72,48 @@ def build_report_markdown(
     lines.append("")
     lines.append(f"- Route: `{route}`")
     lines.append(f"- Observed at (UTC): `{observed_at_utc.isoformat()}`")
+    n_carried = sum(1 for r in rows if r.get("carried_from"))
+    if n_carried:
+        lines.append(
+            f"- Dates queried: {len(rows) - n_carried}; carried forward (not due): {n_carried}"
+        )
     lines.append("")
 
     lines.append("## Cheapest by outbound date")
     lines.append("")
-    lines.append("| Outbound date | Cheapest | Δ vs prev | Evidence |")
-    lines.append("|---|---:|---:|---|")
+    if summary is None:
+        lines.append("| Outbound date | Cheapest | Δ vs prev | Evidence |")
+        lines.append("|---|---:|---:|---|")
+    else:
+        lines.append(
+            "| Outbound date | Cheapest | Δ vs prev | Min–max | Last change | Since last drop "
+            "| Evidence |"
+        )
+        lines.append("|---|---:|---:|---:|---:|---:|---|")
 
     for r in rows:
         od = r["outbound_date"]
         price = float(r["cheapest_price"])
-        delta = None
-        if prev_prices and od in prev_prices:
-            delta = price - float(prev_prices[od])
-        delta_s = "" if delta is None else _fmt_delta(delta, currency)
-        ev = ev_by_date.get(od)
-        ev_s = "" if ev is None else f"`{ev.json_path}` (`{ev.sha256}`)"
-        lines.append(f"| {od} | {_fmt_money(price, currency)} | {delta_s} | {ev_s} |")
+        carried_from = r.get("carried_from")
+        if carried_from:
+            price_s, delta_s = f"{format_money(price, currency)}*", ""
+            ev_s = f"carried forward from {carried_from}"
+        else:
+            price_s = format_money(price, currency)
+            delta = None
+            if prev_prices and od in prev_prices:
+                delta = price - float(prev_prices[od])
+            delta_s = "" if delta is None else _fmt_delta(delta, currency)
+            ev = ev_by_date.get(od)
+            ev_s = "" if ev is None else f"`{ev.json_path}` (`{ev.sha256}`)"
+        cells = [od, price_s, delta_s]
+        if summary is not None:
+            cells.extend(_summary_cells(summary.get(od), observed_at_utc, currency))
+        cells.append(ev_s)
+        lines.append("|" + "|".join(f" {c} " if c else " " for c in cells) + "|")
+    if n_carried:
+        lines.append("")
+        lines.append("\\* Not re-queried in this run; last known price carried forward.")
 
     lines.append("")
     lines.append("## Top deals")
@@ -81,7 +122,8 @@ def build_report_markdown(
     for r in top:
         od = r["outbound_date"]
         cp = float(r["cheapest_price"])
-        lines.append(f"- `{od}`: {_fmt_money(cp, currency)}")
+        carried_s = f" (carried from {r['carried_from']})" if r.get("carried_from") else ""
+        lines.append(f"- `{od}`: {format_money(cp, currency)}{carried_s}")
 
     lines.append("")
     lines.append("## Evidence")
@@ -89,10 +131,92 @@ def build_report_markdown(
     for ev in evidence:
         lines.append(f"- `{ev.outbound_date}`: `{ev.json_path}` (sha256 `{ev.sha256}`)")
 
+    if timings:
+        lines.extend(_timing_lines(timings))
+
     lines.append("")
     return "\n".join(lines)
 
 
+def build_round_trip_report_markdown(
+    *,
+    route: str,
+    observed_at_utc: datetime,
+    currency: str,
+    matrix: PriceMatrix,
+    evidence: list[EvidenceRef],
+    top_k_deals: int,
+    timings: list[StageSummary] | None = None,
+) -> str:
+    """Build the Markdown report of a round-trip route.
+
+    Args:
+        route: Route identifier in the form ORIGIN-DESTINATION.
+        observed_at_utc: Timestamp of observation in UTC.
+        currency: Currency code used for display.
+        matrix: Cheapest prices of the run by outbound date and trip length.
+        evidence: Evidence references of the round trips in the run.
+        top_k_deals: Number of cheapest round trips to include in the Top deals section.
+        timings: Per-stage totals of the run so far; adds a Run timing section.
+
+    Returns:
+        Markdown report body.
+    """
+    lines: list[str] = []
+    lines.append("# Flight price tracker report")
+    lines.append("")
+    lines.append(f"- Route: `{route}` (round trip)")
+    lines.append(f"- Observed at (UTC): `{observed_at_utc.isoformat()}`")
+    lines.append(f"- Outbound dates: {matrix.shape[0]}")
+    lines.append(f"- Trip lengths (nights): {', '.join(map(str, matrix.trip_lengths.to_pylist()))}")
+    lines.append("")
+
+    lines.append(f"## Cheapest round trip by outbound date and nights ({currency})")
+    lines.append("")
+    lines.extend(matrix.to_markdown())
+
+    lines.append("")
+    lines.append("## Top deals")
+    lines.append("")
+    for cell in matrix.cheapest(top_k_deals):
+        lines.append(
+            f"- `{cell.outbound_date}` → `{cell.return_date}` ({cell.trip_length_days} nights): "
+            f"{format_money(cell.price, currency)}"
+        )
+
+    lines.append("")
+    lines.append("## Evidence")
+    lines.append("")
+    for ev in evidence:
+        lines.append(
+            f"- `{ev.outbound_date}` → `{ev.return_date}`: `{ev.json_path}` (sha256 `{ev.sha256}`)"
+        )
+
+    if timings:
+        lines.extend(_timing_lines(timings))
+
+    lines.append("")
+    return "\n".join(lines)
+
+
+def _timing_lines(timings: list[StageSummary]) -> list[str]:
+    """Format the Run timing section."""
+    lines = ["", "## Run timing", ""]
+    lines.append("| Stage | Calls | Total s | Max s | Bytes | Rows |")
+    lines.append("|---|---:|---:|---:|---:|---:|")
+    for t in timings:
+        cells = [
+            t.stage,
+            str(t.count),
+            f"{t.seconds:.3f}",
+            f"{t.max_seconds:.3f}",
+            "" if t.bytes is None else f"{t.bytes:,}",
+            "" if t.rows is None else f"{t.rows:,}",
+        ]
+        lines.append("|" + "|".join(f" {c} " if c else " " for c in cells) + "|")
+    return lines
+
+
 def load_previous_prices(
     *,
     data_root: Path,
@@ -102,6 +226,10 @@ def load_previous_prices(
 ) -> dict[str, float] | None:
     """Load the most recent prior run's prices for delta calculations.
 
+    Route and timestamp filters are pushed down into the Parquet scan, `run_date` partitions
+    are pruned so typically only the newest partition is read, and the latest observation is
+    selected with Arrow compute kernels; only the rows of that run become Python objects.
+
     Args:
         data_root: Root folder where the tracker writes Parquet output.
         dataset_name: dlt dataset name.
@@ -115,45 +243,82 @@ def load_previous_prices(
     if not search_runs_dir.exists():
         return None
 
-    dataset = ds.dataset(str(search_runs_dir), format="parquet")
-    if "cheapest_price" not in dataset.schema.names:
-        return None
-    table = dataset.to_table(
-        columns=["observed_at_utc", "route", "outbound_date", "cheapest_price"]
-    )  # type: ignore[arg-type]
-
-    if table.num_rows == 0:
+    dataset = open_dataset(data_root / dataset_name, "search_runs")
+
+    # Rows land in the partition of their load date (the dlt writer derives it from the load
+    # id), which is on or after the UTC date of `observed_at_utc` but can be any later day
+    # (e.g. a resumed run). Probe partitions newest-first in doubling batches until one has
+    # matching rows; a later observation can then only be in older partitions dated on or
+    # after its day, which are read too. Hive pruning on `run_date` means each scan only
+    # opens that batch's files, and the route/timestamp predicates are pushed into the scan.
+    run_dates = sorted(
+        {p.name.partition("=")[2] for p in search_runs_dir.glob("run_date=*")}, reverse=True
+    )
+    predicate = (
+        (ds.field("route") == route)
+        & ds.field("return_date").is_null()
+        & (
+            ds.field("observed_at_utc")
+            < pa.scalar(before_observed_at_utc, type=pa.timestamp("us", tz="UTC"))
+        )
+    )
+
+    def _scan(newest: str, oldest: str) -> pa.Table:
+        return dataset.to_table(
+            columns=["observed_at_utc", "outbound_date", "cheapest_price"],
+            filter=(ds.field("run_date") <= newest) & (ds.field("run_date") >= oldest) & predicate,
+        )
+
+    history = None
+    start, batch = 0, 1
+    while start < len(run_dates):
+        end = min(start + batch, len(run_dates))
+        history = _scan(run_dates[start], run_dates[end - 1])
+        start, batch = end, batch * 2
+        if history.num_rows:
+            floor = pc.max(history.column("observed_at_utc")).as_py().date().isoformat()
+            if start < len(run_dates) and run_dates[start] >= floor:
+                history = pa.concat_tables([history, _scan(run_dates[start], floor)])
+            break
+    if history is None or history.num_rows == 0:
         return None
 
-    py = table.to_pylist()
-    filtered: list[dict[str, Any]] = []
-    for row in py:
-        if row.get("route") != route:
-            continue
-        obs = row.get("observed_at_utc")
-        obs_dt = _coerce_datetime(obs)
-        if obs_dt is None:
-            continue
-        if obs_dt >= before_observed_at_utc:
-            continue
-        filtered.append({**row, "_obs": obs_dt})
-
-    if not filtered:
-        return None
+    latest_obs = pc.max(history.column("observed_at_utc"))
+    latest = history.filter(
+        pc.and_(
+            pc.equal(history.column("observed_at_utc"), latest_obs),
+            pc.and_(
+                pc.is_valid(history.column("outbound_date")),
+                pc.is_valid(history.column("cheapest_price")),
+            ),
+        )
+    )
+
+    out = dict(
+        zip(
+            latest.column("outbound_date").to_pylist(),
+            pc.cast(latest.column("cheapest_price"), pa.float64()).to_pylist(),
+            strict=True,
+        )
+    )
+    return out or None
 
-    latest_obs = max(r["_obs"] for r in filtered)
-    latest_rows = [r for r in filtered if r["_obs"] == latest_obs]
 
-    out: dict[str, float] = {}
-    for r in latest_rows:
-        od = r.get("outbound_date")
-        cp = r.get("cheapest_price")
-        if isinstance(od, str) and isinstance(cp, (int, float)):
-            out[od] = float(cp)
-    return out or None
+def _summary_cells(s: PriceSummary | None, observed_at_utc: datetime, currency: str) -> list[str]:
+    """Format the price-history columns of one outbound date."""
+    if s is None:
+        return ["", "", ""]
+    range_s = f"{format_money(s.min_price, currency)}–{format_money(s.max_price, currency)}"
+    change_s = ""
+    if s.last_change is not None and s.last_change_utc is not None:
+        change_s = f"{_fmt_delta(s.last_change, currency)} ({s.last_change_utc.date().isoformat()})"
+    drop_s = ""
+    if s.last_drop_utc is not None:
+        drop_s = f"{(observed_at_utc.date() - s.last_drop_utc.date()).days}d"
+    return [range_s, change_s, drop_s]
 
 
-def _fmt_money(amount: float, currency: str) -> str:
+def format_money(amount: float, currency: str) -> str:
     """Format a currency amount for display."""
     return f"{currency} {amount:.2f}".rstrip("0").rstrip(".")
 
@@ -161,23 +326,4 @@ def _fmt_money(amount: float, currency: str) -> str:
 def _fmt_delta(delta: float, currency: str) -> str:
     """Format a delta amount with a sign."""
     sign = "+" if delta > 0 else ""
-    return f"{sign}{_fmt_money(delta, currency)}"
-
-
-def _coerce_datetime(value: Any) -> datetime | None:
-    """Coerce a value to a datetime if possible.
-
-    Args:
-        value: Value from a Parquet table cell.
-
-    Returns:
-        Parsed datetime, or None if the value cannot be converted.
-    """
-    if isinstance(value, datetime):
-        return value
-    if isinstance(value, str):
-        try:
-            return datetime.fromisoformat(value.replace("Z", "+00:00"))
-        except ValueError:
-            return None
-    return None
+    return f"{sign}{format_money(delta, currency)}"
@@ -0,0 +1,351 @@
+"""Rebuild the normalized tables from stored evidence.
+
+When offer extraction improves, `reprocess` re-runs it over the raw evidence of every
+`search_runs` row and rewrites the `search_runs` and `offers` partitions in place:
+
+- the evidence of each row is read (from JSON files or the archive) and its SHA256 checked
+  against `search_runs.evidence_sha256` and the `.sha256` sidecar, if there is one;
+- offers are re-extracted in a process pool, one `run_date=` partition at a time, so memory
+  is bounded by the largest partition rather than the whole history;
+- both tables of a partition are written to staging directories and swapped in together
+  (see :func:`flight_price_tracker.compact.replace_partition`).
+
+Each table's swap is atomic, but the two are separate renames. They run back to back under
+the dataset lock, once both tables are staged and a marker listing the swaps
+(`.reprocess.run_date=<date>.json` in the dataset folder) has been written; a rerun finishes
+the swaps of a marker left behind by a crash before reprocessing anything. A reader that does
+not take the lock may still see new `search_runs` next to old `offers` for the instant
+between the two renames.
+
+Rows whose evidence is missing or does not match its digest keep their stored values.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import secrets
+import shutil
+import time
+from collections.abc import Callable, Iterable, Mapping
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, fields, replace
+from hashlib import sha256
+from pathlib import Path
+from typing import Any, NamedTuple
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from flight_price_tracker.compact import finish_replace, parquet_files, replace_partition
+from flight_price_tracker.evidence_store import read_evidence
+from flight_price_tracker.normalize import top_offers
+from flight_price_tracker.parquet_writer import (
+    dataset_lock,
+    offers_to_table,
+    search_runs_to_table,
+    write_atomic,
+)
+from flight_price_tracker.payload import decode_json
+from flight_price_tracker.records import Offer, SearchRun, query_key
+from flight_price_tracker.serving import SERVING_DIR, rebuild_serving_tables
+from flight_price_tracker.summary import summary_path, update_summary
+
+_SEARCH_RUN_FIELDS = tuple(f.name for f in fields(SearchRun) if f.name != "offers")
+_OFFER_FIELDS = tuple(f.name for f in fields(Offer))
+_TABLES = ("search_runs", "offers")
+
+
+@dataclass(frozen=True)
+class ReprocessStats:
+    """Outcome of a reprocess.
+
+    Attributes:
+        partitions: Number of `run_date=` partitions rewritten.
+        files: Evidence files re-extracted.
+        skipped: Rows whose evidence was missing or did not match its digest.
+        seconds: Wall-clock duration.
+    """
+
+    partitions: int
+    files: int
+    skipped: int
+    seconds: float
+
+    @property
+    def files_per_second(self) -> float:
+        """Evidence files re-extracted per second."""
+        return self.files / self.seconds if self.seconds > 0 else 0.0
+
+
+class _Task(NamedTuple):
+    """One evidence file to re-extract (sent to a worker process)."""
+
+    evidence_json_path: str
+    evidence_sha256: str
+    outbound_date: str
+    top_n: int
+    currency: str
+
+
+class _Outcome(NamedTuple):
+    """Re-extraction result of one evidence file (None if it failed verification)."""
+
+    cheapest_price: float | None
+    offers: tuple[Offer, ...]
+    serpapi_search_metadata_id: str | None
+
+
+def reprocess_dataset(
+    *,
+    dataset_root: Path,
+    top_n: Mapping[str, int],
+    default_top_n: int,
+    workers: int | None = None,
+    on_partition: Callable[[str, int], None] | None = None,
+) -> ReprocessStats:
+    """Re-extract offers from evidence and rewrite every partition of the dataset.
+
+    Args:
+        dataset_root: Dataset folder (e.g. `data/flight_price_tracker`).
+        top_n: Offers to keep per outbound date, by route.
+        default_top_n: Offers to keep for routes missing from `top_n`.
+        workers: Worker processes (None: one per CPU; 1: extract in this process).
+        on_partition: Called with the run date and file count after each partition.
+
+    Returns:
+        Reprocessing statistics.
+    """
+    started = time.perf_counter()
+    partitions = files = skipped = 0
+    workers = workers or os.cpu_count() or 1
+    for marker in sorted(dataset_root.glob(".reprocess.run_date=*.json")):
+        _swap(dataset_root, marker)
+
+    pool = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+    try:
+        for partition in sorted((dataset_root / "search_runs").glob("run_date=*")):
+            if not partition.is_dir() or not parquet_files(partition):
+                continue
+            # List both tables at once, so no run's files are in one listing but not the other.
+            with dataset_lock(dataset_root):
+                sources = {t: _listing(dataset_root / t / partition.name) for t in _TABLES}
+            runs, n_files, n_skipped = _reprocess_partition(
+                sources=sources,
+                top_n=top_n,
+                default_top_n=default_top_n,
+                pool=pool,
+            )
+            _rewrite(
+                dataset_root=dataset_root,
+                run_date_dir=partition.name,
+                runs=runs,
+                replaced={t: {p.name for p in files} for t, files in sources.items()},
+            )
+            partitions += 1
+            files += n_files
+            skipped += n_skipped
+            if on_partition is not None:
+                on_partition(partition.name.removeprefix("run_date="), n_files)
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    # Cheapest prices may have changed: rebuild the price history summary from scratch.
+    path = summary_path(dataset_root)
+    if path.exists():
+        path.unlink()
+        update_summary(dataset_root=dataset_root, search_runs=[])
+    # The same goes for the UI's serving tables.
+    if (dataset_root / SERVING_DIR).exists():
+        rebuild_serving_tables(dataset_root=dataset_root)
+
+    return ReprocessStats(
+        partitions=partitions,
+        files=files,
+        skipped=skipped,
+        seconds=time.perf_counter() - started,
+    )
+
+
+def _reprocess_partition(
+    *,
+    sources: Mapping[str, list[Path]],
+    top_n: Mapping[str, int],
+    default_top_n: int,
+    pool: ProcessPoolExecutor | None,
+) -> tuple[list[SearchRun], int, int]:
+    """Rebuild the search runs of one partition from their evidence.
+
+    Args:
+        sources: Parquet files of the partition, by table.
+        top_n: Offers to keep per outbound date, by route.
+        default_top_n: Offers to keep for routes missing from `top_n`.
+        pool: Worker processes (None: extract in this process).
+
+    Returns:
+        Tuple of (search runs, files re-extracted, rows skipped).
+    """
+    rows = _read_files(sources["search_runs"]).to_pylist()
+    stored = [SearchRun(**{k: row.get(k) for k in _SEARCH_RUN_FIELDS}) for row in rows]
+
+    indexed = [
+        (
+            i,
+            _Task(
+                evidence_json_path=r.evidence_json_path,
+                evidence_sha256=r.evidence_sha256,
+                outbound_date=r.outbound_date,
+                top_n=top_n.get(r.route, default_top_n),
+                currency=r.currency,
+            ),
+        )
+        for i, r in enumerate(stored)
+        if r.evidence_json_path and r.evidence_sha256
+    ]
+    tasks = [task for _, task in indexed]
+    if pool is None:
+        outcomes: Iterable[_Outcome | None] = map(_reextract, tasks)
+    else:
+        outcomes = pool.map(_reextract, tasks, chunksize=max(1, len(tasks) // 64))
+
+    runs = list(stored)
+    failed: set[int] = set()
+    for (i, _), outcome in zip(indexed, outcomes, strict=True):
+        if outcome is None:
+            failed.add(i)
+            continue
+        runs[i] = replace(
+            stored[i],
+            cheapest_price=outcome.cheapest_price,
+            offers=outcome.offers,
+            serpapi_search_metadata_id=outcome.serpapi_search_metadata_id
+            or stored[i].serpapi_search_metadata_id,
+        )
+
+    # Rows whose evidence failed verification keep their stored offers.
+    if failed:
+        stored_offers = _read_offers(sources["offers"])
+        for i in failed:
+            r = stored[i]
+            runs[i] = replace(r, offers=stored_offers.get((*r.key, r.observed_at_utc), ()))
+    return runs, len(indexed) - len(failed), len(failed)
+
+
+def _reextract(task: _Task) -> _Outcome | None:
+    """Verify one evidence file and extract its offers (runs in a worker process)."""
+    try:
+        raw = read_evidence(task.evidence_json_path)
+    except OSError:
+        return None
+    digest = sha256(raw).hexdigest()
+    if digest != task.evidence_sha256:
+        return None
+    sidecar = Path(task.evidence_json_path).with_suffix(".sha256")
+    if sidecar.exists() and sidecar.read_text(encoding="utf-8").strip() != digest:
+        return None
+
+    resp = decode_json(raw)
+    offers, cheapest = top_offers(
+        resp,
+        outbound_date=task.outbound_date,
+        top_n=task.top_n,
+        default_currency=task.currency,
+    )
+    meta = resp.get("search_metadata")
+    meta_id = meta.get("id") if isinstance(meta, dict) else None
+    return _Outcome(
+        cheapest_price=None if cheapest is None else cheapest.price,
+        offers=tuple(offers),
+        serpapi_search_metadata_id=meta_id if isinstance(meta_id, str) else None,
+    )
+
+
+def _listing(partition: Path) -> list[Path]:
+    """List the visible Parquet files of a partition (none if it does not exist)."""
+    return parquet_files(partition) if partition.is_dir() else []
+
+
+def _read_files(files: list[Path]) -> pa.Table:
+    """Read Parquet files as one table."""
+    return pa.concat_tables([pq.read_table(p) for p in files], promote_options="default")
+
+
+def _read_offers(files: list[Path]) -> dict[tuple[Any, ...], tuple[Offer, ...]]:
+    """Read the stored offers of a partition, keyed by (*query_key, observed_at_utc)."""
+    if not files:
+        return {}
+    table = _read_files(files)
+    grouped: dict[tuple[Any, ...], list[Offer]] = {}
+    for row in table.sort_by("rank").to_pylist():
+        key = (
+            *query_key(row["route"], row["outbound_date"], row.get("return_date")),
+            row["observed_at_utc"],
+        )
+        grouped.setdefault(key, []).append(Offer(**{k: row.get(k) for k in _OFFER_FIELDS}))
+    return {key: tuple(offers) for key, offers in grouped.items()}
+
+
+def _rewrite(
+    *,
+    dataset_root: Path,
+    run_date_dir: str,
+    runs: list[SearchRun],
+    replaced: Mapping[str, set[str]],
+) -> None:
+    """Stage both tables of one partition, record the swaps in a marker, and run them.
+
+    Args:
+        dataset_root: Dataset folder.
+        run_date_dir: Partition folder name (`run_date=...`).
+        runs: Rebuilt search runs (with their offers) of the partition.
+        replaced: Names of the files the rebuilt tables supersede, by table.
+    """
+    load_id = str(time.time())
+    swaps: dict[str, dict[str, list[str]]] = {}
+    for table_name, table in (
+        ("search_runs", search_runs_to_table(runs, load_id=load_id)),
+        ("offers", offers_to_table(runs, load_id=load_id)),
+    ):
+        partition = dataset_root / table_name / run_date_dir
+        if table.num_rows == 0 and not partition.exists():
+            continue  # nothing to write, and no files to replace
+        staging = _staging_path(partition)
+        shutil.rmtree(staging, ignore_errors=True)
+        staging.mkdir(parents=True)
+        new = []
+        if table.num_rows:
+            new.append(f"{load_id}.{secrets.token_hex(5)}.parquet")
+            pq.write_table(table, staging / new[0])
+        swaps[table_name] = {"replaced": sorted(replaced.get(table_name, ())), "new": new}
+
+    marker = dataset_root / f".reprocess.{run_date_dir}.json"
+    text = json.dumps({"run_date_dir": run_date_dir, "tables": swaps}, sort_keys=True)
+    write_atomic(marker, lambda tmp: tmp.write_text(text, encoding="utf-8"))
+    _swap(dataset_root, marker)
+
+
+def _swap(dataset_root: Path, marker: Path) -> None:
+    """Swap in the staged tables listed in a marker, then remove it.
+
+    Swaps that already happened are skipped or completed, so a marker left behind by a crash
+    can be finished by running this again.
+    """
+    swaps = json.loads(marker.read_text(encoding="utf-8"))
+    with dataset_lock(dataset_root):
+        for table_name, swap in swaps["tables"].items():
+            partition = dataset_root / table_name / swaps["run_date_dir"]
+            staging = _staging_path(partition)
+            replaced = set(swap["replaced"])
+            if not staging.exists():
+                continue  # swapped and cleaned up
+            if {p.name for p in staging.iterdir()} == set(swap["new"]):
+                replace_partition(partition, staging=staging, replaced=replaced)
+            else:  # exchanged before a crash: `staging` holds the old files
+                finish_replace(partition, staging=staging, replaced=replaced)
+        marker.unlink()
+
+
+def _staging_path(partition: Path) -> Path:
+    """Return the hidden staging directory of a partition."""
+    return partition.with_name(f".{partition.name}.reprocess")
@@ -2,169 +2,572 @@
 
 from __future__ import annotations
 
+import contextlib
 import json
+import sys
+import threading
 import time
+from collections.abc import Collection, Mapping
 from datetime import date, datetime, timedelta, timezone
 from hashlib import sha256
 from pathlib import Path
 from typing import Any
 
+from flight_price_tracker import DATASET_NAME
+from flight_price_tracker.alerts import (
+    build_sinks,
+    evaluate_alerts,
+    load_alert_history,
+    send_alerts,
+)
+from flight_price_tracker.cache import CachedResponse, ResponseCache
 from flight_price_tracker.dlt_source import build_resources
-from flight_price_tracker.normalize import cheapest_offer, extract_offers
-from flight_price_tracker.report import EvidenceRef, build_report_markdown, load_previous_prices
-from flight_price_tracker.serpapi import SerpApiError, search_google_flights
-from flight_price_tracker.settings import AppConfig, EnvSettings, load_app_config
-
-DATASET_NAME = "flight_price_tracker"
-
-
-def run_once(*, config_path: Path) -> None:
+from flight_price_tracker.env import EnvSettings
+from flight_price_tracker.evidence_store import EvidenceArchive, evidence_json_path, read_evidence
+from flight_price_tracker.fetch import (
+    CircuitBreaker,
+    FetchJob,
+    FetchResult,
+    RetryPolicy,
+    TokenBucket,
+    fetch_all,
+)
+from flight_price_tracker.journal import JOURNAL_DIR, JournalEntry, RunJournal
+from flight_price_tracker.matrix import load_price_matrix
+from flight_price_tracker.metrics import RunMetrics, write_run_metrics
+from flight_price_tracker.normalize import top_offers
+from flight_price_tracker.parquet_writer import dataset_lock, write_search_runs
+from flight_price_tracker.payload import decode_json
+from flight_price_tracker.records import SearchRun
+from flight_price_tracker.report import (
+    EvidenceRef,
+    build_report_markdown,
+    build_round_trip_report_markdown,
+    load_previous_prices,
+)
+from flight_price_tracker.schedule import DateHistory, load_history, plan_queries
+from flight_price_tracker.serpapi import SerpApiClient
+from flight_price_tracker.serving import update_serving_run_metrics, update_serving_tables
+from flight_price_tracker.settings import AppConfig, load_app_config
+from flight_price_tracker.summary import load_summary, update_summary
+
+
+def run_once(
+    *,
+    config_path: Path,
+    use_cache: bool | None = None,
+    resume: bool = False,
+    config: AppConfig | None = None,
+    routes: Collection[str] | None = None,
+    client: SerpApiClient | None = None,
+    previous_prices: Mapping[str, dict[str, float] | None] | None = None,
+) -> list[SearchRun]:
     """Execute one tracking run.
 
-    Fetches SerpApi Google Flights data for each outbound date in the configured window,
-    writes evidence JSON+sha256, loads normalized tables to Parquet via dlt, and writes reports.
+    Fetches SerpApi Google Flights data for each route x outbound date in the configured
+    windows (concurrently, through one shared queue and global rate limit), writes evidence
+    JSON+sha256, writes normalized tables for all routes to Parquet in a single load (dlt or
+    direct PyArrow, per `storage.writer`), and writes one report per route. Dates answered by
+    the response cache reuse their existing evidence instead of calling SerpApi. With
+    `schedule.enabled`, only dates that are due (see :mod:`flight_price_tracker.schedule`) are
+    queried and the others carry forward their last known price in the reports. Routes with
+    `window.trip_lengths_days` are queried as round trips, once per outbound date and trip
+    length, and reported as an outbound date x trip length price matrix. Transient
+    SerpApi failures are retried with backoff under a per-run circuit breaker, and dates that
+    still failed are re-attempted once in a final pass (see :mod:`flight_price_tracker.fetch`).
+    Configured alert rules are checked against the run's prices and matches are sent to the
+    alert sinks (see :mod:`flight_price_tracker.alerts`).
+
+    Progress is checkpointed in a run journal (see :mod:`flight_price_tracker.journal`). With
+    `resume`, an interrupted run is continued under its original `observed_at_utc`: dates whose
+    evidence was already written are rebuilt from it, and dates already loaded are not written
+    again.
+
+    The `serve` daemon (see :mod:`flight_price_tracker.daemon`) passes the config, a
+    long-lived client and the previous prices it keeps in memory, and runs only the routes
+    that are due.
 
     Args:
         config_path: Path to the YAML configuration file.
+        use_cache: Override `cache.enabled` from the config (None keeps the config value).
+        resume: Continue the latest interrupted run instead of starting a new one.
+        config: Config already loaded from `config_path` (None: load it).
+        routes: Route identifiers to run (None: all configured routes).
+        client: SerpApi client to use instead of opening one for this run (it is not closed).
+        previous_prices: Prices of the previous run by route, for routes whose history
+            should not be read from the dataset.
+
+    Returns:
+        The search runs of this run, with their offers.
     """
-    config = load_app_config(config_path)
-    env = EnvSettings()
+    if config is None:
+        config = load_app_config(config_path)
+    all_routes = {_route_id(c): c for c in config.split_routes()}
+    route_configs = {r: c for r, c in all_routes.items() if routes is None or r in routes}
+
+    journal = RunJournal.latest_incomplete(JOURNAL_DIR) if resume else None
+    if journal is None:
+        journal = RunJournal.start(JOURNAL_DIR, observed_at_utc=datetime.now(timezone.utc))
+    checkpoints = journal.entries()
 
-    observed_at = datetime.now(timezone.utc)
+    observed_at = journal.observed_at_utc
     run_date = observed_at.date().isoformat()
-    route = f"{config.route.origin}-{config.route.destination}"
 
     data_root = Path("data")
     evidence_root = Path("evidence")
     reports_root = Path("reports")
 
-    prev_prices = load_previous_prices(
-        data_root=data_root,
-        dataset_name=DATASET_NAME,
-        route=route,
-        before_observed_at_utc=observed_at,
-    )
-
-    outbound_dates = _rolling_outbound_dates(
-        start=observed_at.date() + timedelta(days=config.window.start_offset_days),
-        days=config.window.window_days,
-    )
+    metrics = RunMetrics()
+    prev_prices: dict[str, dict[str, float] | None] = {}
+    for route, route_config in route_configs.items():
+        if route_config.window.round_trip:
+            prev_prices[route] = None
+            continue
+        if previous_prices is not None and route in previous_prices:
+            prev_prices[route] = previous_prices[route]
+            continue
+        with metrics.stage("history", route=route) as m:
+            prev_prices[route] = load_previous_prices(
+                data_root=data_root,
+                dataset_name=DATASET_NAME,
+                route=route,
+                before_observed_at_utc=observed_at,
+            )
+            m.rows = len(prev_prices[route] or {})
 
-    search_runs_rows: list[dict[str, Any]] = []
-    offers_rows: list[dict[str, Any]] = []
-    evidence_refs: list[EvidenceRef] = []
+    jobs = [
+        FetchJob(
+            route=route,
+            outbound_date=outbound_date,
+            return_date=return_date,
+            params=_build_serpapi_params(
+                config=route_config, outbound_date=outbound_date, return_date=return_date
+            ),
+        )
+        for route, route_config in route_configs.items()
+        for outbound_date in _rolling_outbound_dates(
+            start=observed_at.date() + timedelta(days=route_config.window.start_offset_days),
+            days=route_config.window.window_days,
+        )
+        for return_date in _return_dates(
+            outbound_date=outbound_date, trip_lengths=route_config.window.trip_lengths_days
+        )
+    ]
+    carried: dict[tuple[str, str], DateHistory] = {}
+    if config.schedule.enabled:
+        with metrics.stage("schedule") as m:
+            history, calls_today = load_history(
+                data_root=data_root,
+                dataset_name=DATASET_NAME,
+                routes=list(route_configs),
+                since=observed_at.date() - timedelta(days=config.schedule.lookback_days),
+                before_observed_at_utc=observed_at,
+            )
+            m.rows = len(history)
+        plan = plan_queries(
+            [job.key for job in jobs],
+            history=history,
+            today=observed_at.date(),
+            calls_today=calls_today,
+            config=config.schedule,
+        )
+        scheduled = set(plan.query)
+        jobs = [job for job in jobs if job.key in scheduled]
+        carried = plan.carried
+    loaded = {key for key, entry in checkpoints.items() if entry.stage == "loaded"}
+
+    # Responses that need no SerpApi call: evidence journaled by an interrupted attempt of this
+    # run, or cache hits. A loaded date whose evidence no longer replays is fetched and loaded
+    # again, so the run never reports it without a response.
+    archive = EvidenceArchive(evidence_root) if config.storage.evidence == "archive" else None
+    cache = _open_cache(config=config, use_cache=use_cache)
+    cached: dict[tuple[str, ...], CachedResponse] = {}
+    with metrics.stage("cache") as m:
+        for job in jobs:
+            entry = checkpoints.get(job.key)
+            hit = _replay_evidence(entry) if entry is not None else None
+            if hit is None:
+                loaded.discard(job.key)
+            if hit is None and cache is not None:
+                hit = cache.get(job.params)
+                if hit is not None:
+                    journal.record(
+                        "fetched",
+                        route=job.route,
+                        outbound_date=job.outbound_date,
+                        return_date=job.return_date,
+                        evidence_json_path=hit.evidence_json_path,
+                        evidence_sha256=hit.evidence_sha256,
+                    )
+            if hit is not None:
+                cached[job.key] = hit
+        m.rows = len(cached)
+        m.bytes = sum(len(hit.raw_json) for hit in cached.values())
+
+    evidence_lock = threading.Lock()
+    written: dict[tuple[str, ...], tuple[str, str]] = {}
+
+    def _checkpoint(result: FetchResult) -> None:
+        """Write evidence as soon as a response arrives and journal the fetch."""
+        job = result.job
+        metrics.record(
+            "serpapi",
+            seconds=result.seconds or 0.0,
+            route=job.route,
+            outbound_date=job.outbound_date,
+            bytes=None if result.raw_json is None else len(result.raw_json),
+        )
+        if result.attempts > 1:
+            metrics.record(
+                "serpapi_backoff",
+                seconds=result.backoff_seconds,
+                route=job.route,
+                outbound_date=job.outbound_date,
+                rows=result.attempts - 1,
+            )
+        if result.raw_json is None:
+            journal.record(
+                "fetched",
+                route=job.route,
+                outbound_date=job.outbound_date,
+                return_date=job.return_date,
+                error=str(result.error),
+            )
+            return
+        with (
+            evidence_lock,
+            metrics.stage("write_evidence", route=job.route, outbound_date=job.outbound_date) as m,
+        ):
+            m.bytes = len(result.raw_json)
+            evidence_json_path, evidence_sha = _write_evidence(
+                evidence_root=evidence_root,
+                route=job.route,
+                run_date=run_date,
+                outbound_date=job.outbound_date,
+                return_date=job.return_date,
+                raw_json=result.raw_json,
+                archive=archive,
+            )
+            if cache is not None:
+                cache.put(
+                    job.params,
+                    evidence_json_path=evidence_json_path,
+                    evidence_sha256=evidence_sha,
+                )
+        written[job.key] = (evidence_json_path, evidence_sha)
+        journal.record(
+            "fetched",
+            route=job.route,
+            outbound_date=job.outbound_date,
+            return_date=job.return_date,
+            evidence_json_path=evidence_json_path,
+            evidence_sha256=evidence_sha,
+        )
 
-    for outbound_date in outbound_dates:
-        params = _build_serpapi_params(config=config, outbound_date=outbound_date)
+    limiter = TokenBucket.from_interval(config.serpapi.rate_limit_seconds)
+    retry = RetryPolicy(
+        max_retries=config.serpapi.max_retries,
+        base_delay_seconds=config.serpapi.retry_backoff_seconds,
+        max_delay_seconds=config.serpapi.retry_max_backoff_seconds,
+    )
+    breaker = CircuitBreaker(failure_threshold=config.serpapi.circuit_breaker_failures)
+    with (
+        open_serpapi_client(config) if client is None else contextlib.nullcontext(client)
+    ) as client:
+
+        def _fetch(pending: list[FetchJob]) -> list[FetchResult]:
+            return fetch_all(
+                pending,
+                search=client.search_google_flights,
+                limiter=limiter,
+                max_concurrency=config.serpapi.max_concurrency,
+                on_result=_checkpoint,
+                retry=retry,
+                breaker=breaker,
+            )
 
-        try:
-            resp, raw_json = search_google_flights(
-                api_key=env.serpapi_api_key,
-                params=params,
+        results = {
+            result.job.key: result
+            for result in _fetch(
+                [job for job in jobs if job.key not in cached and job.key not in loaded]
             )
-        except SerpApiError as e:
+        }
+        # Final pass: dates that failed transiently (or were skipped by the open breaker) get
+        # one more round after a pause, with the breaker closed again.
+        failed = [r.job for r in results.values() if r.error is not None and r.error.transient]
+        if failed:
+            with metrics.stage("final_pass") as m:
+                time.sleep(config.serpapi.final_pass_delay_seconds)
+                breaker.reset()
+                retried = _fetch(failed)
+                m.rows = sum(r.error is None for r in retried)
+            results.update((r.job.key, r) for r in retried)
+
+    search_runs: list[SearchRun] = []
+    evidence_refs: dict[str, list[EvidenceRef]] = {route: [] for route in route_configs}
+
+    for job in jobs:
+        route, outbound_date, return_date = job.route, job.outbound_date, job.return_date
+        route_config = route_configs[route]
+
+        hit = cached.get(job.key)
+        result = results.get(job.key)
+        if hit is not None:
+            resp, raw_json = hit.response, hit.raw_json
+            evidence_json_path, evidence_sha = hit.evidence_json_path, hit.evidence_sha256
+        elif result is not None and result.response is not None:
+            resp, raw_json = result.response, result.raw_json
+            evidence_json_path, evidence_sha = written[job.key]
+        else:
+            resp = raw_json = None
+        base = {
+            "run_date": run_date,
+            "observed_at_utc": observed_at,
+            "route": route,
+            "origin": route_config.route.origin,
+            "destination": route_config.route.destination,
+            "outbound_date": outbound_date,
+            "return_date": return_date,
+            "currency": route_config.serpapi.currency,
+            "serpapi_params": json.dumps(job.params, sort_keys=True),
+        }
+        if resp is None or raw_json is None:
             # Still record the run with missing price; evidence is not available.
-            search_runs_rows.append(
-                {
-                    "run_date": run_date,
-                    "observed_at_utc": observed_at,
-                    "route": route,
-                    "origin": config.route.origin,
-                    "destination": config.route.destination,
-                    "outbound_date": outbound_date,
-                    "currency": config.serpapi.currency,
-                    "cheapest_price": None,
-                    "error": str(e),
-                    "serpapi_params": json.dumps(params, sort_keys=True),
-                }
+            error = result.error if result is not None else checkpoints[job.key].error
+            search_runs.append(SearchRun(**base, error=str(error or "no response")))
+            journal.record(
+                "normalized", route=route, outbound_date=outbound_date, return_date=return_date
             )
             continue
 
-        evidence_json_path, evidence_sha = _write_evidence(
-            evidence_root=evidence_root,
-            route=route,
-            run_date=run_date,
-            outbound_date=outbound_date,
-            raw_json=raw_json,
-        )
-        evidence_refs.append(
+        evidence_refs[route].append(
             EvidenceRef(
                 outbound_date=outbound_date,
                 json_path=evidence_json_path,
                 sha256=evidence_sha,
+                return_date=return_date,
             )
         )
 
-        offers = extract_offers(
-            resp,
-            outbound_date=outbound_date,
-            default_currency=config.serpapi.currency,
+        with metrics.stage("normalize", route=route, outbound_date=outbound_date) as m:
+            ranked_offers, cheapest = top_offers(
+                resp,
+                outbound_date=outbound_date,
+                top_n=route_config.serpapi.top_n_offers,
+                default_currency=route_config.serpapi.currency,
+            )
+            m.rows = len(ranked_offers)
+
+        search_runs.append(
+            SearchRun(
+                **base,
+                cheapest_price=None if cheapest is None else cheapest.price,
+                evidence_json_path=evidence_json_path,
+                evidence_sha256=evidence_sha,
+                serpapi_search_metadata_id=_get_search_metadata_id(resp),
+                offers=tuple(ranked_offers),
+            )
+        )
+        journal.record(
+            "normalized", route=route, outbound_date=outbound_date, return_date=return_date
         )
-        top_offers = offers[: config.serpapi.top_n_offers]
-        cheapest = cheapest_offer(offers)
 
-        search_runs_rows.append(
+    if cache is not None:
+        cache.evict()
+
+    pending = [r for r in search_runs if r.key not in loaded]
+    with metrics.stage("load") as m:
+        _write_tables(config=config, data_root=data_root, search_runs=pending)
+        m.rows = len(pending) + sum(len(r.offers) for r in pending)
+    for r in pending:
+        journal.record(
+            "loaded", route=r.route, outbound_date=r.outbound_date, return_date=r.return_date
+        )
+    # Alerts compare with the summary as it was before this run, so they run first.
+    if config.alerts.rules:
+        with metrics.stage("alerts") as m:
+            alerts = evaluate_alerts(
+                rules=config.alerts.rules,
+                search_runs=search_runs,
+                history=load_alert_history(
+                    dataset_root=data_root / DATASET_NAME, search_runs=search_runs
+                ),
+            )
+            m.rows = len(alerts)
+            for error in send_alerts(alerts, build_sinks(config.alerts.sinks)):
+                print(f"alert sink failed: {error}", file=sys.stderr)
+    # All rows of the run, not just `pending`: re-applying rows loaded before a resume is a no-op.
+    with metrics.stage("summary"):
+        update_summary(dataset_root=data_root / DATASET_NAME, search_runs=search_runs)
+    with metrics.stage("serving") as m:
+        m.rows = len(
+            update_serving_tables(dataset_root=data_root / DATASET_NAME, search_runs=search_runs)
+        )
+
+    for route, route_config in route_configs.items():
+        # A single-route config keeps the flat `reports/` layout; batches get one folder each.
+        route_reports = reports_root if len(all_routes) == 1 else reports_root / f"route={route}"
+        if route_config.window.round_trip:
+            with metrics.stage("report", route=route) as m:
+                matrix = load_price_matrix(
+                    dataset_root=data_root / DATASET_NAME,
+                    route=route,
+                    observed_at_utc=observed_at,
+                    trip_lengths=route_config.window.trip_lengths_days or [],
+                )
+                md = build_round_trip_report_markdown(
+                    route=route,
+                    observed_at_utc=observed_at,
+                    currency=route_config.serpapi.currency,
+                    matrix=matrix,
+                    evidence=evidence_refs[route],
+                    top_k_deals=route_config.reporting.top_k_deals,
+                    timings=metrics.summary(),
+                )
+                m.bytes = len(md.encode("utf-8"))
+                _write_report(
+                    md, route_reports=route_reports, run_date=run_date, config=route_config
+                )
+            continue
+
+        report_rows = [
+            r.to_row() for r in search_runs if r.route == route and r.cheapest_price is not None
+        ]
+        report_rows.extend(
             {
-                "run_date": run_date,
-                "observed_at_utc": observed_at,
-                "route": route,
-                "origin": config.route.origin,
-                "destination": config.route.destination,
                 "outbound_date": outbound_date,
-                "currency": config.serpapi.currency,
-                "cheapest_price": None if cheapest is None else float(cheapest["price"]),
-                "evidence_json_path": evidence_json_path,
-                "evidence_sha256": evidence_sha,
-                "serpapi_params": json.dumps(params, sort_keys=True),
-                "serpapi_search_metadata_id": _get_search_metadata_id(resp),
+                "cheapest_price": h.last_price,
+                "carried_from": h.last_observed_at_utc.date().isoformat(),
             }
+            for (r_id, outbound_date), h in carried.items()
+            if r_id == route
         )
-
-        for i, o in enumerate(top_offers, start=1):
-            offers_rows.append(
-                {
-                    "run_date": run_date,
-                    "observed_at_utc": observed_at,
-                    "route": route,
-                    "outbound_date": outbound_date,
-                    "rank": i,
-                    "price": float(o["price"]),
-                    "currency": o.get("currency") or config.serpapi.currency,
-                    "bucket": o.get("bucket"),
-                    "airlines": o.get("airlines"),
-                    "depart_time": o.get("depart_time"),
-                    "arrive_time": o.get("arrive_time"),
-                    "duration_minutes": o.get("duration_minutes"),
-                    "stops": o.get("stops"),
-                }
+        report_rows.sort(key=lambda r: str(r["outbound_date"]))
+
+        with metrics.stage("report", route=route) as m:
+            md = build_report_markdown(
+                route=route,
+                observed_at_utc=observed_at,
+                currency=route_config.serpapi.currency,
+                rows=report_rows,
+                evidence=evidence_refs[route],
+                prev_prices=prev_prices[route],
+                top_k_deals=route_config.reporting.top_k_deals,
+                summary=load_summary(
+                    dataset_root=data_root / DATASET_NAME,
+                    route=route,
+                    outbound_dates=[str(r["outbound_date"]) for r in report_rows],
+                ),
+                timings=metrics.summary(),
             )
+            m.bytes = len(md.encode("utf-8"))
+            _write_report(md, route_reports=route_reports, run_date=run_date, config=route_config)
 
-        if config.serpapi.rate_limit_seconds:
-            time.sleep(config.serpapi.rate_limit_seconds)
+    write_run_metrics(
+        metrics,
+        dataset_root=data_root / DATASET_NAME,
+        run_date=run_date,
+        observed_at_utc=observed_at,
+    )
+    update_serving_run_metrics(
+        dataset_root=data_root / DATASET_NAME,
+        run_metrics=metrics.to_table(run_date=run_date, observed_at_utc=observed_at),
+    )
+    journal.record("completed")
+    return search_runs
 
-    _load_with_dlt(data_root=data_root, search_runs_rows=search_runs_rows, offers_rows=offers_rows)
 
-    report_rows = [
-        r
-        for r in search_runs_rows
-        if r.get("cheapest_price") is not None and isinstance(r.get("outbound_date"), str)
-    ]
-    report_rows.sort(key=lambda r: str(r["outbound_date"]))
+def open_serpapi_client(config: AppConfig) -> SerpApiClient:
+    """Open a SerpApi client with the fetch settings of `config` and the API key from `.env`.
 
-    md = build_report_markdown(
-        route=route,
-        observed_at_utc=observed_at,
-        currency=config.serpapi.currency,
-        rows=report_rows,
-        evidence=evidence_refs,
-        prev_prices=prev_prices,
-        top_k_deals=config.reporting.top_k_deals,
+    Args:
+        config: Validated configuration.
+
+    Returns:
+        The client; close it when done.
+    """
+    return SerpApiClient(
+        api_key=EnvSettings().serpapi_api_key,
+        timeout_seconds=config.serpapi.timeout_seconds,
+        pool_size=config.serpapi.max_concurrency,
     )
 
-    reports_root.mkdir(parents=True, exist_ok=True)
-    (reports_root / "latest.md").write_text(md, encoding="utf-8")
+
+def _write_report(md: str, *, route_reports: Path, run_date: str, config: AppConfig) -> None:
+    """Write a route's report as `latest.md` (and `<run_date>.md` if configured)."""
+    route_reports.mkdir(parents=True, exist_ok=True)
+    (route_reports / "latest.md").write_text(md, encoding="utf-8")
     if config.reporting.write_dated_report:
-        (reports_root / f"{run_date}.md").write_text(md, encoding="utf-8")
+        (route_reports / f"{run_date}.md").write_text(md, encoding="utf-8")
+
+
+def _replay_evidence(entry: JournalEntry) -> CachedResponse | None:
+    """Rebuild a response from evidence journaled by an earlier attempt of the same run.
+
+    Args:
+        entry: Journal state of one (route, outbound_date).
+
+    Returns:
+        The response with its evidence reference, or None if the fetch failed or the evidence
+        is missing or no longer matches its digest.
+    """
+    if entry.evidence_json_path is None or entry.evidence_sha256 is None:
+        return None
+    try:
+        raw = read_evidence(entry.evidence_json_path)
+    except OSError:
+        return None
+    if sha256(raw).hexdigest() != entry.evidence_sha256:
+        return None
+    return CachedResponse(
+        response=decode_json(raw),
+        raw_json=raw,
+        evidence_json_path=entry.evidence_json_path,
+        evidence_sha256=entry.evidence_sha256,
+    )
+
+
+def _open_cache(*, config: AppConfig, use_cache: bool | None) -> ResponseCache | None:
+    """Create the response cache if it is enabled.
+
+    Args:
+        config: Validated application config.
+        use_cache: CLI override for `cache.enabled` (None keeps the config value).
+
+    Returns:
+        The cache, or None when caching is disabled.
+    """
+    enabled = config.cache.enabled if use_cache is None else use_cache
+    if not enabled:
+        return None
+    return ResponseCache(
+        root=config.cache.dir,
+        ttl_seconds=config.cache.ttl_seconds,
+        max_entries=config.cache.max_entries,
+    )
+
+
+def _write_tables(
+    *,
+    config: AppConfig,
+    data_root: Path,
+    search_runs: list[SearchRun],
+) -> None:
+    """Write normalized tables to Parquet with the configured writer.
+
+    Args:
+        config: Validated application config.
+        data_root: Root folder where Parquet output will be written.
+        search_runs: Search runs (with their offers) of this run.
+    """
+    if config.storage.writer == "pyarrow":
+        write_search_runs(dataset_root=data_root / DATASET_NAME, search_runs=search_runs)
+        return
+    _load_with_dlt(
+        data_root=data_root,
+        search_runs_rows=[r.to_row() for r in search_runs],
+        offers_rows=[row for r in search_runs for row in r.offer_rows()],
+    )
 
 
 def _load_with_dlt(
@@ -173,7 +576,7 @@ def _load_with_dlt(
     search_runs_rows: list[dict[str, Any]],
     offers_rows: list[dict[str, Any]],
 ) -> None:
-    """Write normalized tables to Parquet via dlt.
+    """Write normalized tables to Parquet via dlt, holding the dataset lock.
 
     Args:
         data_root: Root folder where Parquet output will be written.
@@ -196,10 +599,11 @@ def _load_with_dlt(
         dataset_name=DATASET_NAME,
     )
 
-    pipeline.run(
-        build_resources(search_runs_rows=search_runs_rows, offers_rows=offers_rows),
-        loader_file_format="parquet",
-    )
+    with dataset_lock(data_root / DATASET_NAME):
+        pipeline.run(
+            build_resources(search_runs_rows=search_runs_rows, offers_rows=offers_rows),
+            loader_file_format="parquet",
+        )
 
 
 def _write_evidence(
@@ -208,7 +612,9 @@ def _write_evidence(
     route: str,
     run_date: str,
     outbound_date: str,
-    raw_json: str,
+    raw_json: bytes,
+    archive: EvidenceArchive | None = None,
+    return_date: str | None = None,
 ) -> tuple[str, str]:
     """Persist the raw SerpApi JSON response and its SHA256.
 
@@ -217,18 +623,34 @@ def _write_evidence(
         route: Route identifier in the form ORIGIN-DESTINATION.
         run_date: Run date (YYYY-MM-DD).
         outbound_date: Outbound date (YYYY-MM-DD) for the request.
-        raw_json: Raw JSON string.
+        raw_json: Canonical JSON bytes (see :mod:`flight_price_tracker.payload`).
+        archive: Archive store to use instead of a standalone JSON file + sidecar.
+        return_date: Return date (YYYY-MM-DD) of a round-trip request, or None for one-way.
 
     Returns:
         Tuple of (relative_json_path, sha256_hex).
     """
-    base = evidence_root / f"route={route}" / f"run_date={run_date}"
-    base.mkdir(parents=True, exist_ok=True)
+    if archive is not None:
+        return archive.put(
+            route=route,
+            run_date=run_date,
+            outbound_date=outbound_date,
+            return_date=return_date,
+            raw=raw_json,
+        )
 
-    json_rel = base / f"outbound_date={outbound_date}.json"
-    json_rel.write_text(raw_json, encoding="utf-8")
-    digest = sha256(raw_json.encode("utf-8")).hexdigest()
-    (base / f"outbound_date={outbound_date}.sha256").write_text(digest + "\n", encoding="utf-8")
+    json_rel = evidence_json_path(
+        evidence_root=evidence_root,
+        route=route,
+        run_date=run_date,
+        outbound_date=outbound_date,
+        return_date=return_date,
+    )
+    json_rel.parent.mkdir(parents=True, exist_ok=True)
+
+    json_rel.write_bytes(raw_json)
+    digest = sha256(raw_json).hexdigest()
+    json_rel.with_suffix(".sha256").write_text(digest + "\n", encoding="utf-8")
 
     return json_rel.as_posix(), digest
 
@@ -246,6 +668,30 @@ def _rolling_outbound_dates(*, start: date, days: int) -> list[str]:
     return [(start + timedelta(days=i)).isoformat() for i in range(days)]
 
 
+def _return_dates(*, outbound_date: str, trip_lengths: list[int] | None) -> list[str | None]:
+    """Return the return dates to query for one outbound date.
+
+    Args:
+        outbound_date: Outbound date (YYYY-MM-DD).
+        trip_lengths: Configured trip lengths in days, or None for a one-way window.
+
+    Returns:
+        One return date per trip length, or `[None]` (a single one-way query).
+    """
+    if trip_lengths is None:
+        return [None]
+    start = date.fromisoformat(outbound_date)
+    return [(start + timedelta(days=n)).isoformat() for n in trip_lengths]
+
+
+def _route_id(config: AppConfig) -> str:
+    """Return the ORIGIN-DESTINATION identifier of a single-route config."""
+    route = config.route
+    if route is None:
+        raise ValueError("Expected a single-route config (see AppConfig.split_routes)")
+    return route.route_id
+
+
 def _get_search_metadata_id(resp: dict[str, Any]) -> str | None:
     """Extract SerpApi `search_metadata.id` from a response."""
     meta = resp.get("search_metadata")
@@ -256,18 +702,22 @@ def _get_search_metadata_id(resp: dict[str, Any]) -> str | None:
     return None
 
 
-def _build_serpapi_params(*, config: AppConfig, outbound_date: str) -> dict[str, Any]:
+def _build_serpapi_params(
+    *, config: AppConfig, outbound_date: str, return_date: str | None = None
+) -> dict[str, Any]:
     """Build SerpApi query parameters for a single outbound date.
 
     Args:
         config: Validated application config.
         outbound_date: Outbound date (YYYY-MM-DD).
+        return_date: Return date (YYYY-MM-DD) for a round trip (`type=1`); None for one-way
+            (`type=2`).
 
     Returns:
         Mapping of query parameters for `search_google_flights`.
     """
     params: dict[str, Any] = {
-        "type": "2",
+        "type": "2" if return_date is None else "1",
         "departure_id": config.route.origin,
         "arrival_id": config.route.destination,
         "outbound_date": outbound_date,
@@ -278,6 +728,8 @@ def _build_serpapi_params(*, config: AppConfig, outbound_date: str) -> dict[str,
         "travel_class": config.serpapi.travel_class,
         "deep_search": str(config.serpapi.deep_search).lower(),
     }
+    if return_date is not None:
+        params["return_date"] = return_date
 
     if config.serpapi.include_airlines:
         params["include_airlines"] = ",".join(config.serpapi.include_airlines)
@@ -0,0 +1,183 @@
+"""Adaptive re-query scheduling of outbound dates.
+
+Instead of querying every date of the window on every run, each (route, outbound_date) gets a
+refresh interval from its recent `search_runs` history:
+
+- dates never observed (or only with failed queries) are always due;
+- near-term dates and volatile dates (large relative price range over the lookback) are
+  refreshed on every run;
+- stable dates are refreshed every `max_interval_days`, with intervals in between scaled
+  linearly by volatility.
+
+Due dates are then capped by the remaining daily API-call budget, most overdue first. Dates
+that are not queried carry forward their last known price in the reports.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable
+from dataclasses import dataclass
+from datetime import date, datetime
+from pathlib import Path
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+
+from flight_price_tracker.parquet_writer import open_dataset
+from flight_price_tracker.settings import ScheduleConfig
+
+
+@dataclass(frozen=True)
+class DateHistory:
+    """Recent successful observations of one (route, outbound_date).
+
+    Attributes:
+        last_observed_at_utc: Time of the latest observation with a price.
+        last_price: Cheapest price of that observation.
+        volatility: Relative price range `(max - min) / min` over the lookback window.
+    """
+
+    last_observed_at_utc: datetime
+    last_price: float
+    volatility: float
+
+
+@dataclass(frozen=True)
+class SchedulePlan:
+    """Outcome of scheduling one run.
+
+    Attributes:
+        query: Keys (route, outbound_date) to query, in job order.
+        carried: Skipped keys with history; their last observation is carried forward.
+    """
+
+    query: list[tuple[str, str]]
+    carried: dict[tuple[str, str], DateHistory]
+
+
+def load_history(
+    *,
+    data_root: Path,
+    dataset_name: str,
+    routes: Iterable[str],
+    since: date,
+    before_observed_at_utc: datetime,
+) -> tuple[dict[tuple[str, str], DateHistory], int]:
+    """Summarise recent `search_runs` per (route, outbound_date) in one scan.
+
+    Args:
+        data_root: Root folder where the tracker writes Parquet output.
+        dataset_name: dlt dataset name.
+        routes: Route identifiers to include.
+        since: First run date of the lookback window.
+        before_observed_at_utc: Only consider runs observed strictly before this timestamp.
+
+    Returns:
+        Tuple of (history per key, API calls already made for these routes on the UTC date of
+        `before_observed_at_utc`).
+    """
+    search_runs_dir = data_root / dataset_name / "search_runs"
+    if not search_runs_dir.exists():
+        return {}, 0
+
+    table = open_dataset(data_root / dataset_name, "search_runs").to_table(
+        columns=["run_date", "route", "outbound_date", "observed_at_utc", "cheapest_price"],
+        filter=(ds.field("run_date") >= since.isoformat())
+        & ds.field("route").isin(pa.array(list(routes), type=pa.string()))
+        & ds.field("return_date").is_null()
+        & (
+            ds.field("observed_at_utc")
+            < pa.scalar(before_observed_at_utc, type=pa.timestamp("us", tz="UTC"))
+        ),
+    )
+    today = before_observed_at_utc.date().isoformat()
+    calls_today = pc.sum(pc.equal(table.column("run_date"), today)).as_py() or 0
+
+    priced = table.filter(pc.is_valid(table.column("cheapest_price"))).sort_by("observed_at_utc")
+    grouped = priced.group_by(["route", "outbound_date"], use_threads=False).aggregate(
+        [
+            ("observed_at_utc", "max"),
+            ("cheapest_price", "last"),
+            ("cheapest_price", "min"),
+            ("cheapest_price", "max"),
+        ]
+    )
+    history: dict[tuple[str, str], DateHistory] = {}
+    for row in grouped.to_pylist():
+        low, high = float(row["cheapest_price_min"]), float(row["cheapest_price_max"])
+        history[(row["route"], row["outbound_date"])] = DateHistory(
+            last_observed_at_utc=row["observed_at_utc_max"],
+            last_price=float(row["cheapest_price_last"]),
+            volatility=(high - low) / low if low > 0 else 0.0,
+        )
+    return history, int(calls_today)
+
+
+def refresh_interval_days(
+    *, history: DateHistory | None, days_out: int, config: ScheduleConfig
+) -> int:
+    """Return how many days may pass between two queries of a date.
+
+    Args:
+        history: Recent observations of the date, or None if it was never observed.
+        days_out: Days from the run date to the outbound date.
+        config: Scheduling configuration.
+
+    Returns:
+        The interval in days (0 for dates without history, i.e. always due).
+    """
+    if history is None:
+        return 0
+    if days_out <= config.near_term_days or history.volatility >= config.volatile_change:
+        return 1
+    if history.volatility <= config.stable_change:
+        return config.max_interval_days
+    share = (config.volatile_change - history.volatility) / (
+        config.volatile_change - config.stable_change
+    )
+    return max(1, round(1 + (config.max_interval_days - 1) * share))
+
+
+def plan_queries(
+    keys: list[tuple[str, str]],
+    *,
+    history: dict[tuple[str, str], DateHistory],
+    today: date,
+    calls_today: int,
+    config: ScheduleConfig,
+) -> SchedulePlan:
+    """Choose which (route, outbound_date) keys to query in this run.
+
+    Args:
+        keys: Candidate keys from the configured windows, in job order.
+        history: Recent observations per key (see :func:`load_history`).
+        today: Run date.
+        calls_today: API calls already made today.
+        config: Scheduling configuration.
+
+    Returns:
+        The plan; keys that are due but do not fit in the budget are carried like stable ones.
+    """
+    due: list[tuple[float, int, int, tuple[str, str]]] = []
+    for i, key in enumerate(keys):
+        h = history.get(key)
+        days_out = (date.fromisoformat(key[1]) - today).days
+        interval = refresh_interval_days(history=h, days_out=days_out, config=config)
+        if h is None:
+            due.append((float("-inf"), days_out, i, key))
+            continue
+        age_days = (today - h.last_observed_at_utc.date()).days
+        if age_days >= interval:
+            # Most overdue (relative to its interval) first, then nearest departure.
+            due.append((-age_days / interval, days_out, i, key))
+
+    due.sort()
+    if config.daily_call_budget is not None:
+        due = due[: max(config.daily_call_budget - calls_today, 0)]
+    selected = {key for *_, key in due}
+
+    return SchedulePlan(
+        query=[k for k in keys if k in selected],
+        carried={k: history[k] for k in keys if k not in selected and k in history},
+    )
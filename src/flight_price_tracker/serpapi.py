@@ -1,21 +1,143 @@
 """SerpApi client.
 
-Uses dlt's verified REST API source to fetch JSON responses from SerpApi.
+Fetches JSON responses from SerpApi over a pooled, keep-alive `requests` session.
 """
 
 from __future__ import annotations
 
-import json
 import re
 from collections.abc import Mapping
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from types import TracebackType
 from typing import TYPE_CHECKING, Any
+from urllib.parse import urljoin
+
+from flight_price_tracker.payload import canonical_json, decode_json
 
 if TYPE_CHECKING:
-    from dlt.sources.rest_api import RESTAPIConfig
+    import requests
+
+SERPAPI_BASE_URL = "https://serpapi.com/"
 
 
 class SerpApiError(RuntimeError):
-    """Raised when a SerpApi request fails or returns an unexpected response."""
+    """Raised when a SerpApi request fails or returns an unexpected response.
+
+    Attributes:
+        status_code: HTTP status of the failed response, if one was received.
+        retry_after_seconds: Delay requested by the response's `Retry-After` header, if any.
+        transient: Whether the same request may succeed later (HTTP 429 or 5xx, connection
+            errors and timeouts).
+    """
+
+    def __init__(
+        self,
+        message: str,
+        *,
+        status_code: int | None = None,
+        retry_after_seconds: float | None = None,
+        transient: bool = False,
+    ) -> None:
+        """Create an error.
+
+        Args:
+            message: Error message (secrets already redacted).
+            status_code: HTTP status of the failed response, if one was received.
+            retry_after_seconds: Delay requested by the `Retry-After` header, if any.
+            transient: Whether the same request may succeed later.
+        """
+        super().__init__(message)
+        self.status_code = status_code
+        self.retry_after_seconds = retry_after_seconds
+        self.transient = transient
+
+
+class SerpApiClient:
+    """Long-lived SerpApi client with keep-alive connection pooling.
+
+    One client is meant to be created per run and shared by all worker threads; the
+    underlying connection pool holds up to `pool_size` connections.
+
+    Attributes:
+        timeout_seconds: Connect/read timeout applied to every request.
+        base_url: SerpApi base URL (overridable for local test servers).
+    """
+
+    def __init__(
+        self,
+        *,
+        api_key: str,
+        timeout_seconds: float = 60.0,
+        base_url: str = SERPAPI_BASE_URL,
+        pool_size: int = 4,
+    ) -> None:
+        """Create a client.
+
+        Args:
+            api_key: SerpApi API key.
+            timeout_seconds: Connect/read timeout applied to every request.
+            base_url: SerpApi base URL.
+            pool_size: Maximum number of pooled keep-alive connections.
+        """
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        self.timeout_seconds = timeout_seconds
+        self.base_url = base_url
+        self._api_key = api_key
+        self._session: requests.Session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self._session.mount("https://", adapter)
+        self._session.mount("http://", adapter)
+
+    def search_google_flights(self, params: Mapping[str, Any]) -> tuple[dict[str, Any], bytes]:
+        """Search Google Flights via SerpApi.
+
+        Args:
+            params: Query params excluding the API key. This method adds
+                `engine=google_flights`.
+
+        Returns:
+            A tuple of (parsed_response_json, canonical_json_bytes); see
+            :mod:`flight_price_tracker.payload`.
+
+        Raises:
+            SerpApiError: If the request fails or the response is not a JSON object; HTTP 429
+                and 5xx responses, connection errors and timeouts are marked `transient`.
+        """
+        merged = {**dict(params), "api_key": self._api_key, "engine": "google_flights"}
+
+        try:
+            resp = self._session.get(
+                urljoin(self.base_url, "search.json"),
+                params=merged,
+                timeout=self.timeout_seconds,
+            )
+            resp.raise_for_status()
+            data = decode_json(resp.content)
+        except Exception as e:  # noqa: BLE001
+            raise _to_serpapi_error(e) from e
+
+        data = _coerce_response(data)
+        return data, canonical_json(data)
+
+    def close(self) -> None:
+        """Close pooled connections."""
+        self._session.close()
+
+    def __enter__(self) -> SerpApiClient:
+        """Return the client for use as a context manager."""
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        """Close pooled connections."""
+        self.close()
 
 
 def search_google_flights(
@@ -23,57 +145,79 @@ def search_google_flights(
     api_key: str,
     params: Mapping[str, Any],
     timeout_seconds: float = 60.0,
-) -> tuple[dict[str, Any], str]:
-    """Search Google Flights via SerpApi.
+    base_url: str = SERPAPI_BASE_URL,
+) -> tuple[dict[str, Any], bytes]:
+    """Search Google Flights via SerpApi with a one-off client.
+
+    Prefer a shared :class:`SerpApiClient` when issuing more than one request.
 
     Args:
         api_key: SerpApi API key.
         params: Query params excluding the API key. This function adds `engine=google_flights`.
-        timeout_seconds: Currently unused (reserved for future HTTP client configuration).
+        timeout_seconds: Connect/read timeout for the request.
+        base_url: SerpApi base URL (overridable for local test servers).
 
     Returns:
-        A tuple of (parsed_response_json, raw_json_string).
+        A tuple of (parsed_response_json, canonical_json_bytes).
     """
-    from dlt.sources.rest_api import rest_api_resources
-
-    merged = {**dict(params), "api_key": api_key, "engine": "google_flights"}
-
-    # Note: we intentionally do not pass a custom `session` object here because it must be
-    # serializable; some session implementations contain thread-locals and break extraction.
-    config: RESTAPIConfig = {
-        "client": {
-            "base_url": "https://serpapi.com/",
-        },
-        "resources": [
-            {
-                "name": "search",
-                "endpoint": {
-                    "path": "search.json",
-                    "params": merged,
-                    "paginator": {"type": "single_page"},
-                    "data_selector": "$",
-                },
-            }
-        ],
-    }
+    with SerpApiClient(
+        api_key=api_key, timeout_seconds=timeout_seconds, base_url=base_url, pool_size=1
+    ) as client:
+        return client.search_google_flights(params)
 
-    try:
-        (resource,) = list(rest_api_resources(config))
-        items = list(resource)
-    except Exception as e:  # noqa: BLE001
-        raise SerpApiError(_redact_secret(str(e))) from e
 
-    if not items:
-        raise SerpApiError("SerpApi returned no data")
+def _coerce_response(data: Any) -> dict[str, Any]:
+    """Validate the decoded response body and unwrap single-item lists.
+
+    Args:
+        data: Decoded JSON body.
+
+    Returns:
+        The response as a dict.
 
-    data = items[0]
+    Raises:
+        SerpApiError: If the body is empty or not a JSON object.
+    """
+    if data is None or data == []:
+        raise SerpApiError("SerpApi returned no data")
     if isinstance(data, list) and len(data) == 1 and isinstance(data[0], dict):
         data = data[0]
     if not isinstance(data, dict):
         raise SerpApiError(f"SerpApi returned unexpected type: {type(data)!r}")
-
-    raw = json.dumps(data, ensure_ascii=False, sort_keys=True)
-    return data, raw
+    return data
+
+
+def _to_serpapi_error(exc: Exception) -> SerpApiError:
+    """Wrap a request or decoding failure, classifying whether it is worth retrying."""
+    import requests
+
+    message = _redact_secret(str(exc))
+    if isinstance(exc, requests.HTTPError) and exc.response is not None:
+        status = exc.response.status_code
+        return SerpApiError(
+            message,
+            status_code=status,
+            retry_after_seconds=_parse_retry_after(exc.response.headers.get("Retry-After")),
+            transient=status == 429 or status >= 500,
+        )
+    transient = isinstance(exc, requests.ConnectionError | requests.Timeout)
+    return SerpApiError(message, transient=transient)
+
+
+def _parse_retry_after(value: str | None) -> float | None:
+    """Parse a `Retry-After` header (delay in seconds or HTTP date) into seconds from now."""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
 
 
 def _redact_secret(text: str) -> str:
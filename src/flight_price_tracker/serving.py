@@ -0,0 +1,374 @@
+"""Pre-aggregated serving tables for the Evidence UI.
+
+At the end of each run the tracker folds the run into small tables, partitioned by route and
+sorted for display, so the UI reads a few compact files instead of scanning the full
+`search_runs`, `offers` and `run_metrics` history:
+
+    data/flight_price_tracker/serving/latest_run/route=<route>/latest_run.parquet
+    data/flight_price_tracker/serving/daily_min/route=<route>/daily_min.parquet
+    data/flight_price_tracker/serving/airline_stats/route=<route>/airline_stats.parquet
+    data/flight_price_tracker/serving/run_metrics/run_metrics.parquet
+
+- `latest_run`: the search runs of the route's latest run (one-way and round trips).
+- `daily_min`: the lowest one-way cheapest price per outbound date and run date, for the
+  `RETENTION_DAYS` run dates up to the route's latest one.
+- `airline_stats`: one-way offer counts and prices per airline (offers operated by several
+  airlines count for each of them).
+- `run_metrics`: the stage samples of the runs of the last `RETENTION_DAYS` run dates.
+
+Only the partitions of the routes in the run are rewritten, and only from the run's own rows
+plus the existing partition. Every table is bounded: `daily_min` holds at most
+`RETENTION_DAYS` x the search window rows per route, so neither the cost of a run nor the UI's
+source build grows with history. The first update on a dataset without serving tables builds
+them from the stored history once.
+
+Updates are read-modify-writes of whole partitions, so each one holds an exclusive lock
+(`data/flight_price_tracker/.serving.lock`); a scheduled run and the `serve` daemon updating
+the tables at the same time do not lose each other's rows.
+"""
+
+from __future__ import annotations
+
+import shutil
+from collections.abc import Callable, Sequence
+from contextlib import AbstractContextManager
+from datetime import date, timedelta
+from pathlib import Path
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from flight_price_tracker.metrics import RUN_METRICS_SCHEMA
+from flight_price_tracker.metrics import TABLE_NAME as RUN_METRICS_TABLE
+from flight_price_tracker.parquet_writer import (
+    exclusive_lock,
+    offers_to_table,
+    open_dataset,
+    search_runs_to_table,
+    write_atomic,
+)
+from flight_price_tracker.records import SearchRun
+
+SERVING_DIR = "serving"
+
+# Run dates kept in `daily_min` and `run_metrics`, counted back from the latest one.
+RETENTION_DAYS = 90
+
+_TS = pa.timestamp("us", tz="UTC")
+
+LATEST_RUN_SCHEMA = pa.schema(
+    [
+        pa.field("route", pa.string()),
+        pa.field("observed_at_utc", _TS),
+        pa.field("outbound_date", pa.string()),
+        pa.field("return_date", pa.string()),
+        pa.field("currency", pa.string()),
+        pa.field("cheapest_price", pa.float64()),
+        pa.field("error", pa.string()),
+        pa.field("evidence_json_path", pa.string()),
+        pa.field("evidence_sha256", pa.string()),
+    ]
+)
+
+DAILY_MIN_SCHEMA = pa.schema(
+    [
+        pa.field("route", pa.string()),
+        pa.field("outbound_date", pa.string()),
+        pa.field("run_date", pa.string()),
+        pa.field("currency", pa.string()),
+        pa.field("min_price", pa.float64()),
+        pa.field("last_observed_at_utc", _TS),
+    ]
+)
+
+AIRLINE_STATS_SCHEMA = pa.schema(
+    [
+        pa.field("route", pa.string()),
+        pa.field("airline", pa.string()),
+        pa.field("currency", pa.string()),
+        pa.field("offers", pa.int64()),
+        pa.field("min_price", pa.float64()),
+        pa.field("avg_price", pa.float64()),
+        pa.field("max_price", pa.float64()),
+        pa.field("first_seen_utc", _TS),
+        pa.field("last_seen_utc", _TS),
+    ]
+)
+
+SERVING_SCHEMAS: dict[str, pa.Schema] = {
+    "latest_run": LATEST_RUN_SCHEMA,
+    "daily_min": DAILY_MIN_SCHEMA,
+    "airline_stats": AIRLINE_STATS_SCHEMA,
+}
+
+_DAILY_KEYS = ["route", "outbound_date", "run_date"]
+_AIRLINE_KEYS = ["route", "airline"]
+
+# Serving table -> builder of a route's new partition from (run rows, offers, existing
+# partition or None); a builder returns None when the partition is unchanged.
+_Builder = Callable[[pa.Table, pa.Table, "pa.Table | None"], "pa.Table | None"]
+
+
+def serving_path(dataset_root: Path, table_name: str, route: str) -> Path:
+    """Return the file of one route's partition of a serving table."""
+    return dataset_root / SERVING_DIR / table_name / f"route={route}" / f"{table_name}.parquet"
+
+
+def update_serving_tables(*, dataset_root: Path, search_runs: Sequence[SearchRun]) -> list[Path]:
+    """Fold the rows of a run into the serving tables.
+
+    Must run after the run's rows were loaded: a dataset without serving tables is backfilled
+    from the stored history, which then already includes them. Re-applying a run (e.g. after
+    `run --resume`) does not count its offers twice.
+
+    Args:
+        dataset_root: Dataset folder (e.g. `data/flight_price_tracker`).
+        search_runs: Search runs (with their offers) of this run.
+
+    Returns:
+        Paths of the partitions written.
+    """
+    with _serving_lock(dataset_root):
+        return _update_serving_tables(dataset_root=dataset_root, search_runs=search_runs)
+
+
+def _update_serving_tables(*, dataset_root: Path, search_runs: Sequence[SearchRun]) -> list[Path]:
+    """Fold the rows of a run into the serving tables (the caller holds the serving lock)."""
+    if (dataset_root / SERVING_DIR).exists():
+        runs = search_runs_to_table(search_runs, load_id="")
+        offers = offers_to_table(search_runs, load_id="")
+    else:
+        runs, offers = _read_history(dataset_root)
+
+    builders: dict[str, _Builder] = {
+        "latest_run": _latest_run,
+        "daily_min": _daily_min,
+        "airline_stats": _airline_stats,
+    }
+    written: list[Path] = []
+    for route in pc.unique(runs.column("route")).to_pylist():
+        route_runs = runs.filter(pc.equal(runs.column("route"), route))
+        route_offers = offers.filter(pc.equal(offers.column("route"), route))
+        for table_name, build in builders.items():
+            path = serving_path(dataset_root, table_name, route)
+            existing = pq.read_table(path) if path.exists() else None
+            table = build(route_runs, route_offers, existing)
+            if table is not None:
+                table = table.cast(SERVING_SCHEMAS[table_name])
+                write_atomic(path, lambda tmp, table=table: pq.write_table(table, tmp))
+                written.append(path)
+    return written
+
+
+def update_serving_run_metrics(*, dataset_root: Path, run_metrics: pa.Table) -> Path | None:
+    """Append the stage samples of a run to the `run_metrics` serving table.
+
+    Must run after the samples were written to `run_metrics`: a missing serving table is
+    backfilled from the retained run dates of the stored history, which then already
+    includes them.
+
+    Args:
+        dataset_root: Dataset folder (e.g. `data/flight_price_tracker`).
+        run_metrics: Samples of this run, with `RUN_METRICS_SCHEMA`.
+
+    Returns:
+        Path of the file written, or None if there are no samples.
+    """
+    with _serving_lock(dataset_root):
+        return _update_serving_run_metrics(dataset_root=dataset_root, run_metrics=run_metrics)
+
+
+def _update_serving_run_metrics(*, dataset_root: Path, run_metrics: pa.Table) -> Path | None:
+    """Append the stage samples of a run to `run_metrics` (the caller holds the serving lock)."""
+    path = _run_metrics_path(dataset_root)
+    if path.exists():
+        table = pa.concat_tables([pq.read_table(path), run_metrics.cast(RUN_METRICS_SCHEMA)])
+    else:
+        table = _read_run_metrics_history(dataset_root)
+    if table.num_rows == 0:
+        return None
+    table = _recent(table).sort_by([("observed_at_utc", "ascending"), ("stage", "ascending")])
+    write_atomic(path, lambda tmp: pq.write_table(table, tmp))
+    return path
+
+
+def rebuild_serving_tables(*, dataset_root: Path) -> list[Path]:
+    """Rebuild the serving tables from the full history (e.g. after `reprocess`).
+
+    Args:
+        dataset_root: Dataset folder (e.g. `data/flight_price_tracker`).
+
+    Returns:
+        Paths of the partitions written.
+    """
+    with _serving_lock(dataset_root):
+        shutil.rmtree(dataset_root / SERVING_DIR, ignore_errors=True)
+        written = _update_serving_tables(dataset_root=dataset_root, search_runs=[])
+        path = _update_serving_run_metrics(
+            dataset_root=dataset_root, run_metrics=RUN_METRICS_SCHEMA.empty_table()
+        )
+    return written if path is None else [*written, path]
+
+
+def _serving_lock(dataset_root: Path) -> AbstractContextManager[None]:
+    """Return the lock held by serving table updates (outside the folder `rebuild` removes)."""
+    return exclusive_lock(dataset_root / f".{SERVING_DIR}.lock")
+
+
+def _run_metrics_path(dataset_root: Path) -> Path:
+    """Return the file of the `run_metrics` serving table."""
+    return dataset_root / SERVING_DIR / RUN_METRICS_TABLE / f"{RUN_METRICS_TABLE}.parquet"
+
+
+def _read_run_metrics_history(dataset_root: Path) -> pa.Table:
+    """Read the samples of the retained run dates from the `run_metrics` table."""
+    if not (dataset_root / RUN_METRICS_TABLE).exists():
+        return RUN_METRICS_SCHEMA.empty_table()
+    dataset = ds.dataset(
+        str(dataset_root / RUN_METRICS_TABLE),
+        format="parquet",
+        schema=RUN_METRICS_SCHEMA,
+        partitioning=ds.partitioning(pa.schema([("run_date", pa.string())]), flavor="hive"),
+    )
+    run_dates = dataset.to_table(columns=["run_date"]).column("run_date")
+    if len(run_dates) == 0:
+        return RUN_METRICS_SCHEMA.empty_table()
+    cutoff = _cutoff(pc.max(run_dates).as_py())
+    return dataset.to_table(filter=ds.field("run_date") >= cutoff)
+
+
+def _recent(table: pa.Table) -> pa.Table:
+    """Drop the rows of run dates more than `RETENTION_DAYS` before the latest one."""
+    cutoff = _cutoff(pc.max(table.column("run_date")).as_py())
+    return table.filter(pc.greater_equal(table.column("run_date"), cutoff))
+
+
+def _cutoff(latest_run_date: str) -> str:
+    """Return the earliest run date kept when `latest_run_date` is the latest one."""
+    return (date.fromisoformat(latest_run_date) - timedelta(days=RETENTION_DAYS - 1)).isoformat()
+
+
+def _read_history(dataset_root: Path) -> tuple[pa.Table, pa.Table]:
+    """Read the columns the serving tables need from all stored runs and offers."""
+    tables = []
+    for table_name, columns in (
+        ("search_runs", [*LATEST_RUN_SCHEMA.names, "run_date"]),
+        ("offers", ["route", "observed_at_utc", "return_date", "currency", "price", "airlines"]),
+    ):
+        dataset = open_dataset(dataset_root, table_name)
+        if (dataset_root / table_name).exists():
+            tables.append(dataset.to_table(columns=columns))
+        else:
+            tables.append(dataset.schema.empty_table().select(columns))
+    return tables[0], tables[1]
+
+
+def _latest_run(runs: pa.Table, offers: pa.Table, existing: pa.Table | None) -> pa.Table | None:
+    """Return the rows of the route's latest run, unless a later run is already stored."""
+    latest = pc.max(runs.column("observed_at_utc"))
+    if existing is not None and existing.num_rows:
+        if pc.max(existing.column("observed_at_utc")).as_py() > latest.as_py():
+            return None
+    rows = runs.filter(pc.equal(runs.column("observed_at_utc"), latest))
+    return rows.select(LATEST_RUN_SCHEMA.names).sort_by(
+        [("outbound_date", "ascending"), ("return_date", "ascending")]
+    )
+
+
+def _daily_min(runs: pa.Table, offers: pa.Table, existing: pa.Table | None) -> pa.Table | None:
+    """Merge the run's lowest one-way prices per outbound date and run date (retained dates)."""
+    priced = runs.filter(
+        pc.and_(pc.is_null(runs.column("return_date")), pc.is_valid(runs.column("cheapest_price")))
+    )
+    if priced.num_rows == 0:
+        return None
+    new = _aggregate(
+        priced,
+        _DAILY_KEYS,
+        [
+            ("currency", "last", "currency"),
+            ("cheapest_price", "min", "min_price"),
+            ("observed_at_utc", "max", "last_observed_at_utc"),
+        ],
+    )
+    if existing is not None:
+        # Min and max are idempotent, so folding a run in twice changes nothing.
+        new = _aggregate(
+            pa.concat_tables([existing, new.cast(existing.schema)]),
+            _DAILY_KEYS,
+            [
+                ("currency", "last", "currency"),
+                ("min_price", "min", "min_price"),
+                ("last_observed_at_utc", "max", "last_observed_at_utc"),
+            ],
+        )
+    return _recent(new).sort_by([("outbound_date", "ascending"), ("run_date", "ascending")])
+
+
+def _airline_stats(runs: pa.Table, offers: pa.Table, existing: pa.Table | None) -> pa.Table | None:
+    """Merge the run's one-way offers into per-airline counts and prices."""
+    mask = pc.and_(pc.is_null(offers.column("return_date")), pc.is_valid(offers.column("price")))
+    mask = pc.and_(mask, pc.is_valid(offers.column("airlines")))
+    if existing is not None and existing.num_rows:
+        # Offers of runs that are already counted (e.g. a resumed run) are skipped.
+        seen = pc.max(existing.column("last_seen_utc"))
+        mask = pc.and_(mask, pc.greater(offers.column("observed_at_utc"), seen))
+    offers = offers.filter(mask)
+    if offers.num_rows == 0:
+        return None
+
+    names = pc.split_pattern(offers.column("airlines"), ", ")
+    exploded = (
+        offers.select(["route", "currency", "price", "observed_at_utc"])
+        .take(pc.list_parent_indices(names))
+        .append_column("airline", pc.list_flatten(names))
+    )
+    new = _aggregate(
+        exploded,
+        _AIRLINE_KEYS,
+        [
+            ("currency", "last", "currency"),
+            ("price", "count", "offers"),
+            ("price", "sum", "price_sum"),
+            ("price", "min", "min_price"),
+            ("price", "max", "max_price"),
+            ("observed_at_utc", "min", "first_seen_utc"),
+            ("observed_at_utc", "max", "last_seen_utc"),
+        ],
+    )
+    if existing is not None:
+        # Averages are merged through their totals.
+        totals = pc.multiply(existing.column("avg_price"), existing.column("offers"))
+        previous = existing.append_column("price_sum", totals).select(new.column_names)
+        new = _aggregate(
+            pa.concat_tables([previous.cast(new.schema), new]),
+            _AIRLINE_KEYS,
+            [
+                ("currency", "last", "currency"),
+                ("offers", "sum", "offers"),
+                ("price_sum", "sum", "price_sum"),
+                ("min_price", "min", "min_price"),
+                ("max_price", "max", "max_price"),
+                ("first_seen_utc", "min", "first_seen_utc"),
+                ("last_seen_utc", "max", "last_seen_utc"),
+            ],
+        )
+    avg = pc.divide(new.column("price_sum"), pc.cast(new.column("offers"), pa.float64()))
+    table = new.append_column("avg_price", avg).select(AIRLINE_STATS_SCHEMA.names)
+    return table.sort_by([("offers", "descending"), ("airline", "ascending")])
+
+
+def _aggregate(
+    table: pa.Table, keys: list[str], aggregations: list[tuple[str, str, str]]
+) -> pa.Table:
+    """Group `table` by `keys`, naming each (column, function, name) aggregate `name`."""
+    # Single-threaded, so "last" follows row order (later tables win when concatenated).
+    grouped = table.group_by(keys, use_threads=False).aggregate(
+        [(column, function) for column, function, _ in aggregations]
+    )
+    columns = {key: grouped.column(key) for key in keys}
+    for column, function, name in aggregations:
+        columns[name] = grouped.column(f"{column}_{function}")
+    return pa.table(columns)
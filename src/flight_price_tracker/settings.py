@@ -1,30 +1,31 @@
 """Configuration and environment settings.
 
-Loads non-secret configuration from YAML and secrets (API keys) from `.env`.
+Loads non-secret configuration from YAML. Secrets (API keys) are read from `.env` by
+:mod:`flight_price_tracker.env`.
 """
 
 from __future__ import annotations
 
 from pathlib import Path
-from typing import Any
+from typing import Any, Literal
 
 import yaml
-from pydantic import BaseModel, ConfigDict, Field
-from pydantic_settings import BaseSettings, SettingsConfigDict
+from pydantic import BaseModel, ConfigDict, Field, model_validator
 
+from flight_price_tracker.cron import CronSchedule
 
-class RouteConfig(BaseModel):
-    """Route definition.
-
-    Attributes:
-        origin: IATA airport code of the departure airport.
-        destination: IATA airport code of the arrival airport.
-    """
-
-    model_config = ConfigDict(extra="forbid")
-
-    origin: str = Field(min_length=3, max_length=10)
-    destination: str = Field(min_length=3, max_length=10)
+_SHARED_SERPAPI_FIELDS = frozenset(
+    {
+        "rate_limit_seconds",
+        "max_concurrency",
+        "timeout_seconds",
+        "max_retries",
+        "retry_backoff_seconds",
+        "retry_max_backoff_seconds",
+        "circuit_breaker_failures",
+        "final_pass_delay_seconds",
+    }
+)
 
 
 class WindowConfig(BaseModel):
@@ -33,12 +34,32 @@ class WindowConfig(BaseModel):
     Attributes:
         start_offset_days: Days from today to start querying.
         window_days: Number of consecutive outbound dates to query.
+        trip_lengths_days: Stay lengths for round trips. When set, every outbound date is
+            queried once per length as a round trip returning that many days later (an
+            outbound x trip-length matrix); when unset, outbound dates are queried one-way.
     """
 
     model_config = ConfigDict(extra="forbid")
 
     start_offset_days: int = Field(default=1, ge=0, le=365)
     window_days: int = Field(default=30, ge=1, le=365)
+    trip_lengths_days: list[int] | None = Field(default=None, min_length=1, max_length=60)
+
+    @model_validator(mode="after")
+    def _check_trip_lengths(self) -> WindowConfig:
+        """Require distinct trip lengths between 0 and 365 days."""
+        lengths = self.trip_lengths_days
+        if lengths is not None:
+            if len(set(lengths)) != len(lengths):
+                raise ValueError("`window.trip_lengths_days` must not contain duplicates")
+            if any(n < 0 or n > 365 for n in lengths):
+                raise ValueError("`window.trip_lengths_days` must be between 0 and 365")
+        return self
+
+    @property
+    def round_trip(self) -> bool:
+        """Whether the window is queried as round trips."""
+        return self.trip_lengths_days is not None
 
 
 class SerpApiConfig(BaseModel):
@@ -54,7 +75,19 @@ class SerpApiConfig(BaseModel):
         include_airlines: Optional list of airline codes to include.
         exclude_airlines: Optional list of airline codes to exclude.
         top_n_offers: Number of offers to store per outbound date.
-        rate_limit_seconds: Sleep between API calls.
+        rate_limit_seconds: Minimum spacing between API request starts (global rate cap).
+        max_concurrency: Maximum number of API requests in flight at once.
+        timeout_seconds: Connect/read timeout for each API request.
+        max_retries: Retries of a request after a transient failure (HTTP 429/5xx, connection
+            error, timeout).
+        retry_backoff_seconds: Backoff cap of the first retry; doubles on every further retry
+            (the actual wait is drawn uniformly below the cap, and never shorter than the
+            response's `Retry-After`).
+        retry_max_backoff_seconds: Longest single wait between retries.
+        circuit_breaker_failures: Consecutive failed requests after which the run stops
+            calling SerpApi.
+        final_pass_delay_seconds: Pause before dates that failed transiently are re-attempted
+            once more at the end of the fetch.
     """
 
     model_config = ConfigDict(extra="forbid")
@@ -69,6 +102,74 @@ class SerpApiConfig(BaseModel):
     exclude_airlines: list[str] | None = None
     top_n_offers: int = Field(default=5, ge=1, le=50)
     rate_limit_seconds: float = Field(default=1.0, ge=0.0, le=60.0)
+    max_concurrency: int = Field(default=4, ge=1, le=32)
+    timeout_seconds: float = Field(default=60.0, gt=0.0, le=600.0)
+    max_retries: int = Field(default=3, ge=0, le=10)
+    retry_backoff_seconds: float = Field(default=1.0, ge=0.0, le=60.0)
+    retry_max_backoff_seconds: float = Field(default=30.0, ge=0.0, le=600.0)
+    circuit_breaker_failures: int = Field(default=5, ge=1)
+    final_pass_delay_seconds: float = Field(default=5.0, ge=0.0, le=600.0)
+
+
+class TriggerConfig(BaseModel):
+    """When the `serve` daemon runs a route; exactly one of `cron` or `interval_minutes`.
+
+    Attributes:
+        cron: Five-field cron expression in UTC (e.g. `0 6 * * *`), or `@daily` etc.
+        interval_minutes: Minutes between runs; the first run starts when the daemon does.
+    """
+
+    model_config = ConfigDict(extra="forbid")
+
+    cron: str | None = None
+    interval_minutes: float | None = Field(default=None, gt=0.0, le=366 * 24 * 60)
+
+    @model_validator(mode="after")
+    def _check_trigger(self) -> TriggerConfig:
+        """Require exactly one of `cron`/`interval_minutes` and a valid cron expression."""
+        if (self.cron is None) == (self.interval_minutes is None):
+            raise ValueError("A trigger must set exactly one of `cron` or `interval_minutes`")
+        if self.cron is not None:
+            CronSchedule.parse(self.cron)
+        return self
+
+
+class RouteConfig(BaseModel):
+    """Route definition.
+
+    Attributes:
+        origin: IATA airport code of the departure airport.
+        destination: IATA airport code of the arrival airport.
+        window: Optional window override for this route.
+        serpapi: Optional SerpApi overrides for this route; only the fields set here replace
+            the top-level values. Fetch-engine settings (rate limit, concurrency, timeout, retries)
+            are shared by all routes and cannot be overridden.
+        trigger: Optional `serve` schedule for this route (default: `serve.trigger`).
+    """
+
+    model_config = ConfigDict(extra="forbid")
+
+    origin: str = Field(min_length=3, max_length=10)
+    destination: str = Field(min_length=3, max_length=10)
+    window: WindowConfig | None = None
+    serpapi: SerpApiConfig | None = None
+    trigger: TriggerConfig | None = None
+
+    @property
+    def route_id(self) -> str:
+        """Route identifier in the form ORIGIN-DESTINATION."""
+        return f"{self.origin}-{self.destination}"
+
+    @model_validator(mode="after")
+    def _check_serpapi_overrides(self) -> RouteConfig:
+        """Reject per-route overrides of settings shared by the fetch engine."""
+        if self.serpapi is not None:
+            shared = self.serpapi.model_fields_set & _SHARED_SERPAPI_FIELDS
+            if shared:
+                raise ValueError(
+                    f"Route {self.route_id}: serpapi.{sorted(shared)[0]} can only be set globally"
+                )
+        return self
 
 
 class ReportingConfig(BaseModel):
@@ -85,23 +186,246 @@ class ReportingConfig(BaseModel):
     top_k_deals: int = Field(default=5, ge=1, le=50)
 
 
-class AppConfig(BaseModel):
-    """Top-level YAML configuration model."""
+class StorageConfig(BaseModel):
+    """Parquet output configuration.
+
+    Attributes:
+        writer: Parquet writer backend; `dlt` runs a dlt filesystem pipeline, `pyarrow`
+            writes the same layout directly with fixed schemas.
+        evidence: Evidence store; `files` writes standalone JSON + `.sha256` sidecars,
+            `archive` writes deduplicated zstd blobs plus a small index.
+    """
 
     model_config = ConfigDict(extra="forbid")
 
-    route: RouteConfig
-    window: WindowConfig = WindowConfig()
-    serpapi: SerpApiConfig = SerpApiConfig()
-    reporting: ReportingConfig = ReportingConfig()
+    writer: Literal["dlt", "pyarrow"] = "dlt"
+    evidence: Literal["files", "archive"] = "files"
 
 
-class EnvSettings(BaseSettings):
-    """Secrets loaded from environment variables and `.env`."""
+class CacheConfig(BaseModel):
+    """SerpApi response cache configuration.
 
-    model_config = SettingsConfigDict(env_prefix="", env_file=".env", extra="ignore")
+    Attributes:
+        enabled: Whether to reuse cached responses (overridable with `--cache/--no-cache`).
+        dir: Directory holding cache entries.
+        ttl_seconds: Maximum age of a cached response.
+        max_entries: Maximum number of entries kept (least recently used are evicted).
+    """
 
-    serpapi_api_key: str = Field(validation_alias="SERPAPI_API_KEY")
+    model_config = ConfigDict(extra="forbid")
+
+    enabled: bool = False
+    dir: Path = Path(".tracker/cache/serpapi")
+    ttl_seconds: float = Field(default=6 * 3600, gt=0.0)
+    max_entries: int = Field(default=1000, ge=1)
+
+
+class ScheduleConfig(BaseModel):
+    """Adaptive re-query scheduling configuration.
+
+    Attributes:
+        enabled: Whether to skip dates that are not due (otherwise every date is queried).
+        daily_call_budget: Maximum SerpApi queries per UTC day across all routes (None for no
+            limit).
+        lookback_days: Days of `search_runs` history used to measure volatility.
+        near_term_days: Dates departing within this many days are queried on every run.
+        volatile_change: Relative price range at or above which a date is queried every run.
+        stable_change: Relative price range at or below which a date is queried every
+            `max_interval_days`.
+        max_interval_days: Longest refresh interval for stable dates.
+    """
+
+    model_config = ConfigDict(extra="forbid")
+
+    enabled: bool = False
+    daily_call_budget: int | None = Field(default=None, ge=1)
+    lookback_days: int = Field(default=14, ge=1, le=365)
+    near_term_days: int = Field(default=7, ge=0, le=365)
+    volatile_change: float = Field(default=0.05, gt=0.0)
+    stable_change: float = Field(default=0.01, ge=0.0)
+    max_interval_days: int = Field(default=7, ge=1, le=60)
+
+    @model_validator(mode="after")
+    def _check_thresholds(self) -> ScheduleConfig:
+        """Require `stable_change` < `volatile_change`."""
+        if self.stable_change >= self.volatile_change:
+            raise ValueError("`schedule.stable_change` must be below `volatile_change`")
+        return self
+
+
+class AlertRuleConfig(BaseModel):
+    """One price alert rule, evaluated against every one-way date of each run.
+
+    Attributes:
+        name: Unique rule name, included in every alert.
+        kind: `drop`: the price fell by at least `threshold` since the date's previous
+            observation; `drop_pct`: it fell by at least `threshold` percent; `new_low`: it is
+            below every earlier observation of the date; `below`: it crossed below `threshold`
+            (fires again only after the price was back at or above it).
+        threshold: Amount, percentage or price limit (not used by `new_low`).
+        routes: Route identifiers the rule applies to (None: all routes).
+    """
+
+    model_config = ConfigDict(extra="forbid")
+
+    name: str = Field(min_length=1)
+    kind: Literal["drop", "drop_pct", "new_low", "below"]
+    threshold: float | None = Field(default=None, gt=0.0)
+    routes: list[str] | None = None
+
+    @model_validator(mode="after")
+    def _check_threshold(self) -> AlertRuleConfig:
+        """Require a threshold for every kind except `new_low`."""
+        if (self.threshold is None) != (self.kind == "new_low"):
+            raise ValueError(
+                f"Alert rule {self.name!r}: `threshold` is required for {self.kind!r} rules"
+                if self.threshold is None
+                else f"Alert rule {self.name!r}: `new_low` rules take no `threshold`"
+            )
+        return self
+
+
+class AlertSinkConfig(BaseModel):
+    """Destination of alert notifications.
+
+    Attributes:
+        type: `stdout` prints one line per alert, `file` appends one JSON object per line to
+            `path`, `webhook` POSTs `{"alerts": [...]}` as JSON to `url`.
+        path: JSON Lines file of a `file` sink.
+        url: Endpoint of a `webhook` sink.
+        timeout_seconds: Connect/read timeout of a `webhook` sink.
+    """
+
+    model_config = ConfigDict(extra="forbid")
+
+    type: Literal["stdout", "file", "webhook"]
+    path: Path | None = None
+    url: str | None = None
+    timeout_seconds: float = Field(default=10.0, gt=0.0, le=600.0)
+
+    @model_validator(mode="after")
+    def _check_target(self) -> AlertSinkConfig:
+        """Require `path` for file sinks and `url` for webhook sinks."""
+        if self.type == "file" and self.path is None:
+            raise ValueError("`file` alert sinks need a `path`")
+        if self.type == "webhook" and self.url is None:
+            raise ValueError("`webhook` alert sinks need a `url`")
+        return self
+
+
+class AlertsConfig(BaseModel):
+    """Price alerting configuration.
+
+    Attributes:
+        rules: Alert rules; no rules means alerting is off.
+        sinks: Where alerts are sent (default: stdout).
+    """
+
+    model_config = ConfigDict(extra="forbid")
+
+    rules: list[AlertRuleConfig] = Field(default_factory=list)
+    sinks: list[AlertSinkConfig] = Field(default_factory=lambda: [AlertSinkConfig(type="stdout")])
+
+    @model_validator(mode="after")
+    def _check_names(self) -> AlertsConfig:
+        """Require unique rule names."""
+        names = [r.name for r in self.rules]
+        dupes = sorted({n for n in names if names.count(n) > 1})
+        if dupes:
+            raise ValueError(f"Duplicate alert rules: {', '.join(dupes)}")
+        return self
+
+
+class ServeConfig(BaseModel):
+    """`serve` daemon configuration.
+
+    Attributes:
+        trigger: Default schedule of routes without their own `trigger`.
+        host: Address of the health and metrics endpoint.
+        port: Port of the health and metrics endpoint (0 picks a free port).
+        reload_seconds: How often the config file is checked for changes.
+    """
+
+    model_config = ConfigDict(extra="forbid")
+
+    trigger: TriggerConfig = TriggerConfig(cron="0 6 * * *")
+    host: str = "127.0.0.1"
+    port: int = Field(default=8787, ge=0, le=65535)
+    reload_seconds: float = Field(default=5.0, gt=0.0, le=3600.0)
+
+
+class AppConfig(BaseModel):
+    """Top-level YAML configuration model.
+
+    Exactly one of `route` (a single route) or `routes` (a batch of routes sharing one fetch
+    queue, rate limit and Parquet load) must be set.
+    """
+
+    model_config = ConfigDict(extra="forbid")
+
+    route: RouteConfig | None = None
+    routes: list[RouteConfig] | None = None
+    window: WindowConfig = WindowConfig()
+    serpapi: SerpApiConfig = SerpApiConfig()
+    reporting: ReportingConfig = ReportingConfig()
+    storage: StorageConfig = StorageConfig()
+    cache: CacheConfig = CacheConfig()
+    schedule: ScheduleConfig = ScheduleConfig()
+    serve: ServeConfig = ServeConfig()
+    alerts: AlertsConfig = AlertsConfig()
+
+    @model_validator(mode="after")
+    def _check_routes(self) -> AppConfig:
+        """Require exactly one of `route`/`routes` and unique route identifiers."""
+        if (self.route is None) == (self.routes is None):
+            raise ValueError("Config must set exactly one of `route` or `routes`")
+        if self.routes is not None:
+            if not self.routes:
+                raise ValueError("`routes` must not be empty")
+            ids = [r.route_id for r in self.routes]
+            dupes = sorted({i for i in ids if ids.count(i) > 1})
+            if dupes:
+                raise ValueError(f"Duplicate routes: {', '.join(dupes)}")
+        if self.schedule.enabled and any(c.window.round_trip for c in self.split_routes()):
+            raise ValueError("`schedule` is only supported for one-way windows")
+        known = {r.route_id for r in self.routes or ([self.route] if self.route else [])}
+        for rule in self.alerts.rules:
+            unknown = sorted(set(rule.routes or ()) - known)
+            if unknown:
+                raise ValueError(f"Alert rule {rule.name!r}: unknown route {unknown[0]}")
+        return self
+
+    def split_routes(self) -> list[AppConfig]:
+        """Resolve the configured routes into one single-route config each.
+
+        Per-route `window` replaces the top-level window; per-route `serpapi` fields are
+        layered over the top-level `serpapi` section.
+
+        Returns:
+            Configs with `route` set and per-route overrides applied, in config order.
+        """
+        routes = self.routes or ([self.route] if self.route is not None else [])
+        out: list[AppConfig] = []
+        for r in routes:
+            serpapi = self.serpapi
+            if r.serpapi is not None:
+                serpapi = serpapi.model_copy(update=r.serpapi.model_dump(exclude_unset=True))
+            out.append(
+                self.model_copy(
+                    update={
+                        "route": r.model_copy(update={"window": None, "serpapi": None}),
+                        "routes": None,
+                        "window": r.window or self.window,
+                        "serpapi": serpapi,
+                    }
+                )
+            )
+        return out
+
+    def route_triggers(self) -> dict[str, TriggerConfig]:
+        """Return the `serve` trigger of each route (its own, or `serve.trigger`), in order."""
+        routes = self.routes or ([self.route] if self.route is not None else [])
+        return {r.route_id: r.trigger or self.serve.trigger for r in routes}
 
 
 def load_app_config(path: Path) -> AppConfig:
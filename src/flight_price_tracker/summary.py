@@ -0,0 +1,259 @@
+"""Incrementally maintained `price_history_summary` table.
+
+One row per (route, outbound_date) with running price statistics, stored as a single Parquet
+file next to the partitioned tables:
+
+    data/flight_price_tracker/price_history_summary/price_history_summary.parquet
+
+Each run folds only its own `search_runs` into the rows of the dates it touched, so reading
+price statistics costs O(window) instead of a scan over the full history. The first update
+on a dataset without a summary backfills it from the existing `search_runs` once. Round-trip
+queries (with a `return_date`) are not summarised.
+
+An update reads, modifies and rewrites the whole file, so it holds an exclusive lock
+(`data/flight_price_tracker/.price_history_summary.lock`); a scheduled run and the `serve`
+daemon updating the summary at the same time do not lose each other's observations.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass, fields
+from datetime import datetime
+from pathlib import Path
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from flight_price_tracker.parquet_writer import exclusive_lock, open_dataset, write_atomic
+from flight_price_tracker.records import SearchRun
+
+TABLE_NAME = "price_history_summary"
+
+_TS = pa.timestamp("us", tz="UTC")
+
+SUMMARY_SCHEMA = pa.schema(
+    [
+        pa.field("route", pa.string(), nullable=False),
+        pa.field("outbound_date", pa.string(), nullable=False),
+        pa.field("currency", pa.string()),
+        pa.field("observations", pa.int64(), nullable=False),
+        pa.field("first_seen_utc", _TS, nullable=False),
+        pa.field("last_seen_utc", _TS, nullable=False),
+        pa.field("min_price", pa.float64(), nullable=False),
+        pa.field("max_price", pa.float64(), nullable=False),
+        pa.field("last_price", pa.float64(), nullable=False),
+        pa.field("last_change", pa.float64()),
+        pa.field("last_change_utc", _TS),
+        pa.field("last_drop_utc", _TS),
+    ]
+)
+
+
+@dataclass(frozen=True, slots=True)
+class PriceSummary:
+    """Running price statistics of one (route, outbound_date).
+
+    Only successful observations (with a cheapest price) are counted.
+
+    Attributes:
+        route: Route identifier in the form ORIGIN-DESTINATION.
+        outbound_date: Outbound date (YYYY-MM-DD).
+        currency: Currency of the latest observation.
+        observations: Number of priced observations.
+        first_seen_utc: Time of the first priced observation.
+        last_seen_utc: Time of the latest priced observation.
+        min_price: Lowest cheapest price seen.
+        max_price: Highest cheapest price seen.
+        last_price: Cheapest price of the latest observation.
+        last_change: Difference between the latest price and the price before it changed.
+        last_change_utc: Time the price last changed.
+        last_drop_utc: Time the price last went down.
+    """
+
+    route: str
+    outbound_date: str
+    currency: str | None
+    observations: int
+    first_seen_utc: datetime
+    last_seen_utc: datetime
+    min_price: float
+    max_price: float
+    last_price: float
+    last_change: float | None = None
+    last_change_utc: datetime | None = None
+    last_drop_utc: datetime | None = None
+
+    def observe(
+        self, *, price: float, observed_at_utc: datetime, currency: str | None
+    ) -> PriceSummary:
+        """Return the summary after one more observation.
+
+        Observations at or before `last_seen_utc` are ignored, which makes re-applying the
+        rows of a run (e.g. after `run --resume`) a no-op.
+        """
+        if observed_at_utc <= self.last_seen_utc:
+            return self
+        changed = price != self.last_price
+        return PriceSummary(
+            route=self.route,
+            outbound_date=self.outbound_date,
+            currency=currency,
+            observations=self.observations + 1,
+            first_seen_utc=self.first_seen_utc,
+            last_seen_utc=observed_at_utc,
+            min_price=min(self.min_price, price),
+            max_price=max(self.max_price, price),
+            last_price=price,
+            last_change=price - self.last_price if changed else self.last_change,
+            last_change_utc=observed_at_utc if changed else self.last_change_utc,
+            last_drop_utc=observed_at_utc if price < self.last_price else self.last_drop_utc,
+        )
+
+
+def summary_path(dataset_root: Path) -> Path:
+    """Return the summary file of a dataset."""
+    return dataset_root / TABLE_NAME / f"{TABLE_NAME}.parquet"
+
+
+def update_summary(*, dataset_root: Path, search_runs: Sequence[SearchRun]) -> Path:
+    """Fold new search runs into the summary and rewrite it atomically.
+
+    Only the summary rows of the touched (route, outbound_date) keys are converted to Python;
+    all other rows are carried over as Arrow data. The summary lock is held throughout.
+
+    Args:
+        dataset_root: Dataset folder (e.g. `data/flight_price_tracker`).
+        search_runs: Search runs written by this run.
+
+    Returns:
+        Path of the summary file.
+    """
+    path = summary_path(dataset_root)
+    with exclusive_lock(dataset_root / f".{TABLE_NAME}.lock"):
+        if path.exists():
+            existing = pq.read_table(path)
+        else:
+            existing = _backfill(dataset_root)
+
+        priced = sorted(
+            (r.observed_at_utc, r.route, r.outbound_date, r.cheapest_price, r.currency)
+            for r in search_runs
+            if r.cheapest_price is not None and r.return_date is None
+        )
+        mask = _key_mask(existing, {(route, od) for _, route, od, _, _ in priced})
+        current = {
+            (s.route, s.outbound_date): s
+            for s in (PriceSummary(**row) for row in existing.filter(mask).to_pylist())
+        }
+        for observed_at, route, od, price, currency in priced:
+            current[(route, od)] = _observe(
+                current.get((route, od)),
+                route=route,
+                outbound_date=od,
+                price=price,
+                observed_at_utc=observed_at,
+                currency=currency,
+            )
+
+        table = pa.concat_tables([existing.filter(pc.invert(mask)), _to_table(current.values())])
+        table = table.sort_by([("route", "ascending"), ("outbound_date", "ascending")])
+        write_atomic(path, lambda tmp: pq.write_table(table, tmp))
+    return path
+
+
+def load_summary(
+    *, dataset_root: Path, route: str, outbound_dates: Iterable[str]
+) -> dict[str, PriceSummary]:
+    """Read the summary rows of some outbound dates of one route.
+
+    Args:
+        dataset_root: Dataset folder (e.g. `data/flight_price_tracker`).
+        route: Route identifier in the form ORIGIN-DESTINATION.
+        outbound_dates: Outbound dates to read.
+
+    Returns:
+        Summaries keyed by outbound date (dates without observations are missing).
+    """
+    path = summary_path(dataset_root)
+    if not path.exists():
+        return {}
+    table = pq.read_table(
+        path,
+        filters=(ds.field("route") == route)
+        & ds.field("outbound_date").isin(pa.array(list(outbound_dates), type=pa.string())),
+    )
+    return {row["outbound_date"]: PriceSummary(**row) for row in table.to_pylist()}
+
+
+def _observe(
+    summary: PriceSummary | None,
+    *,
+    route: str,
+    outbound_date: str,
+    price: float,
+    observed_at_utc: datetime,
+    currency: str | None,
+) -> PriceSummary:
+    """Apply one observation to a summary, starting a new one if needed."""
+    if summary is None:
+        return PriceSummary(
+            route=route,
+            outbound_date=outbound_date,
+            currency=currency,
+            observations=1,
+            first_seen_utc=observed_at_utc,
+            last_seen_utc=observed_at_utc,
+            min_price=price,
+            max_price=price,
+            last_price=price,
+        )
+    return summary.observe(price=price, observed_at_utc=observed_at_utc, currency=currency)
+
+
+def _backfill(dataset_root: Path) -> pa.Table:
+    """Build the summary from all existing `search_runs` (used once per dataset)."""
+    search_runs_dir = dataset_root / "search_runs"
+    if not search_runs_dir.exists():
+        return SUMMARY_SCHEMA.empty_table()
+    history = (
+        open_dataset(dataset_root, "search_runs")
+        .to_table(
+            columns=["route", "outbound_date", "currency", "observed_at_utc", "cheapest_price"],
+            filter=ds.field("cheapest_price").is_valid() & ds.field("return_date").is_null(),
+        )
+        .sort_by("observed_at_utc")
+    )
+    summaries: dict[tuple[str, str], PriceSummary] = {}
+    for row in history.to_pylist():
+        key = (row["route"], row["outbound_date"])
+        summaries[key] = _observe(
+            summaries.get(key),
+            route=row["route"],
+            outbound_date=row["outbound_date"],
+            price=float(row["cheapest_price"]),
+            observed_at_utc=row["observed_at_utc"],
+            currency=row["currency"],
+        )
+    return _to_table(summaries.values())
+
+
+def _key_mask(table: pa.Table, keys: set[tuple[str, str]]) -> pa.ChunkedArray:
+    """Return a boolean mask of the rows whose (route, outbound_date) is in `keys`."""
+    if not keys or table.num_rows == 0:
+        return pa.chunked_array([pa.array([False] * table.num_rows, type=pa.bool_())])
+    joined = pc.binary_join_element_wise(table["route"], table["outbound_date"], "\x1f")
+    wanted = pa.array([f"{route}\x1f{od}" for route, od in keys], type=pa.string())
+    return pc.is_in(joined, value_set=wanted)
+
+
+def _to_table(summaries: Iterable[PriceSummary]) -> pa.Table:
+    """Convert summaries to an Arrow table with `SUMMARY_SCHEMA`."""
+    names = [f.name for f in fields(PriceSummary)]
+    rows = list(summaries)
+    return pa.Table.from_arrays(
+        [pa.array([getattr(s, n) for s in rows], type=SUMMARY_SCHEMA.field(n).type) for n in names],
+        schema=SUMMARY_SCHEMA,
+    )
@@ -0,0 +1,239 @@
+"""Check stored evidence against its `.sha256` sidecars and the Parquet records.
+
+`verify` hashes every evidence payload referenced by `search_runs` (from the JSON file store
+or the archive, see :func:`flight_price_tracker.evidence_store.resolve_evidence`) plus every
+JSON evidence file on disk, and reports:
+
+- `missing`: a recorded evidence path resolves to neither a JSON file nor an archived blob;
+- `corrupt`: the payload's SHA256 differs from `search_runs.evidence_sha256`;
+- `missing_sidecar`: a JSON evidence file has no `.sha256` sidecar;
+- `sidecar_mismatch`: the sidecar differs from the payload's SHA256.
+
+Files are hashed in a thread pool (`hashlib` and zstd decompression release the GIL) and read
+in chunks, so memory stays flat however large a payload is. Every run writes a manifest of
+the size, mtime and digest of each file it hashed; an incremental run re-hashes only files
+whose size or mtime changed since then and still checks the cached digests against the
+current sidecars and records.
+"""
+
+from __future__ import annotations
+
+import json
+import time
+from collections import defaultdict
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from hashlib import sha256
+from pathlib import Path
+
+import pyarrow.dataset as ds
+
+from flight_price_tracker.evidence_store import (
+    EvidenceNotFoundError,
+    open_evidence,
+    resolve_evidence,
+)
+from flight_price_tracker.parquet_writer import open_dataset, write_atomic
+
+DEFAULT_MANIFEST_PATH = Path(".tracker/verify/manifest.json")
+
+_MANIFEST_VERSION = 1
+
+
+@dataclass(frozen=True)
+class VerifyIssue:
+    """One problem found with a piece of evidence.
+
+    Attributes:
+        kind: `missing`, `corrupt`, `missing_sidecar` or `sidecar_mismatch`.
+        path: Logical evidence path.
+        detail: Human-readable description.
+    """
+
+    kind: str
+    path: str
+    detail: str
+
+
+@dataclass(frozen=True)
+class VerifyStats:
+    """Outcome of a verification.
+
+    Attributes:
+        files: Evidence files checked (JSON files and archive blobs).
+        hashed: Files hashed in this run.
+        unchanged: Files whose digest was taken from the manifest (incremental runs).
+        bytes_hashed: Payload bytes hashed.
+        seconds: Wall-clock duration.
+        issues: Problems found, sorted by path.
+    """
+
+    files: int
+    hashed: int
+    unchanged: int
+    bytes_hashed: int
+    seconds: float
+    issues: tuple[VerifyIssue, ...]
+
+    @property
+    def ok(self) -> bool:
+        """Whether no issue was found."""
+        return not self.issues
+
+    @property
+    def megabytes_per_second(self) -> float:
+        """Hashing throughput in MB/s."""
+        return self.bytes_hashed / 1e6 / self.seconds if self.seconds > 0 else 0.0
+
+
+def verify_evidence(
+    *,
+    evidence_root: Path,
+    dataset_root: Path,
+    workers: int | None = None,
+    manifest_path: Path | None = DEFAULT_MANIFEST_PATH,
+    incremental: bool = False,
+    chunk_size: int = 1 << 20,
+    on_file: Callable[[Path], None] | None = None,
+) -> VerifyStats:
+    """Hash stored evidence and cross-check it with its sidecars and `search_runs` records.
+
+    Args:
+        evidence_root: Evidence folder (e.g. `evidence`).
+        dataset_root: Dataset folder (e.g. `data/flight_price_tracker`).
+        workers: Hashing threads (None: `ThreadPoolExecutor`'s default).
+        manifest_path: Manifest to write (and read, if incremental); None to skip it.
+        incremental: Re-hash only files whose size or mtime changed since the manifest.
+        chunk_size: Bytes read per chunk.
+        on_file: Called with each file after it has been hashed.
+
+    Returns:
+        Verification statistics and the issues found.
+    """
+    started = time.perf_counter()
+    recorded = _recorded_digests(dataset_root)
+    paths = set(recorded)
+    paths.update(p.as_posix() for p in evidence_root.glob("route=*/run_date=*/*.json"))
+
+    issues: list[VerifyIssue] = []
+    resolved: dict[str, Path] = {}
+    for path in paths:
+        try:
+            resolved[path] = resolve_evidence(path)
+        except EvidenceNotFoundError:
+            issues.append(VerifyIssue("missing", path, "no JSON file or archived blob"))
+
+    # Archived payloads with identical content share one blob: hash each file once.
+    files = {str(file): file for file in resolved.values()}
+    stats = {key: file.stat() for key, file in files.items()}
+    previous = _read_manifest(manifest_path) if incremental and manifest_path else {}
+    digests: dict[str, str] = {}
+    for key, st in stats.items():
+        entry = previous.get(key)
+        if entry is not None and entry[:2] == [st.st_size, st.st_mtime_ns]:
+            digests[key] = entry[2]
+    unchanged = len(digests)
+
+    def _hash(key: str) -> tuple[str, str, int]:
+        digest, size = _hash_file(files[key], chunk_size=chunk_size)
+        if on_file is not None:
+            on_file(files[key])
+        return key, digest, size
+
+    bytes_hashed = 0
+    todo = sorted(key for key in files if key not in digests)
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for key, digest, size in pool.map(_hash, todo):
+            digests[key] = digest
+            bytes_hashed += size
+
+    for path, file in resolved.items():
+        issues.extend(_check(path, file, digests[str(file)], recorded.get(path, ())))
+
+    if manifest_path is not None:
+        _write_manifest(
+            manifest_path,
+            {key: [st.st_size, st.st_mtime_ns, digests[key]] for key, st in stats.items()},
+        )
+    return VerifyStats(
+        files=len(files),
+        hashed=len(todo),
+        unchanged=unchanged,
+        bytes_hashed=bytes_hashed,
+        seconds=time.perf_counter() - started,
+        issues=tuple(sorted(issues, key=lambda i: (i.path, i.kind))),
+    )
+
+
+def _recorded_digests(dataset_root: Path) -> dict[str, set[str]]:
+    """Return the SHA256 digests recorded in `search_runs`, by evidence path."""
+    recorded: dict[str, set[str]] = defaultdict(set)
+    if not (dataset_root / "search_runs").exists():
+        return recorded
+    table = (
+        open_dataset(dataset_root, "search_runs")
+        .to_table(
+            columns=["evidence_json_path", "evidence_sha256"],
+            filter=ds.field("evidence_json_path").is_valid()
+            & ds.field("evidence_sha256").is_valid(),
+        )
+        .group_by(["evidence_json_path", "evidence_sha256"], use_threads=False)
+        .aggregate([])
+    )
+    for path, digest in zip(
+        table["evidence_json_path"].to_pylist(),
+        table["evidence_sha256"].to_pylist(),
+        strict=True,
+    ):
+        recorded[Path(path).as_posix()].add(digest)
+    return recorded
+
+
+def _hash_file(file: Path, *, chunk_size: int) -> tuple[str, int]:
+    """Return the SHA256 and size of an evidence payload (archive blobs are decompressed)."""
+    h = sha256()
+    size = 0
+    with open_evidence(file) as f:
+        while chunk := f.read(chunk_size):
+            h.update(chunk)
+            size += len(chunk)
+    return h.hexdigest(), size
+
+
+def _check(path: str, file: Path, digest: str, recorded: set[str]) -> list[VerifyIssue]:
+    """Compare one payload's digest with its records and, for JSON files, its sidecar."""
+    issues = [
+        VerifyIssue("corrupt", path, f"sha256 {digest[:12]} != recorded {expected[:12]}")
+        for expected in sorted(recorded)
+        if expected != digest
+    ]
+    if file.as_posix() == path:
+        sidecar = file.with_suffix(".sha256")
+        if not sidecar.exists():
+            issues.append(VerifyIssue("missing_sidecar", path, f"{sidecar.name} not found"))
+        elif (expected := sidecar.read_text(encoding="utf-8").strip()) != digest:
+            issues.append(
+                VerifyIssue(
+                    "sidecar_mismatch", path, f"sha256 {digest[:12]} != sidecar {expected[:12]}"
+                )
+            )
+    return issues
+
+
+def _read_manifest(path: Path) -> dict[str, list]:
+    """Read a manifest's `{file: [size, mtime_ns, sha256]}` entries ({} if absent or stale)."""
+    try:
+        manifest = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(manifest, dict) or manifest.get("version") != _MANIFEST_VERSION:
+        return {}
+    files = manifest.get("files")
+    return files if isinstance(files, dict) else {}
+
+
+def _write_manifest(path: Path, files: dict[str, list]) -> None:
+    """Write a manifest atomically."""
+    text = json.dumps({"version": _MANIFEST_VERSION, "files": files}, sort_keys=True)
+    write_atomic(path, lambda tmp: tmp.write_text(text, encoding="utf-8"))
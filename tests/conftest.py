@@ -5,8 +5,14 @@ This test suite imports the package directly from the repository's `src/` folder
 
 from __future__ import annotations
 
+import json
 import sys
 from pathlib import Path
+from typing import Any
+
+import pytest
+
+FIXTURES = Path(__file__).parent / "fixtures"
 
 
 def _ensure_src_on_path() -> None:
@@ -17,3 +23,10 @@ def _ensure_src_on_path() -> None:
 
 
 _ensure_src_on_path()
+
+
+@pytest.fixture
+def serpapi_payload() -> dict[str, Any]:
+    """Return a fresh copy of the sample SerpApi Google Flights response."""
+    text = (FIXTURES / "serpapi_google_flights_sample.json").read_text(encoding="utf-8")
+    return json.loads(text)
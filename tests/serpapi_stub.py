@@ -0,0 +1,123 @@
+"""Local stand-in for the SerpApi `search.json` endpoint used by tests."""
+
+from __future__ import annotations
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+from urllib.parse import parse_qsl, urlsplit
+
+
+class SerpApiStub:
+    """Threaded HTTP server answering Google Flights searches with a fixed payload.
+
+    Attributes:
+        latency_seconds: Artificial delay before each response.
+        payload: JSON object returned for successful searches.
+        fail_dates: Outbound dates that get an HTTP error instead of the payload.
+        flaky: Per outbound date, HTTP statuses returned (in order) to its first requests
+            before the payload is served.
+        retry_after: `Retry-After` header value sent with HTTP 429 responses, if any.
+        requests: Query params of every request received (in arrival order).
+        connections: Number of TCP connections accepted.
+    """
+
+    def __init__(
+        self,
+        *,
+        latency_seconds: float = 0.0,
+        payload: dict[str, Any] | None = None,
+        fail_dates: set[str] | None = None,
+        flaky: dict[str, list[int]] | None = None,
+        retry_after: str | None = None,
+    ) -> None:
+        """Configure the stub; call `start()` or use it as a context manager."""
+        self.latency_seconds = latency_seconds
+        self.payload = payload if payload is not None else {"best_flights": []}
+        self.fail_dates = fail_dates or set()
+        self.flaky = {date: list(statuses) for date, statuses in (flaky or {}).items()}
+        self.retry_after = retry_after
+        self.requests: list[dict[str, str]] = []
+        self.connections = 0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True
+        )
+
+    @property
+    def base_url(self) -> str:
+        """Base URL to pass to the SerpApi client."""
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/"
+
+    def start(self) -> SerpApiStub:
+        """Start serving in a background thread."""
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop the server and release its socket."""
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> SerpApiStub:
+        """Start the stub."""
+        return self.start()
+
+    def __exit__(self, *exc: object) -> None:
+        """Stop the stub."""
+        self.stop()
+
+    def _handler(self) -> type[BaseHTTPRequestHandler]:
+        """Build a request handler class bound to this stub."""
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def setup(self) -> None:
+                super().setup()
+                with stub._lock:
+                    stub.connections += 1
+
+            def do_GET(self) -> None:  # noqa: N802
+                query = dict(parse_qsl(urlsplit(self.path).query))
+                with stub._lock:
+                    stub.requests.append(query)
+                if stub.latency_seconds:
+                    time.sleep(stub.latency_seconds)
+
+                if query.get("outbound_date") in stub.fail_dates:
+                    self._send(401, {"error": "Invalid API key."})
+                    return
+                with stub._lock:
+                    statuses = stub.flaky.get(query.get("outbound_date", ""))
+                    status = statuses.pop(0) if statuses else None
+                if status is not None:
+                    self._send(status, {"error": f"Simulated HTTP {status}."})
+                    return
+                body = {
+                    **stub.payload,
+                    "search_metadata": {"id": f"stub-{query.get('outbound_date')}"},
+                }
+                self._send(200, body)
+
+            def _send(self, status: int, body: dict[str, Any]) -> None:
+                data = json.dumps(body).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                if status == 429 and stub.retry_after is not None:
+                    self.send_header("Retry-After", stub.retry_after)
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, format: str, *args: Any) -> None:  # noqa: A002
+                return
+
+        return Handler
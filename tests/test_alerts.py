@@ -0,0 +1,219 @@
+"""Tests for price alert rules and sinks."""
+
+from __future__ import annotations
+
+import functools
+import io
+import json
+import threading
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any
+
+import pytest
+from pydantic import ValidationError
+from serpapi_stub import SerpApiStub
+
+import flight_price_tracker.run as run
+from flight_price_tracker.alerts import (
+    FileSink,
+    StdoutSink,
+    WebhookSink,
+    evaluate_alerts,
+    send_alerts,
+)
+from flight_price_tracker.records import SearchRun
+from flight_price_tracker.serpapi import SerpApiClient
+from flight_price_tracker.settings import AlertRuleConfig, AppConfig
+from flight_price_tracker.summary import PriceSummary
+
+T0 = datetime(2026, 3, 1, 6, 0, tzinfo=timezone.utc)
+
+
+def _run(route: str, outbound_date: str, price: float | None) -> SearchRun:
+    return SearchRun(
+        run_date=T0.date().isoformat(),
+        observed_at_utc=T0,
+        route=route,
+        origin=route[:3],
+        destination=route[4:],
+        outbound_date=outbound_date,
+        currency="EUR",
+        serpapi_params="{}",
+        cheapest_price=price,
+    )
+
+
+def _summary(route: str, outbound_date: str, *, last: float, low: float) -> PriceSummary:
+    return PriceSummary(
+        route=route,
+        outbound_date=outbound_date,
+        currency="EUR",
+        observations=3,
+        first_seen_utc=T0 - timedelta(days=3),
+        last_seen_utc=T0 - timedelta(days=1),
+        min_price=low,
+        max_price=200.0,
+        last_price=last,
+    )
+
+
+class _WebhookReceiver:
+    """Local stand-in for a webhook endpoint that records POSTed JSON bodies."""
+
+    def __init__(self, *, status: int = 200) -> None:
+        self.bodies: list[dict[str, Any]] = []
+        receiver = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self) -> None:  # noqa: N802
+                length = int(self.headers["Content-Length"])
+                receiver.bodies.append(json.loads(self.rfile.read(length)))
+                self.send_response(status)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+
+            def log_message(self, format: str, *args: Any) -> None:  # noqa: A002
+                return
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        host, port = self._server.server_address[:2]
+        self.url = f"http://{host}:{port}/hook"
+
+    def close(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+
+def test_rules_fire_on_drops_lows_and_threshold_crossings() -> None:
+    """Each kind fires only on its condition, for its routes, and not for folded rows."""
+    rules = [
+        AlertRuleConfig(name="drop20", kind="drop", threshold=20),
+        AlertRuleConfig(name="pct10", kind="drop_pct", threshold=10),
+        AlertRuleConfig(name="low", kind="new_low"),
+        AlertRuleConfig(name="cheap", kind="below", threshold=100, routes=["VIE-TGD"]),
+    ]
+    history = {
+        ("VIE-TGD", "2026-04-01"): _summary("VIE-TGD", "2026-04-01", last=120.0, low=100.0),
+        ("VIE-TGD", "2026-04-02"): _summary("VIE-TGD", "2026-04-02", last=95.0, low=90.0),
+        ("VIE-BEG", "2026-04-01"): _summary("VIE-BEG", "2026-04-01", last=150.0, low=80.0),
+        ("VIE-BEG", "2026-04-03"): PriceSummary(
+            route="VIE-BEG",
+            outbound_date="2026-04-03",
+            currency="EUR",
+            observations=1,
+            first_seen_utc=T0,
+            last_seen_utc=T0,
+            min_price=10.0,
+            max_price=10.0,
+            last_price=10.0,
+        ),
+    }
+    runs = [
+        _run("VIE-TGD", "2026-04-01", 99.0),  # -21 (17.5 %), new low, crosses below 100
+        _run("VIE-TGD", "2026-04-02", 85.0),  # -10 (10.5 %), new low, was already below 100
+        _run("VIE-TGD", "2026-04-04", 50.0),  # no history: only the threshold crossing
+        _run("VIE-TGD", "2026-04-05", None),  # failed query
+        _run("VIE-BEG", "2026-04-01", 99.0),  # `cheap` is limited to VIE-TGD
+        _run("VIE-BEG", "2026-04-03", 1.0),  # already in the summary (resumed run)
+    ]
+
+    alerts = evaluate_alerts(rules=rules, search_runs=runs, history=history)
+
+    assert [(a.route, a.outbound_date, a.rule) for a in alerts] == [
+        ("VIE-TGD", "2026-04-01", "drop20"),
+        ("VIE-TGD", "2026-04-01", "pct10"),
+        ("VIE-TGD", "2026-04-01", "low"),
+        ("VIE-TGD", "2026-04-01", "cheap"),
+        ("VIE-TGD", "2026-04-02", "pct10"),
+        ("VIE-TGD", "2026-04-02", "low"),
+        ("VIE-TGD", "2026-04-04", "cheap"),
+        ("VIE-BEG", "2026-04-01", "drop20"),
+        ("VIE-BEG", "2026-04-01", "pct10"),
+    ]
+    assert (
+        alerts[0].message == "drop20: VIE-TGD 2026-04-01: EUR 99, down EUR 21 (17.5%) from EUR 120"
+    )
+    assert alerts[0].previous_price == 120.0
+
+
+@pytest.mark.parametrize(
+    "rule",
+    [
+        {"name": "r", "kind": "drop"},
+        {"name": "r", "kind": "new_low", "threshold": 5},
+        {"name": "r", "kind": "below", "threshold": 5, "routes": ["VIE-XXX"]},
+    ],
+)
+def test_invalid_rules_are_rejected(rule: dict[str, Any]) -> None:
+    """Thresholds must match the kind and routes must be configured."""
+    with pytest.raises(ValidationError):
+        AppConfig.model_validate(
+            {"route": {"origin": "VIE", "destination": "TGD"}, "alerts": {"rules": [rule]}}
+        )
+
+
+def test_sinks_deliver_alerts_and_a_failing_sink_does_not_stop_the_others(
+    tmp_path: Path,
+) -> None:
+    """File, stdout and webhook sinks receive the same batch; errors are reported."""
+    alerts = evaluate_alerts(
+        rules=[AlertRuleConfig(name="cheap", kind="below", threshold=100)],
+        search_runs=[_run("VIE-TGD", "2026-04-01", 99.0)],
+        history={},
+    )
+    stream = io.StringIO()
+    ok, failing = _WebhookReceiver(), _WebhookReceiver(status=500)
+    try:
+        errors = send_alerts(
+            alerts,
+            [
+                WebhookSink(failing.url),
+                FileSink(tmp_path / "alerts" / "alerts.jsonl"),
+                StdoutSink(stream),
+                WebhookSink(ok.url),
+            ],
+        )
+    finally:
+        ok.close()
+        failing.close()
+
+    assert len(errors) == 1 and errors[0].startswith("WebhookSink: 500")
+    lines = (tmp_path / "alerts" / "alerts.jsonl").read_text(encoding="utf-8").splitlines()
+    assert [json.loads(line)["rule"] for line in lines] == ["cheap"]
+    assert stream.getvalue() == "[alert] cheap: VIE-TGD 2026-04-01: EUR 99, below EUR 100\n"
+    assert ok.bodies == [{"alerts": [alerts[0].to_dict()]}]
+    assert ok.bodies[0]["alerts"][0]["observed_at_utc"] == T0.isoformat()
+
+
+def test_run_sends_alerts_when_a_price_drops(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, serpapi_payload: dict[str, Any]
+) -> None:
+    """A second run with cheaper prices alerts once per date through the configured sink."""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("SERPAPI_API_KEY", "k")
+    Path("config.yaml").write_text(
+        "route: {origin: VIE, destination: TGD}\n"
+        "window: {start_offset_days: 1, window_days: 2}\n"
+        "serpapi: {rate_limit_seconds: 0}\n"
+        "storage: {writer: pyarrow}\n"
+        "alerts:\n"
+        "  rules: [{name: drop, kind: drop_pct, threshold: 5}]\n"
+        "  sinks: [{type: file, path: alerts.jsonl}]\n",
+        encoding="utf-8",
+    )
+    for price in (123, 100):
+        serpapi_payload["best_flights"][0]["price"] = price
+        with SerpApiStub(payload=serpapi_payload) as stub:
+            monkeypatch.setattr(
+                run, "SerpApiClient", functools.partial(SerpApiClient, base_url=stub.base_url)
+            )
+            run.run_once(config_path=Path("config.yaml"))
+
+    alerts = [json.loads(line) for line in Path("alerts.jsonl").read_text().splitlines()]
+    assert [(a["rule"], a["previous_price"], a["price"]) for a in alerts] == [
+        ("drop", 123.0, 100.0),
+        ("drop", 123.0, 100.0),
+    ]
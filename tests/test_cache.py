@@ -0,0 +1,88 @@
+"""Tests for the SerpApi response cache."""
+
+from __future__ import annotations
+
+import json
+from hashlib import sha256
+from pathlib import Path
+
+from flight_price_tracker.cache import ResponseCache
+
+PARAMS = {"departure_id": "VIE", "arrival_id": "TGD", "outbound_date": "2026-03-01"}
+
+
+def _evidence(tmp_path: Path, payload: dict[str, object]) -> tuple[str, str]:
+    raw = json.dumps(payload, ensure_ascii=False, sort_keys=True)
+    path = tmp_path / "outbound_date=2026-03-01.json"
+    path.write_text(raw, encoding="utf-8")
+    return str(path), sha256(raw.encode("utf-8")).hexdigest()
+
+
+def test_cache_hit_reuses_evidence_and_ignores_api_key(tmp_path: Path) -> None:
+    """A hit should return the stored evidence regardless of the API key in the params."""
+    cache = ResponseCache(root=tmp_path / "cache", ttl_seconds=60, max_entries=10)
+    path, digest = _evidence(tmp_path, {"best_flights": []})
+
+    cache.put({**PARAMS, "api_key": "one"}, evidence_json_path=path, evidence_sha256=digest)
+    hit = cache.get({**PARAMS, "api_key": "two"})
+
+    assert hit is not None
+    assert hit.evidence_json_path == path
+    assert hit.evidence_sha256 == digest
+    assert hit.response == {"best_flights": []}
+    assert cache.get({**PARAMS, "outbound_date": "2026-03-02"}) is None
+
+
+def test_cache_expires_entries_and_rejects_tampered_evidence(tmp_path: Path) -> None:
+    """Entries older than the TTL, or whose evidence changed, should be misses."""
+    now = [1000.0]
+    cache = ResponseCache(
+        root=tmp_path / "cache", ttl_seconds=60, max_entries=10, clock=lambda: now[0]
+    )
+    path, digest = _evidence(tmp_path, {"best_flights": []})
+
+    cache.put(PARAMS, evidence_json_path=path, evidence_sha256=digest)
+    now[0] += 61
+    assert cache.get(PARAMS) is None
+
+    cache.put(PARAMS, evidence_json_path=path, evidence_sha256=digest)
+    Path(path).write_text("{}", encoding="utf-8")
+    assert cache.get(PARAMS) is None
+
+
+def test_cache_expiry_counts_from_put_on_lookup_and_eviction(tmp_path: Path) -> None:
+    """Hits refresh an entry's recency but not its age: both expiry paths use `created_at`."""
+    now = [1000.0]
+    cache = ResponseCache(
+        root=tmp_path / "cache", ttl_seconds=60, max_entries=10, clock=lambda: now[0]
+    )
+    path, digest = _evidence(tmp_path, {"best_flights": []})
+    cache.put(PARAMS, evidence_json_path=path, evidence_sha256=digest)
+    for _ in range(3):
+        now[0] += 20
+        assert cache.get(PARAMS) is not None
+
+    now[0] += 20  # 80s after the put, 20s after the last hit
+    assert cache.evict() == 1
+    assert not list((tmp_path / "cache").rglob("*.json"))
+
+
+def test_cache_evicts_least_recently_used(tmp_path: Path) -> None:
+    """Eviction should drop the entries that were accessed least recently."""
+    now = [1000.0]
+    cache = ResponseCache(
+        root=tmp_path / "cache", ttl_seconds=3600, max_entries=2, clock=lambda: now[0]
+    )
+    path, digest = _evidence(tmp_path, {"best_flights": []})
+    dates = ["2026-03-01", "2026-03-02", "2026-03-03"]
+
+    for d in dates:
+        cache.put({**PARAMS, "outbound_date": d}, evidence_json_path=path, evidence_sha256=digest)
+        now[0] += 1
+
+    now[0] += 1
+    assert cache.get({**PARAMS, "outbound_date": "2026-03-01"}) is not None
+
+    assert cache.evict() == 1
+    assert cache.get({**PARAMS, "outbound_date": "2026-03-02"}) is None
+    assert cache.get({**PARAMS, "outbound_date": "2026-03-01"}) is not None
@@ -0,0 +1,64 @@
+"""Tests for the command line interface."""
+
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from flight_price_tracker.cli import main
+
+SRC = Path(__file__).resolve().parents[1] / "src"
+
+_PROBE = """
+import sys
+from flight_price_tracker.cli import main
+try:
+    main(sys.argv[1:])
+except SystemExit:
+    pass
+print(" ".join(sorted({m.split(".")[0] for m in sys.modules})))
+"""
+
+
+@pytest.mark.parametrize(
+    ("argv", "forbidden"),
+    [
+        (["--help"], {"dlt", "pyarrow", "pydantic", "yaml", "requests"}),
+        (["validate-config", "--config", "config.yaml"], {"dlt", "pyarrow", "pydantic_settings"}),
+    ],
+)
+def test_light_commands_do_not_import_heavy_dependencies(
+    argv: list[str], forbidden: set[str]
+) -> None:
+    """`--help` and `validate-config` must not pay for dlt, PyArrow and friends."""
+    proc = subprocess.run(
+        [sys.executable, "-c", _PROBE, *argv],
+        cwd=SRC.parent,
+        env={**os.environ, "PYTHONPATH": str(SRC)},
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    loaded = set(proc.stdout.splitlines()[-1].split())
+    assert "flight_price_tracker" in loaded
+    assert not loaded & forbidden
+
+
+def test_validate_config_reports_errors(tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    """A valid config exits 0 with a summary; an invalid one exits 1 with the error."""
+    good = tmp_path / "good.yaml"
+    good.write_text("route:\n  origin: VIE\n  destination: TGD\n", encoding="utf-8")
+    assert main(["validate-config", "--config", str(good)]) == 0
+    assert "VIE-TGD: 30 days from +1" in capsys.readouterr().out
+
+    bad = tmp_path / "bad.yaml"
+    bad.write_text("route:\n  origin: VIE\nwindow:\n  window_days: 0\n", encoding="utf-8")
+    assert main(["validate-config", "--config", str(bad)]) == 1
+    err = capsys.readouterr().err
+    assert "invalid config" in err and "destination" in err
+
+    assert main(["validate-config", "--config", str(tmp_path / "missing.yaml")]) == 1
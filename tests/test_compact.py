@@ -0,0 +1,108 @@
+"""Tests for Parquet compaction."""
+
+from __future__ import annotations
+
+from collections.abc import Iterator
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import pyarrow.dataset as ds
+import pytest
+
+import flight_price_tracker.compact as compact
+from flight_price_tracker.compact import compact_dataset
+from flight_price_tracker.parquet_writer import dataset_lock, write_tables
+
+
+def _write_run(dataset_root: Path, observed_at: datetime, price: float) -> None:
+    write_tables(
+        dataset_root=dataset_root,
+        search_runs_rows=[
+            {
+                "run_date": "2026-03-01",
+                "observed_at_utc": observed_at,
+                "route": "VIE-TGD",
+                "outbound_date": "2026-03-10",
+                "cheapest_price": price,
+            }
+        ],
+        offers_rows=[],
+    )
+
+
+def test_compact_merges_partition_into_one_sorted_file(tmp_path: Path) -> None:
+    """Several appends to one partition should become one file sorted by the sort keys."""
+    dataset_root = tmp_path / "flight_price_tracker"
+    start = datetime(2026, 3, 1, 6, 0, tzinfo=timezone.utc)
+    for run in range(3):
+        observed_at = start + timedelta(hours=run)
+        write_tables(
+            dataset_root=dataset_root,
+            search_runs_rows=[
+                {
+                    "run_date": "2026-03-01",
+                    "observed_at_utc": observed_at,
+                    "route": route,
+                    "outbound_date": od,
+                    "cheapest_price": 100.0 + run,
+                }
+                for route in ("VIE-TGD", "VIE-LHR")
+                for od in ("2026-03-11", "2026-03-10")
+            ],
+            offers_rows=[],
+        )
+
+    (stats,) = compact_dataset(dataset_root=dataset_root)
+
+    assert (stats.table, stats.partitions, stats.files_before, stats.files_after) == (
+        "search_runs",
+        1,
+        3,
+        1,
+    )
+    assert stats.bytes_after > 0
+    partition = dataset_root / "search_runs" / "run_date=2026-03-01"
+    assert len(list(partition.glob("*.parquet"))) == 1
+    assert [p.name for p in (dataset_root / "search_runs").iterdir()] == [partition.name]
+
+    table = ds.dataset(str(dataset_root / "search_runs"), format="parquet").to_table()
+    keys = list(
+        zip(
+            table.column("route").to_pylist(),
+            table.column("outbound_date").to_pylist(),
+            table.column("observed_at_utc").to_pylist(),
+            strict=True,
+        )
+    )
+    assert len(keys) == 12
+    assert keys == sorted(keys)
+
+
+def test_compact_keeps_files_added_during_compaction(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """A file (and a writer's temp file) added between staging and the swap survive it."""
+    dataset_root = tmp_path / "flight_price_tracker"
+    start = datetime(2026, 3, 1, 6, 0, tzinfo=timezone.utc)
+    for run in range(2):
+        _write_run(dataset_root, start + timedelta(hours=run), 100.0 + run)
+    partition = dataset_root / "search_runs" / "run_date=2026-03-01"
+    in_flight = partition / ".1772345600.0.abcdef0123.parquet.0a1b2c3d.tmp"
+
+    @contextmanager
+    def _lock_after_a_write(root: Path) -> Iterator[None]:
+        # The merged file is staged; a run writes before compaction gets the lock.
+        _write_run(dataset_root, start + timedelta(hours=2), 102.0)
+        in_flight.write_bytes(b"partial")
+        with dataset_lock(root):
+            yield
+
+    monkeypatch.setattr(compact, "dataset_lock", _lock_after_a_write)
+    compact_dataset(dataset_root=dataset_root, tables=("search_runs",))
+
+    assert len(list(partition.glob("*.parquet"))) == 2
+    assert in_flight.read_bytes() == b"partial"
+    prices = ds.dataset(str(dataset_root / "search_runs")).to_table()["cheapest_price"]
+    assert sorted(prices.to_pylist()) == [100.0, 101.0, 102.0]
+    assert [p.name for p in (dataset_root / "search_runs").iterdir()] == [partition.name]
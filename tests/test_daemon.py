@@ -0,0 +1,128 @@
+"""Tests for cron parsing and the `serve` daemon."""
+
+from __future__ import annotations
+
+import functools
+import json
+import urllib.error
+import urllib.request
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any
+
+import pytest
+from serpapi_stub import SerpApiStub
+
+import flight_price_tracker.run as run
+from flight_price_tracker.cron import CronSchedule
+from flight_price_tracker.daemon import HealthServer, TrackerDaemon
+from flight_price_tracker.serpapi import SerpApiClient
+
+T0 = datetime(2026, 3, 1, 5, 30, tzinfo=timezone.utc)  # a Sunday
+
+
+@pytest.mark.parametrize(
+    ("expression", "expected"),
+    [
+        ("0 6 * * *", datetime(2026, 3, 1, 6, 0, tzinfo=timezone.utc)),
+        ("*/20 * * * *", datetime(2026, 3, 1, 5, 40, tzinfo=timezone.utc)),
+        ("30 8-18/2 * * 1-5", datetime(2026, 3, 2, 8, 30, tzinfo=timezone.utc)),
+        ("0 0 1,15 * 7", datetime(2026, 3, 1, 0, 0, tzinfo=timezone.utc) + timedelta(days=7)),
+        ("0 0 29 2 *", datetime(2028, 2, 29, 0, 0, tzinfo=timezone.utc)),
+        ("@monthly", datetime(2026, 4, 1, 0, 0, tzinfo=timezone.utc)),
+    ],
+)
+def test_cron_next_after(expression: str, expected: datetime) -> None:
+    """The next firing time honours ranges, steps and either-day matching."""
+    assert CronSchedule.parse(expression).next_after(T0) == expected
+
+
+@pytest.mark.parametrize("expression", ["0 6 * *", "61 * * * *", "0 0 31-1 * *", "*/0 * * * *"])
+def test_cron_rejects_malformed_expressions(expression: str) -> None:
+    """Wrong field counts, out-of-range values and zero steps are rejected."""
+    with pytest.raises(ValueError):
+        CronSchedule.parse(expression)
+
+
+def test_daemon_runs_due_routes_reloads_config_and_serves_health(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, serpapi_payload: dict[str, Any]
+) -> None:
+    """Routes run on their own triggers, reuse in-memory history and survive bad reloads."""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("SERPAPI_API_KEY", "k")
+    config = Path("config.yaml")
+    config.write_text(
+        "routes:\n"
+        "  - {origin: VIE, destination: TGD, trigger: {interval_minutes: 60}}\n"
+        "  - {origin: VIE, destination: BEG}\n"
+        "window: {start_offset_days: 1, window_days: 2}\n"
+        "serpapi: {rate_limit_seconds: 0}\n"
+        "storage: {writer: pyarrow}\n"
+        "serve: {trigger: {cron: '0 6 * * *'}, port: 0}\n",
+        encoding="utf-8",
+    )
+    now = [T0]
+    events: list[str] = []
+
+    with SerpApiStub(payload=serpapi_payload) as stub:
+        monkeypatch.setattr(
+            run, "SerpApiClient", functools.partial(SerpApiClient, base_url=stub.base_url)
+        )
+        daemon = TrackerDaemon(config, clock=lambda: now[0], on_event=events.append)
+        with HealthServer(daemon, host="127.0.0.1", port=0) as server:
+            # The interval route is due at start, the cron route at 06:00.
+            assert {r.route for r in daemon.tick()} == {"VIE-TGD"}
+            assert daemon.tick() == []
+            assert Path("reports/route=VIE-TGD/latest.md").exists()
+            assert not Path("reports/route=VIE-BEG").exists()
+
+            # Later ticks compare with the prices kept in memory instead of reading history
+            # (a route's first run still reads it once).
+            load_previous_prices = run.load_previous_prices
+
+            def _first_scan_only(**kwargs: Any) -> dict[str, float] | None:
+                assert kwargs["route"] != "VIE-TGD", "history was re-read"
+                return load_previous_prices(**kwargs)
+
+            monkeypatch.setattr(run, "load_previous_prices", _first_scan_only)
+            now[0] = T0 + timedelta(hours=1)
+            assert {r.route for r in daemon.tick()} == {"VIE-TGD", "VIE-BEG"}
+            assert daemon.routes["VIE-TGD"].next_run_utc == T0 + timedelta(hours=2)
+            assert daemon.routes["VIE-BEG"].next_run_utc == T0 + timedelta(days=1, minutes=30)
+            report = Path("reports/route=VIE-TGD/latest.md").read_text(encoding="utf-8")
+            assert "| USD 0 |" in report
+            assert len(stub.requests) == 6
+
+            with urllib.request.urlopen(server.url + "healthz") as resp:
+                health = json.loads(resp.read())
+            assert health["status"] == "ok"
+            assert health["routes"]["VIE-TGD"]["runs"] == 2
+            with urllib.request.urlopen(server.url + "metrics") as resp:
+                metrics = resp.read().decode("utf-8")
+            assert 'flight_price_tracker_runs_total{route="VIE-BEG"} 1' in metrics
+
+            # An invalid edit keeps the running config and marks the daemon degraded.
+            config.write_text("routes: []\n", encoding="utf-8")
+            assert daemon.tick() == []
+            assert set(daemon.routes) == {"VIE-TGD", "VIE-BEG"}
+            with pytest.raises(urllib.error.HTTPError) as excinfo:
+                urllib.request.urlopen(server.url + "healthz")
+            assert excinfo.value.code == 503
+
+            # A valid edit drops the removed route and reschedules the changed trigger.
+            config.write_text(
+                "route: {origin: VIE, destination: TGD, trigger: {cron: '@daily'}}\n"
+                "window: {start_offset_days: 1, window_days: 2}\n"
+                "serpapi: {rate_limit_seconds: 0}\n"
+                "storage: {writer: pyarrow}\n",
+                encoding="utf-8",
+            )
+            assert daemon.reload_if_changed()
+            assert set(daemon.routes) == {"VIE-TGD"}
+            assert daemon.routes["VIE-TGD"].next_run_utc == datetime(
+                2026, 3, 2, 0, 0, tzinfo=timezone.utc
+            )
+            assert daemon.health()["status"] == "ok"
+        daemon.close()
+
+    assert any("config reload failed" in e for e in events)
@@ -0,0 +1,97 @@
+"""Tests for the compressed evidence archive."""
+
+from __future__ import annotations
+
+import json
+from concurrent.futures import ProcessPoolExecutor
+from hashlib import sha256
+from pathlib import Path
+
+from flight_price_tracker.evidence_store import (
+    EvidenceArchive,
+    iter_evidence_chunks,
+    read_evidence,
+)
+
+
+def test_archive_deduplicates_and_resolves_logical_paths(tmp_path: Path) -> None:
+    """Identical payloads share one blob and logical JSON paths resolve through the index."""
+    archive = EvidenceArchive(tmp_path / "evidence")
+    raw = json.dumps({"best_flights": [{"price": 1}] * 500}, sort_keys=True).encode("utf-8")
+
+    path_a, digest_a = archive.put(
+        route="VIE-TGD", run_date="2026-03-01", outbound_date="2026-03-10", raw=raw
+    )
+    path_b, digest_b = archive.put(
+        route="VIE-TGD", run_date="2026-03-02", outbound_date="2026-03-10", raw=raw
+    )
+
+    assert digest_a == digest_b == sha256(raw).hexdigest()
+    assert path_a.endswith("route=VIE-TGD/run_date=2026-03-01/outbound_date=2026-03-10.json")
+    assert not Path(path_a).exists()
+    assert len(list((tmp_path / "evidence" / "archive" / "blobs").rglob("*.zst"))) == 1
+    assert archive.blob_path(digest_a).stat().st_size < len(raw)
+    assert read_evidence(path_b) == raw
+    assert b"".join(iter_evidence_chunks(path_a, chunk_size=100)) == raw
+
+
+def test_import_tree_moves_verified_json_files(tmp_path: Path) -> None:
+    """Existing JSON + sidecar evidence should move into the archive and keep resolving."""
+    evidence_root = tmp_path / "evidence"
+    base = evidence_root / "route=VIE-TGD" / "run_date=2026-03-01"
+    base.mkdir(parents=True)
+    raw = b'{"best_flights": []}'
+    (base / "outbound_date=2026-03-10.json").write_bytes(raw)
+    (base / "outbound_date=2026-03-10.sha256").write_text(sha256(raw).hexdigest() + "\n")
+    (base / "outbound_date=2026-03-11.json").write_bytes(raw)
+    (base / "outbound_date=2026-03-11.sha256").write_text("0" * 64 + "\n")
+
+    assert EvidenceArchive(evidence_root).import_tree() == 1
+
+    assert not (base / "outbound_date=2026-03-10.json").exists()
+    assert read_evidence(base / "outbound_date=2026-03-10.json") == raw
+    assert (base / "outbound_date=2026-03-11.json").exists()
+
+
+def test_round_trip_evidence_is_indexed_per_return_date(tmp_path: Path) -> None:
+    """Round trips of one outbound date get their own logical paths and index entries."""
+    archive = EvidenceArchive(tmp_path / "evidence")
+    paths = {
+        ret: archive.put(
+            route="VIE-TGD",
+            run_date="2026-03-01",
+            outbound_date="2026-03-10",
+            return_date=ret,
+            raw=f'{{"return": "{ret}"}}'.encode(),
+        )[0]
+        for ret in (None, "2026-03-13", "2026-03-17")
+    }
+
+    assert paths["2026-03-13"].endswith("outbound_date=2026-03-10_return_date=2026-03-13.json")
+    assert read_evidence(paths[None]) == b'{"return": "None"}'
+    assert read_evidence(paths["2026-03-17"]) == b'{"return": "2026-03-17"}'
+
+
+def _put_dates(evidence_root: Path, worker: int) -> None:
+    """Archive 20 outbound dates of one route and run date (runs in a worker process)."""
+    archive = EvidenceArchive(evidence_root)
+    for day in range(1, 21):
+        archive.put(
+            route="VIE-TGD",
+            run_date="2026-03-01",
+            outbound_date=f"2026-{worker + 4:02d}-{day:02d}",
+            raw=json.dumps({"worker": worker, "day": day}).encode("utf-8"),
+        )
+
+
+def test_concurrent_writers_keep_every_index_entry(tmp_path: Path) -> None:
+    """Processes archiving the same route and run date do not lose each other's entries."""
+    evidence_root = tmp_path / "evidence"
+    with ProcessPoolExecutor(max_workers=4) as pool:
+        list(pool.map(_put_dates, [evidence_root] * 4, range(4)))
+
+    index = (
+        tmp_path / "evidence" / "archive" / "index" / "route=VIE-TGD" / "run_date=2026-03-01.json"
+    )
+    assert len(json.loads(index.read_text(encoding="utf-8"))) == 80
+    assert not list(index.parent.glob("*.tmp"))
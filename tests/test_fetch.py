@@ -0,0 +1,192 @@
+"""Tests for the concurrent fetch engine."""
+
+from __future__ import annotations
+
+import functools
+import json
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any
+
+import pyarrow.dataset as ds
+import pytest
+from serpapi_stub import SerpApiStub
+
+import flight_price_tracker.run as run
+from flight_price_tracker.fetch import (
+    CircuitBreaker,
+    FetchJob,
+    RetryPolicy,
+    TokenBucket,
+    fetch_all,
+)
+from flight_price_tracker.serpapi import SerpApiClient
+
+
+def _jobs(n: int) -> list[FetchJob]:
+    dates = [f"2026-03-{day:02d}" for day in range(1, n + 1)]
+    return [FetchJob(route="VIE-TGD", outbound_date=d, params={"outbound_date": d}) for d in dates]
+
+
+def test_token_bucket_spaces_requests_at_configured_rate() -> None:
+    """A one-token bucket should release the N-th caller after (N-1) intervals."""
+    now = [0.0]
+
+    def _sleep(seconds: float) -> None:
+        now[0] += seconds
+
+    bucket = TokenBucket(rate_per_second=2.0, clock=lambda: now[0], sleep=_sleep)
+    for _ in range(5):
+        bucket.acquire()
+
+    assert now[0] == 2.0
+
+
+def test_fetch_all_is_faster_than_sequential_loop_with_sleep(
+    serpapi_payload: dict[str, Any],
+) -> None:
+    """Concurrent fetching should beat the old fetch-then-sleep loop by a wide margin."""
+    latency, interval, jobs = 0.2, 0.02, _jobs(8)
+
+    with (
+        SerpApiStub(latency_seconds=latency, payload=serpapi_payload) as stub,
+        SerpApiClient(api_key="test-key", base_url=stub.base_url, pool_size=8) as client,
+    ):
+        search = client.search_google_flights
+
+        start = time.perf_counter()
+        for job in jobs:
+            search(job.params)
+            time.sleep(interval)
+        sequential = time.perf_counter() - start
+
+        start = time.perf_counter()
+        results = fetch_all(
+            jobs,
+            search=search,
+            limiter=TokenBucket.from_interval(interval),
+            max_concurrency=8,
+        )
+        concurrent = time.perf_counter() - start
+
+    assert [r.job.outbound_date for r in results] == [j.outbound_date for j in jobs]
+    assert all(r.error is None for r in results)
+    assert concurrent < sequential / 2
+
+
+def test_fetch_all_keeps_per_date_results_and_errors(serpapi_payload: dict[str, Any]) -> None:
+    """Failed dates should surface as `SerpApiError` results without affecting others."""
+    jobs = _jobs(4)
+
+    with (
+        SerpApiStub(payload=serpapi_payload, fail_dates={"2026-03-02"}) as stub,
+        SerpApiClient(api_key="test-key", base_url=stub.base_url) as client,
+    ):
+        results = fetch_all(
+            jobs,
+            search=client.search_google_flights,
+            limiter=TokenBucket.from_interval(0.0),
+            max_concurrency=3,
+        )
+
+    by_date = {r.job.outbound_date: r for r in results}
+    assert by_date["2026-03-02"].error is not None
+    assert "test-key" not in str(by_date["2026-03-02"].error)
+    ok = by_date["2026-03-01"]
+    assert ok.response is not None
+    assert ok.response["search_metadata"]["id"] == "stub-2026-03-01"
+    assert ok.raw_json == json.dumps(ok.response, ensure_ascii=False, sort_keys=True).encode()
+
+
+def test_retry_policy_uses_full_jitter_and_honours_retry_after() -> None:
+    """Waits are drawn below a doubling cap, never below `Retry-After`, and eventually stop."""
+    policy = RetryPolicy(max_retries=3, base_delay_seconds=1.0, max_delay_seconds=5.0)
+
+    assert [policy.delay(n, rng=lambda: 1.0) for n in range(4)] == [1.0, 2.0, 4.0, None]
+    assert policy.delay(2, rng=lambda: 0.5) == 2.0
+    assert policy.delay(0, retry_after_seconds=3.0, rng=lambda: 0.5) == 3.0
+    assert policy.delay(0, retry_after_seconds=60.0) is None
+
+
+def test_fetch_all_retries_transient_failures_only(serpapi_payload: dict[str, Any]) -> None:
+    """HTTP 429/5xx are retried (waiting for `Retry-After`); HTTP 401 fails at once."""
+    jobs = _jobs(3)
+    waits: list[float] = []
+
+    with (
+        SerpApiStub(
+            payload=serpapi_payload,
+            fail_dates={"2026-03-03"},
+            flaky={"2026-03-01": [429, 503]},
+            retry_after="2",
+        ) as stub,
+        SerpApiClient(api_key="test-key", base_url=stub.base_url) as client,
+    ):
+        results = fetch_all(
+            jobs,
+            search=client.search_google_flights,
+            limiter=TokenBucket.from_interval(0.0),
+            max_concurrency=1,
+            retry=RetryPolicy(max_retries=3, base_delay_seconds=0.01, max_delay_seconds=5.0),
+            sleep=waits.append,
+        )
+
+    by_date = {r.job.outbound_date: r for r in results}
+    assert by_date["2026-03-01"].error is None
+    assert by_date["2026-03-01"].attempts == 3
+    assert waits[0] == 2.0 and waits[1] <= 0.02
+    assert by_date["2026-03-01"].backoff_seconds == sum(waits)
+    error = by_date["2026-03-03"].error
+    assert error is not None and error.status_code == 401 and not error.transient
+    assert by_date["2026-03-03"].attempts == 1
+
+
+def test_non_transient_failures_do_not_open_the_breaker(serpapi_payload: dict[str, Any]) -> None:
+    """Deterministic failures (HTTP 401 here) leave the breaker closed for the other dates."""
+    breaker = CircuitBreaker(failure_threshold=2)
+    with (
+        SerpApiStub(payload=serpapi_payload, fail_dates={"2026-03-01", "2026-03-02"}) as stub,
+        SerpApiClient(api_key="test-key", base_url=stub.base_url) as client,
+    ):
+        results = fetch_all(
+            _jobs(3),
+            search=client.search_google_flights,
+            limiter=TokenBucket.from_interval(0.0),
+            max_concurrency=1,
+            breaker=breaker,
+        )
+
+    assert [r.error is None for r in results] == [False, False, True]
+    assert len(stub.requests) == 3
+    assert not breaker.is_open
+
+
+def test_breaker_stops_requests_and_final_pass_recovers(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, serpapi_payload: dict[str, Any]
+) -> None:
+    """An open breaker skips the remaining dates; the final pass fetches all of them."""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("SERPAPI_API_KEY", "k")
+    Path("config.yaml").write_text(
+        "route: {origin: VIE, destination: TGD}\n"
+        "window: {start_offset_days: 1, window_days: 3}\n"
+        "serpapi: {rate_limit_seconds: 0, max_concurrency: 1, max_retries: 0,\n"
+        "          circuit_breaker_failures: 2, final_pass_delay_seconds: 0}\n"
+        "storage: {writer: pyarrow}\n",
+        encoding="utf-8",
+    )
+    today = datetime.now(timezone.utc).date()
+    dates = [(today + timedelta(days=i)).isoformat() for i in (1, 2, 3)]
+
+    with SerpApiStub(payload=serpapi_payload, flaky={d: [500] for d in dates[:2]}) as stub:
+        monkeypatch.setattr(
+            run, "SerpApiClient", functools.partial(SerpApiClient, base_url=stub.base_url)
+        )
+        run.run_once(config_path=Path("config.yaml"))
+
+    # Pass 1: two failures open the breaker, the third date is skipped. Final pass: 3 calls.
+    assert [q["outbound_date"] for q in stub.requests] == [*dates[:2], *dates]
+    runs = ds.dataset("data/flight_price_tracker/search_runs", format="parquet").to_table()
+    assert runs.num_rows == 3
+    assert runs["cheapest_price"].null_count == 0
@@ -0,0 +1,130 @@
+"""Tests for the run journal and resumable runs."""
+
+from __future__ import annotations
+
+import functools
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+import pyarrow.dataset as ds
+import pytest
+from serpapi_stub import SerpApiStub
+
+from flight_price_tracker import run
+from flight_price_tracker.journal import JOURNAL_DIR, RunJournal
+from flight_price_tracker.serpapi import SerpApiClient
+
+OBSERVED_AT = datetime(2026, 3, 1, 6, 0, tzinfo=timezone.utc)
+
+
+def test_entries_track_furthest_stage_and_refetches(tmp_path: Path) -> None:
+    """Stages only move forward, except that a new `fetched` replaces a failed attempt."""
+    journal = RunJournal.start(tmp_path, observed_at_utc=OBSERVED_AT)
+    journal.record("fetched", route="VIE-TGD", outbound_date="2026-03-10", error="boom")
+    journal.record(
+        "fetched",
+        route="VIE-TGD",
+        outbound_date="2026-03-11",
+        evidence_json_path="e.json",
+        evidence_sha256="abc",
+    )
+    journal.record("loaded", route="VIE-TGD", outbound_date="2026-03-11")
+    journal.record("normalized", route="VIE-TGD", outbound_date="2026-03-11")
+    journal.record("fetched", route="VIE-TGD", outbound_date="2026-03-10", evidence_sha256="d")
+    with journal.path.open("ab") as f:
+        f.write(b'{"event": "load')  # torn by a crash
+
+    resumed = RunJournal.latest_incomplete(tmp_path)
+    assert resumed is not None
+    assert resumed.observed_at_utc == OBSERVED_AT
+    resumed.record("normalized", route="VIE-TGD", outbound_date="2026-03-10")
+
+    entries = resumed.entries()
+    assert entries[("VIE-TGD", "2026-03-10")].stage == "normalized"
+    assert entries[("VIE-TGD", "2026-03-10")].error is None
+    assert entries[("VIE-TGD", "2026-03-11")].stage == "loaded"
+    assert entries[("VIE-TGD", "2026-03-11")].evidence_sha256 == "abc"
+
+    resumed.record("completed")
+    assert RunJournal.latest_incomplete(tmp_path) is None
+
+
+def test_resume_rebuilds_from_evidence_without_refetching(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, serpapi_payload: dict[str, Any]
+) -> None:
+    """A run that crashed while loading is finished by `--resume` without new API calls."""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("SERPAPI_API_KEY", "k")
+    Path("config.yaml").write_text(
+        "route: {origin: VIE, destination: TGD}\n"
+        "window: {start_offset_days: 1, window_days: 4}\n"
+        "serpapi: {rate_limit_seconds: 0}\n"
+        "storage: {writer: pyarrow}\n",
+        encoding="utf-8",
+    )
+    with SerpApiStub(payload=serpapi_payload, fail_dates=set()) as stub:
+        monkeypatch.setattr(
+            run, "SerpApiClient", functools.partial(SerpApiClient, base_url=stub.base_url)
+        )
+        write_tables = run._write_tables
+
+        def _crash(**kwargs: object) -> None:
+            raise RuntimeError("load failed")
+
+        monkeypatch.setattr(run, "_write_tables", _crash)
+        with pytest.raises(RuntimeError):
+            run.run_once(config_path=Path("config.yaml"))
+        assert len(stub.requests) == 4
+        assert not Path("data").exists()
+
+        monkeypatch.setattr(run, "_write_tables", write_tables)
+        run.run_once(config_path=Path("config.yaml"), resume=True)
+        assert len(stub.requests) == 4
+
+    journals = list(JOURNAL_DIR.glob("run=*.jsonl"))
+    assert len(journals) == 1
+    table = ds.dataset("data/flight_price_tracker/search_runs", format="parquet").to_table()
+    assert table.num_rows == 4
+    assert len(set(table.column("observed_at_utc").to_pylist())) == 1
+    assert Path("reports/latest.md").exists()
+    assert RunJournal.latest_incomplete(JOURNAL_DIR) is None
+
+
+def test_resume_refetches_loaded_dates_whose_evidence_is_gone(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, serpapi_payload: dict[str, Any]
+) -> None:
+    """A loaded date whose evidence was deleted is fetched again, not reported as failed."""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("SERPAPI_API_KEY", "k")
+    Path("config.yaml").write_text(
+        "route: {origin: VIE, destination: TGD}\n"
+        "window: {start_offset_days: 1, window_days: 2}\n"
+        "serpapi: {rate_limit_seconds: 0}\n"
+        "storage: {writer: pyarrow}\n",
+        encoding="utf-8",
+    )
+    with SerpApiStub(payload=serpapi_payload, fail_dates=set()) as stub:
+        monkeypatch.setattr(
+            run, "SerpApiClient", functools.partial(SerpApiClient, base_url=stub.base_url)
+        )
+        update_summary = run.update_summary
+
+        def _crash(**kwargs: object) -> None:
+            raise RuntimeError("summary failed")
+
+        monkeypatch.setattr(run, "update_summary", _crash)
+        with pytest.raises(RuntimeError):
+            run.run_once(config_path=Path("config.yaml"))
+        first = ds.dataset("data/flight_price_tracker/search_runs", format="parquet").to_table()
+        deleted = Path(first.column("evidence_json_path")[0].as_py())
+        deleted.unlink()
+
+        monkeypatch.setattr(run, "update_summary", update_summary)
+        run.run_once(config_path=Path("config.yaml"), resume=True)
+        assert len(stub.requests) == 3
+
+    assert deleted.exists()
+    table = ds.dataset("data/flight_price_tracker/search_runs", format="parquet").to_table()
+    assert table.column("error").null_count == table.num_rows
+    assert "None" not in Path("reports/latest.md").read_text(encoding="utf-8")
@@ -0,0 +1,136 @@
+"""Tests for round-trip queries and price matrices."""
+
+from __future__ import annotations
+
+import functools
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+from pydantic import ValidationError
+from serpapi_stub import SerpApiStub
+
+import flight_price_tracker.run as run
+from flight_price_tracker.matrix import build_price_matrix, load_price_matrix
+from flight_price_tracker.parquet_writer import open_dataset, write_search_runs
+from flight_price_tracker.records import SearchRun
+from flight_price_tracker.serpapi import SerpApiClient
+from flight_price_tracker.settings import AppConfig
+
+
+def test_price_matrix_places_cells_by_outbound_date_and_trip_length() -> None:
+    """Rows land in their cell; missing, failed and unconfigured lengths stay empty."""
+    table = pa.table(
+        {
+            "outbound_date": ["2026-03-02", "2026-03-01", "2026-03-01", "2026-03-02", "2026-03-01"],
+            "return_date": ["2026-03-09", "2026-03-04", "2026-03-08", "2026-03-05", "2026-03-03"],
+            "cheapest_price": [300.5, 120.0, None, 99.0, 50.0],
+        }
+    )
+
+    matrix = build_price_matrix(table, trip_lengths=pa.array([3, 7], type=pa.int64()))
+
+    assert matrix.shape == (2, 2)
+    assert matrix.prices.to_pylist() == [120.0, None, 99.0, 300.5]
+    assert matrix.price("2026-03-02", 7) == 300.5
+    assert matrix.price("2026-03-05", 7) is None
+    assert matrix.to_markdown()[2:] == [
+        "| 2026-03-01 | 120 | – |",
+        "| 2026-03-02 | 99 | 300.5 |",
+    ]
+    cheapest = matrix.cheapest(5)
+    assert [(c.outbound_date, c.return_date, c.price) for c in cheapest] == [
+        ("2026-03-02", "2026-03-05", 99.0),
+        ("2026-03-01", "2026-03-04", 120.0),
+        ("2026-03-02", "2026-03-09", 300.5),
+    ]
+
+
+def test_price_matrix_reads_runs_loaded_after_midnight(tmp_path: Path) -> None:
+    """A run that starts before midnight UTC and loads after it is still found."""
+    observed = datetime(2026, 3, 1, 23, 50, tzinfo=timezone.utc)
+    runs = [
+        SearchRun(
+            run_date="2026-03-02",  # the load date, as the dlt writer partitions it
+            observed_at_utc=observed,
+            route="VIE-TGD",
+            origin="VIE",
+            destination="TGD",
+            outbound_date="2026-04-01",
+            return_date=f"2026-04-0{1 + nights}",
+            currency="EUR",
+            serpapi_params="{}",
+            cheapest_price=100.0 + nights,
+        )
+        for nights in (3, 7)
+    ]
+    write_search_runs(dataset_root=tmp_path, search_runs=runs)
+
+    matrix = load_price_matrix(
+        dataset_root=tmp_path, route="VIE-TGD", observed_at_utc=observed, trip_lengths=[3, 7]
+    )
+
+    assert matrix.prices.to_pylist() == [103.0, 107.0]
+
+
+def test_schedule_is_rejected_for_round_trip_windows() -> None:
+    """Round-trip windows cannot be combined with adaptive scheduling."""
+    with pytest.raises(ValidationError):
+        AppConfig.model_validate(
+            {
+                "route": {"origin": "VIE", "destination": "TGD"},
+                "window": {"trip_lengths_days": [3, 7]},
+                "schedule": {"enabled": True},
+            }
+        )
+
+
+@pytest.mark.parametrize("writer", ["pyarrow", "dlt"])
+def test_round_trip_run_queries_matrix_and_reports_it(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, writer: str, serpapi_payload: dict[str, Any]
+) -> None:
+    """Each outbound date is queried once per trip length and reported as a matrix."""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("SERPAPI_API_KEY", "k")
+    Path("config.yaml").write_text(
+        "route: {origin: VIE, destination: TGD}\n"
+        "window: {start_offset_days: 1, window_days: 2, trip_lengths_days: [3, 7]}\n"
+        "serpapi: {rate_limit_seconds: 0}\n"
+        f"storage: {{writer: {writer}}}\n",
+        encoding="utf-8",
+    )
+    today = datetime.now(timezone.utc).date()
+    outbound = [(today + timedelta(days=i)).isoformat() for i in (1, 2)]
+
+    with SerpApiStub(payload=serpapi_payload) as stub:
+        monkeypatch.setattr(
+            run, "SerpApiClient", functools.partial(SerpApiClient, base_url=stub.base_url)
+        )
+        run.run_once(config_path=Path("config.yaml"))
+
+    queried = sorted((q["type"], q["outbound_date"], q["return_date"]) for q in stub.requests)
+    assert queried == sorted(
+        ("1", od, (datetime.fromisoformat(od) + timedelta(days=n)).date().isoformat())
+        for od in outbound
+        for n in (3, 7)
+    )
+    dataset_root = Path("data/flight_price_tracker")
+    runs = open_dataset(dataset_root, "search_runs").to_table()
+    assert runs.num_rows == 4
+    assert runs["return_date"].null_count == 0
+    assert runs["cheapest_price"].null_count == 0
+    assert all(Path(p).exists() for p in runs["evidence_json_path"].to_pylist())
+    offers = open_dataset(dataset_root, "offers").to_table()
+    assert offers.num_rows > 0
+    assert offers["return_date"].null_count == 0
+
+    report = Path("reports/latest.md").read_text(encoding="utf-8")
+    assert "| Outbound \\ nights | 3 | 7 |" in report
+    assert f"| {outbound[0]} |" in report
+    assert "## Top deals" in report
+    # Round trips are not folded into the one-way price history summary.
+    summary = dataset_root / "price_history_summary" / "price_history_summary.parquet"
+    assert pq.read_table(summary).num_rows == 0
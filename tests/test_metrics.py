@@ -0,0 +1,89 @@
+"""Tests for per-stage run metrics."""
+
+from __future__ import annotations
+
+import functools
+import pstats
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+import pyarrow.dataset as ds
+import pytest
+from serpapi_stub import SerpApiStub
+
+import flight_price_tracker.run as run
+from flight_price_tracker.cli import main
+from flight_price_tracker.metrics import RUN_METRICS_SCHEMA, RunMetrics
+from flight_price_tracker.report import build_report_markdown
+from flight_price_tracker.serpapi import SerpApiClient
+
+
+def test_stages_are_timed_and_summarised() -> None:
+    """Samples keep their sizes; the summary totals them per stage in first-seen order."""
+    ticks = iter([0.0, 0.5, 1.0, 1.25, 2.0, 2.25])
+    metrics = RunMetrics(clock=lambda: next(ticks))
+
+    with metrics.stage("serpapi", route="VIE-TGD", outbound_date="2026-04-01") as m:
+        m.bytes = 100
+    with metrics.stage("normalize", route="VIE-TGD", outbound_date="2026-04-01") as m:
+        m.rows = 5
+    with pytest.raises(RuntimeError), metrics.stage("serpapi", route="VIE-TGD"):
+        raise RuntimeError("boom")
+    metrics.record("load", seconds=3.0, rows=7)
+
+    summary = {s.stage: s for s in metrics.summary()}
+    assert list(summary) == ["serpapi", "normalize", "load"]
+    assert (summary["serpapi"].count, summary["serpapi"].seconds) == (2, 0.75)
+    assert (summary["serpapi"].max_seconds, summary["serpapi"].bytes) == (0.5, 100)
+    assert (summary["normalize"].rows, summary["normalize"].bytes) == (5, None)
+
+    observed = datetime(2026, 3, 1, 6, 0, tzinfo=timezone.utc)
+    table = metrics.to_table(run_date="2026-03-01", observed_at_utc=observed)
+    assert table.schema == RUN_METRICS_SCHEMA
+    assert table.column("stage").to_pylist() == ["serpapi", "normalize", "serpapi", "load"]
+
+    md = build_report_markdown(
+        route="VIE-TGD",
+        observed_at_utc=observed,
+        currency="EUR",
+        rows=[],
+        evidence=[],
+        prev_prices=None,
+        top_k_deals=1,
+        timings=metrics.summary(),
+    )
+    assert "| serpapi | 2 | 0.750 | 0.500 | 100 | |" in md
+    assert "| load | 1 | 3.000 | 3.000 | | 7 |" in md
+
+
+def test_run_writes_run_metrics_and_profile(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, serpapi_payload: dict[str, Any]
+) -> None:
+    """A run records per-date SerpApi samples; `--profile` dumps readable pstats."""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("SERPAPI_API_KEY", "k")
+    Path("config.yaml").write_text(
+        "route: {origin: VIE, destination: TGD}\n"
+        "window: {start_offset_days: 1, window_days: 3}\n"
+        "serpapi: {rate_limit_seconds: 0}\n"
+        "storage: {writer: pyarrow}\n"
+        "cache: {enabled: false}\n",
+        encoding="utf-8",
+    )
+    with SerpApiStub(payload=serpapi_payload) as stub:
+        monkeypatch.setattr(
+            run, "SerpApiClient", functools.partial(SerpApiClient, base_url=stub.base_url)
+        )
+        assert main(["run", "--profile", "run.prof"]) == 0
+
+    table = ds.dataset("data/flight_price_tracker/run_metrics", format="parquet").to_table()
+    rows = table.to_pylist()
+    serpapi = [r for r in rows if r["stage"] == "serpapi"]
+    assert len(serpapi) == 3
+    assert all(r["bytes"] > 0 and r["outbound_date"] for r in serpapi)
+    assert {"history", "cache", "write_evidence", "normalize", "load", "report"} <= {
+        r["stage"] for r in rows
+    }
+    assert "## Run timing" in Path("reports/latest.md").read_text(encoding="utf-8")
+    assert pstats.Stats("run.prof").total_calls > 0
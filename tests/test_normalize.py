@@ -5,7 +5,7 @@ from __future__ import annotations
 import json
 from pathlib import Path
 
-from flight_price_tracker.normalize import cheapest_offer, extract_offers
+from flight_price_tracker.normalize import cheapest_offer, extract_offers, top_offers
 
 
 def test_extract_offers_and_cheapest_offer() -> None:
@@ -15,12 +15,12 @@ def test_extract_offers_and_cheapest_offer() -> None:
 
     offers = extract_offers(resp, outbound_date="2026-03-01", default_currency="USD")
     assert len(offers) == 2
-    assert offers[0]["price"] == 123.0
+    assert offers[0].price == 123.0
 
     cheapest = cheapest_offer(offers)
     assert cheapest is not None
-    assert cheapest["price"] == 123.0
-    assert cheapest["airlines"] == "Air Test"
+    assert cheapest.price == 123.0
+    assert cheapest.airlines == "Air Test"
 
 
 def test_extract_offers_from_airports_bucket() -> None:
@@ -29,9 +29,26 @@ def test_extract_offers_from_airports_bucket() -> None:
     resp = json.loads(p.read_text(encoding="utf-8"))
 
     offers = extract_offers(resp, outbound_date="2026-02-20", default_currency="EUR")
-    assert [o["price"] for o in offers] == [148.0, 225.0]
+    assert [o.price for o in offers] == [148.0, 225.0]
 
     cheapest = cheapest_offer(offers)
     assert cheapest is not None
-    assert cheapest["price"] == 148.0
-    assert cheapest["airlines"] == "Air Cheap"
+    assert cheapest.price == 148.0
+    assert cheapest.airlines == "Air Cheap"
+
+
+def test_top_offers_matches_full_sort() -> None:
+    """The single-pass top-N selection must agree with sorting every offer."""
+    entries = [
+        {"price": price, "stops": stops, "flights": [{"airline": f"A{i}"}]}
+        for i, (price, stops) in enumerate(
+            [(300, 1), (120, 2), (120, 0), (90, 2), (120, None), (500, 0), (90, 1)]
+        )
+    ]
+    resp = {"best_flights": entries[:3], "airports": [{"other_flights": entries[3:]}]}
+
+    offers = extract_offers(resp, outbound_date="2026-03-01")
+    for n in (1, 3, 10):
+        top, cheapest = top_offers(resp, outbound_date="2026-03-01", top_n=n)
+        assert top == offers[:n]
+        assert cheapest == cheapest_offer(offers)
@@ -0,0 +1,123 @@
+"""Tests for the direct PyArrow Parquet writer."""
+
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+import pyarrow.parquet as pq
+
+from flight_price_tracker.parquet_writer import (
+    OFFERS_SCHEMA,
+    SEARCH_RUNS_SCHEMA,
+    offers_to_table,
+    write_search_runs,
+    write_tables,
+)
+from flight_price_tracker.records import Offer, SearchRun
+from flight_price_tracker.report import load_previous_prices
+
+OBSERVED_AT = datetime(2026, 3, 1, 6, 0, tzinfo=timezone.utc)
+
+
+def _run(outbound_date: str, **kwargs: Any) -> SearchRun:
+    """Build a search run for VIE-TGD observed at `OBSERVED_AT`."""
+    return SearchRun(
+        run_date="2026-03-01",
+        observed_at_utc=OBSERVED_AT,
+        route="VIE-TGD",
+        origin="VIE",
+        destination="TGD",
+        outbound_date=outbound_date,
+        currency="EUR",
+        serpapi_params="{}",
+        **kwargs,
+    )
+
+
+def test_write_tables_uses_fixed_schemas_and_dlt_layout(tmp_path: Path) -> None:
+    """Files should land in `{table}/run_date=.../` with the dlt-compatible schemas."""
+    base = {"run_date": "2026-03-01", "observed_at_utc": OBSERVED_AT, "route": "VIE-TGD"}
+    written = write_tables(
+        dataset_root=tmp_path / "flight_price_tracker",
+        search_runs_rows=[
+            {**base, "outbound_date": "2026-03-10", "currency": "EUR", "cheapest_price": 99.0},
+            {**base, "outbound_date": "2026-03-11", "currency": "EUR", "error": "boom"},
+        ],
+        offers_rows=[{**base, "outbound_date": "2026-03-10", "rank": 1, "price": 99.0}],
+    )
+
+    by_table = {p.parent.parent.name: p for p in written}
+    assert set(by_table) == {"search_runs", "offers"}
+    assert by_table["offers"].parent.name == "run_date=2026-03-01"
+    assert pq.read_schema(by_table["search_runs"]).remove_metadata().equals(SEARCH_RUNS_SCHEMA)
+    assert pq.read_schema(by_table["offers"]).remove_metadata().equals(OFFERS_SCHEMA)
+    assert not list(tmp_path.rglob("*.tmp"))
+
+    prev = load_previous_prices(
+        data_root=tmp_path,
+        dataset_name="flight_price_tracker",
+        route="VIE-TGD",
+        before_observed_at_utc=datetime(2026, 3, 2, tzinfo=timezone.utc),
+    )
+    assert prev == {"2026-03-10": 99.0}
+
+
+def test_write_search_runs_matches_row_writer_schemas(tmp_path: Path) -> None:
+    """Records should be written with the same schemas as row dicts."""
+    offer = Offer(outbound_date="2026-03-10", bucket="best_flights", price=99.0)
+    written = write_search_runs(
+        dataset_root=tmp_path / "flight_price_tracker",
+        search_runs=[
+            _run("2026-03-10", cheapest_price=99.0, offers=(offer,)),
+            _run("2026-03-11", error="boom"),
+        ],
+    )
+
+    by_table = {p.parent.parent.name: p for p in written}
+    assert pq.read_schema(by_table["search_runs"]).remove_metadata().equals(SEARCH_RUNS_SCHEMA)
+    assert pq.read_schema(by_table["offers"]).remove_metadata().equals(OFFERS_SCHEMA)
+    runs = pq.read_table(by_table["search_runs"]).sort_by("outbound_date").to_pylist()
+    assert [(r["cheapest_price"], r["error"]) for r in runs] == [(99.0, None), (None, "boom")]
+
+
+def test_offers_to_table_ranks_offers_and_fills_currency() -> None:
+    """Offers are ranked per search run and inherit the run's currency when they lack one."""
+    runs = [
+        _run(
+            "2026-03-10",
+            offers=(
+                Offer(outbound_date="2026-03-10", bucket="best_flights", price=99.0, stops=0),
+                Offer(
+                    outbound_date="2026-03-10", bucket="other_flights", price=120.0, currency="USD"
+                ),
+            ),
+        ),
+        _run("2026-03-11", error="boom"),
+        _run(
+            "2026-03-12",
+            offers=(Offer(outbound_date="2026-03-12", bucket="best_flights", price=80.0),),
+        ),
+    ]
+
+    table = offers_to_table(runs, load_id="1")
+
+    rows = table.select(["outbound_date", "rank", "price", "currency", "stops"]).to_pylist()
+    assert rows == [
+        {"outbound_date": "2026-03-10", "rank": 1, "price": 99.0, "currency": "EUR", "stops": 0},
+        {
+            "outbound_date": "2026-03-10",
+            "rank": 2,
+            "price": 120.0,
+            "currency": "USD",
+            "stops": None,
+        },
+        {"outbound_date": "2026-03-12", "rank": 1, "price": 80.0, "currency": "EUR", "stops": None},
+    ]
+    assert table.schema.equals(OFFERS_SCHEMA)
+    assert rows == [
+        {k: row[k] for k in ("outbound_date", "rank", "price", "currency", "stops")}
+        for r in runs
+        for row in r.offer_rows()
+    ]
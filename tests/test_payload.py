@@ -0,0 +1,33 @@
+"""Tests for decoding and canonical encoding of SerpApi payloads."""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+
+from flight_price_tracker.payload import canonical_json, decode_json
+
+FIXTURE = Path(__file__).parent / "fixtures" / "serpapi_google_flights_sample.json"
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        FIXTURE.read_text(encoding="utf-8"),
+        '{"b": 1.1, "a": [1e-7, 3.0, -0.0, 12345678901234567890123], "z": "Beograd – Ñ 😀"}',
+        '{"price": NaN, "escaped": "\\ud83d\\ude00 \\u00e9"}',
+    ],
+)
+def test_canonical_json_is_byte_identical_to_stdlib(text: str) -> None:
+    """Decode + canonical encode must match the historic `json.dumps` evidence bytes."""
+    expected = json.dumps(json.loads(text), ensure_ascii=False, sort_keys=True).encode("utf-8")
+    assert canonical_json(decode_json(text.encode("utf-8"))) == expected
+    assert canonical_json(decode_json(text)) == expected
+
+
+def test_decode_json_rejects_invalid_documents() -> None:
+    """Invalid JSON raises `ValueError` whichever backend is used."""
+    with pytest.raises(ValueError):
+        decode_json(b'{"price": ')
@@ -0,0 +1,129 @@
+"""Tests for the DuckDB query layer."""
+
+from __future__ import annotations
+
+import json
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import pyarrow.parquet as pq
+import pytest
+
+from flight_price_tracker.cli import main
+from flight_price_tracker.parquet_writer import search_runs_to_table, write_search_runs
+from flight_price_tracker.query import QueryEngine, QueryError
+from flight_price_tracker.records import SearchRun
+from flight_price_tracker.report import load_previous_prices
+
+pytest.importorskip("duckdb")
+
+T0 = datetime(2026, 3, 1, 6, 0, tzinfo=timezone.utc)
+
+
+def _run(day: int, outbound_date: str, price: float | None) -> SearchRun:
+    observed = T0 + timedelta(days=day)
+    return SearchRun(
+        run_date=observed.date().isoformat(),
+        observed_at_utc=observed,
+        route="VIE-TGD",
+        origin="VIE",
+        destination="TGD",
+        outbound_date=outbound_date,
+        currency="EUR",
+        serpapi_params="{}",
+        cheapest_price=price,
+    )
+
+
+def test_named_queries_match_report_and_refresh_when_files_change(tmp_path: Path) -> None:
+    """Named queries agree with the report's loaders and see newly written runs."""
+    root = tmp_path / "flight_price_tracker"
+    with QueryEngine(root) as engine:
+        # No files yet: the views exist and are empty.
+        assert engine.run("deltas", route="VIE-TGD").num_rows == 0
+
+        write_search_runs(
+            dataset_root=root,
+            search_runs=[_run(0, "2026-04-01", 120.0), _run(0, "2026-04-02", 90.0)],
+        )
+        write_search_runs(
+            dataset_root=root,
+            search_runs=[_run(1, "2026-04-01", 100.0), _run(1, "2026-04-02", None)],
+        )
+        deltas = engine.run("deltas", route="VIE-TGD")
+        assert deltas.to_pylist() == [
+            {
+                "outbound_date": "2026-04-01",
+                "cheapest_price": 100.0,
+                "previous_price": 120.0,
+                "delta": -20.0,
+            },
+            {
+                "outbound_date": "2026-04-02",
+                "cheapest_price": None,
+                "previous_price": 90.0,
+                "delta": None,
+            },
+        ]
+        assert engine.run("deltas", route="VIE-TGD") is deltas
+
+        before = T0 + timedelta(days=1, hours=1)
+        previous = engine.run("previous_prices", route="VIE-TGD", before=before).to_pydict()
+        assert dict(zip(previous["outbound_date"], previous["cheapest_price"], strict=True)) == (
+            load_previous_prices(
+                data_root=tmp_path,
+                dataset_name="flight_price_tracker",
+                route="VIE-TGD",
+                before_observed_at_utc=before,
+            )
+        )
+
+        trends = engine.run("trends", route="VIE-TGD", since="2026-03-01")
+        assert trends.column("observations").to_pylist() == [2, 1]
+        assert trends.column("last_price").to_pylist() == [100.0, 90.0]
+
+        with pytest.raises(QueryError):
+            engine.run("trends", route="VIE-TGD")
+
+
+def test_named_queries_run_on_files_written_before_return_date(tmp_path: Path) -> None:
+    """Views have every schema column even when no file has it yet."""
+    root = tmp_path / "flight_price_tracker"
+    for day, price in ((0, 120.0), (1, 100.0)):
+        run = _run(day, "2026-04-01", price)
+        table = search_runs_to_table([run], load_id=str(day)).drop_columns(["return_date"])
+        partition = root / "search_runs" / f"run_date={run.run_date}"
+        partition.mkdir(parents=True)
+        pq.write_table(table, partition / f"{day}.parquet")
+
+    with QueryEngine(root) as engine:
+        latest = engine.run("latest_run", route="VIE-TGD").to_pylist()
+        assert [(r["cheapest_price"], r["return_date"]) for r in latest] == [(100.0, None)]
+        previous = engine.run("previous_prices", route="VIE-TGD", before=T0 + timedelta(days=1))
+        assert previous.column("cheapest_price").to_pylist() == [120.0]
+        assert engine.run("deltas", route="VIE-TGD").column("delta").to_pylist() == [-20.0]
+        trends = engine.run("trends", route="VIE-TGD", since="2026-03-01")
+        assert trends.column("observations").to_pylist() == [2]
+
+
+def test_query_command_prints_named_and_ad_hoc_results(
+    tmp_path: Path, capsys: pytest.CaptureFixture[str]
+) -> None:
+    """`query` runs named queries and SQL and keeps its views in a DuckDB file."""
+    write_search_runs(
+        dataset_root=tmp_path / "data" / "flight_price_tracker",
+        search_runs=[_run(0, "2026-04-01", 120.0), _run(0, "2026-04-02", 90.0)],
+    )
+    database = tmp_path / "query.duckdb"
+    common = ["--data-root", str(tmp_path / "data"), "--database", str(database)]
+
+    assert main(["query", "latest_run", "-p", "route=VIE-TGD", "--format", "json", *common]) == 0
+    rows = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert [r["cheapest_price"] for r in rows] == [120.0, 90.0]
+
+    sql = "SELECT count(*) AS n FROM search_runs"
+    assert main(["query", "--sql", sql, "--format", "csv", *common]) == 0
+    assert capsys.readouterr().out.splitlines() == ['"n"', "2"]
+    assert database.exists()
+
+    assert main(["query", "--sql", "SELECT * FROM missing", *common]) == 1
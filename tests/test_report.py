@@ -3,8 +3,11 @@
 from __future__ import annotations
 
 from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
 
-from flight_price_tracker.report import EvidenceRef, build_report_markdown
+from flight_price_tracker.parquet_writer import write_tables
+from flight_price_tracker.report import EvidenceRef, build_report_markdown, load_previous_prices
 
 
 def test_report_includes_evidence_paths_and_hashes() -> None:
@@ -28,3 +31,83 @@ def test_report_includes_evidence_paths_and_hashes() -> None:
     assert "evidence/route=LHR-JFK" in md
     assert "sha256 `deadbeef`" in md
     assert "USD" in md
+
+
+def test_load_previous_prices_picks_latest_prior_run_for_route(tmp_path: Path) -> None:
+    """Only the latest run before the cutoff for the requested route should be returned."""
+
+    def _row(observed_at: datetime, route: str, od: str, price: float | None) -> dict[str, Any]:
+        return {
+            "run_date": observed_at.date().isoformat(),
+            "observed_at_utc": observed_at,
+            "route": route,
+            "outbound_date": od,
+            "cheapest_price": price,
+        }
+
+    day1 = datetime(2026, 3, 1, 6, 0, tzinfo=timezone.utc)
+    day2 = datetime(2026, 3, 2, 6, 0, tzinfo=timezone.utc)
+    day3 = datetime(2026, 3, 3, 6, 0, tzinfo=timezone.utc)
+    write_tables(
+        dataset_root=tmp_path / "flight_price_tracker",
+        search_runs_rows=[
+            _row(day1, "VIE-TGD", "2026-03-10", 150.0),
+            _row(day2, "VIE-TGD", "2026-03-10", 140.0),
+            _row(day2, "VIE-TGD", "2026-03-11", None),
+            _row(day2, "VIE-LHR", "2026-03-10", 90.0),
+            _row(day3, "VIE-TGD", "2026-03-10", 130.0),
+        ],
+        offers_rows=[],
+    )
+
+    prev = load_previous_prices(
+        data_root=tmp_path,
+        dataset_name="flight_price_tracker",
+        route="VIE-TGD",
+        before_observed_at_utc=day3,
+    )
+
+    assert prev == {"2026-03-10": 140.0}
+
+    older = load_previous_prices(
+        data_root=tmp_path,
+        dataset_name="flight_price_tracker",
+        route="VIE-LHR",
+        before_observed_at_utc=datetime(2026, 3, 4, tzinfo=timezone.utc),
+    )
+    assert older == {"2026-03-10": 90.0}
+
+
+def test_load_previous_prices_finds_runs_loaded_on_a_later_day(tmp_path: Path) -> None:
+    """Partitions follow the load date, which can be days after the observation."""
+
+    def _row(observed_at: datetime, run_date: str, price: float) -> dict[str, Any]:
+        return {
+            "run_date": run_date,
+            "observed_at_utc": observed_at,
+            "route": "VIE-TGD",
+            "outbound_date": "2026-03-10",
+            "cheapest_price": price,
+        }
+
+    write_tables(
+        dataset_root=tmp_path / "flight_price_tracker",
+        search_runs_rows=[
+            _row(datetime(2026, 3, 1, 6, 0, tzinfo=timezone.utc), "2026-03-04", 150.0),  # resumed
+            _row(datetime(2026, 3, 2, 6, 0, tzinfo=timezone.utc), "2026-03-02", 140.0),
+            _row(datetime(2026, 3, 2, 23, 50, tzinfo=timezone.utc), "2026-03-03", 130.0),
+            _row(datetime(2026, 3, 3, 0, 10, tzinfo=timezone.utc), "2026-03-06", 120.0),
+        ],
+        offers_rows=[],
+    )
+
+    def _prev(before: datetime) -> dict[str, float] | None:
+        return load_previous_prices(
+            data_root=tmp_path,
+            dataset_name="flight_price_tracker",
+            route="VIE-TGD",
+            before_observed_at_utc=before,
+        )
+
+    assert _prev(datetime(2026, 3, 3, 0, 5, tzinfo=timezone.utc)) == {"2026-03-10": 130.0}
+    assert _prev(datetime(2026, 3, 5, tzinfo=timezone.utc)) == {"2026-03-10": 120.0}
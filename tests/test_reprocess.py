@@ -0,0 +1,155 @@
+"""Tests for rebuilding the normalized tables from evidence."""
+
+from __future__ import annotations
+
+import json
+from datetime import datetime, timezone
+from hashlib import sha256
+from pathlib import Path
+
+import pyarrow.dataset as ds
+import pytest
+
+import flight_price_tracker.compact as compact
+import flight_price_tracker.reprocess as reprocess
+from flight_price_tracker.evidence_store import evidence_json_path
+from flight_price_tracker.normalize import top_offers
+from flight_price_tracker.parquet_writer import write_search_runs
+from flight_price_tracker.records import Offer, SearchRun
+from flight_price_tracker.reprocess import reprocess_dataset
+from flight_price_tracker.summary import load_summary, update_summary
+
+FIXTURE = Path(__file__).parent / "fixtures" / "serpapi_google_flights_sample.json"
+OBSERVED_AT = datetime(2026, 3, 1, 6, 0, tzinfo=timezone.utc)
+STALE = Offer(outbound_date="", bucket="best_flights", price=999.0)
+
+
+def _stale_run(evidence_root: Path, outbound_date: str, raw: bytes) -> SearchRun:
+    """Write evidence with its sidecar and a search run whose extraction is outdated."""
+    path = evidence_json_path(
+        evidence_root=evidence_root,
+        route="VIE-TGD",
+        run_date="2026-03-01",
+        outbound_date=outbound_date,
+    )
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(raw)
+    digest = sha256(raw).hexdigest()
+    path.with_suffix(".sha256").write_text(digest + "\n", encoding="utf-8")
+    return SearchRun(
+        run_date="2026-03-01",
+        observed_at_utc=OBSERVED_AT,
+        route="VIE-TGD",
+        origin="VIE",
+        destination="TGD",
+        outbound_date=outbound_date,
+        currency="EUR",
+        serpapi_params="{}",
+        cheapest_price=999.0,
+        evidence_json_path=path.as_posix(),
+        evidence_sha256=digest,
+        offers=(STALE,),
+    )
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_reprocess_rebuilds_tables_from_verified_evidence(tmp_path: Path, workers: int) -> None:
+    """Offers are re-extracted from evidence; tampered evidence keeps the stored rows."""
+    raw = FIXTURE.read_bytes()
+    dataset_root = tmp_path / "data" / "flight_price_tracker"
+    runs = [_stale_run(tmp_path / "evidence", od, raw) for od in ("2026-04-01", "2026-04-02")]
+    tampered = Path(runs[1].evidence_json_path or "")
+    tampered.write_bytes(raw + b" ")
+    write_search_runs(dataset_root=dataset_root, search_runs=runs)
+    write_search_runs(dataset_root=dataset_root, search_runs=runs[:1])  # a second small file
+    update_summary(dataset_root=dataset_root, search_runs=runs)
+
+    stats = reprocess_dataset(
+        dataset_root=dataset_root, top_n={"VIE-TGD": 3}, default_top_n=5, workers=workers
+    )
+    assert (stats.partitions, stats.files, stats.skipped) == (1, 2, 1)
+
+    expected, cheapest = top_offers(
+        json.loads(raw), outbound_date="2026-04-01", top_n=3, default_currency="EUR"
+    )
+    assert cheapest is not None
+    for table in ("search_runs", "offers"):
+        assert len(list((dataset_root / table / "run_date=2026-03-01").glob("*.parquet"))) == 1
+
+    search_runs = ds.dataset(str(dataset_root / "search_runs")).to_table().to_pylist()
+    prices = sorted((r["outbound_date"], r["cheapest_price"]) for r in search_runs)
+    assert prices == [
+        ("2026-04-01", cheapest.price),
+        ("2026-04-01", cheapest.price),
+        ("2026-04-02", 999.0),
+    ]
+
+    offers = ds.dataset(str(dataset_root / "offers")).to_table().sort_by("rank").to_pylist()
+    fresh = [(o["rank"], o["price"]) for o in offers if o["outbound_date"] == "2026-04-01"]
+    assert fresh == [(rank, o.price) for rank, o in enumerate(expected, start=1) for _ in "ab"]
+    assert [o["price"] for o in offers if o["outbound_date"] == "2026-04-02"] == [999.0]
+
+    summary = load_summary(
+        dataset_root=dataset_root, route="VIE-TGD", outbound_dates=["2026-04-01"]
+    )
+    assert summary["2026-04-01"].last_price == cheapest.price
+
+
+def test_reprocess_does_not_create_empty_offers_partitions(tmp_path: Path) -> None:
+    """A partition without offers stays without an `offers` directory."""
+    dataset_root = tmp_path / "data" / "flight_price_tracker"
+    failed = SearchRun(
+        run_date="2026-03-01",
+        observed_at_utc=OBSERVED_AT,
+        route="VIE-TGD",
+        origin="VIE",
+        destination="TGD",
+        outbound_date="2026-04-01",
+        currency="EUR",
+        serpapi_params="{}",
+        error="HTTP 500",
+    )
+    write_search_runs(dataset_root=dataset_root, search_runs=[failed])
+
+    stats = reprocess_dataset(dataset_root=dataset_root, top_n={}, default_top_n=5, workers=1)
+
+    assert stats.partitions == 1
+    assert not (dataset_root / "offers").exists()
+    assert len(list((dataset_root / "search_runs" / "run_date=2026-03-01").iterdir())) == 1
+
+
+@pytest.mark.parametrize("crash", ["before_exchange", "after_exchange"])
+def test_rerun_finishes_a_swap_interrupted_between_tables(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, crash: str
+) -> None:
+    """A crash after `search_runs` was swapped is completed from the marker on the next run."""
+    raw = FIXTURE.read_bytes()
+    dataset_root = tmp_path / "data" / "flight_price_tracker"
+    run = _stale_run(tmp_path / "evidence", "2026-04-01", raw)
+    write_search_runs(dataset_root=dataset_root, search_runs=[run])
+
+    def _crash_on_offers(partition: Path, **kwargs: object) -> None:
+        if partition.parent.name == "offers":
+            raise RuntimeError("crash")
+        original(partition, **kwargs)
+
+    module = reprocess if crash == "before_exchange" else compact
+    name = "replace_partition" if crash == "before_exchange" else "finish_replace"
+    original = getattr(module, name)
+    with monkeypatch.context() as m:
+        m.setattr(module, name, _crash_on_offers)
+        with pytest.raises(RuntimeError):
+            reprocess_dataset(dataset_root=dataset_root, top_n={}, default_top_n=3, workers=1)
+    assert list(dataset_root.glob(".reprocess.*.json"))
+
+    # The evidence is gone: a rerun keeps whatever offers the table holds for the row.
+    Path(run.evidence_json_path or "").unlink()
+    stats = reprocess_dataset(dataset_root=dataset_root, top_n={}, default_top_n=3, workers=1)
+
+    assert stats.skipped == 1
+    assert not list(dataset_root.glob(".reprocess.*.json"))
+    for table in ("search_runs", "offers"):
+        assert [p.name for p in (dataset_root / table).iterdir()] == ["run_date=2026-03-01"]
+    offers = ds.dataset(str(dataset_root / "offers")).to_table().to_pylist()
+    assert len(offers) == 2
+    assert 999.0 not in [o["price"] for o in offers]
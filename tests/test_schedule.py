@@ -0,0 +1,129 @@
+"""Tests for adaptive re-query scheduling."""
+
+from __future__ import annotations
+
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+
+from flight_price_tracker.parquet_writer import write_tables
+from flight_price_tracker.report import build_report_markdown
+from flight_price_tracker.schedule import (
+    DateHistory,
+    load_history,
+    plan_queries,
+    refresh_interval_days,
+)
+from flight_price_tracker.settings import ScheduleConfig
+
+TODAY = date(2026, 3, 10)
+
+
+def _history(days_ago: int, volatility: float, price: float = 100.0) -> DateHistory:
+    observed = datetime(2026, 3, 10, 6, 0, tzinfo=timezone.utc) - timedelta(days=days_ago)
+    return DateHistory(last_observed_at_utc=observed, last_price=price, volatility=volatility)
+
+
+def test_refresh_interval_scales_with_volatility_and_proximity() -> None:
+    """Volatile and near-term dates refresh daily, stable ones every `max_interval_days`."""
+    config = ScheduleConfig(enabled=True)
+
+    def interval(volatility: float, days_out: int = 60) -> int:
+        return refresh_interval_days(
+            history=_history(1, volatility), days_out=days_out, config=config
+        )
+
+    assert refresh_interval_days(history=None, days_out=60, config=config) == 0
+    assert interval(0.2) == 1
+    assert interval(0.0, days_out=3) == 1
+    assert interval(0.0) == 7
+    assert 1 < interval(0.03) < 7
+
+
+def test_plan_queries_respects_due_dates_and_budget() -> None:
+    """Only due dates are queried, new dates first, capped by the remaining budget."""
+    keys = [("VIE-TGD", f"2026-04-{day:02d}") for day in range(1, 6)]
+    history = {
+        keys[0]: _history(1, 0.0),  # stable, queried yesterday -> carried
+        keys[1]: _history(8, 0.0),  # stable but overdue
+        keys[2]: _history(1, 0.5),  # volatile -> due daily
+        # keys[3] has no history -> always due
+        keys[4]: _history(2, 0.5, price=80.0),  # volatile, more overdue than keys[2]
+    }
+
+    unlimited = plan_queries(
+        keys, history=history, today=TODAY, calls_today=0, config=ScheduleConfig(enabled=True)
+    )
+    assert unlimited.query == keys[1:]
+    assert set(unlimited.carried) == {keys[0]}
+
+    budgeted = plan_queries(
+        keys,
+        history=history,
+        today=TODAY,
+        calls_today=1,
+        config=ScheduleConfig(enabled=True, daily_call_budget=3),
+    )
+    assert budgeted.query == [keys[3], keys[4]]
+    assert set(budgeted.carried) == {keys[0], keys[1], keys[2]}
+
+
+def test_load_history_summarises_priced_runs(tmp_path: Path) -> None:
+    """History keeps the last priced observation and the price range per date."""
+    rows = []
+    for day, price in ((6, 100.0), (8, 110.0), (9, None)):
+        observed = datetime(2026, 3, day, 6, 0, tzinfo=timezone.utc)
+        rows.append(
+            {
+                "run_date": observed.date().isoformat(),
+                "observed_at_utc": observed,
+                "route": "VIE-TGD",
+                "outbound_date": "2026-04-01",
+                "cheapest_price": price,
+            }
+        )
+    rows.append({**rows[-1], "route": "VIE-LHR", "cheapest_price": 50.0})
+    rows.append(
+        {
+            **rows[-1],
+            "run_date": "2026-03-10",
+            "observed_at_utc": datetime(2026, 3, 10, 1, tzinfo=timezone.utc),
+        }
+    )
+    write_tables(
+        dataset_root=tmp_path / "flight_price_tracker", search_runs_rows=rows, offers_rows=[]
+    )
+
+    history, calls_today = load_history(
+        data_root=tmp_path,
+        dataset_name="flight_price_tracker",
+        routes=["VIE-TGD", "VIE-LHR"],
+        since=date(2026, 3, 7),
+        before_observed_at_utc=datetime(2026, 3, 10, 6, 0, tzinfo=timezone.utc),
+    )
+
+    tgd = history[("VIE-TGD", "2026-04-01")]
+    assert tgd.last_price == 110.0
+    assert tgd.last_observed_at_utc.date() == date(2026, 3, 8)
+    assert tgd.volatility == 0.0
+    assert history[("VIE-LHR", "2026-04-01")].last_price == 50.0
+    assert calls_today == 1
+
+
+def test_report_marks_carried_forward_prices() -> None:
+    """Carried rows are flagged in the table and in the top deals."""
+    md = build_report_markdown(
+        route="VIE-TGD",
+        observed_at_utc=datetime(2026, 3, 10, 6, 0, tzinfo=timezone.utc),
+        currency="EUR",
+        rows=[
+            {"outbound_date": "2026-04-01", "cheapest_price": 90.0, "carried_from": "2026-03-08"},
+            {"outbound_date": "2026-04-02", "cheapest_price": 120.0},
+        ],
+        evidence=[],
+        prev_prices={"2026-04-01": 100.0},
+        top_k_deals=5,
+    )
+
+    assert "| 2026-04-01 | EUR 90* | | carried forward from 2026-03-08 |" in md
+    assert "- `2026-04-01`: EUR 90 (carried from 2026-03-08)" in md
+    assert "- Dates queried: 1; carried forward (not due): 1" in md
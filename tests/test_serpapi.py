@@ -0,0 +1,37 @@
+"""Tests for the pooled SerpApi client."""
+
+from __future__ import annotations
+
+import time
+
+import pytest
+from serpapi_stub import SerpApiStub
+
+from flight_price_tracker.serpapi import SerpApiClient, SerpApiError
+
+
+def test_client_reuses_one_keep_alive_connection() -> None:
+    """Sequential searches on one client should share a single pooled connection."""
+    with SerpApiStub() as stub, SerpApiClient(api_key="k", base_url=stub.base_url) as client:
+        for day in range(1, 6):
+            resp, _ = client.search_google_flights({"outbound_date": f"2026-03-0{day}"})
+            assert resp["search_metadata"]["id"] == f"stub-2026-03-0{day}"
+
+    assert len(stub.requests) == 5
+    assert stub.connections == 1
+    assert stub.requests[0]["engine"] == "google_flights"
+
+
+def test_client_enforces_timeout() -> None:
+    """Requests slower than `timeout_seconds` should fail fast with a redacted error."""
+    with (
+        SerpApiStub(latency_seconds=1.0) as stub,
+        SerpApiClient(api_key="secret", base_url=stub.base_url, timeout_seconds=0.1) as client,
+    ):
+        start = time.perf_counter()
+        with pytest.raises(SerpApiError) as excinfo:
+            client.search_google_flights({"outbound_date": "2026-03-01"})
+        elapsed = time.perf_counter() - start
+
+    assert elapsed < 0.9
+    assert "secret" not in str(excinfo.value)
@@ -0,0 +1,168 @@
+"""Tests for the UI serving tables."""
+
+from __future__ import annotations
+
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import pyarrow.parquet as pq
+
+from flight_price_tracker.metrics import RunMetrics, write_run_metrics
+from flight_price_tracker.parquet_writer import write_search_runs
+from flight_price_tracker.records import Offer, SearchRun
+from flight_price_tracker.serving import (
+    RETENTION_DAYS,
+    SERVING_DIR,
+    rebuild_serving_tables,
+    serving_path,
+    update_serving_run_metrics,
+    update_serving_tables,
+)
+
+T0 = datetime(2026, 3, 1, 6, 0, tzinfo=timezone.utc)
+
+
+def _run(
+    day: int,
+    outbound_date: str,
+    prices: list[tuple[float, str]],
+    *,
+    route: str = "VIE-TGD",
+    return_date: str | None = None,
+) -> SearchRun:
+    observed = T0 + timedelta(days=day)
+    offers = tuple(
+        Offer(
+            outbound_date=outbound_date, bucket="best_flights", price=p, currency="EUR", airlines=a
+        )
+        for p, a in prices
+    )
+    return SearchRun(
+        run_date=observed.date().isoformat(),
+        observed_at_utc=observed,
+        route=route,
+        origin=route[:3],
+        destination=route[4:],
+        outbound_date=outbound_date,
+        currency="EUR",
+        serpapi_params="{}",
+        return_date=return_date,
+        cheapest_price=min((p for p, _ in prices), default=None),
+        offers=offers,
+    )
+
+
+def _read(root: Path, table_name: str, route: str = "VIE-TGD") -> list[dict[str, object]]:
+    return pq.read_table(serving_path(root, table_name, route)).to_pylist()
+
+
+def test_runs_fold_into_serving_tables_idempotently(tmp_path: Path) -> None:
+    """Each run updates its routes' partitions; re-applying a run changes nothing."""
+    root = tmp_path / "flight_price_tracker"
+    first = [
+        _run(0, "2026-04-01", [(120.0, "Austrian"), (150.0, "Austrian, Air Serbia")]),
+        _run(0, "2026-04-02", []),
+        _run(0, "2026-04-01", [(400.0, "Austrian")], return_date="2026-04-05"),
+    ]
+    second = [
+        _run(1, "2026-04-01", [(100.0, "Air Serbia")]),
+        _run(1, "2026-04-02", [(90.0, "Austrian")]),
+    ]
+    # The first update on a dataset without serving tables backfills from history.
+    write_search_runs(dataset_root=root, search_runs=first)
+    update_serving_tables(dataset_root=root, search_runs=first)
+    write_search_runs(dataset_root=root, search_runs=second)
+    written = update_serving_tables(dataset_root=root, search_runs=second)
+    assert len(written) == 3
+
+    latest = _read(root, "latest_run")
+    assert [(r["outbound_date"], r["cheapest_price"]) for r in latest] == [
+        ("2026-04-01", 100.0),
+        ("2026-04-02", 90.0),
+    ]
+    daily = [(r["outbound_date"], r["run_date"], r["min_price"]) for r in _read(root, "daily_min")]
+    assert daily == [
+        ("2026-04-01", "2026-03-01", 120.0),
+        ("2026-04-01", "2026-03-02", 100.0),
+        ("2026-04-02", "2026-03-02", 90.0),
+    ]
+    stats = {r["airline"]: r for r in _read(root, "airline_stats")}
+    assert {a: (s["offers"], s["min_price"], s["max_price"]) for a, s in stats.items()} == {
+        "Austrian": (3, 90.0, 150.0),
+        "Air Serbia": (2, 100.0, 150.0),
+    }
+    assert stats["Austrian"]["avg_price"] == 120.0
+    assert stats["Air Serbia"]["last_seen_utc"] == T0 + timedelta(days=1)
+
+    before = {name: _read(root, name) for name in ("latest_run", "daily_min", "airline_stats")}
+    update_serving_tables(dataset_root=root, search_runs=second)
+    assert {name: _read(root, name) for name in before} == before
+
+    # A rebuild from history gives the same tables as the incremental updates.
+    rebuild_serving_tables(dataset_root=root)
+    assert {name: _read(root, name) for name in before} == before
+
+
+def test_other_routes_keep_their_partitions(tmp_path: Path) -> None:
+    """A run only rewrites the partitions of its own routes."""
+    root = tmp_path / "flight_price_tracker"
+    vie = [_run(0, "2026-04-01", [(120.0, "Austrian")])]
+    write_search_runs(dataset_root=root, search_runs=vie)
+    update_serving_tables(dataset_root=root, search_runs=vie)
+    kept = serving_path(root, "latest_run", "VIE-TGD").stat().st_mtime_ns
+
+    bud = [_run(1, "2026-04-01", [(80.0, "Wizz Air")], route="BUD-TGD")]
+    write_search_runs(dataset_root=root, search_runs=bud)
+    written = update_serving_tables(dataset_root=root, search_runs=bud)
+
+    assert {p.parent.name for p in written} == {"route=BUD-TGD"}
+    assert serving_path(root, "latest_run", "VIE-TGD").stat().st_mtime_ns == kept
+    assert [r["route"] for r in _read(root, "latest_run", "BUD-TGD")] == ["BUD-TGD"]
+
+
+def test_daily_min_and_run_metrics_keep_only_the_retained_run_dates(tmp_path: Path) -> None:
+    """Run dates older than the retention window are dropped as new runs arrive."""
+    root = tmp_path / "flight_price_tracker"
+    metrics_path = root / SERVING_DIR / "run_metrics" / "run_metrics.parquet"
+    for day in (0, 1, RETENTION_DAYS):
+        runs = [_run(day, "2026-09-01", [(100.0 - day, "Austrian")])]
+        write_search_runs(dataset_root=root, search_runs=runs)
+        update_serving_tables(dataset_root=root, search_runs=runs)
+
+        metrics = RunMetrics()
+        with metrics.stage("load"):
+            pass
+        observed = T0 + timedelta(days=day)
+        kwargs = {"run_date": observed.date().isoformat(), "observed_at_utc": observed}
+        write_run_metrics(metrics, dataset_root=root, **kwargs)
+        update_serving_run_metrics(dataset_root=root, run_metrics=metrics.to_table(**kwargs))
+
+    kept = ["2026-03-02", (T0 + timedelta(days=RETENTION_DAYS)).date().isoformat()]
+    assert [r["run_date"] for r in _read(root, "daily_min")] == kept
+    assert pq.read_table(metrics_path).column("run_date").to_pylist() == kept
+
+    # A rebuild from history keeps the same window.
+    rebuild_serving_tables(dataset_root=root)
+    assert [r["run_date"] for r in _read(root, "daily_min")] == kept
+    assert pq.read_table(metrics_path).column("run_date").to_pylist() == kept
+
+
+def _update_dates(dataset_root: Path, worker: int) -> None:
+    """Fold 10 single-date runs of one route into the serving tables (in a worker process)."""
+    for i in range(10):
+        outbound_date = f"2026-{worker + 4:02d}-{i + 1:02d}"
+        update_serving_tables(
+            dataset_root=dataset_root, search_runs=[_run(0, outbound_date, [(100.0, "XX")])]
+        )
+
+
+def test_concurrent_updates_keep_every_row(tmp_path: Path) -> None:
+    """Processes updating one route's partitions at the same time do not lose each other's rows."""
+    first = [_run(0, "2026-03-31", [(1.0, "XX")])]
+    write_search_runs(dataset_root=tmp_path, search_runs=first)
+    update_serving_tables(dataset_root=tmp_path, search_runs=first)
+    with ProcessPoolExecutor(max_workers=4) as pool:
+        list(pool.map(_update_dates, [tmp_path] * 4, range(4)))
+
+    assert len(_read(tmp_path, "daily_min")) == 41
@@ -0,0 +1,62 @@
+"""Tests for configuration loading and route resolution."""
+
+from __future__ import annotations
+
+import pytest
+from pydantic import ValidationError
+
+from flight_price_tracker.settings import AppConfig
+
+
+def test_split_routes_applies_per_route_overrides() -> None:
+    """Per-route window/serpapi overrides should be layered over the top-level sections."""
+    config = AppConfig.model_validate(
+        {
+            "routes": [
+                {"origin": "VIE", "destination": "TGD"},
+                {
+                    "origin": "VIE",
+                    "destination": "LHR",
+                    "window": {"start_offset_days": 7, "window_days": 3},
+                    "serpapi": {"currency": "GBP", "top_n_offers": 2},
+                },
+            ],
+            "window": {"window_days": 10},
+            "serpapi": {"currency": "EUR", "include_airlines": ["OS"]},
+        }
+    )
+
+    tgd, lhr = config.split_routes()
+
+    assert tgd.route is not None and tgd.route.route_id == "VIE-TGD"
+    assert tgd.window.window_days == 10
+    assert tgd.serpapi.currency == "EUR"
+    assert lhr.route is not None and lhr.route.route_id == "VIE-LHR"
+    assert (lhr.window.start_offset_days, lhr.window.window_days) == (7, 3)
+    assert lhr.serpapi.currency == "GBP"
+    assert lhr.serpapi.top_n_offers == 2
+    assert lhr.serpapi.include_airlines == ["OS"]
+
+
+def test_single_route_config_still_supported() -> None:
+    """A legacy `route:` config should resolve to exactly one route."""
+    config = AppConfig.model_validate({"route": {"origin": "VIE", "destination": "TGD"}})
+
+    (only,) = config.split_routes()
+
+    assert only.route is not None and only.route.route_id == "VIE-TGD"
+
+
+@pytest.mark.parametrize(
+    "raw",
+    [
+        {},
+        {"route": {"origin": "VIE", "destination": "TGD"}, "routes": []},
+        {"routes": [{"origin": "VIE", "destination": "TGD"}] * 2},
+        {"routes": [{"origin": "VIE", "destination": "TGD", "serpapi": {"rate_limit_seconds": 0}}]},
+    ],
+)
+def test_invalid_route_configs_are_rejected(raw: dict[str, object]) -> None:
+    """Missing/duplicate routes and per-route fetch-engine overrides should fail validation."""
+    with pytest.raises(ValidationError):
+        AppConfig.model_validate(raw)
@@ -0,0 +1,109 @@
+"""Tests for the incrementally maintained price history summary."""
+
+from __future__ import annotations
+
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import pyarrow.parquet as pq
+
+from flight_price_tracker.parquet_writer import write_search_runs
+from flight_price_tracker.records import SearchRun
+from flight_price_tracker.report import build_report_markdown
+from flight_price_tracker.summary import load_summary, summary_path, update_summary
+
+T0 = datetime(2026, 3, 1, 6, 0, tzinfo=timezone.utc)
+
+
+def _run(day: int, outbound_date: str, price: float | None, route: str = "VIE-TGD") -> SearchRun:
+    observed = T0 + timedelta(days=day)
+    return SearchRun(
+        run_date=observed.date().isoformat(),
+        observed_at_utc=observed,
+        route=route,
+        origin=route[:3],
+        destination=route[4:],
+        outbound_date=outbound_date,
+        currency="EUR",
+        serpapi_params="{}",
+        cheapest_price=price,
+        error=None if price is not None else "boom",
+    )
+
+
+def test_incremental_update_matches_backfill(tmp_path: Path) -> None:
+    """Folding runs one at a time gives the same table as a backfill from `search_runs`."""
+    days = [
+        [_run(0, "2026-04-01", 120.0), _run(0, "2026-04-02", 90.0), _run(0, "2026-04-01", None)],
+        [_run(1, "2026-04-01", 100.0), _run(1, "2026-04-02", 90.0)],
+        [_run(2, "2026-04-01", 110.0), _run(2, "2026-04-02", None, route="VIE-BEG")],
+        [_run(3, "2026-04-02", 80.0, route="VIE-BEG")],
+    ]
+    incremental = tmp_path / "incremental"
+    backfilled = tmp_path / "backfilled"
+    for runs in days:
+        write_search_runs(dataset_root=incremental, search_runs=runs)
+        update_summary(dataset_root=incremental, search_runs=runs)
+        write_search_runs(dataset_root=backfilled, search_runs=runs)
+    update_summary(dataset_root=backfilled, search_runs=[])
+
+    table = pq.read_table(summary_path(incremental))
+    assert table.equals(pq.read_table(summary_path(backfilled)))
+    assert table.column("route").to_pylist() == ["VIE-BEG", "VIE-TGD", "VIE-TGD"]
+
+    # Re-applying a run that is already folded in (e.g. after a resume) changes nothing.
+    update_summary(dataset_root=incremental, search_runs=days[2])
+    assert pq.read_table(summary_path(incremental)).equals(table)
+
+
+def test_summary_tracks_range_and_last_change(tmp_path: Path) -> None:
+    """The summary keeps the price range, the last change and the last drop."""
+    runs = [
+        _run(0, "2026-04-01", 120.0),
+        _run(1, "2026-04-01", 100.0),
+        _run(2, "2026-04-01", 110.0),
+        _run(3, "2026-04-01", 110.0),
+        _run(3, "2026-04-02", 90.0),
+    ]
+    update_summary(dataset_root=tmp_path, search_runs=runs)
+
+    summary = load_summary(dataset_root=tmp_path, route="VIE-TGD", outbound_dates=["2026-04-01"])
+    assert list(summary) == ["2026-04-01"]
+    s = summary["2026-04-01"]
+    assert (s.observations, s.min_price, s.max_price, s.last_price) == (4, 100.0, 120.0, 110.0)
+    assert s.last_change == 10.0
+    assert s.last_change_utc == T0 + timedelta(days=2)
+    assert s.last_drop_utc == T0 + timedelta(days=1)
+    assert load_summary(dataset_root=tmp_path, route="VIE-BEG", outbound_dates=["2026-04-01"]) == {}
+
+    md = build_report_markdown(
+        route="VIE-TGD",
+        observed_at_utc=T0 + timedelta(days=3),
+        currency="EUR",
+        rows=[{"outbound_date": "2026-04-01", "cheapest_price": 110.0}],
+        evidence=[],
+        prev_prices=None,
+        top_k_deals=1,
+        summary=summary,
+    )
+    assert "| Min–max | Last change | Since last drop |" in md
+    assert "| 2026-04-01 | EUR 110 | | EUR 100–EUR 120 | +EUR 10 (2026-03-03) | 2d | |" in md
+
+
+def _update_route(dataset_root: Path, route: str) -> None:
+    """Fold 10 runs of one route into the summary (runs in a worker process)."""
+    for day in range(10):
+        update_summary(
+            dataset_root=dataset_root,
+            search_runs=[_run(day, f"2026-04-{day + 1:02d}", 100.0 + day, route=route)],
+        )
+
+
+def test_concurrent_updates_keep_every_observation(tmp_path: Path) -> None:
+    """Processes updating the summary at the same time do not lose each other's rows."""
+    routes = ["VIE-TGD", "VIE-BEG", "VIE-LHR", "VIE-CDG"]
+    with ProcessPoolExecutor(max_workers=4) as pool:
+        list(pool.map(_update_route, [tmp_path] * 4, routes))
+
+    assert pq.read_table(summary_path(tmp_path)).num_rows == 40
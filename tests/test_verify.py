@@ -0,0 +1,120 @@
+"""Tests for evidence verification."""
+
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from hashlib import sha256
+from pathlib import Path
+
+import pytest
+
+from flight_price_tracker.cli import main
+from flight_price_tracker.evidence_store import EvidenceArchive, evidence_json_path
+from flight_price_tracker.parquet_writer import write_search_runs
+from flight_price_tracker.records import SearchRun
+from flight_price_tracker.verify import verify_evidence
+
+FIXTURE = Path(__file__).parent / "fixtures" / "serpapi_google_flights_sample.json"
+OBSERVED_AT = datetime(2026, 3, 1, 6, 0, tzinfo=timezone.utc)
+DATASET_ROOT = Path("data/flight_price_tracker")
+
+
+def _evidence(outbound_date: str, raw: bytes) -> Path:
+    """Write a JSON evidence file and its sidecar."""
+    path = evidence_json_path(
+        evidence_root=Path("evidence"),
+        route="VIE-TGD",
+        run_date="2026-03-01",
+        outbound_date=outbound_date,
+    )
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(raw)
+    path.with_suffix(".sha256").write_text(sha256(raw).hexdigest() + "\n", encoding="utf-8")
+    return path
+
+
+def _run(outbound_date: str, path: str, digest: str) -> SearchRun:
+    return SearchRun(
+        run_date="2026-03-01",
+        observed_at_utc=OBSERVED_AT,
+        route="VIE-TGD",
+        origin="VIE",
+        destination="TGD",
+        outbound_date=outbound_date,
+        currency="EUR",
+        serpapi_params="{}",
+        cheapest_price=123.0,
+        evidence_json_path=path,
+        evidence_sha256=digest,
+    )
+
+
+def test_verify_reports_missing_and_corrupt_evidence_and_skips_unchanged_files(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Payloads are checked against records and sidecars; unchanged files are not re-hashed."""
+    monkeypatch.chdir(tmp_path)
+    raw = FIXTURE.read_bytes()
+    digest = sha256(raw).hexdigest()
+    runs = []
+    for outbound_date in ("2026-04-01", "2026-04-02", "2026-04-03", "2026-04-04"):
+        path = _evidence(outbound_date, raw)
+        runs.append(_run(outbound_date, path.as_posix(), digest))
+    archived = EvidenceArchive(Path("evidence")).put(
+        route="VIE-TGD", run_date="2026-03-01", outbound_date="2026-04-05", raw=raw + b"\n"
+    )
+    runs.append(_run("2026-04-05", *archived))
+    write_search_runs(dataset_root=DATASET_ROOT, search_runs=runs)
+
+    tampered = Path(runs[1].evidence_json_path or "")
+    tampered.write_bytes(raw + b" ")
+    Path(runs[2].evidence_json_path or "").unlink()
+    Path(runs[3].evidence_json_path or "").with_suffix(".sha256").unlink()
+    stray = _evidence("2026-04-06", raw)  # not recorded in search_runs
+    stray.with_suffix(".sha256").write_text("0" * 64, encoding="utf-8")
+
+    stats = verify_evidence(evidence_root=Path("evidence"), dataset_root=DATASET_ROOT, workers=2)
+
+    assert [(i.kind, i.path.rsplit("/", 1)[1]) for i in stats.issues] == [
+        ("corrupt", "outbound_date=2026-04-02.json"),
+        ("sidecar_mismatch", "outbound_date=2026-04-02.json"),
+        ("missing", "outbound_date=2026-04-03.json"),
+        ("missing_sidecar", "outbound_date=2026-04-04.json"),
+        ("sidecar_mismatch", "outbound_date=2026-04-06.json"),
+    ]
+    assert (stats.files, stats.hashed, stats.unchanged) == (5, 5, 0)
+    assert stats.bytes_hashed == 5 * len(raw) + 2
+
+    again = verify_evidence(
+        evidence_root=Path("evidence"), dataset_root=DATASET_ROOT, incremental=True
+    )
+    assert (again.hashed, again.unchanged, again.issues) == (0, 5, stats.issues)
+
+    tampered.write_bytes(raw)
+    fixed = verify_evidence(
+        evidence_root=Path("evidence"), dataset_root=DATASET_ROOT, incremental=True
+    )
+    assert (fixed.hashed, fixed.unchanged) == (1, 4)
+    assert [i.kind for i in fixed.issues] == ["missing", "missing_sidecar", "sidecar_mismatch"]
+
+
+def test_verify_command_exits_non_zero_on_issues(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture[str]
+) -> None:
+    """The command prints a summary and lists issues on stderr."""
+    monkeypatch.chdir(tmp_path)
+    raw = FIXTURE.read_bytes()
+    path = _evidence("2026-04-01", raw)
+    write_search_runs(
+        dataset_root=DATASET_ROOT,
+        search_runs=[_run("2026-04-01", path.as_posix(), sha256(raw).hexdigest())],
+    )
+
+    assert main(["verify"]) == 0
+    assert "verified 1 evidence files (1 hashed, 0 unchanged)" in capsys.readouterr().out
+
+    path.write_bytes(b"{}")
+    assert main(["verify", "--incremental", "--workers", "1"]) == 1
+    out, err = capsys.readouterr()
+    assert "(1 hashed, 0 unchanged)" in out and ": 2 issues" in out
+    assert err.startswith(f"corrupt: {path.as_posix()}: sha256 ")